@@ -0,0 +1,8 @@
+"""
+Benchmarks for ggGit.
+
+Measures the latency of the gg* commands and the throughput of
+GitInterface, ConfigManager and ComplexityAnalyzer on generated
+repositories of several sizes, and compares the results with a stored
+baseline. Run with 'python -m benchmarks --help'.
+"""
@@ -0,0 +1,145 @@
+"""
+Run the ggGit benchmarks.
+
+Usage: python -m benchmarks [--scale small] [--repeat 10] [--filter 'git.*']
+                            [--save-baseline] [--threshold 0.25]
+
+A synthetic repository of the chosen scale is generated in a temporary
+directory, every benchmark is timed against it and the results are
+written to .benchmarks/results-<scale>.json. When a baseline for the
+scale exists (.benchmarks/baseline-<scale>.json, or --baseline) the
+results are compared with it and the exit code is 1 if any benchmark
+regressed. --save-baseline stores the results as the new baseline.
+
+Baselines depend on the machine; keep them local or per CI runner.
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from . import harness, synthetic
+
+
+# Directory of result files and baselines
+RESULTS_DIR = Path('.benchmarks')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Generate the repository, run the benchmarks and compare them.
+
+    Args:
+        argv (Optional[List[str]]): Arguments, defaults to sys.argv[1:]
+
+    Returns:
+        int: 0 on success, 1 if a benchmark regressed or failed
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--scale', choices=list(synthetic.SCALES), default='small')
+    parser.add_argument('--repeat', type=int, default=10, help='timed runs of each benchmark')
+    parser.add_argument('--seed', type=int, default=synthetic.DEFAULT_SEED)
+    parser.add_argument('--filter', action='append', default=[], metavar='PATTERN',
+                        help="only benchmarks matching this glob, e.g. 'git.*:warm' (repeatable)")
+    parser.add_argument('--output', type=Path, default=None)
+    parser.add_argument('--baseline', type=Path, default=None)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=harness.DEFAULT_THRESHOLD,
+                        help='relative slowdown of the median reported as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=harness.DEFAULT_MIN_DELTA_MS)
+    options = parser.parse_args(argv)
+    if options.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    scale = synthetic.SCALES[options.scale]
+    output = options.output or RESULTS_DIR / f"results-{scale.name}.json"
+    baseline_path = options.baseline or RESULTS_DIR / f"baseline-{scale.name}.json"
+    # Resolve before the benchmarks change directory
+    output, baseline_path = output.resolve(), baseline_path.resolve()
+
+    with tempfile.TemporaryDirectory(prefix='gggit-bench-') as workdir:
+        repo, home = Path(workdir) / 'repo', Path(workdir) / 'home'
+        home.mkdir()
+        print(f"Generating {scale.name} repository ({scale.files} files, {scale.commits} commits, "
+              f"{scale.branches} branches)...", file=sys.stderr)
+        info = synthetic.create_repo(repo, scale, options.seed)
+
+        results = _run_in_repo(repo, home, info, options.filter, options.repeat)
+
+    document = harness.write_results(output, results, scale=scale.name, seed=options.seed,
+                                     repeat=options.repeat, generator=synthetic.GENERATOR_VERSION)
+    print(f"Results written to {output}")
+    failed = [name for name, summary in results.items() if 'error' in summary]
+
+    if options.save_baseline:
+        harness.write_results(baseline_path, results, scale=scale.name, seed=options.seed,
+                              repeat=options.repeat, generator=synthetic.GENERATOR_VERSION)
+        print(f"Baseline saved to {baseline_path}")
+        return 1 if failed else 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 1 if failed else 0
+
+    baseline = harness.load_results(baseline_path)
+    for key in ('scale', 'seed', 'generator'):
+        if baseline.get(key) != document.get(key):
+            print(f"Baseline {key} is {baseline.get(key)!r}, this run used {document.get(key)!r}; "
+                  f"not comparing", file=sys.stderr)
+            return 1 if failed else 0
+
+    if options.filter:
+        baseline['benchmarks'] = {name: summary for name, summary in baseline['benchmarks'].items()
+                                  if _selected(name, options.filter)}
+    rows = harness.compare(document, baseline, options.threshold, options.min_delta_ms)
+    print()
+    print(harness.format_comparison(rows))
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {options.threshold:.0%}")
+    return 1 if regressions or failed else 0
+
+
+def _run_in_repo(repo: Path, home: Path, info, patterns: List[str], repeat: int):
+    """Run the selected benchmarks from inside the repository with a scratch HOME."""
+    root = Path(__file__).resolve().parent.parent
+    src = str(root / 'src')
+    if src not in sys.path:
+        sys.path.insert(0, src)
+    from .suites import build_benchmarks
+
+    old_cwd, old_home = os.getcwd(), os.environ.get('HOME')
+    os.chdir(repo)
+    os.environ['HOME'] = str(home)
+    try:
+        benchmarks = [benchmark for benchmark in build_benchmarks(repo, home, info)
+                      if _selected(benchmark.name, patterns)]
+        return harness.run_suite(benchmarks, repeat, progress=_print_progress)
+    finally:
+        os.chdir(old_cwd)
+        if old_home is None:
+            os.environ.pop('HOME', None)
+        else:
+            os.environ['HOME'] = old_home
+
+
+def _selected(name: str, patterns: List[str]) -> bool:
+    """Check if a benchmark matches the --filter patterns (all when none)."""
+    return not patterns or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _print_progress(name: str, summary) -> None:
+    """Print one finished benchmark."""
+    if 'error' in summary:
+        print(f"  {name:<40} ERROR {summary['error']}", file=sys.stderr)
+    else:
+        print(f"  {name:<40} median {summary['median_ms']:9.2f} ms  p95 {summary['p95_ms']:9.2f} ms",
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Timing, result files and baseline comparison for ggGit benchmarks.
+
+A Benchmark is a callable timed 'repeat' times, after 'warmup' untimed
+calls. Cold benchmarks use warmup=0 and a setup that throws away
+whatever a previous run left behind (caches, long-lived git helpers,
+a fresh HOME); warm benchmarks reuse it and warm it up first.
+
+Results are written as JSON:
+
+    {"version": 1, "scale": "small", "seed": 20240601, "repeat": 10,
+     "environment": {"python": "3.12.1", "git": "2.43.0", ...},
+     "benchmarks": {"git.get_staged_files:warm":
+                    {"n": 10, "min_ms": 1.9, "median_ms": 2.1, ...}}}
+
+compare() matches two result files by benchmark name and flags a
+benchmark as a regression when its median grew by more than the
+threshold ratio and by more than min_delta_ms, so sub-millisecond noise
+is never reported.
+"""
+
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Version of the result file layout
+RESULTS_VERSION = 1
+
+# Default relative slowdown of the median reported as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Default absolute slowdown of the median below which nothing is reported
+DEFAULT_MIN_DELTA_MS = 2.0
+
+
+@dataclass
+class Benchmark:
+    """
+    A timed operation.
+
+    Attributes:
+        name (str): Unique name, '<group>.<operation>:<cold|warm>'
+        run (Callable[[], Any]): Operation timed on every repetition
+        setup (Optional[Callable[[], Any]]): Untimed call before each repetition
+        teardown (Optional[Callable[[], Any]]): Untimed call after each repetition
+        warmup (int): Untimed repetitions before the timed ones
+    """
+    name: str
+    run: Callable[[], Any]
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[], Any]] = None
+    warmup: int = 0
+
+
+def measure(benchmark: Benchmark, repeat: int) -> List[float]:
+    """
+    Time a benchmark.
+
+    Args:
+        benchmark (Benchmark): Benchmark to run
+        repeat (int): Timed repetitions
+
+    Returns:
+        List[float]: Duration of each timed repetition in seconds
+    """
+    samples = []
+    for iteration in range(benchmark.warmup + repeat):
+        if benchmark.setup:
+            benchmark.setup()
+        start = time.perf_counter()
+        try:
+            benchmark.run()
+        finally:
+            duration = time.perf_counter() - start
+            if benchmark.teardown:
+                benchmark.teardown()
+        if iteration >= benchmark.warmup:
+            samples.append(duration)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize timing samples.
+
+    Args:
+        samples (List[float]): Durations in seconds
+
+    Returns:
+        Dict[str, float]: n, min, median, mean, p95, max and stdev, in ms
+    """
+    values = sorted(sample * 1000 for sample in samples)
+    if not values:
+        return {'n': 0}
+    p95 = values[min(len(values) - 1, math.ceil(0.95 * len(values)) - 1)]
+    return {
+        'n': len(values),
+        'min_ms': round(values[0], 3),
+        'median_ms': round(statistics.median(values), 3),
+        'mean_ms': round(statistics.fmean(values), 3),
+        'p95_ms': round(p95, 3),
+        'max_ms': round(values[-1], 3),
+        'stdev_ms': round(statistics.stdev(values), 3) if len(values) > 1 else 0.0
+    }
+
+
+def run_suite(benchmarks: Iterable[Benchmark], repeat: int,
+              progress: Optional[Callable[[str, Dict[str, float]], None]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run benchmarks one after the other.
+
+    A benchmark that raises is recorded with its error instead of
+    stopping the suite.
+
+    Args:
+        benchmarks (Iterable[Benchmark]): Benchmarks to run
+        repeat (int): Timed repetitions of each benchmark
+        progress (Optional[Callable]): Called with the name and summary
+                                       of each finished benchmark
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Summary by benchmark name
+    """
+    results = {}
+    for benchmark in benchmarks:
+        try:
+            summary = summarize(measure(benchmark, repeat))
+        except Exception as e:
+            summary = {'n': 0, 'error': f"{type(e).__name__}: {e}"}
+        results[benchmark.name] = summary
+        if progress:
+            progress(benchmark.name, summary)
+    return results
+
+
+def get_environment() -> Dict[str, str]:
+    """
+    Describe the machine results were measured on.
+
+    Returns:
+        Dict[str, str]: Python, git and platform versions
+    """
+    try:
+        git = subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        git = 'unknown'
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'git': git.replace('git version ', ''),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'executable': sys.executable
+    }
+
+
+def write_results(path: Path, benchmarks: Dict[str, Dict[str, Any]], **meta: Any) -> Dict[str, Any]:
+    """
+    Write a result file.
+
+    Args:
+        path (Path): File to write, parent directories are created
+        benchmarks (Dict[str, Dict[str, Any]]): Summaries from run_suite()
+        **meta: Run parameters stored alongside (scale, seed, repeat...)
+
+    Returns:
+        Dict[str, Any]: Written document
+    """
+    document = {'version': RESULTS_VERSION,
+                'created': datetime.now().isoformat(timespec='seconds')}
+    document.update(meta)
+    document['environment'] = get_environment()
+    document['benchmarks'] = benchmarks
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=False)
+        f.write('\n')
+    return document
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """
+    Read a result file.
+
+    Args:
+        path (Path): File written by write_results()
+
+    Returns:
+        Dict[str, Any]: Result document
+
+    Raises:
+        ValueError: If the file is not a result file of this version
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if not isinstance(document, dict) or document.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark result file")
+    return document
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        current (Dict[str, Any]): Result document of this run
+        baseline (Dict[str, Any]): Result document to compare with
+        threshold (float): Relative change of the median reported
+        min_delta_ms (float): Absolute change of the median below which
+                              benchmarks are 'ok'
+
+    Returns:
+        List[Dict[str, Any]]: One row per benchmark with 'name', 'status'
+                              ('regression', 'improvement', 'ok', 'new',
+                              'missing' or 'error'), 'baseline_ms',
+                              'current_ms' and 'change' (ratio)
+    """
+    rows = []
+    old_results = baseline.get('benchmarks', {})
+    new_results = current.get('benchmarks', {})
+
+    for name in list(new_results) + [name for name in old_results if name not in new_results]:
+        old = old_results.get(name, {}).get('median_ms')
+        new = new_results.get(name, {}).get('median_ms')
+        row = {'name': name, 'baseline_ms': old, 'current_ms': new, 'change': None}
+
+        if name not in new_results:
+            row['status'] = 'missing'
+        elif new is None:
+            row['status'] = 'error'
+        elif old is None:
+            row['status'] = 'new'
+        else:
+            row['change'] = (new - old) / old if old else 0.0
+            if abs(new - old) < min_delta_ms or abs(row['change']) <= threshold:
+                row['status'] = 'ok'
+            else:
+                row['status'] = 'regression' if new > old else 'improvement'
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """
+    Format a comparison as a table.
+
+    Args:
+        rows (List[Dict[str, Any]]): Rows from compare()
+
+    Returns:
+        str: One line per benchmark, regressions first
+    """
+    order = {'regression': 0, 'error': 1, 'improvement': 2, 'missing': 3, 'new': 4, 'ok': 5}
+    width = max([len(row['name']) for row in rows] + [9])
+    lines = [f"{'Benchmark':<{width}}  {'baseline':>10}  {'current':>10}  {'change':>8}  status"]
+    for row in sorted(rows, key=lambda row: (order[row['status']], row['name'])):
+        old = f"{row['baseline_ms']:.1f} ms" if row['baseline_ms'] is not None else '-'
+        new = f"{row['current_ms']:.1f} ms" if row['current_ms'] is not None else '-'
+        change = f"{row['change']:+.0%}" if row['change'] is not None else '-'
+        lines.append(f"{row['name']:<{width}}  {old:>10}  {new:>10}  {change:>8}  {row['status']}")
+    return '\n'.join(lines)
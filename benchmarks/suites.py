@@ -0,0 +1,223 @@
+"""
+Benchmark definitions for ggGit.
+
+Four groups are measured against a synthetic repository:
+- cmd.*: gg* commands, run as 'python src/gg.py <command>' with the
+  daemon disabled, so each run pays interpreter start-up and imports
+  like an alias invocation without a daemon does
+- git.*: read-only GitInterface methods, in-process
+- config.load: ConfigManager construction
+- complexity.analyze: ComplexityAnalyzer.analyze_complexity()
+
+Every benchmark comes in a cold and a warm variant. Cold runs start
+from nothing: no ~/.gggit (configuration snapshot, logs) for commands
+and ConfigManager, a new GitInterface (no cached repository context,
+no running cat-file helpers) for in-process git calls. Warm runs share
+that state and are warmed up first.
+
+Methods that change the repository (commit, stage, merge, push...) are
+not benchmarked in-process; ggfeat covers the commit path and undoes
+its commit after every run.
+
+The in-process groups expect the current directory to be the synthetic
+repository and HOME to point at a scratch directory; benchmarks.__main__
+sets both up.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .harness import Benchmark
+
+
+# Repository root and ggGit entry point
+ROOT = Path(__file__).resolve().parent.parent
+GG_SCRIPT = ROOT / 'src' / 'gg.py'
+
+# Untimed repetitions of warm benchmarks
+WARMUP = 2
+
+# Commands timed, by benchmark name
+COMMANDS = {
+    'ggs': ['ggs'],
+    'ggl': ['ggl'],
+    'ggb': ['ggb'],
+    'ggdif': ['ggdif'],
+    'ggdif.staged': ['ggdif', '--staged'],
+    'ggv': ['ggv'],
+    'ggconfig.list': ['ggconfig', 'list'],
+    'ggfeat': ['ggfeat', 'benchmark commit'],
+}
+
+# Commands that commit, undone after each run
+COMMITTING = ('ggfeat',)
+
+
+def command_benchmarks(repo: Path, home: Path) -> List[Benchmark]:
+    """
+    Build the gg* command benchmarks.
+
+    Args:
+        repo (Path): Synthetic repository
+        home (Path): Scratch HOME of the commands
+
+    Returns:
+        List[Benchmark]: Cold and warm benchmark of each command
+    """
+    env = dict(os.environ, HOME=str(home), GGGIT_NO_DAEMON='1', GIT_PAGER='cat', PAGER='cat',
+               GGGIT_PROFILE='0', GIT_EDITOR='true')
+
+    def invoke(argv: List[str]) -> Callable[[], None]:
+        def run():
+            result = subprocess.run([sys.executable, str(GG_SCRIPT)] + argv, cwd=repo, env=env,
+                                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                error = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+                raise RuntimeError(f"{' '.join(argv)} exited with {result.returncode}: "
+                                   f"{error[-1] if error else ''}")
+        return run
+
+    def undo_commit():
+        subprocess.run(['git', 'reset', '-q', '--soft', 'HEAD~1'], cwd=repo, check=True)
+
+    def clear_home():
+        shutil.rmtree(home / '.gggit', ignore_errors=True)
+
+    benchmarks = []
+    for name, argv in COMMANDS.items():
+        teardown = undo_commit if name in COMMITTING else None
+        benchmarks.append(Benchmark(f"cmd.{name}:cold", invoke(argv), setup=clear_home, teardown=teardown))
+        benchmarks.append(Benchmark(f"cmd.{name}:warm", invoke(argv), teardown=teardown, warmup=WARMUP))
+    return benchmarks
+
+
+def git_benchmarks(info: Dict[str, List[str]]) -> List[Benchmark]:
+    """
+    Build the in-process GitInterface benchmarks.
+
+    Args:
+        info (Dict[str, List[str]]): Repository description from
+                                     synthetic.create_repo()
+
+    Returns:
+        List[Benchmark]: Cold and warm benchmark of each read-only method
+    """
+    from core.git import GitInterface
+
+    branch = info['branches'][0]
+    text_file = info['staged'][0]
+    calls: Dict[str, Callable[[Any], Any]] = {
+        'is_git_repository': lambda git: git.is_git_repository(),
+        'get_repo_context': lambda git: git.get_repo_context(),
+        'get_current_branch': lambda git: git.get_current_branch(),
+        'get_staged_files': lambda git: git.get_staged_files(),
+        'get_unstaged_files': lambda git: git.get_unstaged_files(),
+        'get_repository_status': lambda git: git.get_repository_status(),
+        'get_diff_content': lambda git: git.get_diff_content(staged=True),
+        'get_diff_line_count': lambda git: git.get_diff_line_count(staged=True),
+        'get_files_to_analyze': lambda git: git.get_files_to_analyze(),
+        'get_file_size': lambda git: git.get_file_size(text_file),
+        'get_index_tree': lambda git: git.get_index_tree(),
+        'get_head_tree': lambda git: git.get_head_tree(),
+        'get_version': lambda git: git.get_version(),
+        'get_branches': lambda git: git.get_branches(),
+        'get_remote_branches': lambda git: git.get_remote_branches(),
+        'get_all_branches': lambda git: git.get_all_branches(),
+        'branch_exists': lambda git: git.branch_exists(branch),
+        'get_mergeable_branches': lambda git: git.get_mergeable_branches(),
+        'get_branch_info': lambda git: git.get_branch_info(branch),
+        'is_branch_mergeable': lambda git: git.is_branch_mergeable(branch),
+        'get_object_info': lambda git: git.get_object_info('HEAD'),
+        'read_object': lambda git: git.read_object(f"HEAD:{text_file}"),
+        'ref_exists': lambda git: git.ref_exists(f"refs/heads/{branch}"),
+    }
+
+    shared = GitInterface()
+    benchmarks = []
+    for name, call in calls.items():
+        benchmarks.append(_cold(f"git.{name}:cold", GitInterface, call))
+        benchmarks.append(Benchmark(f"git.{name}:warm", lambda call=call: call(shared), warmup=WARMUP))
+    return benchmarks
+
+
+def config_benchmarks(home: Path) -> List[Benchmark]:
+    """
+    Build the ConfigManager benchmarks.
+
+    Args:
+        home (Path): Scratch HOME holding ~/.gggit
+
+    Returns:
+        List[Benchmark]: Load without and with the configuration snapshot
+    """
+    from core.config import ConfigManager
+
+    def clear_cache():
+        shutil.rmtree(home / '.gggit' / 'cache', ignore_errors=True)
+
+    return [
+        Benchmark('config.load:cold', ConfigManager, setup=clear_cache),
+        Benchmark('config.load:warm', ConfigManager, warmup=WARMUP),
+    ]
+
+
+def complexity_benchmarks() -> List[Benchmark]:
+    """
+    Build the ComplexityAnalyzer benchmarks.
+
+    Returns:
+        List[Benchmark]: Analysis of the staged changes with a new and a
+                         shared GitInterface
+    """
+    from core.ai.complexity_analyzer import ComplexityAnalyzer
+    from core.config import ConfigManager
+    from core.git import GitInterface
+
+    config = ConfigManager()
+    shared = ComplexityAnalyzer(GitInterface(), config)
+    return [
+        _cold('complexity.analyze:cold', lambda: ComplexityAnalyzer(GitInterface(), config),
+              lambda analyzer: analyzer.analyze_complexity(), close=lambda analyzer: analyzer.git.close()),
+        Benchmark('complexity.analyze:warm', shared.analyze_complexity, warmup=WARMUP),
+    ]
+
+
+def build_benchmarks(repo: Path, home: Path, info: Dict[str, List[str]]) -> List[Benchmark]:
+    """
+    Build every benchmark.
+
+    Args:
+        repo (Path): Synthetic repository
+        home (Path): Scratch HOME
+        info (Dict[str, List[str]]): Repository description from
+                                     synthetic.create_repo()
+
+    Returns:
+        List[Benchmark]: In-process benchmarks first, then commands
+    """
+    return (git_benchmarks(info) + config_benchmarks(home) + complexity_benchmarks()
+            + command_benchmarks(repo, home))
+
+
+def _cold(name: str, factory: Callable[[], Any], call: Callable[[Any], Any],
+          close: Callable[[Any], Any] = lambda git: git.close()) -> Benchmark:
+    """
+    Build a benchmark calling 'call' on a new 'factory()' object each run.
+
+    The object is created in the untimed setup and closed in the
+    untimed teardown, so only the call itself is measured.
+    """
+    holder = {}
+
+    def setup():
+        holder['target'] = factory()
+
+    def teardown():
+        close(holder.pop('target'))
+
+    return Benchmark(name, lambda: call(holder['target']), setup=setup, teardown=teardown)
@@ -0,0 +1,218 @@
+"""
+Synthetic repositories for ggGit benchmarks.
+
+A repository is generated from a Scale and a seed, so the same
+arguments always give the same objects, commit ids and working tree
+changes. History is written in one 'git fast-import' stream instead of
+one 'git commit' per revision, which keeps even the large scale quick
+to build.
+
+Every repository ends up in the state ggGit commands are used in:
+- 'main' checked out, with Scale.commits commits of history
+- Scale.branches branches, each forked from a point of that history
+  and one commit ahead of it
+- a staged text change of Scale.text_diff_lines lines and a staged
+  binary change of Scale.binary_diff_kb KiB
+- a few unstaged modifications and untracked files
+"""
+
+import os
+import random
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+
+# Bump when the generated repositories change, so old baselines are not compared
+GENERATOR_VERSION = 1
+
+# Seed used when none is given
+DEFAULT_SEED = 20240601
+
+# Fixed identity and clock of every generated commit
+AUTHOR = 'ggGit Bench <bench@example.com>'
+EPOCH = 1700000000
+
+_WORDS = ('alpha', 'branch', 'commit', 'delta', 'error', 'feature', 'git', 'hash',
+          'index', 'json', 'kernel', 'log', 'merge', 'node', 'object', 'patch',
+          'query', 'rebase', 'stage', 'tree', 'update', 'value', 'worker', 'yaml')
+
+
+@dataclass(frozen=True)
+class Scale:
+    """
+    Size of a synthetic repository.
+
+    Attributes:
+        name (str): Scale name used in result files
+        files (int): Tracked text files
+        commits (int): Commits on 'main'
+        branches (int): Additional branches
+        text_diff_lines (int): Lines of the staged text change
+        binary_diff_kb (int): KiB of the staged binary change
+        lines_per_file (int): Lines of each tracked text file
+        files_per_commit (int): Files changed by each history commit
+    """
+    name: str
+    files: int
+    commits: int
+    branches: int
+    text_diff_lines: int
+    binary_diff_kb: int
+    lines_per_file: int = 40
+    files_per_commit: int = 3
+
+
+SCALES: Dict[str, Scale] = {
+    'tiny': Scale('tiny', files=12, commits=5, branches=2, text_diff_lines=20, binary_diff_kb=4),
+    'small': Scale('small', files=200, commits=50, branches=5, text_diff_lines=300, binary_diff_kb=64),
+    'medium': Scale('medium', files=2000, commits=500, branches=25, text_diff_lines=3000,
+                    binary_diff_kb=1024),
+    'large': Scale('large', files=20000, commits=3000, branches=100, text_diff_lines=30000,
+                   binary_diff_kb=16384),
+}
+
+
+def file_path(index: int, scale: Scale) -> str:
+    """
+    Get the path of a tracked text file.
+
+    Args:
+        index (int): File number
+        scale (Scale): Repository scale
+
+    Returns:
+        str: Path spread over about 50 files per directory
+    """
+    dirs = max(1, scale.files // 50)
+    return f"src/pkg{index % dirs:03d}/module_{index:05d}.py"
+
+
+def create_repo(path: Path, scale: Scale, seed: int = DEFAULT_SEED) -> Dict[str, List[str]]:
+    """
+    Generate a synthetic repository.
+
+    Args:
+        path (Path): Directory to create, must not exist or be empty
+        scale (Scale): Repository scale
+        seed (int): Random seed
+
+    Returns:
+        Dict[str, List[str]]: Paths of the 'staged', 'unstaged' and
+                              'untracked' working tree changes, and the
+                              'branches' created
+
+    Raises:
+        subprocess.CalledProcessError: If a git command fails
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    _git(path, 'init', '-q')
+    _git(path, 'symbolic-ref', 'HEAD', 'refs/heads/main')
+    _git(path, 'config', 'user.name', 'ggGit Bench')
+    _git(path, 'config', 'user.email', 'bench@example.com')
+    _git(path, 'config', 'gc.auto', '0')
+
+    stream, branches = _history_stream(scale, rng)
+    subprocess.run(['git', 'fast-import', '--quiet'], cwd=path, input=stream, check=True)
+    _git(path, 'checkout', '-q', '-f', 'main')
+
+    return dict(_working_tree_changes(path, scale, rng), branches=branches)
+
+
+def _history_stream(scale: Scale, rng: random.Random):
+    """
+    Build the fast-import stream of the history.
+
+    Returns:
+        Tuple[bytes, List[str]]: Stream and branch names
+    """
+    chunks: List[bytes] = []
+    mark = 0
+
+    def add_blob(content: bytes) -> int:
+        nonlocal mark
+        mark += 1
+        chunks.append(b'blob\nmark :%d\ndata %d\n%s\n' % (mark, len(content), content))
+        return mark
+
+    def add_commit(ref: str, message: str, parent: int, changes: Dict[str, int], when: int) -> int:
+        nonlocal mark
+        mark += 1
+        text = message.encode('utf-8')
+        chunks.append(b'commit %s\nmark :%d\n' % (ref.encode(), mark))
+        chunks.append(b'committer %s %d +0000\n' % (AUTHOR.encode(), when))
+        chunks.append(b'data %d\n%s\n' % (len(text), text))
+        if parent:
+            chunks.append(b'from :%d\n' % parent)
+        for name, blob in sorted(changes.items()):
+            chunks.append(b'M 100644 :%d %s\n' % (blob, name.encode('utf-8')))
+        chunks.append(b'\n')
+        return mark
+
+    # Initial commit with every file
+    changes = {file_path(i, scale): add_blob(_text(rng, scale.lines_per_file, i))
+               for i in range(scale.files)}
+    changes['assets/logo.bin'] = add_blob(rng.randbytes(max(1, scale.binary_diff_kb // 4) * 1024))
+    history = [add_commit('refs/heads/main', 'feat: initial import', 0, changes, EPOCH)]
+
+    # Each later commit rewrites a few files
+    for number in range(1, scale.commits):
+        changes = {}
+        for index in rng.sample(range(scale.files), min(scale.files_per_commit, scale.files)):
+            changes[file_path(index, scale)] = add_blob(_text(rng, scale.lines_per_file, index, number))
+        kind = rng.choice(('feat', 'fix', 'refactor', 'docs', 'test', 'chore'))
+        history.append(add_commit('refs/heads/main', f"{kind}: change {number}", history[-1],
+                                  changes, EPOCH + number * 60))
+
+    # Branches forked along the history, one commit ahead each
+    branches = []
+    for number in range(scale.branches):
+        name = f"feature/bench-{number:03d}"
+        fork = history[(number * len(history)) // max(1, scale.branches)]
+        index = rng.randrange(scale.files)
+        blob = add_blob(_text(rng, scale.lines_per_file, index, -number - 1))
+        add_commit(f"refs/heads/{name}", f"feat: branch work {number}", fork,
+                   {file_path(index, scale): blob}, EPOCH + (scale.commits + number) * 60)
+        branches.append(name)
+
+    return b''.join(chunks) + b'done\n', branches
+
+
+def _working_tree_changes(path: Path, scale: Scale, rng: random.Random) -> Dict[str, List[str]]:
+    """Create the staged, unstaged and untracked changes."""
+    staged = [file_path(0, scale), 'assets/logo.bin']
+    (path / staged[0]).write_bytes(_text(rng, scale.text_diff_lines, 0, 'staged'))
+    (path / staged[1]).write_bytes(rng.randbytes(scale.binary_diff_kb * 1024))
+    _git(path, 'add', '--', *staged)
+
+    unstaged = [file_path(index, scale) for index in range(1, min(6, scale.files))]
+    for name in unstaged:
+        with open(path / name, 'ab') as f:
+            f.write(b'# unstaged edit\n')
+
+    untracked = [f"notes/draft_{number}.md" for number in range(5)]
+    for number, name in enumerate(untracked):
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_bytes(_text(rng, 10, number, 'draft'))
+
+    return {'staged': staged, 'unstaged': unstaged, 'untracked': untracked}
+
+
+def _text(rng: random.Random, lines: int, index: int, revision=0) -> bytes:
+    """Generate the content of a text file."""
+    out = [f'"""Module {index}, revision {revision}."""\n']
+    for number in range(max(0, lines - 1)):
+        words = ' '.join(rng.choice(_WORDS) for _ in range(6))
+        out.append(f"value_{number} = '{words}'\n")
+    return ''.join(out).encode('utf-8')
+
+
+def _git(path: Path, *args: str) -> None:
+    """Run a git command in the repository, failing loudly."""
+    env = dict(os.environ, GIT_CONFIG_NOSYSTEM='1')
+    subprocess.run(['git', *args], cwd=path, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
@@ -87,7 +87,7 @@ def create_aliases():
         'ggmain', 'ggdevelop', 'ggb', 'ggmerge', 'ggpl', 'ggpp',
         'ggfeat', 'ggfix', 'ggdocs', 'ggstyle', 'ggrefactor', 'ggchore', 
         'ggbuild', 'ggci', 'ggperf', 'ggtest', 'ggbreak',
-        'ggai', 'ggconfig', 'ggv'
+        'ggai', 'ggconfig', 'ggv', 'ggdaemon'
     ]
     
     # Create alias definitions
@@ -97,8 +97,12 @@ def create_aliases():
     aliases.append(f"export GGGIT_ROOT='{script_dir}'")
     aliases.append(f"export PYTHONPATH=\"$GGGIT_ROOT/src:$PYTHONPATH\"")
     
+    # Every command goes through the single 'gg' entry point, which uses
+    # the resident daemon when it is running (ggdaemon start) and
+    # otherwise imports only the invoked command
+    aliases.append(f"alias gg='{python_path} $GGGIT_ROOT/src/gg.py'")
     for cmd in commands:
-        aliases.append(f"alias {cmd}='{python_path} $GGGIT_ROOT/src/commands/{cmd}.py'")
+        aliases.append(f"alias {cmd}='{python_path} $GGGIT_ROOT/src/gg.py {cmd}'")
     
     return aliases
 
@@ -254,7 +258,7 @@ def main():
         'ggmain', 'ggdevelop', 'ggb', 'ggmerge', 'ggpl', 'ggpp',
         'ggfeat', 'ggfix', 'ggdocs', 'ggstyle', 'ggrefactor', 'ggchore', 
         'ggbuild', 'ggci', 'ggperf', 'ggtest', 'ggbreak',
-        'ggai', 'ggconfig', 'ggv'
+        'ggai', 'ggconfig', 'ggv', 'ggdaemon'
     ]
     print(f"  {', '.join(commands)}")
     print()
@@ -24,6 +24,7 @@ class GgaCommand(BaseCommand):
             
             if result:
                 click.echo(ColorManager.success("Archivos agregados exitosamente"))
+                self._prefetch_ai_message()
                 return 0
             else:
                 click.echo(ColorManager.error("Error al agregar archivos"))
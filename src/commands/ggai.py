@@ -19,6 +19,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.base_commands.base import BaseCommand
 from core.ai import ComplexityAnalyzer, AiUsageTracker, AiMessageGenerator
+from core.ai.prefetch import MessagePrefetcher, is_prefetch_enabled
+from core.ai.usage_report import PERIODS, build_usage_report, parse_since
 from core.utils.colors import ColorManager
 
 
@@ -30,7 +32,7 @@ class GgaiCommand(BaseCommand):
         super().__init__()
         self.usage_tracker = AiUsageTracker(self.config)
         self.message_generator = AiMessageGenerator(self.config, self.usage_tracker)
-        self.analyzer = ComplexityAnalyzer(self.git, self.config)
+        self.analyzer = ComplexityAnalyzer(self.git, self.config, self.usage_tracker)
     
     def execute(self, *args, **kwargs):
         """Execute the ggai command (required by BaseCommand)."""
@@ -49,7 +51,14 @@ class GgaiCommand(BaseCommand):
                 click.echo(ColorManager.error("No es un repositorio Git"))
                 return 1
             
-            # Analyze complexity
+            # Use the message prefetched after staging, if the index is unchanged
+            if is_prefetch_enabled(self.config):
+                message = MessagePrefetcher(self.git, self.config).claim(self.message_generator)
+                if message is not None:
+                    click.echo(ColorManager.success(f"🤖 Mensaje generado: {message}"))
+                    return 0
+            
+            # Analyze complexity and check budget before reading the diff
             should_use_ai, analysis = self.analyzer.should_use_ai()
             
             if should_use_ai:
@@ -58,7 +67,10 @@ class GgaiCommand(BaseCommand):
                 diff_content = self.git.get_diff_content(files, staged=analysis['has_staged'])
                 
                 try:
-                    message = self.message_generator.generate_message(files, diff_content)
+                    plan = analysis.get('plan')
+                    message = self.message_generator.generate_message(
+                        files, diff_content, strategy=plan.strategy if plan else None
+                    )
                     click.echo(ColorManager.success(f"🤖 Mensaje generado: {message}"))
                     
                     # Show analysis summary
@@ -99,7 +111,13 @@ class GgaiCommand(BaseCommand):
             click.echo(f"📊 Consumo de IA - Período: {start_date}")
             click.echo(f"├── Requests: {requests}")
             click.echo(f"├── Tokens usados: {tokens:,}")
-            click.echo(f"└── Costo estimado: ${cost:.2f}/${cost_limit:.2f}")
+            if 'prompt_tokens' in stats['totals']:
+                click.echo(f"│   ├── Prompt: {stats['totals']['prompt_tokens']:,}")
+                click.echo(f"│   └── Respuesta: {stats['totals'].get('completion_tokens', 0):,}")
+            if stats['totals'].get('timed_requests'):
+                latency = stats['totals']['latency_seconds'] / stats['totals']['timed_requests']
+                click.echo(f"├── Latencia media: {latency:.2f}s")
+            click.echo(f"└── Costo estimado: ${cost:.4f}/${cost_limit:.2f}")
             
             # Show remaining budget
             remaining = self.usage_tracker.get_remaining_budget()
@@ -109,6 +127,7 @@ class GgaiCommand(BaseCommand):
             # Show help
             click.echo("\n💡 Comandos disponibles:")
             click.echo("   ggai usage reset    # Reiniciar contador")
+            click.echo("   ggai usage report   # Latencias y tokens por comando y modelo")
             click.echo("   ggconfig get ai.*   # Ver configuración")
             
             return 0
@@ -133,6 +152,98 @@ class GgaiCommand(BaseCommand):
             click.echo(ColorManager.error(f"Error reiniciando contador: {e}"))
             return 1
     
+    def execute_usage_report(self, days: int = 30, period: str = 'day') -> int:
+        """Execute ggai usage report command (latency and token percentiles)."""
+        if not self.usage_tracker.is_tracking_enabled():
+            click.echo(ColorManager.warning("Tracking de IA deshabilitado"))
+            return 0
+        
+        try:
+            report = build_usage_report(self.usage_tracker.iter_ledger(), period, parse_since(days))
+            totals = report['totals']
+            if not totals['requests'] and not totals['cache_hits']:
+                click.echo(ColorManager.info("Sin consumo de IA registrado en el período"))
+                return 0
+            
+            span = f"últimos {days} días" if days else "todo el registro"
+            click.echo(f"📈 Informe de consumo de IA - {span}")
+            self._echo_usage_group("Total", totals)
+            
+            for title, key in (("Por comando", 'by_command'), ("Por modelo", 'by_model'),
+                               ("Por repositorio", 'by_repo')):
+                click.echo(f"\n{title}:")
+                for name, group in report[key].items():
+                    self._echo_usage_group(name, group)
+            
+            click.echo(f"\nTendencia ({period}):")
+            for bucket, group in report['trend'].items():
+                latency = group['latency']
+                p95 = f"{latency['p95']:.2f}s" if latency['p95'] is not None else "-"
+                click.echo(f"  {bucket}  {group['requests']:>5} req  {group['tokens']:>9,} tokens  "
+                           f"p95 {p95}  ${group['cost']:.4f}")
+            
+            return 0
+            
+        except Exception as e:
+            click.echo(ColorManager.error(f"Error generando informe: {e}"))
+            return 1
+    
+    def _echo_usage_group(self, name: str, group) -> None:
+        """Show the counters of one group of a usage report."""
+        click.echo(f"├── {name}: {group['requests']} requests, {group['tokens']:,} tokens, ${group['cost']:.4f}")
+        latency = group['latency']
+        if latency['count']:
+            click.echo(f"│   ├── Latencia p50/p95/p99: {latency['p50']:.2f}s / "
+                       f"{latency['p95']:.2f}s / {latency['p99']:.2f}s")
+        for label, key in (("Tokens prompt", 'prompt_tokens'), ("Tokens respuesta", 'completion_tokens')):
+            tokens = group[key]
+            if tokens['count']:
+                click.echo(f"│   ├── {label} p50/p95/p99: {tokens['p50']:.0f} / "
+                           f"{tokens['p95']:.0f} / {tokens['p99']:.0f}")
+        if group['tokens_per_second'] is not None:
+            click.echo(f"│   ├── Velocidad: {group['tokens_per_second']:.1f} tokens/s")
+        if group['cache_hit_rate'] is not None:
+            click.echo(f"│   └── Caché: {group['cache_hits']} aciertos / "
+                       f"{group['cache_misses']} fallos ({group['cache_hit_rate']:.0%})")
+    
+    def execute_cache_stats(self) -> int:
+        """Execute ggai cache stats command (show message cache statistics)."""
+        try:
+            cache = self.message_generator.message_cache
+            stats = cache.get_stats()
+            size_kb = stats['size_bytes'] / 1024
+            
+            click.echo("🗄️  Caché de mensajes IA")
+            click.echo(f"├── Estado: {'habilitada' if cache.is_enabled() else 'deshabilitada'}")
+            click.echo(f"├── Entradas: {stats['entries']}")
+            click.echo(f"├── Tamaño: {size_kb:.1f} KB")
+            click.echo(f"├── Aciertos: {stats['hits']} / Fallos: {stats['misses']} ({stats['hit_rate']:.0%})")
+            if stats['newest'] is not None:
+                newest = datetime.fromtimestamp(stats['newest']).strftime('%Y-%m-%d %H:%M')
+                oldest = datetime.fromtimestamp(stats['oldest']).strftime('%Y-%m-%d %H:%M')
+                click.echo(f"├── Uso más antiguo: {oldest}")
+                click.echo(f"├── Uso más reciente: {newest}")
+            click.echo(f"└── Directorio: {stats['dir']}")
+            return 0
+            
+        except Exception as e:
+            click.echo(ColorManager.error(f"Error obteniendo estadísticas de caché: {e}"))
+            return 1
+    
+    def execute_cache_clear(self) -> int:
+        """Execute ggai cache clear command (remove cached messages and summaries)."""
+        try:
+            removed = self.message_generator.message_cache.clear()
+            summaries = self.message_generator.summary_cache.clear()
+            click.echo(ColorManager.success(
+                f"✅ Caché vaciada ({removed} mensajes eliminados, {summaries} resúmenes)"
+            ))
+            return 0
+            
+        except Exception as e:
+            click.echo(ColorManager.error(f"Error vaciando caché: {e}"))
+            return 1
+    
     def execute_test(self) -> int:
         """Execute ggai test command (test AI connection)."""
         try:
@@ -219,5 +330,51 @@ def reset():
         sys.exit(1)
 
 
+@usage_group.command()
+@click.option('--days', default=30, show_default=True, type=click.IntRange(min=0),
+              help='Days to include, 0 for the whole ledger')
+@click.option('--period', default='day', show_default=True, type=click.Choice(PERIODS),
+              help='Bucket of the trend')
+def report(days, period):
+    """Show latency and token percentiles by command, model and repository."""
+    try:
+        command = GgaiCommand()
+        result = command.execute_usage_report(days, period)
+        sys.exit(result)
+    except Exception as e:
+        ColorManager.error(f"Error: {e}")
+        sys.exit(1)
+
+
+@ggai.group()
+def cache():
+    """AI message cache commands."""
+    pass
+
+
+@cache.command()
+def stats():
+    """Show AI message cache statistics."""
+    try:
+        command = GgaiCommand()
+        result = command.execute_cache_stats()
+        sys.exit(result)
+    except Exception as e:
+        ColorManager.error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cache.command()
+def clear():
+    """Remove all cached AI messages."""
+    try:
+        command = GgaiCommand()
+        result = command.execute_cache_clear()
+        sys.exit(result)
+    except Exception as e:
+        ColorManager.error(f"Error: {e}")
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     ggai()
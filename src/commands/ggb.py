@@ -151,8 +151,7 @@ class GgbCommand(BaseCommand):
     def _branch_exists(self, branch_name):
         """Check if branch exists."""
         try:
-            branches = self.git.get_branches()
-            return branch_name in branches
+            return self.git.branch_exists(branch_name)
         except:
             return False
     
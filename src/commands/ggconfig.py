@@ -18,40 +18,62 @@ from core.utils.colors import ColorManager
 
 
 @click.command()
-@click.argument('action', type=click.Choice(['get', 'set', 'list', 'reset']))
+@click.argument('action', type=click.Choice(['get', 'set', 'list', 'reset', 'cleanup-logs', 'events']))
 @click.argument('key', required=False)
-@click.argument('value', required=False)
+@click.argument('value', nargs=-1)
 @click.option('--level', '-l', 
               type=click.Choice(['repo', 'module', 'user', 'default']), 
               default='user',
               help='Configuration level to operate on')
+@click.option('--from-file', '-f', type=click.Path(exists=True, dir_okay=False),
+              help='YAML file with values to set in one write')
+@click.option('--days', '-d', type=click.IntRange(min=1), default=7,
+              help='Days of command events to summarize (events action)')
 @click.option('--help-action', is_flag=True, help='Show help for specific action')
-def main(action, key, value, level, help_action):
+def main(action, key, value, level, from_file, days, help_action):
     """
     ggconfig - Manage ggGit configuration
     
     ACTIONS:
         get KEY          Get configuration value for KEY
         set KEY VALUE    Set configuration value for KEY to VALUE
+                         (several KEY VALUE pairs or --from-file FILE
+                         are written at once)
         list             List all configuration values
         reset [KEY]      Reset configuration (optionally for specific KEY)
+        cleanup-logs     Remove rotated logs older than logging.retention_days
+        events [COMMAND] Summarize command latency from the event log
     
     EXAMPLES:
         ggconfig get ui.colors.success
         ggconfig set ui.colors.success bright_green --level user
+        ggconfig set ai.enabled true ai.provider openai
+        ggconfig set --from-file settings.yaml
         ggconfig list
         ggconfig reset user
+        ggconfig cleanup-logs
+        ggconfig events --days 30
     """
     if help_action:
         show_action_help(action)
         return
     
+    values = list(value)
+    pairs = None
+    if action == 'set' and (len(values) > 1 or (from_file and key)):
+        items = [key] + values
+        if len(items) % 2:
+            click.echo(ColorManager.error("Error: set expects KEY VALUE pairs"))
+            sys.exit(1)
+        pairs = list(zip(items[::2], items[1::2]))
+    
     try:
         # Create ConfigCommand instance
         config_cmd = ConfigCommand()
         
         # Execute the action
-        result = config_cmd.execute(action, key, value, level)
+        result = config_cmd.execute(action, key, values[0] if values else None, level,
+                                    pairs=pairs, from_file=from_file, days=days)
         
         # Exit with result code
         sys.exit(result)
@@ -77,12 +99,18 @@ Examples:
         'set': """
 SET - Set configuration value
 
-Usage: ggconfig set KEY VALUE [--level LEVEL]
+Usage: ggconfig set KEY VALUE [KEY VALUE ...] [--level LEVEL]
+       ggconfig set --from-file FILE [--level LEVEL]
+
+Several values are written to the level file at once and the
+configuration is reloaded once.
 
 Examples:
     ggconfig set ui.colors.success bright_green
     ggconfig set git.default_branch main --level repo
     ggconfig set ai.enabled true --level user
+    ggconfig set ai.enabled true ai.provider openai
+    ggconfig set --from-file provisioning.yaml --level user
         """,
         'list': """
 LIST - List all configuration values
@@ -103,6 +131,32 @@ Examples:
     ggconfig reset user
     ggconfig reset repo
     ggconfig reset ui.colors.success --level user
+        """,
+        'cleanup-logs': """
+CLEANUP-LOGS - Remove old log files
+
+Usage: ggconfig cleanup-logs
+
+Removes rotated log segments in ~/.gggit/logs not modified in
+logging.retention_days days. This also runs automatically at most
+once a day.
+
+Examples:
+    ggconfig set logging.retention_days 7
+    ggconfig cleanup-logs
+        """,
+        'events': """
+EVENTS - Summarize the command event log
+
+Usage: ggconfig events [COMMAND] [--days DAYS]
+
+Reads ~/.gggit/logs/events.log and its rotated segments line by line
+and shows, per command, runs, failures, wall time percentiles, CPU
+time and git calls per run, and the 95th percentile of the AI wait.
+
+Examples:
+    ggconfig events
+    ggconfig events ggfeat --days 30
         """
     }
     
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+ggdaemon - Manage the resident ggGit daemon
+
+Usage: ggdaemon {start|stop|status|restart} [--idle-timeout SECONDS]
+"""
+
+import click
+import sys
+from core.base_commands.base import BaseCommand
+from core.daemon import (
+    DEFAULT_IDLE_TIMEOUT,
+    DaemonError,
+    default_socket_path,
+    ping,
+    start_daemon,
+    stop_daemon
+)
+from core.utils.colors import ColorManager
+
+
+class GgdaemonCommand(BaseCommand):
+    """Command for daemon lifecycle operations."""
+
+    def execute(self, action, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """Execute the ggdaemon command."""
+        try:
+            socket_path = default_socket_path()
+
+            if action in ('stop', 'restart'):
+                if stop_daemon(socket_path):
+                    click.echo(ColorManager.success("Daemon detenido"))
+                elif action == 'stop':
+                    click.echo(ColorManager.info("El daemon no está en ejecución"))
+
+            if action in ('start', 'restart'):
+                if action == 'start' and ping(socket_path):
+                    click.echo(ColorManager.info("El daemon ya está en ejecución"))
+                    return 0
+                status = start_daemon(socket_path, idle_timeout=idle_timeout)
+                click.echo(ColorManager.success(f"Daemon iniciado (pid {status['pid']})"))
+
+            if action == 'status':
+                status = ping(socket_path)
+                if status is None:
+                    click.echo(ColorManager.info("El daemon no está en ejecución"))
+                    return 1
+                click.echo(ColorManager.success(f"Daemon en ejecución (pid {status['pid']})"))
+                click.echo(f"  Socket: {status['socket']}")
+                click.echo(f"  Activo desde hace: {status['uptime']}s")
+                click.echo(f"  Comandos servidos: {status['served']}")
+
+            return 0
+
+        except DaemonError as e:
+            click.echo(ColorManager.error(f"Error: {str(e)}"))
+            return 1
+        except Exception as e:
+            click.echo(ColorManager.error(f"Error: {str(e)}"))
+            return 1
+
+
+@click.command()
+@click.argument('action', type=click.Choice(['start', 'stop', 'status', 'restart']))
+@click.option('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+              help='Seconds without commands before the daemon exits')
+def main(action, idle_timeout):
+    """Manage the resident ggGit daemon"""
+    try:
+        # Create and run command
+        cmd = GgdaemonCommand()
+        sys.exit(cmd.run(action, idle_timeout=idle_timeout))
+
+    except Exception as e:
+        click.echo(ColorManager.error(f"Error: {str(e)}"))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,5 +8,8 @@ usage tracking, and intelligent decision making for commit message generation.
 from .complexity_analyzer import ComplexityAnalyzer
 from .usage_tracker import AiUsageTracker
 from .message_generator import AiMessageGenerator
+from .message_cache import AiMessageCache
+from .providers import AiProvider, AiProviderError, create_provider
 
-__all__ = ['ComplexityAnalyzer', 'AiUsageTracker', 'AiMessageGenerator']
+__all__ = ['ComplexityAnalyzer', 'AiUsageTracker', 'AiMessageGenerator', 'AiMessageCache',
+           'AiProvider', 'AiProviderError', 'create_provider']
@@ -6,10 +6,12 @@ and decide whether to use AI for commit message generation or show
 educational fallback messages.
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from ..git import GitInterface
+from ..git_status import RepositoryStatus
 from ..config import ConfigManager
 from ..utils.colors import ColorManager
+from .preflight import PreflightPlan, get_exceeded_limits, plan_request
 
 
 class ComplexityAnalyzer:
@@ -23,6 +25,8 @@ class ComplexityAnalyzer:
     Attributes:
         git (GitInterface): Git operations interface
         config (ConfigManager): Configuration management instance
+        usage_tracker (AiUsageTracker): Usage tracker for the cost budget,
+                                        None to skip budget checks
         
     Example:
         analyzer = ComplexityAnalyzer(git_interface, config_manager)
@@ -37,18 +41,21 @@ class ComplexityAnalyzer:
             print(fallback_message)
     """
     
-    def __init__(self, git_interface: GitInterface, config_manager: ConfigManager):
+    def __init__(self, git_interface: GitInterface, config_manager: ConfigManager, usage_tracker=None):
         """
         Initialize complexity analyzer.
         
         Args:
             git_interface (GitInterface): Git operations interface
             config_manager (ConfigManager): Configuration management instance
+            usage_tracker (AiUsageTracker, optional): Usage tracker for the
+                                                      cost budget
         """
         self.git = git_interface
         self.config = config_manager
+        self.usage_tracker = usage_tracker
     
-    def analyze_complexity(self) -> Dict[str, Any]:
+    def analyze_complexity(self, status: Optional[RepositoryStatus] = None) -> Dict[str, Any]:
         """
         Analyze complexity of current changes.
         
@@ -57,6 +64,14 @@ class ComplexityAnalyzer:
         - Number of lines in diff
         - Size of largest file modified
         
+        The file lists come from a single repository status snapshot.
+        Callers that already hold one can pass it to avoid another
+        'git status' call.
+        
+        Args:
+            status (Optional[RepositoryStatus]): Status snapshot to analyze,
+                taken from GitInterface when omitted
+        
         Returns:
             Dict[str, Any]: Analysis results with metrics:
                 - file_count: Number of files modified
@@ -65,8 +80,11 @@ class ComplexityAnalyzer:
                 - files: List of files modified
                 - has_staged: Whether there are staged files
         """
-        # Get files to analyze
-        files = self.git.get_files_to_analyze()
+        if status is None:
+            status = self.git.get_repository_status()
+        
+        # Staged files take priority over working tree changes
+        files = status.files_to_analyze()
         
         if not files:
             return {
@@ -77,9 +95,7 @@ class ComplexityAnalyzer:
                 'has_staged': False
             }
         
-        # Check if there are staged files
-        staged_files = self.git.get_staged_files()
-        has_staged = len(staged_files) > 0
+        has_staged = status.has_staged
         
         # Get diff line count
         diff_lines = self.git.get_diff_line_count(files, staged=has_staged)
@@ -104,24 +120,30 @@ class ComplexityAnalyzer:
             'has_staged': has_staged
         }
     
-    def should_use_ai(self) -> Tuple[bool, Dict[str, Any]]:
+    def should_use_ai(self, status: Optional[RepositoryStatus] = None) -> Tuple[bool, Dict[str, Any]]:
         """
         Decide if AI should be used based on complexity analysis.
         
-        Analyzes the complexity of current changes and decides whether
-        to use AI for commit message generation or show educational
-        fallback messages.
+        Analyzes the complexity of current changes and runs the
+        pre-flight checks: the prompt tokens, cost and latency are
+        projected from the diff line counts, before the diff is read,
+        and compared with the cost budget and the ai.analysis ceilings.
+        
+        Args:
+            status (Optional[RepositoryStatus]): Status snapshot to analyze,
+                taken from GitInterface when omitted
         
         Returns:
             Tuple[bool, Dict[str, Any]]: 
                 - bool: True if AI should be used, False for fallback
-                - Dict: Analysis results for further processing
+                - Dict: Analysis results for further processing, with
+                  the chosen PreflightPlan under 'plan'
         """
-        analysis = self.analyze_complexity()
+        analysis = self.analyze_complexity(status)
+        plan = plan_request(analysis, self.config, self.usage_tracker)
+        analysis['plan'] = plan
         
-        # Always use AI - removed complexity limits for better user experience
-        # Cost control is handled by ai.cost_limit in configuration
-        return True, analysis
+        return not plan.refused, analysis
     
     def get_fallback_message(self, analysis: Dict[str, Any]) -> str:
         """
@@ -136,20 +158,15 @@ class ComplexityAnalyzer:
         Returns:
             str: Educational fallback message
         """
-        file_count = analysis['file_count']
-        diff_lines = analysis['diff_lines']
-        max_file_size = analysis['max_file_size']
+        plan: Optional[PreflightPlan] = analysis.get('plan')
+        if plan is not None and plan.reason:
+            # Refused for its cost or latency, not for its size
+            return f"""⚠️ {plan.reason}
+💡 Sugerencia: Revisa 'ggai usage' y los límites en 'ggconfig get ai.*'
+   O usa 'ggfeat "mensaje manual"' para commitear sin IA"""
         
         # Build specific feedback based on what exceeded limits
-        reasons = []
-        if file_count > self.config.get_config('ai.analysis.max_files', 10):
-            reasons.append(f"demasiados archivos ({file_count})")
-        if diff_lines > self.config.get_config('ai.analysis.max_diff_lines', 200):
-            reasons.append(f"demasiadas líneas de cambio ({diff_lines})")
-        if max_file_size > self.config.get_config('ai.analysis.max_file_size', 5000):
-            reasons.append(f"archivos muy grandes ({max_file_size} bytes)")
-        
-        reason_text = ", ".join(reasons)
+        reason_text = ", ".join(get_exceeded_limits(analysis, self.config))
         
         return f"""⚠️ No es aconsejable commitear tanto contenido ({reason_text})
 💡 Sugerencia: Selecciona grupos de archivos más pequeños
@@ -174,5 +191,13 @@ class ComplexityAnalyzer:
         has_staged = analysis['has_staged']
         
         status = "staged" if has_staged else "unstaged"
+        summary = f"📝 Archivos: {file_count}, Líneas: {diff_lines} ({status})"
+        
+        plan: Optional[PreflightPlan] = analysis.get('plan')
+        if plan is not None and not plan.refused:
+            requests = "1 petición" if plan.requests == 1 else f"{plan.requests} peticiones"
+            summary += f", ~{plan.prompt_tokens:,} tokens en {requests}"
+            if plan.cost:
+                summary += f", ~${plan.cost:.4f}"
         
-        return f"📝 Archivos: {file_count}, Líneas: {diff_lines} ({status})"
+        return summary
@@ -0,0 +1,391 @@
+"""
+Token-budgeted diff reduction for ggGit.
+
+The diff of a large change can be far bigger than what a local model
+can evaluate quickly, or fit in its context at all. reduce_diff() turns
+the output of 'git diff' into a smaller diff for the prompt:
+
+1. Files that say nothing about the change are reduced to one line:
+   binary files, lockfiles, generated or minified files, and pure
+   renames.
+2. Hunks whose only changes are whitespace are dropped.
+3. The remaining hunks are ranked by the number of changed lines, and
+   added while they fit in the token budget: first the best hunk of
+   every file (so each file is represented), then the rest. A hunk too
+   large for what is left is cut at a line boundary.
+4. The diff is rebuilt in its original order, with a note for every
+   omitted hunk, and per-file statistics are returned alongside.
+
+The result only depends on the input text and the budget, so the same
+staged changes always produce the same prompt.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+# Default budget for the diff part of the prompt, in estimated tokens
+DEFAULT_MAX_DIFF_TOKENS = 3000
+
+# Rough characters per token for source code and diffs
+CHARS_PER_TOKEN = 4
+
+LOCKFILE_NAMES = frozenset({
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml',
+    'poetry.lock', 'Pipfile.lock', 'uv.lock', 'Cargo.lock', 'composer.lock',
+    'Gemfile.lock', 'go.sum', 'mix.lock', 'pubspec.lock', 'packages.lock.json'
+})
+
+GENERATED_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\.min\.(js|css)$', r'\.map$', r'(^|/)(dist|build|vendor|node_modules)/',
+    r'_pb2(_grpc)?\.py$', r'\.pb\.go$', r'\.generated\.', r'(^|/)__snapshots__/'
+)]
+
+# Markers tools write at the top of generated files
+GENERATED_MARKERS = ('@generated', 'DO NOT EDIT', 'Code generated by')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class Hunk:
+    """One '@@' hunk of a file diff."""
+
+    lines: List[str]
+    added: int = 0
+    removed: int = 0
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.lines)
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.removed
+
+    def is_whitespace_only(self) -> bool:
+        """Whether the hunk only changes whitespace."""
+        removed = ''.join(re.sub(r'\s+', '', line[1:]) for line in self.lines if line.startswith('-'))
+        added = ''.join(re.sub(r'\s+', '', line[1:]) for line in self.lines if line.startswith('+'))
+        return removed == added
+
+
+@dataclass
+class FileDiff:
+    """Diff of one file: header lines and hunks."""
+
+    path: str
+    header: List[str]
+    hunks: List[Hunk] = field(default_factory=list)
+    old_path: Optional[str] = None
+    binary: bool = False
+    # Blob ids from the 'index <old>..<new>' line, when present
+    blobs: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.header) + ''.join(hunk.text for hunk in self.hunks)
+
+    @property
+    def added(self) -> int:
+        return sum(hunk.added for hunk in self.hunks)
+
+    @property
+    def removed(self) -> int:
+        return sum(hunk.removed for hunk in self.hunks)
+
+
+@dataclass
+class FileStats:
+    """
+    What happened to one file during reduction.
+
+    Attributes:
+        path (str): File path (new path for renames)
+        status (str): 'kept', 'partial', 'omitted', 'binary', 'lockfile',
+                      'generated', 'renamed' or 'whitespace'
+        added (int): Added lines in the original diff
+        removed (int): Removed lines in the original diff
+        hunks (int): Hunks in the original diff
+        hunks_kept (int): Hunks included, fully or cut
+    """
+
+    path: str
+    status: str
+    added: int = 0
+    removed: int = 0
+    hunks: int = 0
+    hunks_kept: int = 0
+
+
+@dataclass
+class ReducedDiff:
+    """
+    Result of reduce_diff().
+
+    Attributes:
+        text (str): Reduced diff for the prompt
+        files (List[FileStats]): Per-file statistics, in diff order
+        original_tokens (int): Estimated tokens of the input diff
+        tokens (int): Estimated tokens of the reduced diff
+        budget (int): Token budget used
+    """
+
+    text: str
+    files: List[FileStats]
+    original_tokens: int
+    tokens: int
+    budget: int
+
+    @property
+    def reduced(self) -> bool:
+        """Whether anything was left out of the diff."""
+        return any(stats.status != 'kept' for stats in self.files)
+
+    def summary(self) -> str:
+        """
+        Describe what was left out, for the prompt.
+
+        Returns:
+            str: One line per kind of omission, empty if nothing was
+        """
+        labels = {
+            'binary': 'binary', 'lockfile': 'lockfile', 'generated': 'generated',
+            'renamed': 'renamed without changes', 'whitespace': 'whitespace-only',
+            'omitted': 'omitted for size', 'partial': 'partially shown'
+        }
+        lines = []
+        for status, label in labels.items():
+            paths = [stats.path for stats in self.files if stats.status == status]
+            if paths:
+                lines.append(f"Note: {label} files: {', '.join(paths)}")
+        return '\n'.join(lines)
+
+
+def parse_diff(diff_content: str) -> List[FileDiff]:
+    """
+    Parse 'git diff' output into files and hunks.
+
+    Args:
+        diff_content (str): Unified diff as produced by git
+
+    Returns:
+        List[FileDiff]: Files in diff order
+    """
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    hunk: Optional[Hunk] = None
+
+    for line in diff_content.splitlines(keepends=True):
+        if line.startswith('diff --git '):
+            current = FileDiff(path=_path_from_diff_line(line), header=[line])
+            files.append(current)
+            hunk = None
+        elif current is None:
+            continue
+        elif line.startswith('@@'):
+            hunk = Hunk(lines=[line])
+            current.hunks.append(hunk)
+        elif hunk is not None:
+            hunk.lines.append(line)
+            if line.startswith('+'):
+                hunk.added += 1
+            elif line.startswith('-'):
+                hunk.removed += 1
+        else:
+            current.header.append(line)
+            if line.startswith('rename from '):
+                current.old_path = line[len('rename from '):].rstrip('\n')
+            elif line.startswith('rename to '):
+                current.path = line[len('rename to '):].rstrip('\n')
+            elif line.startswith('index '):
+                current.blobs = line[len('index '):].split()[0]
+            elif line.startswith('+++ b/'):
+                current.path = line[len('+++ b/'):].rstrip('\n')
+            elif line.startswith('Binary files ') or line.startswith('GIT binary patch'):
+                current.binary = True
+
+    return files
+
+
+def _path_from_diff_line(line: str) -> str:
+    """Get the new path from a 'diff --git a/x b/x' line."""
+    parts = line.rstrip('\n').split(' b/', 1)
+    return parts[1] if len(parts) == 2 else line.rstrip('\n')
+
+
+def classify_file(file_diff: FileDiff) -> Optional[str]:
+    """
+    Get the reason a file says nothing about the change, if any.
+
+    Args:
+        file_diff (FileDiff): Parsed file diff
+
+    Returns:
+        Optional[str]: 'binary', 'lockfile', 'generated' or 'renamed', or
+                       None for files whose diff should be shown
+    """
+    name = file_diff.path.rsplit('/', 1)[-1]
+    if file_diff.binary:
+        return 'binary'
+    if name in LOCKFILE_NAMES:
+        return 'lockfile'
+    if any(pattern.search(file_diff.path) for pattern in GENERATED_PATTERNS):
+        return 'generated'
+    first_lines = ''.join(line for hunk in file_diff.hunks[:1] for line in hunk.lines[:6])
+    if any(marker in first_lines for marker in GENERATED_MARKERS):
+        return 'generated'
+    if file_diff.old_path and not file_diff.hunks:
+        return 'renamed'
+    return None
+
+
+def _file_note(file_diff: FileDiff, status: str) -> str:
+    """One-line description of a file reduced to a note."""
+    if status == 'renamed':
+        return f"# {file_diff.old_path} -> {file_diff.path}: renamed, no content changes\n"
+    return f"# {file_diff.path}: {status} file changed (+{file_diff.added} -{file_diff.removed})\n"
+
+
+def _cut_hunk(hunk: Hunk, budget: int) -> Optional[str]:
+    """Cut a hunk at a line boundary to fit in a token budget."""
+    kept = []
+    used = 0
+    for line in hunk.lines:
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    if len(kept) <= 1:
+        return None
+    omitted = len(hunk.lines) - len(kept)
+    return ''.join(kept) + f"# ... {omitted} more lines in this hunk\n"
+
+
+def reduce_diff(diff_content: str, max_tokens: int = DEFAULT_MAX_DIFF_TOKENS) -> ReducedDiff:
+    """
+    Reduce a diff to fit in a token budget.
+
+    Args:
+        diff_content (str): Unified diff as produced by 'git diff'
+        max_tokens (int): Token budget for the reduced diff
+
+    Returns:
+        ReducedDiff: Reduced text and per-file statistics
+
+    Example:
+        reduced = reduce_diff(git.get_diff_content(staged=True), 2000)
+        prompt_diff = reduced.text
+    """
+    files = parse_diff(diff_content)
+    stats: List[FileStats] = []
+    # Per file: (header text or note, candidate hunks as (index, hunk))
+    layout: List[Tuple[str, List[Tuple[int, Hunk]]]] = []
+
+    for file_diff in files:
+        file_stats = FileStats(path=file_diff.path, status='kept', added=file_diff.added,
+                               removed=file_diff.removed, hunks=len(file_diff.hunks))
+        stats.append(file_stats)
+
+        reason = classify_file(file_diff)
+        if reason:
+            file_stats.status = reason
+            layout.append((_file_note(file_diff, reason), []))
+            continue
+
+        candidates = [(index, hunk) for index, hunk in enumerate(file_diff.hunks)
+                      if not hunk.is_whitespace_only()]
+        if file_diff.hunks and not candidates:
+            file_stats.status = 'whitespace'
+            layout.append((_file_note(file_diff, 'whitespace-only'), []))
+            continue
+        # 'index <oid>..<oid>' lines mean nothing to the model
+        header = ''.join(line for line in file_diff.header if not line.startswith('index '))
+        layout.append((header, candidates))
+
+    # Headers and notes are always included
+    remaining = max_tokens - sum(estimate_tokens(header) for header, _ in layout)
+
+    # Pick hunks: first the best hunk of every file, each file getting an
+    # equal share of the budget (cheaper files leave more for the rest),
+    # then the remaining hunks by size while they fit
+    def rank(item):
+        file_index, (hunk_index, hunk) = item
+        return (-hunk.changed, file_index, hunk_index)
+
+    firsts, rest = [], []
+    for file_index, (_, candidates) in enumerate(layout):
+        ordered = sorted(((file_index, candidate) for candidate in candidates), key=rank)
+        firsts.extend(ordered[:1])
+        rest.extend(ordered[1:])
+
+    chosen = {}
+
+    def take(item, allowance):
+        file_index, (hunk_index, hunk) = item
+        text = hunk.text
+        if estimate_tokens(text) > allowance:
+            text = _cut_hunk(hunk, allowance) if allowance > 0 else None
+        if text is not None:
+            chosen[(file_index, hunk_index)] = text
+            return estimate_tokens(text)
+        return 0
+
+    firsts.sort(key=lambda item: (estimate_tokens(item[1][1].text), item[0]))
+    for position, item in enumerate(firsts):
+        share = remaining // (len(firsts) - position)
+        remaining -= take(item, share)
+
+    for item in sorted(rest, key=rank):
+        remaining -= take(item, remaining)
+
+    # Rebuild in diff order
+    parts = []
+    for file_index, (header, candidates) in enumerate(layout):
+        parts.append(header)
+        file_stats = stats[file_index]
+        if file_stats.status != 'kept':
+            continue
+        omitted = []
+        for hunk_index, hunk in enumerate(files[file_index].hunks):
+            text = chosen.get((file_index, hunk_index))
+            if text is None:
+                omitted.append(hunk)
+                continue
+            file_stats.hunks_kept += 1
+            if text != hunk.text:
+                file_stats.status = 'partial'
+            parts.append(text)
+        candidate_ids = {id(hunk) for _, hunk in candidates}
+        skipped = [hunk for hunk in omitted if id(hunk) in candidate_ids]
+        whitespace = len(omitted) - len(skipped)
+        if whitespace:
+            parts.append(f"# ... {whitespace} whitespace-only hunks omitted\n")
+        if skipped:
+            added = sum(hunk.added for hunk in skipped)
+            removed = sum(hunk.removed for hunk in skipped)
+            parts.append(f"# ... {len(skipped)} hunks omitted (+{added} -{removed})\n")
+            file_stats.status = 'omitted' if file_stats.hunks_kept == 0 else 'partial'
+
+    text = ''.join(parts)
+    return ReducedDiff(
+        text=text,
+        files=stats,
+        original_tokens=estimate_tokens(diff_content),
+        tokens=estimate_tokens(text),
+        budget=max_tokens
+    )
@@ -0,0 +1,192 @@
+"""
+HTTP client for AI providers.
+
+Calling requests.post() directly opens a new connection for every
+request. AiHttpClient keeps one requests.Session per process instead,
+so consecutive calls (a connection test followed by a generation, or
+the concurrent per-file summaries of a large commit) reuse kept-alive
+connections from its pool.
+
+The session is created on first use, so importing this module does not
+import requests. Connect and read timeouts come from ai.http.*, and
+connection errors (refused or reset connections) are retried with
+exponential backoff. Read timeouts are not retried: the server got the
+request and is just slow.
+
+Sessions are never shared across fork(): a daemon worker that inherits
+a client from its parent creates its own session.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+
+# Connections kept per host, enough for the map-reduce workers
+POOL_SIZE = 10
+
+
+class AiHttpClient:
+    """
+    Pooled HTTP client with timeouts and retries.
+
+    Attributes:
+        connect_timeout (float): Seconds to wait for the connection
+        read_timeout (float): Seconds to wait between response bytes
+        retries (int): Retries after a connection error
+        backoff (float): Delay before the first retry, doubled each time
+
+    Example:
+        client = get_http_client(config_manager)
+        response = client.post(f"{base_url}/api/generate", json=data)
+    """
+
+    def __init__(self, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF):
+        """
+        Initialize HTTP client.
+
+        Args:
+            connect_timeout (float): Seconds to wait for the connection
+            read_timeout (float): Seconds to wait between response bytes
+            retries (int): Retries after a connection error
+            backoff (float): Delay before the first retry, in seconds
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_manager) -> 'AiHttpClient':
+        """
+        Create a client from the ai.http.* settings.
+
+        Args:
+            config_manager (ConfigManager): Configuration management instance
+
+        Returns:
+            AiHttpClient: New client
+        """
+        return cls(*_read_settings(config_manager))
+
+    @property
+    def session(self):
+        """Get the pooled session, creating it on first use."""
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                # Imported here so that commands not using AI never load requests
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+                self._pid = os.getpid()
+            return self._session
+
+    def request(self, method: str, url: str, **kwargs: Any):
+        """
+        Send a request, retrying connection errors.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Arguments for requests.Session.request; timeout
+                      defaults to (connect_timeout, read_timeout)
+
+        Returns:
+            requests.Response: Response
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+                after all retries
+        """
+        import requests
+
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        attempt = 0
+        while True:
+            try:
+                return self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if attempt >= self.retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt))
+                attempt += 1
+
+    def get(self, url: str, **kwargs: Any):
+        """Send a GET request, see request()."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        """Send a POST request, see request()."""
+        return self.request('POST', url, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._lock:
+            if self._session is not None and self._pid == os.getpid():
+                self._session.close()
+            self._session = None
+
+
+# One client per distinct set of settings, shared by the whole process
+_clients: Dict[Tuple[float, float, int, float], AiHttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(config_manager) -> AiHttpClient:
+    """
+    Get the shared client for the configured settings.
+
+    Args:
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        AiHttpClient: Client reused by every caller with the same settings
+    """
+    settings = _read_settings(config_manager)
+    with _clients_lock:
+        client = _clients.get(settings)
+        if client is None:
+            client = _clients[settings] = AiHttpClient(*settings)
+        return client
+
+
+def close_http_clients() -> None:
+    """Close and forget every shared client."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def _read_settings(config_manager) -> Tuple[float, float, int, float]:
+    """Read ai.http.* settings, falling back to the defaults."""
+    def number(key: str, default: float, allow_zero: bool) -> float:
+        value = config_manager.get_config(key, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return default
+        if value < 0 or (value == 0 and not allow_zero):
+            return default
+        return value
+
+    return (
+        number('ai.http.connect_timeout', DEFAULT_CONNECT_TIMEOUT, False),
+        number('ai.http.read_timeout', DEFAULT_READ_TIMEOUT, False),
+        int(number('ai.http.retries', DEFAULT_RETRIES, True)),
+        number('ai.http.backoff', DEFAULT_BACKOFF, True)
+    )
@@ -0,0 +1,261 @@
+"""
+AI message cache for ggGit.
+
+This module stores generated commit messages under a key derived from
+everything that determines the model's answer: the staged diff and file
+list, the provider and model, the commit type and the prompt template
+version. Running 'ggai main' and then 'ggfeat' on the same staged
+changes, or retrying an aborted commit, reuses the message instead of
+calling the model again.
+
+Entries are small JSON files under ~/.gggit/cache/ai-messages/. Reading
+an entry refreshes its modification time, and eviction removes entries
+older than ai.cache.max_age_days and then the least recently used ones
+beyond ai.cache.max_entries. Ages are measured from the last use.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Hit/miss counters, kept apart from the entries
+STATS_FILE = '.stats.json'
+
+
+class AiMessageCache:
+    """
+    Content-addressed cache of AI-generated commit messages.
+
+    Attributes:
+        config (ConfigManager): Configuration management instance
+        cache_dir (Path): Directory holding the cache entries
+
+    Example:
+        cache = AiMessageCache(config_manager)
+        key = cache.make_key(diff_content, files, 'ollama|gemma3:4b', 'feat', 1)
+        message = cache.get(key)
+        if message is None:
+            message = generate()
+            cache.put(key, message)
+    """
+
+    def __init__(self, config_manager, cache_dir: Optional[Path] = None):
+        """
+        Initialize AI message cache.
+
+        Args:
+            config_manager (ConfigManager): Configuration management instance
+            cache_dir (Path, optional): Cache directory, defaults to
+                                        ~/.gggit/cache/ai-messages
+        """
+        self.config = config_manager
+        self.cache_dir = cache_dir or Path.home() / '.gggit' / 'cache' / 'ai-messages'
+
+    def is_enabled(self) -> bool:
+        """
+        Check if the message cache is enabled.
+
+        Returns:
+            bool: True if ai.cache.enabled is true (the default)
+        """
+        return self.config.get_config('ai.cache.enabled', True) is True
+
+    @staticmethod
+    def make_key(diff_content: str, files: List[str], model: str,
+                 commit_type: Optional[str], prompt_version: int) -> str:
+        """
+        Build the cache key for a generation request.
+
+        Args:
+            diff_content (str): Diff sent to the model
+            files (List[str]): Files included in the commit
+            model (str): Provider and model identifier
+            commit_type (Optional[str]): Commit type (feat, fix, ...)
+            prompt_version (int): Version of the prompt template
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        for part in (str(prompt_version), model, commit_type or '', '\0'.join(files), diff_content):
+            digest.update(part.encode('utf-8', 'surrogateescape'))
+            digest.update(b'\0\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached message.
+
+        Args:
+            key (str): Cache key from make_key()
+
+        Returns:
+            Optional[str]: Cached message, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime > self._max_age_seconds():
+                self._remove(path)
+                raise OSError("expired")
+            with open(path, 'r', encoding='utf-8') as f:
+                message = json.load(f)['message']
+        except (OSError, ValueError, KeyError, TypeError):
+            self._count('misses')
+            return None
+
+        # Refresh the entry for least-recently-used eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hits')
+        return message
+
+    def put(self, key: str, message: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store a message and evict old entries.
+
+        Args:
+            key (str): Cache key from make_key()
+            message (str): Generated message
+            metadata (Dict[str, Any], optional): Extra information to keep
+                                                 with the entry (model, type)
+        """
+        entry = dict(metadata or {}, message=message, created=time.time())
+        try:
+            self._write_json(self._entry_path(key), entry)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and the least recently used beyond the limit.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = self._list_entries()
+        now = time.time()
+        max_age = self._max_age_seconds()
+        max_entries = self.config.get_config('ai.cache.max_entries', 500)
+
+        removed = 0
+        kept = []
+        for path, st in entries:
+            if now - st.st_mtime > max_age:
+                removed += self._remove(path)
+            else:
+                kept.append((path, st))
+
+        if isinstance(max_entries, int) and len(kept) > max_entries:
+            kept.sort(key=lambda item: item[1].st_mtime)
+            for path, _ in kept[:len(kept) - max_entries]:
+                removed += self._remove(path)
+
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove every entry and reset the counters.
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = sum(self._remove(path) for path, _ in self._list_entries())
+        self._remove(self.cache_dir / STATS_FILE)
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: entries, size_bytes, hits, misses, hit_rate,
+                            oldest and newest (timestamps or None), dir
+        """
+        entries = self._list_entries()
+        counters = self._read_counters()
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        mtimes = [st.st_mtime for _, st in entries]
+
+        return {
+            'entries': len(entries),
+            'size_bytes': sum(st.st_size for _, st in entries),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'oldest': min(mtimes) if mtimes else None,
+            'newest': max(mtimes) if mtimes else None,
+            'dir': str(self.cache_dir)
+        }
+
+    def _entry_path(self, key: str) -> Path:
+        """Get the file of a cache entry."""
+        return self.cache_dir / f'{key}.json'
+
+    def _max_age_seconds(self) -> float:
+        """Get the maximum entry age in seconds."""
+        days = self.config.get_config('ai.cache.max_age_days', 30)
+        if not isinstance(days, (int, float)):
+            days = 30
+        return days * 86400
+
+    def _list_entries(self) -> List[Any]:
+        """List entry files with their stat information."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for item in it:
+                    if item.name.endswith('.json') and not item.name.startswith('.'):
+                        try:
+                            entries.append((Path(item.path), item.stat()))
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+        return entries
+
+    def _remove(self, path: Path) -> int:
+        """Remove a file, returning 1 if it existed."""
+        try:
+            os.unlink(path)
+            return 1
+        except OSError:
+            return 0
+
+    def _read_counters(self) -> Dict[str, int]:
+        """Read the hit/miss counters."""
+        try:
+            with open(self.cache_dir / STATS_FILE, 'r', encoding='utf-8') as f:
+                counters = json.load(f)
+            return counters if isinstance(counters, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _count(self, name: str) -> None:
+        """Increment a hit/miss counter."""
+        counters = self._read_counters()
+        counters[name] = counters.get(name, 0) + 1
+        try:
+            self._write_json(self.cache_dir / STATS_FILE, counters)
+        except OSError:
+            pass
+
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> None:
+        """Write a JSON file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
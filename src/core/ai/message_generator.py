@@ -7,17 +7,28 @@ Currently implements a mock version for MVP development.
 
 import os
 import re
-import requests
-from typing import List, Dict, Any, Optional
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from .diff_reducer import DEFAULT_MAX_DIFF_TOKENS, FileDiff, classify_file, parse_diff, reduce_diff
+from .preflight import STRATEGY_FULL, STRATEGY_SUMMARIZED, get_map_reduce_workers, use_map_reduce
+from .pricing import calculate_cost
+from .providers import AiProvider, ProviderResponse, create_provider
+from .token_counter import count_tokens
+from .message_cache import AiMessageCache
+from ..utils.profiling import span
+
 # Constants for conventional commit prefixes
 CONVENTIONAL_COMMIT_PREFIXES = r'^(feat|fix|docs|style|refactor|test|chore|perf|ci|build|break)(\([^)]+\))?:\s*'
 
-# Token estimation multiplier
-# This multiplier accounts for the fact that AI tokens are typically longer than simple word splits
-# and includes overhead for special tokens, formatting, and context
-TOKEN_ESTIMATION_MULTIPLIER = 1.3
+# Version of the prompt built by _build_context_prompt; bump it whenever
+# the template changes so cached messages from the old prompt are not reused
+PROMPT_VERSION = 2
+
+# Version of the per-file summary prompt, part of the summary cache key
+SUMMARY_PROMPT_VERSION = 1
 
 
 class AiMessageGenerator:
@@ -54,18 +65,44 @@ class AiMessageGenerator:
         """
         self.config = config_manager
         self.usage_tracker = usage_tracker
+        self.message_cache = AiMessageCache(config_manager)
+        # Per-file summaries for map-reduce generation, keyed by blob ids
+        self.summary_cache = AiMessageCache(
+            config_manager, Path.home() / '.gggit' / 'cache' / 'ai-summaries'
+        )
+        # Echo streamed tokens while the model writes, only for a terminal
+        self.show_tokens = sys.stderr.isatty()
+        self._provider = None
+        # Command and cache outcome recorded in the usage ledger for the
+        # current request
+        self._usage_command = 'ggai'
+        self._usage_cache_hit = None
     
-    def generate_message(self, files: List[str], diff_content: str, commit_type: str = None) -> str:
+    def generate_message(self, files: List[str], diff_content: str, commit_type: str = None,
+                         strategy: Optional[str] = None, index_tree: Optional[str] = None) -> str:
         """
         Generate commit message using real AI.
         
         This method generates a commit message using real AI services
-        based on the files and diff content.
+        based on the files and diff content. Messages are cached by diff,
+        files, model, commit type and prompt version, so the same staged
+        changes are only sent to the model once.
+        
+        With ai.map_reduce.enabled, commits touching at least
+        ai.map_reduce.min_files files are summarized file by file in
+        parallel, and the message is generated from the summaries.
+        The strategy chosen by the pre-flight checks overrides that rule.
         
         Args:
             files (List[str]): List of files that were modified
             diff_content (str): Git diff content for analysis
             commit_type (str): Type of commit (feat, fix, etc.) for context
+            strategy (Optional[str]): STRATEGY_FULL or STRATEGY_SUMMARIZED
+                                      from PreflightPlan, None to decide
+                                      from ai.map_reduce
+            index_tree (Optional[str]): Index tree id the diff was read
+                                        from; the message is also cached
+                                        under it for get_prefetched()
             
         Returns:
             str: Generated commit message
@@ -73,18 +110,47 @@ class AiMessageGenerator:
         if not files:
             return "chore: no changes detected"
         
+        self._usage_command = f"gg{commit_type}" if commit_type else 'ggai'
+        self._usage_cache_hit = None
         try:
-            # Build context-aware prompt
-            prompt = self._build_context_prompt(files, diff_content, commit_type)
+            cache_key = None
+            if self.message_cache.is_enabled():
+                cache_key = self.message_cache.make_key(
+                    diff_content, files, self._get_model_id(), commit_type, PROMPT_VERSION
+                )
+                cached = self.message_cache.get(cache_key)
+                if cached is not None:
+                    self._track_cache_hit()
+                    return cached
+                self._usage_cache_hit = False
             
-            # Call real AI API
-            response = self._call_ollama_api(prompt)
+            if self._use_map_reduce(files, strategy):
+                # Summarize every file, then ask for the message
+                summaries = self._summarize_files(parse_diff(diff_content))
+                changes = '\n'.join(f"- {path}: {summary}" for path, summary in summaries)
+                prompt = self._build_context_prompt(files, changes, commit_type)
+            else:
+                # Reduce the diff to the token budget and build the prompt
+                reduced = reduce_diff(diff_content, self._get_diff_budget())
+                prompt = self._build_context_prompt(files, reduced.text, commit_type, reduced.summary())
+            
+            # Call real AI API (usage is tracked with the answer)
+            response = self._call_ai_api(prompt)
             
             # Process and clean response
             message = self._process_ai_response(response)
             
-            # Track real usage
-            self._track_real_usage(prompt, response)
+            if cache_key is not None:
+                self.message_cache.put(cache_key, message, {
+                    'model': self._get_model_id(),
+                    'commit_type': commit_type
+                })
+            if index_tree:
+                self.message_cache.put(self._make_tree_key(index_tree, commit_type), message, {
+                    'model': self._get_model_id(),
+                    'commit_type': commit_type,
+                    'tree': index_tree
+                })
             
             return message
             
@@ -92,6 +158,156 @@ class AiMessageGenerator:
             # No fallback to mock - show clear error
             raise Exception(f"Error generando mensaje IA: {e}")
     
+    def get_prefetched(self, index_tree: str, commit_type: str = None) -> Optional[str]:
+        """
+        Get a message generated earlier for the same staged contents.
+        
+        Looking the message up by index tree id avoids reading the diff,
+        so a message prefetched in the background is returned at once.
+        
+        Args:
+            index_tree (str): Index tree id, from GitInterface.get_index_tree()
+            commit_type (str): Type of commit (feat, fix, etc.)
+            
+        Returns:
+            Optional[str]: Cached message, or None on a miss
+        """
+        message = self.message_cache.get(self._make_tree_key(index_tree, commit_type))
+        if message is not None:
+            self._usage_command = f"gg{commit_type}" if commit_type else 'ggai'
+            self._track_cache_hit()
+        return message
+    
+    def _make_tree_key(self, index_tree: str, commit_type: Optional[str]) -> str:
+        """
+        Build the cache key of a message by index tree id.
+        
+        Args:
+            index_tree (str): Index tree id
+            commit_type (Optional[str]): Commit type
+            
+        Returns:
+            str: Cache key, distinct from the keys built from diffs
+        """
+        return self.message_cache.make_key(
+            '', [f"tree:{index_tree}"], self._get_model_id(), commit_type, PROMPT_VERSION
+        )
+    
+    def _get_diff_budget(self) -> int:
+        """
+        Get the token budget for the diff part of the prompt.
+        
+        Returns:
+            int: ai.diff.max_tokens, or the default budget
+        """
+        budget = self.config.get_config('ai.diff.max_tokens', DEFAULT_MAX_DIFF_TOKENS)
+        return budget if isinstance(budget, int) and budget > 0 else DEFAULT_MAX_DIFF_TOKENS
+    
+    def _use_map_reduce(self, files: List[str], strategy: Optional[str] = None) -> bool:
+        """
+        Check if a commit is generated from per-file summaries.
+        
+        Args:
+            files (List[str]): Files included in the commit
+            strategy (Optional[str]): Strategy chosen by the pre-flight checks
+            
+        Returns:
+            bool: True for STRATEGY_SUMMARIZED; without a strategy, True if
+                  ai.map_reduce.enabled is true and the commit has at
+                  least ai.map_reduce.min_files files
+        """
+        if strategy in (STRATEGY_FULL, STRATEGY_SUMMARIZED):
+            return strategy == STRATEGY_SUMMARIZED
+        return use_map_reduce(len(files), self.config)
+    
+    def _summarize_files(self, file_diffs: List[FileDiff]) -> List[Tuple[str, str]]:
+        """
+        Summarize each file of a diff in one line.
+        
+        Files that say nothing about the change (lockfiles, binaries...)
+        are described without the model. Summaries are cached by the
+        blob ids of the file, so after restaging or amending only the
+        files that changed are sent again. The rest are sent as one batch
+        to the provider, at most ai.map_reduce.max_workers at a time.
+        
+        Args:
+            file_diffs (List[FileDiff]): Parsed diff, from parse_diff()
+            
+        Returns:
+            List[Tuple[str, str]]: (path, summary) pairs in diff order
+            
+        Raises:
+            Exception: If a summary request fails
+        """
+        cache = self.summary_cache if self.summary_cache.is_enabled() else None
+        model_id = self._get_model_id()
+        summaries: Dict[int, str] = {}
+        pending = []
+        
+        for index, file_diff in enumerate(file_diffs):
+            reason = classify_file(file_diff)
+            if reason:
+                summaries[index] = f"{reason} file changed"
+                continue
+            key = self.summary_cache.make_key(
+                file_diff.blobs or file_diff.text, [file_diff.path], model_id, None, SUMMARY_PROMPT_VERSION
+            )
+            cached = cache.get(key) if cache else None
+            if cached is not None:
+                summaries[index] = cached
+            else:
+                pending.append((index, key, self._build_summary_prompt(file_diff)))
+        
+        if pending:
+            workers = get_map_reduce_workers(self.config)
+            stream = self.config.get_config('ai.stream', True) is True
+            with span('ai.summarize', files=len(pending), requests=len(pending), model=model_id):
+                responses = self._get_provider().generate_batch(
+                    [prompt for _, _, prompt in pending], max_workers=workers, stream=stream
+                )
+            # Usage tracking and cache writes stay in this thread
+            for (index, key, prompt), result in zip(pending, responses):
+                summary = re.sub(r'\s+', ' ', result.text).strip() or "updated"
+                self._track_real_usage(prompt, result)
+                summaries[index] = summary
+                if cache:
+                    cache.put(key, summary, {'model': model_id, 'path': file_diffs[index].path})
+        
+        return [(file_diff.path, summaries[index]) for index, file_diff in enumerate(file_diffs)]
+    
+    def _build_summary_prompt(self, file_diff: FileDiff) -> str:
+        """
+        Build the prompt summarizing the changes of one file.
+        
+        Args:
+            file_diff (FileDiff): Parsed file diff
+            
+        Returns:
+            str: Formatted prompt for AI
+        """
+        reduced = reduce_diff(file_diff.text, self._get_diff_budget())
+        return f"""Summarize the following changes to {file_diff.path} in one line:
+
+{reduced.text}
+
+Requirements:
+- One line, under 80 characters
+- Describe what changed and why, not how
+- Do not use markdown formatting
+- Generate only the summary, no explanations"""
+    
+    def _get_model_id(self) -> str:
+        """
+        Get the identifier of the model answering requests.
+        
+        Returns:
+            str: Provider, base URL and model name
+        """
+        provider = self.config.get_config('ai.provider', 'openai')
+        base_url = self.config.get_config('ai.base_url', 'http://localhost:11434')
+        model = self.config.get_config('ai.model', 'gemma3:4b')
+        return f"{provider}|{base_url}|{model}"
+    
     def test_connection(self) -> bool:
         """
         Test AI connection and configuration.
@@ -114,7 +330,7 @@ class AiMessageGenerator:
             
             # Test with a simple prompt
             test_prompt = "Generate a simple commit message for: test file"
-            response = self._call_ollama_api(test_prompt)
+            response = self._call_ai_api(test_prompt)
             
             # If we get a response, connection is working
             return bool(response and response.strip())
@@ -242,46 +458,50 @@ class AiMessageGenerator:
             'status': 'configured' if self.test_connection() else 'not_configured'
         }
     
-    def _call_ollama_api(self, prompt: str) -> str:
+    def _get_provider(self) -> AiProvider:
         """
-        Call Ollama API to generate commit message.
+        Get the backend selected by ai.provider, created on first use.
         
-        Args:
-            prompt (str): Prompt to send to the AI model
-            
         Returns:
-            str: AI-generated response
+            AiProvider: Provider backend
             
         Raises:
-            Exception: If API call fails
+            AiProviderError: If ai.provider names an unknown provider
         """
-        base_url = self.config.get_config('ai.base_url', 'http://localhost:11434')
-        model = self.config.get_config('ai.model', 'gemma3:4b')
+        if self._provider is None:
+            self._provider = create_provider(self.config)
+        return self._provider
+    
+    def _call_ai_api(self, prompt: str, show_tokens: bool = True) -> str:
+        """
+        Call the configured AI provider to generate commit message.
         
-        url = f"{base_url}/api/generate"
-        data = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.7,
-                "max_tokens": 200
-            }
-        }
+        With ai.stream enabled (the default) the answer is read as it
+        arrives and the request is closed as soon as a complete subject
+        line has been produced, which also makes the server stop
+        generating. Usage is tracked for every call.
         
-        try:
-            response = requests.post(url, json=data, timeout=30)
-            response.raise_for_status()
+        Args:
+            prompt (str): Prompt to send to the AI model
+            show_tokens (bool): Echo streamed tokens to a terminal
             
-            result = response.json()
-            return result.get("response", "").strip()
+        Returns:
+            str: AI-generated response
             
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error de conexión con Ollama: {e}")
-        except Exception as e:
-            raise Exception(f"Error procesando respuesta de IA: {e}")
+        Raises:
+            AiProviderError: If the provider call fails
+        """
+        stream = self.config.get_config('ai.stream', True) is True
+        provider = self._get_provider()
+        with span('ai.generate', provider=provider.name, model=provider.model):
+            result = provider.generate(
+                prompt, stream=stream, show_tokens=show_tokens and self.show_tokens
+            )
+        self._track_real_usage(prompt, result)
+        return result.text
     
-    def _build_context_prompt(self, files: List[str], diff_content: str, commit_type: str = None) -> str:
+    def _build_context_prompt(self, files: List[str], diff_content: str, commit_type: str = None,
+                              diff_notes: str = "") -> str:
         """
         Build context-aware prompt for better AI generation.
         
@@ -289,6 +509,7 @@ class AiMessageGenerator:
             files (List[str]): List of files modified
             diff_content (str): Git diff content
             commit_type (str): Type of commit for context
+            diff_notes (str): What was left out of the diff, if anything
             
         Returns:
             str: Formatted prompt for AI
@@ -301,6 +522,8 @@ class AiMessageGenerator:
         
         # Build additional context
         additional_context = self._get_additional_context(files, diff_content)
+        if diff_notes:
+            additional_context = '\n'.join(part for part in (additional_context, diff_notes) if part)
         
         prompt = f"""Generate a concise commit message for the following changes:
 
@@ -426,25 +649,47 @@ Requirements:
         
         return message
     
-    def _track_real_usage(self, prompt: str, response: str) -> None:
+    def _track_real_usage(self, prompt: str, result: ProviderResponse) -> None:
         """
         Track real AI usage for cost monitoring.
         
+        Token counts reported by the provider are used when present;
+        otherwise the prompt and answer are counted locally. The cost
+        comes from the price table of the model.
+        
         Args:
             prompt (str): Prompt sent to AI
-            response (str): Response received from AI
+            result (ProviderResponse): Answer received from AI
         """
         if not self.usage_tracker.is_tracking_enabled():
             return
         
-        # Estimate tokens (rough calculation)
-        prompt_tokens = len(prompt.split()) * TOKEN_ESTIMATION_MULTIPLIER
-        response_tokens = len(response.split()) * TOKEN_ESTIMATION_MULTIPLIER
-        
-        total_tokens = int(prompt_tokens + response_tokens)
-        
-        # Estimate cost (Ollama local is free, but track for consistency)
-        cost = 0.0  # Local Ollama is free
+        provider = self._get_provider()
+        prompt_tokens = result.prompt_tokens
+        if prompt_tokens is None:
+            prompt_tokens = count_tokens(prompt, provider.model)
+        completion_tokens = result.completion_tokens
+        if completion_tokens is None:
+            completion_tokens = count_tokens(result.text, provider.model)
+        
+        cost = calculate_cost(provider.name, provider.model, prompt_tokens, completion_tokens, self.config)
+        
+        self.usage_tracker.increment_usage(
+            self._usage_command, prompt_tokens + completion_tokens, cost,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency=result.latency,
+            model=provider.model,
+            cache_hit=self._usage_cache_hit
+        )
+    
+    def _track_cache_hit(self) -> None:
+        """Record a message served from the cache in the usage ledger."""
+        if not self.usage_tracker.is_tracking_enabled():
+            return
         
-        # Track usage
-        self.usage_tracker.increment_usage("ggai", total_tokens, cost)
+        self.usage_tracker.increment_usage(
+            self._usage_command, 0, 0.0,
+            model=self.config.get_config('ai.model', 'gemma3:4b'),
+            cache_hit=True
+        )
@@ -0,0 +1,375 @@
+"""
+Speculative commit message prefetch for ggGit.
+
+With ai.prefetch.enabled, 'gga' starts a detached worker as soon as the
+files are staged. The worker runs the usual pre-flight checks on the
+staged changes and generates a message for each type in
+ai.prefetch.types, storing it in the message cache under the id of the
+index tree ('git write-tree'). While the user reviews the changes and
+types 'ggfeat', the model is already working.
+
+The commit command then computes the index tree again:
+- a message cached for that tree and type is used at once
+- a worker still generating for that tree is waited for, at most
+  ai.prefetch.wait seconds
+- a worker for another tree is stale (the index changed since) and is
+  stopped, and the message is generated as usual
+
+One worker runs per repository. Its pid and tree are kept in a small
+JSON file under ~/.gggit/cache/ai-prefetch/, which the worker removes
+when it finishes. Workers are controlled with POSIX signals, so
+prefetching is not available on Windows.
+"""
+
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Root of the ggGit sources (the directory containing 'core')
+SRC_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Commit types generated when ai.prefetch.types is not set
+DEFAULT_TYPES = ['feat']
+
+# Seconds a commit waits for a running worker by default
+DEFAULT_WAIT = 30
+
+# Seconds between checks while waiting for a worker
+_POLL_INTERVAL = 0.1
+
+
+def default_prefetch_dir() -> Path:
+    """
+    Get the directory holding prefetch job files.
+
+    Returns:
+        Path: ~/.gggit/cache/ai-prefetch
+    """
+    return Path.home() / '.gggit' / 'cache' / 'ai-prefetch'
+
+
+def is_prefetch_enabled(config_manager) -> bool:
+    """
+    Check if messages are prefetched after staging.
+
+    Args:
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        bool: True if ai.enabled, ai.prefetch.enabled and ai.cache.enabled
+              are true and the platform supports it
+    """
+    return (
+        os.name == 'posix'
+        and config_manager.get_config('ai.enabled', False) is True
+        and config_manager.get_config('ai.prefetch.enabled', False) is True
+        and config_manager.get_config('ai.cache.enabled', True) is True
+    )
+
+
+def get_prefetch_types(config_manager) -> List[str]:
+    """
+    Get the commit types a worker generates messages for.
+
+    Args:
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        List[str]: ai.prefetch.types, or DEFAULT_TYPES
+    """
+    types = config_manager.get_config('ai.prefetch.types', DEFAULT_TYPES)
+    if not isinstance(types, list) or not all(isinstance(t, str) and t for t in types):
+        return list(DEFAULT_TYPES)
+    return types
+
+
+class MessagePrefetcher:
+    """
+    Starts, waits for and cancels prefetch workers of one repository.
+
+    Attributes:
+        git (GitInterface): Git interface of the repository
+        config (ConfigManager): Configuration management instance
+        prefetch_dir (Path): Directory holding the job files
+
+    Example:
+        # After staging
+        MessagePrefetcher(git, config).start()
+
+        # In the commit command
+        message = MessagePrefetcher(git, config).claim(generator, 'feat')
+        if message is None:
+            message = generator.generate_message(files, diff, 'feat')
+    """
+
+    def __init__(self, git_interface, config_manager, prefetch_dir: Optional[Path] = None):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            git_interface (GitInterface): Git interface of the repository
+            config_manager (ConfigManager): Configuration management instance
+            prefetch_dir (Path, optional): Job file directory, defaults to
+                                           ~/.gggit/cache/ai-prefetch
+        """
+        self.git = git_interface
+        self.config = config_manager
+        self.prefetch_dir = prefetch_dir or default_prefetch_dir()
+
+    def start(self) -> bool:
+        """
+        Start a worker for the staged changes.
+
+        A worker already running for the same index tree is kept; one
+        running for another tree is stopped first.
+
+        Returns:
+            bool: True if a worker is running for the current index tree
+        """
+        tree = self.git.get_index_tree()
+        if not tree or tree == self.git.get_head_tree():
+            # Nothing staged
+            self.cancel()
+            return False
+
+        job = self._read_job()
+        if job and _is_running(job):
+            if job.get('tree') == tree:
+                return True
+            self.cancel()
+
+        return self._spawn(tree)
+
+    def claim(self, generator, commit_type: Optional[str] = None) -> Optional[str]:
+        """
+        Get the prefetched message for the staged changes.
+
+        Args:
+            generator (AiMessageGenerator): Generator owning the message cache
+            commit_type (Optional[str]): Type of commit (feat, fix, etc.)
+
+        Returns:
+            Optional[str]: Message generated for the current index tree,
+                           or None if there is none (yet)
+        """
+        tree = self.git.get_index_tree()
+        if not tree:
+            return None
+
+        job = self._read_job()
+        if job and job.get('tree') != tree:
+            self.cancel()
+        elif job and commit_type in job.get('types', []):
+            self._wait(job)
+
+        return generator.get_prefetched(tree, commit_type)
+
+    def cancel(self) -> bool:
+        """
+        Stop the worker of this repository, if any.
+
+        Returns:
+            bool: True if a running worker was signalled
+        """
+        job = self._read_job()
+        if job is None:
+            return False
+
+        stopped = False
+        if _is_running(job):
+            try:
+                # The worker leads its own session; stop its git children too
+                os.killpg(job['pid'], signal.SIGTERM)
+                stopped = True
+            except OSError:
+                pass
+        self._remove_job(job)
+        return stopped
+
+    def run(self, tree: str) -> int:
+        """
+        Generate the messages for an index tree (the worker's body).
+
+        Args:
+            tree (str): Index tree id the worker was started for
+
+        Returns:
+            int: 0 if messages were generated, 1 otherwise
+        """
+        from .complexity_analyzer import ComplexityAnalyzer
+        from .message_generator import AiMessageGenerator
+        from .usage_tracker import AiUsageTracker
+
+        try:
+            usage_tracker = AiUsageTracker(self.config)
+            analyzer = ComplexityAnalyzer(self.git, self.config, usage_tracker)
+            generator = AiMessageGenerator(self.config, usage_tracker)
+            generator.show_tokens = False
+
+            should_use_ai, analysis = analyzer.should_use_ai()
+            if not should_use_ai or not analysis.get('has_staged'):
+                return 1
+
+            files = analysis['files']
+            diff_content = self.git.get_diff_content(files, staged=True)
+            if self.git.get_index_tree() != tree:
+                # Restaged while reading the diff: the diff is not the tree's
+                return 1
+
+            plan = analysis.get('plan')
+            for commit_type in get_prefetch_types(self.config):
+                generator.generate_message(files, diff_content, commit_type,
+                                           strategy=plan.strategy if plan else None,
+                                           index_tree=tree)
+            return 0
+        except Exception as e:
+            print(f"Prefetch failed: {e}", file=sys.stderr)
+            return 1
+        finally:
+            job = self._read_job()
+            if job and job.get('pid') == os.getpid():
+                self._remove_job(job)
+
+    def _spawn(self, tree: str) -> bool:
+        """
+        Start a detached worker for an index tree.
+
+        Args:
+            tree (str): Index tree id
+
+        Returns:
+            bool: True if the worker was started
+        """
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_ROOT), env.get('PYTHONPATH')]))
+
+        try:
+            self.prefetch_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.prefetch_dir / 'prefetch.log', 'ab') as log_file:
+                process = subprocess.Popen(
+                    [sys.executable, '-m', 'core.ai.prefetch', tree],
+                    stdin=subprocess.DEVNULL,
+                    stdout=log_file,
+                    stderr=log_file,
+                    cwd=os.getcwd(),
+                    env=env,
+                    start_new_session=True
+                )
+        except OSError:
+            return False
+
+        self._write_job({
+            'pid': process.pid,
+            'tree': tree,
+            'types': get_prefetch_types(self.config),
+            'started': time.time()
+        })
+        return True
+
+    def _wait(self, job: Dict[str, Any]) -> None:
+        """
+        Wait for a worker to finish, at most ai.prefetch.wait seconds.
+
+        Args:
+            job (Dict[str, Any]): Job of the worker
+        """
+        wait = self.config.get_config('ai.prefetch.wait', DEFAULT_WAIT)
+        if not isinstance(wait, (int, float)) or wait < 0:
+            wait = DEFAULT_WAIT
+
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline and _is_running(job):
+            current = self._read_job()
+            if current is None or current.get('pid') != job['pid']:
+                return
+            time.sleep(_POLL_INTERVAL)
+
+    def _job_path(self) -> Optional[Path]:
+        """Get the job file of the current repository."""
+        context = self.git.get_repo_context()
+        if context is None:
+            return None
+        digest = hashlib.sha256(os.path.abspath(context.git_dir).encode('utf-8', 'surrogateescape'))
+        return self.prefetch_dir / f'{digest.hexdigest()[:32]}.json'
+
+    def _read_job(self) -> Optional[Dict[str, Any]]:
+        """Read the job file of the current repository."""
+        path = self._job_path()
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(job, dict) or not isinstance(job.get('pid'), int):
+            return None
+        return job
+
+    def _write_job(self, job: Dict[str, Any]) -> None:
+        """Write the job file of the current repository atomically."""
+        path = self._job_path()
+        if path is None:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(job, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _remove_job(self, job: Dict[str, Any]) -> None:
+        """Remove the job file if it still describes the given job."""
+        path = self._job_path()
+        current = self._read_job()
+        if path is None or current is None or current.get('pid') != job.get('pid'):
+            return
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _is_running(job: Dict[str, Any]) -> bool:
+    """Check whether the process of a job is still alive."""
+    try:
+        os.kill(job['pid'], 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to someone else: not our worker any more
+        return False
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the worker started by MessagePrefetcher._spawn()."""
+    from ..config import ConfigManager
+    from ..git import GitInterface
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m core.ai.prefetch <tree>", file=sys.stderr)
+        return 2
+
+    # Let SIGTERM from cancel() end the worker like Ctrl+C would
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(143))
+
+    with GitInterface() as git:
+        return MessagePrefetcher(git, ConfigManager()).run(argv[0])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Pre-flight checks for AI requests.
+
+Before any prompt is built, the size of the change is already known from
+'git diff --numstat' (ComplexityAnalyzer.analyze_complexity), without
+reading the diff itself. From those counts the prompt tokens, cost and
+latency of the request are projected and compared with the remaining
+budget (ai.cost_limit) and the ceilings under ai.analysis, and one of
+three strategies is chosen:
+
+- full: one prompt with the diff, reduced to ai.diff.max_tokens
+- summarized: per-file summaries combined in a final prompt
+- refuse: no request is sent, the user is told why
+
+Changes over ai.analysis.max_files, max_diff_lines or max_file_size are
+summarized when ai.map_reduce.enabled is true. Otherwise they still get
+one full prompt: the diff is reduced to ai.diff.max_tokens, so the
+prompt stays bounded whatever the size of the change. Requests are only
+refused for their cost, the remaining budget or their latency.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .diff_reducer import DEFAULT_MAX_DIFF_TOKENS
+from .pricing import calculate_cost
+
+
+STRATEGY_FULL = 'full'
+STRATEGY_SUMMARIZED = 'summarized'
+STRATEGY_REFUSE = 'refuse'
+
+# Defaults of the ai.analysis ceilings
+DEFAULT_MAX_FILES = 10
+DEFAULT_MAX_DIFF_LINES = 200
+DEFAULT_MAX_FILE_SIZE = 5000
+# USD per message; 0 disables a ceiling
+DEFAULT_MAX_COST = 0.10
+DEFAULT_MAX_LATENCY = 0
+
+# Defaults of the map-reduce generation
+DEFAULT_MAP_REDUCE_MIN_FILES = 10
+DEFAULT_MAP_REDUCE_WORKERS = 4
+
+# Average tokens of a changed diff line (about 40 characters) and of the
+# headers of each file in a diff
+TOKENS_PER_LINE = 10
+TOKENS_PER_FILE = 20
+# Instructions and context around the diff in a prompt
+PROMPT_OVERHEAD_TOKENS = 150
+# One '- path: summary' line of the final map-reduce prompt
+SUMMARY_LINE_TOKENS = 20
+# Upper bound of the answer to each request
+COMPLETION_TOKENS = 200
+
+
+@dataclass
+class PreflightPlan:
+    """
+    Strategy and projections for one commit message request.
+
+    Attributes:
+        strategy (str): STRATEGY_FULL, STRATEGY_SUMMARIZED or STRATEGY_REFUSE
+        prompt_tokens (int): Projected prompt tokens of all requests
+        requests (int): Number of requests sent to the provider
+        cost (float): Projected cost in USD
+        latency (Optional[float]): Projected seconds, None without history
+        limits (List[str]): ai.analysis ceilings exceeded by the change
+        reason (Optional[str]): Why the request is refused
+    """
+    strategy: str
+    prompt_tokens: int = 0
+    requests: int = 0
+    cost: float = 0.0
+    latency: Optional[float] = None
+    limits: List[str] = field(default_factory=list)
+    reason: Optional[str] = None
+
+    @property
+    def refused(self) -> bool:
+        """Whether the request must not be sent."""
+        return self.strategy == STRATEGY_REFUSE
+
+
+def get_exceeded_limits(analysis: Dict[str, Any], config_manager) -> List[str]:
+    """
+    List the ai.analysis ceilings a change exceeds.
+
+    Args:
+        analysis (Dict[str, Any]): Results of ComplexityAnalyzer.analyze_complexity()
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        List[str]: Description of each exceeded ceiling, empty if none
+    """
+    file_count = analysis.get('file_count', 0)
+    diff_lines = analysis.get('diff_lines', 0)
+    max_file_size = analysis.get('max_file_size', 0)
+
+    limits = []
+    if file_count > config_manager.get_config('ai.analysis.max_files', DEFAULT_MAX_FILES):
+        limits.append(f"demasiados archivos ({file_count})")
+    if diff_lines > config_manager.get_config('ai.analysis.max_diff_lines', DEFAULT_MAX_DIFF_LINES):
+        limits.append(f"demasiadas líneas de cambio ({diff_lines})")
+    if max_file_size > config_manager.get_config('ai.analysis.max_file_size', DEFAULT_MAX_FILE_SIZE):
+        limits.append(f"archivos muy grandes ({max_file_size} bytes)")
+    return limits
+
+
+def is_map_reduce_enabled(config_manager) -> bool:
+    """
+    Check if commits may be generated from per-file summaries.
+
+    Args:
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        bool: True if ai.map_reduce.enabled is true
+    """
+    return config_manager.get_config('ai.map_reduce.enabled', False) is True
+
+
+def use_map_reduce(file_count: int, config_manager) -> bool:
+    """
+    Check if a commit is summarized file by file regardless of its size.
+
+    Args:
+        file_count (int): Files included in the commit
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        bool: True if ai.map_reduce.enabled is true and the commit has
+              at least ai.map_reduce.min_files files
+    """
+    if not is_map_reduce_enabled(config_manager):
+        return False
+    min_files = config_manager.get_config('ai.map_reduce.min_files', DEFAULT_MAP_REDUCE_MIN_FILES)
+    if not isinstance(min_files, int):
+        min_files = DEFAULT_MAP_REDUCE_MIN_FILES
+    return file_count >= min_files
+
+
+def get_map_reduce_workers(config_manager) -> int:
+    """
+    Get the number of summaries requested at the same time.
+
+    Args:
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        int: ai.map_reduce.max_workers, or the default
+    """
+    workers = config_manager.get_config('ai.map_reduce.max_workers', DEFAULT_MAP_REDUCE_WORKERS)
+    if not isinstance(workers, int) or workers < 1:
+        return DEFAULT_MAP_REDUCE_WORKERS
+    return workers
+
+
+def plan_request(analysis: Dict[str, Any], config_manager, usage_tracker=None) -> PreflightPlan:
+    """
+    Choose how to generate a commit message before building the prompt.
+
+    Args:
+        analysis (Dict[str, Any]): Results of ComplexityAnalyzer.analyze_complexity()
+        config_manager (ConfigManager): Configuration management instance
+        usage_tracker (AiUsageTracker, optional): Usage tracker for the
+                                                  budget and past latency
+
+    Returns:
+        PreflightPlan: Chosen strategy with its projections
+
+    Example:
+        >>> plan = plan_request({'file_count': 2, 'diff_lines': 40, 'max_file_size': 900}, config)
+        >>> plan.strategy, plan.prompt_tokens
+        ('full', 590)
+    """
+    limits = get_exceeded_limits(analysis, config_manager)
+    file_count = analysis.get('file_count', 0)
+
+    if usage_tracker is not None and usage_tracker.is_cost_limit_exceeded():
+        return PreflightPlan(
+            STRATEGY_REFUSE, limits=limits,
+            reason=f"Límite de costo alcanzado (${usage_tracker.get_cost_limit():.2f})"
+        )
+
+    # Without map-reduce, oversized changes get one prompt with the diff
+    # reduced to ai.diff.max_tokens
+    if (limits and is_map_reduce_enabled(config_manager)) or use_map_reduce(file_count, config_manager):
+        plan = _project_summarized(analysis, config_manager)
+    else:
+        plan = _project_full(analysis, config_manager)
+    plan.limits = limits
+    plan.latency = _project_latency(plan, config_manager, usage_tracker)
+
+    remaining = usage_tracker.get_remaining_budget() if usage_tracker is not None else None
+    if remaining is not None and plan.cost > remaining:
+        plan.strategy = STRATEGY_REFUSE
+        plan.reason = f"El costo estimado (${plan.cost:.4f}) supera el presupuesto restante (${remaining:.4f})"
+        return plan
+
+    max_cost = _get_ceiling(config_manager, 'ai.analysis.max_cost', DEFAULT_MAX_COST)
+    if max_cost and plan.cost > max_cost:
+        plan.strategy = STRATEGY_REFUSE
+        plan.reason = f"El costo estimado (${plan.cost:.4f}) supera ai.analysis.max_cost (${max_cost:.4f})"
+        return plan
+
+    max_latency = _get_ceiling(config_manager, 'ai.analysis.max_latency', DEFAULT_MAX_LATENCY)
+    if max_latency and plan.latency is not None and plan.latency > max_latency:
+        plan.strategy = STRATEGY_REFUSE
+        plan.reason = (f"La latencia estimada ({plan.latency:.1f}s) supera "
+                       f"ai.analysis.max_latency ({max_latency:.1f}s)")
+    return plan
+
+
+def _get_diff_budget(config_manager) -> int:
+    """Get ai.diff.max_tokens, or the default budget."""
+    budget = config_manager.get_config('ai.diff.max_tokens', DEFAULT_MAX_DIFF_TOKENS)
+    return budget if isinstance(budget, int) and budget > 0 else DEFAULT_MAX_DIFF_TOKENS
+
+
+def _get_ceiling(config_manager, key: str, default: float) -> Optional[float]:
+    """Get a positive numeric ceiling, None when disabled."""
+    value = config_manager.get_config(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        return None
+    return float(value)
+
+
+def _estimate_diff_tokens(analysis: Dict[str, Any]) -> int:
+    """Estimate the tokens of a diff from its changed line and file counts."""
+    return analysis.get('diff_lines', 0) * TOKENS_PER_LINE + analysis.get('file_count', 0) * TOKENS_PER_FILE
+
+
+def _project_full(analysis: Dict[str, Any], config_manager) -> PreflightPlan:
+    """Project one prompt with the diff reduced to its budget."""
+    diff_tokens = min(_estimate_diff_tokens(analysis), _get_diff_budget(config_manager))
+    prompt_tokens = diff_tokens + PROMPT_OVERHEAD_TOKENS
+    return PreflightPlan(
+        STRATEGY_FULL, prompt_tokens=prompt_tokens, requests=1,
+        cost=_project_cost(config_manager, prompt_tokens, 1)
+    )
+
+
+def _project_summarized(analysis: Dict[str, Any], config_manager) -> PreflightPlan:
+    """Project one summary per file plus the final prompt."""
+    file_count = max(analysis.get('file_count', 0), 1)
+    # Each file is reduced to the budget on its own
+    diff_tokens = min(_estimate_diff_tokens(analysis), file_count * _get_diff_budget(config_manager))
+    prompt_tokens = (diff_tokens + file_count * PROMPT_OVERHEAD_TOKENS
+                     + PROMPT_OVERHEAD_TOKENS + file_count * SUMMARY_LINE_TOKENS)
+    requests = file_count + 1
+    return PreflightPlan(
+        STRATEGY_SUMMARIZED, prompt_tokens=prompt_tokens, requests=requests,
+        cost=_project_cost(config_manager, prompt_tokens, requests)
+    )
+
+
+def _project_cost(config_manager, prompt_tokens: int, requests: int) -> float:
+    """Price the projected tokens with the configured model."""
+    provider = config_manager.get_config('ai.provider', 'openai')
+    model = config_manager.get_config('ai.model', 'gemma3:4b')
+    return calculate_cost(provider, model, prompt_tokens, requests * COMPLETION_TOKENS, config_manager)
+
+
+def _project_latency(plan: PreflightPlan, config_manager, usage_tracker) -> Optional[float]:
+    """
+    Project the wall time of a plan from the mean latency of past requests.
+
+    Summaries are requested ai.map_reduce.max_workers at a time, so a
+    summarized plan takes one round per batch plus the final request.
+    """
+    if usage_tracker is None or not usage_tracker.is_tracking_enabled():
+        return None
+    totals = usage_tracker.get_usage_stats().get('totals', {})
+    timed = totals.get('timed_requests', 0)
+    if not timed:
+        return None
+    mean = totals.get('latency_seconds', 0.0) / timed
+    if plan.strategy == STRATEGY_SUMMARIZED:
+        rounds = math.ceil((plan.requests - 1) / get_map_reduce_workers(config_manager)) + 1
+    else:
+        rounds = plan.requests
+    return round(mean * rounds, 3)
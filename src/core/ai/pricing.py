@@ -0,0 +1,102 @@
+"""
+AI model prices for ggGit.
+
+Costs are computed from the prompt and completion tokens of each request
+with a per-model price table, in USD per million tokens. Models are
+matched by the longest known prefix of their name, so dated snapshots
+('gpt-4o-mini-2024-07-18') use the price of their family.
+
+Local and offline providers (Ollama, fake) are free. Prices of other
+models, or corrections to the table, are configured under ai.prices:
+
+    ai:
+      prices:
+        my-model: {input: 0.2, output: 0.6}
+"""
+
+from typing import Dict, Optional, Tuple
+
+
+# USD per million (input, output) tokens
+PRICES: Dict[str, Tuple[float, float]] = {
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'gpt-4': (30.00, 60.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4.1': (2.00, 8.00),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'o3-mini': (1.10, 4.40),
+    'o4-mini': (1.10, 4.40),
+    'claude-3-haiku': (0.25, 1.25),
+    'claude-3-5-haiku': (0.80, 4.00),
+    'claude-3-sonnet': (3.00, 15.00),
+    'claude-3-5-sonnet': (3.00, 15.00),
+    'claude-3-7-sonnet': (3.00, 15.00),
+    'claude-sonnet-4': (3.00, 15.00),
+    'claude-3-opus': (15.00, 75.00),
+    'claude-opus-4': (15.00, 75.00)
+}
+
+# Providers running models locally or not at all
+FREE_PROVIDERS = frozenset({'local', 'ollama', 'fake'})
+
+
+def get_price(model: str, config_manager=None) -> Optional[Tuple[float, float]]:
+    """
+    Get the price of a model.
+
+    Args:
+        model (str): Model name
+        config_manager (ConfigManager, optional): Configuration with
+                                                  ai.prices overrides
+
+    Returns:
+        Optional[Tuple[float, float]]: USD per million input and output
+                                       tokens, or None if unknown
+    """
+    table = dict(PRICES)
+    overrides = config_manager.get_config('ai.prices', {}) if config_manager is not None else {}
+    if isinstance(overrides, dict):
+        for name, price in overrides.items():
+            if isinstance(price, dict):
+                table[name] = (float(price.get('input', 0)), float(price.get('output', 0)))
+
+    if not isinstance(model, str):
+        return None
+    # Azure deployments and gateways often prefix the family name
+    name = model.rsplit('/', 1)[-1]
+    matches = [prefix for prefix in table if name == prefix or name.startswith(prefix + '-')
+               or name.startswith(prefix + ':')]
+    if not matches:
+        return None
+    return table[max(matches, key=len)]
+
+
+def calculate_cost(provider: str, model: str, prompt_tokens: int, completion_tokens: int,
+                   config_manager=None) -> float:
+    """
+    Calculate the cost of a request.
+
+    Args:
+        provider (str): Provider name, as in ai.provider
+        model (str): Model name
+        prompt_tokens (int): Prompt tokens
+        completion_tokens (int): Generated tokens
+        config_manager (ConfigManager, optional): Configuration with
+                                                  ai.prices overrides
+
+    Returns:
+        float: Cost in USD, 0.0 for free providers and unknown models
+
+    Example:
+        >>> calculate_cost('openai', 'gpt-4o-mini', 1000, 20)
+        0.000162
+    """
+    if provider in FREE_PROVIDERS:
+        return 0.0
+    price = get_price(model, config_manager)
+    if price is None:
+        return 0.0
+    return round((prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000, 8)
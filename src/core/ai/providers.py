@@ -0,0 +1,508 @@
+"""
+AI provider backends for ggGit.
+
+Each value of ai.provider selects a backend speaking one wire protocol:
+
+- openai: OpenAI-compatible chat completions (/v1/chat/completions),
+  which also covers llama.cpp server, vLLM, LM Studio and Ollama's
+  compatibility endpoint
+- azure: Azure OpenAI chat completions (deployment URL, api-key header)
+- anthropic: Anthropic Messages API (/v1/messages)
+- local / ollama: Ollama's native API, /api/generate or /api/chat
+  depending on ai.ollama.endpoint
+- fake: deterministic offline backend for tests and benchmarks
+
+Every backend supports streaming (tokens are read as they arrive and the
+request is closed once a complete commit subject line has been
+produced), batches of prompts sent concurrently, and reports the token
+counts of the provider when it returns them.
+
+Requests go through the pooled client of http_client, so requests is
+only imported when a network backend is actually used.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .http_client import get_http_client
+from .token_counter import count_tokens
+
+
+DEFAULT_BASE_URL = 'http://localhost:11434'
+DEFAULT_MODEL = 'gemma3:4b'
+DEFAULT_MAX_TOKENS = 200
+TEMPERATURE = 0.7
+
+ANTHROPIC_BASE_URL = 'https://api.anthropic.com'
+ANTHROPIC_VERSION = '2023-06-01'
+AZURE_API_VERSION = '2024-02-15-preview'
+
+
+class AiProviderError(Exception):
+    """Error reported by, or while reaching, an AI provider"""
+    pass
+
+
+def extract_subject_line(text: str) -> Optional[str]:
+    """
+    Get the first complete commit subject line from partial model output.
+
+    A line is complete once the newline after it has arrived. Empty
+    lines, code fence markers and introductions ending with ':' (such as
+    "Here is the commit message:") are skipped.
+
+    Args:
+        text (str): Model output received so far
+
+    Returns:
+        Optional[str]: Subject line, or None if none is complete yet
+
+    Example:
+        >>> extract_subject_line("```\\nfeat: add login\\n")
+        'feat: add login'
+    """
+    for line in text.split('\n')[:-1]:
+        line = line.strip()
+        if not line or line.startswith('```') or line.endswith(':'):
+            continue
+        return line
+    return None
+
+
+@dataclass
+class ProviderResponse:
+    """
+    Answer of an AI provider.
+
+    Attributes:
+        text (str): Generated text (the subject line if stopped early)
+        prompt_tokens (Optional[int]): Prompt tokens counted by the provider
+        completion_tokens (Optional[int]): Generated tokens counted by the
+                                           provider
+        complete (bool): False if the stream was closed before the end
+        latency (Optional[float]): Seconds from request to answer
+    """
+
+    text: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    complete: bool = True
+    latency: Optional[float] = None
+
+
+class AiProvider:
+    """
+    Base class of AI provider backends.
+
+    Subclasses describe their wire protocol with _build_request(),
+    _parse_response() and _iter_stream(); generate() and
+    generate_batch() are shared. Backends without HTTP override
+    _complete() instead.
+
+    Attributes:
+        config (ConfigManager): Configuration management instance
+        name (str): Provider name, as in ai.provider
+        base_url (str): Provider base URL
+        model (str): Model name
+
+    Example:
+        provider = create_provider(config_manager)
+        result = provider.generate(prompt, stream=True)
+        print(result.text, result.completion_tokens)
+    """
+
+    name = ''
+    default_base_url = DEFAULT_BASE_URL
+
+    def __init__(self, config_manager):
+        """
+        Initialize provider.
+
+        Args:
+            config_manager (ConfigManager): Configuration management instance
+        """
+        self.config = config_manager
+        self.base_url = (config_manager.get_config('ai.base_url') or self.default_base_url).rstrip('/')
+        self.model = config_manager.get_config('ai.model', DEFAULT_MODEL)
+
+    def get_api_key(self) -> Optional[str]:
+        """
+        Get the API key from the variable named by ai.api_key_env.
+
+        Returns:
+            Optional[str]: API key, or None if not set
+        """
+        api_key_env = self.config.get_config('ai.api_key_env')
+        return os.getenv(api_key_env) if isinstance(api_key_env, str) else None
+
+    def generate(self, prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS, stream: bool = True,
+                 show_tokens: bool = False,
+                 stop: Optional[Callable[[str], Optional[str]]] = extract_subject_line) -> ProviderResponse:
+        """
+        Generate text for a prompt.
+
+        Args:
+            prompt (str): Prompt to send to the model
+            max_tokens (int): Maximum tokens to generate
+            stream (bool): Read the answer as it is generated
+            show_tokens (bool): Echo streamed tokens to stderr
+            stop (Callable, optional): When streaming, called with the text
+                received so far after every newline; a non-None result
+                closes the request and becomes the answer
+
+        Returns:
+            ProviderResponse: Generated text and token counts
+
+        Raises:
+            AiProviderError: If the provider cannot be reached or fails
+        """
+        started = time.perf_counter()
+        result = self._complete(prompt, max_tokens, stream, show_tokens, stop)
+        result.latency = time.perf_counter() - started
+        return result
+
+    def _complete(self, prompt: str, max_tokens: int, stream: bool, show_tokens: bool,
+                  stop: Optional[Callable[[str], Optional[str]]]) -> ProviderResponse:
+        """Send one request over HTTP, see generate()."""
+        # Imported here so that commands not using AI never load requests
+        import requests
+
+        url, body, headers = self._build_request(prompt, max_tokens, stream)
+        try:
+            response = get_http_client(self.config).post(url, json=body, headers=headers, stream=stream)
+            response.raise_for_status()
+            if not stream:
+                return self._parse_response(response.json())
+            return self._read_stream(response, show_tokens, stop)
+        except requests.exceptions.RequestException as e:
+            raise AiProviderError(f"Error de conexión con el proveedor de IA ({self.name}): {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            raise AiProviderError(f"Respuesta no válida del proveedor de IA ({self.name}): {e}")
+
+    def generate_batch(self, prompts: List[str], max_workers: int = 4,
+                       max_tokens: int = DEFAULT_MAX_TOKENS, stream: bool = True) -> List[ProviderResponse]:
+        """
+        Generate text for several prompts concurrently.
+
+        Args:
+            prompts (List[str]): Prompts to send
+            max_workers (int): Maximum requests in flight
+            max_tokens (int): Maximum tokens to generate per prompt
+            stream (bool): Read each answer as it is generated
+
+        Returns:
+            List[ProviderResponse]: Answers, in the order of the prompts
+
+        Raises:
+            AiProviderError: If any request fails
+        """
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as executor:
+            futures = [executor.submit(self.generate, prompt, max_tokens, stream) for prompt in prompts]
+            return [future.result() for future in futures]
+
+    def _read_stream(self, response, show_tokens: bool,
+                     stop: Optional[Callable[[str], Optional[str]]]) -> ProviderResponse:
+        """Read a streamed answer, closing it early once stop() matches."""
+        text = ''
+        counts: Dict[str, int] = {}
+        shown = False
+        try:
+            for token, usage in self._iter_stream(response):
+                if usage:
+                    counts.update(usage)
+                if not token:
+                    continue
+                text += token
+                if show_tokens:
+                    sys.stderr.write(token)
+                    sys.stderr.flush()
+                    shown = True
+                if stop is not None and '\n' in token:
+                    result = stop(text)
+                    if result is not None:
+                        return ProviderResponse(result, counts.get('prompt_tokens'),
+                                                counts.get('completion_tokens'), complete=False)
+            return ProviderResponse(text.strip(), counts.get('prompt_tokens'), counts.get('completion_tokens'))
+        finally:
+            # Closing the connection early makes the server stop generating
+            response.close()
+            if shown and not text.endswith('\n'):
+                sys.stderr.write('\n')
+
+    def _build_request(self, prompt: str, max_tokens: int, stream: bool) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """Build the URL, JSON body and headers of a request."""
+        raise NotImplementedError
+
+    def _parse_response(self, data: Dict[str, Any]) -> ProviderResponse:
+        """Parse a complete (non-streamed) JSON answer."""
+        raise NotImplementedError
+
+    def _iter_stream(self, response) -> Iterator[Tuple[str, Optional[Dict[str, int]]]]:
+        """Yield (token, token counts or None) from a streamed answer."""
+        raise NotImplementedError
+
+
+def _iter_sse_data(response) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON 'data:' payloads of a server-sent events stream."""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.startswith('data:'):
+            continue
+        payload = line[len('data:'):].strip()
+        if payload == '[DONE]':
+            return
+        yield json.loads(payload)
+
+
+def _error_message(error: Any) -> str:
+    """Get the message of an error object found in an answer."""
+    if isinstance(error, dict):
+        return str(error.get('message') or error)
+    return str(error)
+
+
+class OpenAIProvider(AiProvider):
+    """OpenAI-compatible chat completions (OpenAI, llama.cpp, vLLM, LM Studio)."""
+
+    name = 'openai'
+    # Ask for token counts in the last streamed chunk
+    stream_usage = True
+
+    def _get_url(self) -> str:
+        """Get the chat completions URL."""
+        base = self.base_url if self.base_url.endswith('/v1') else f"{self.base_url}/v1"
+        return f"{base}/chat/completions"
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Get the authentication headers."""
+        api_key = self.get_api_key()
+        return {'Authorization': f"Bearer {api_key}"} if api_key else {}
+
+    def _build_request(self, prompt, max_tokens, stream):
+        body = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'temperature': TEMPERATURE,
+            'max_tokens': max_tokens,
+            'stream': stream
+        }
+        if stream and self.stream_usage:
+            body['stream_options'] = {'include_usage': True}
+        return self._get_url(), body, self._get_headers()
+
+    def _parse_response(self, data):
+        if data.get('error'):
+            raise AiProviderError(_error_message(data['error']))
+        usage = data.get('usage') or {}
+        return ProviderResponse(
+            text=(data['choices'][0]['message'].get('content') or '').strip(),
+            prompt_tokens=usage.get('prompt_tokens'),
+            completion_tokens=usage.get('completion_tokens')
+        )
+
+    def _iter_stream(self, response):
+        for chunk in _iter_sse_data(response):
+            if chunk.get('error'):
+                raise AiProviderError(_error_message(chunk['error']))
+            usage = chunk.get('usage')
+            token = ''
+            if chunk.get('choices'):
+                token = (chunk['choices'][0].get('delta') or {}).get('content') or ''
+            yield token, ({'prompt_tokens': usage.get('prompt_tokens'),
+                           'completion_tokens': usage.get('completion_tokens')} if usage else None)
+
+
+class AzureOpenAIProvider(OpenAIProvider):
+    """Azure OpenAI chat completions on a deployment."""
+
+    name = 'azure'
+    stream_usage = False
+
+    def _get_url(self) -> str:
+        """Get the deployment chat completions URL."""
+        base = self.base_url
+        endpoint = self.config.get_config('ai.endpoint')
+        if '/deployments/' not in base and isinstance(endpoint, str) and endpoint:
+            # ai.endpoint is the resource URL, the deployment is named like the model
+            base = f"{endpoint.rstrip('/')}/openai/deployments/{self.model}"
+        api_version = self.config.get_config('ai.api_version') or AZURE_API_VERSION
+        return f"{base}/chat/completions?api-version={api_version}"
+
+    def _get_headers(self) -> Dict[str, str]:
+        api_key = self.get_api_key()
+        return {'api-key': api_key} if api_key else {}
+
+
+class AnthropicProvider(AiProvider):
+    """Anthropic Messages API."""
+
+    name = 'anthropic'
+    default_base_url = ANTHROPIC_BASE_URL
+
+    def _build_request(self, prompt, max_tokens, stream):
+        base = self.base_url if self.base_url.endswith('/v1') else f"{self.base_url}/v1"
+        headers = {'anthropic-version': ANTHROPIC_VERSION}
+        api_key = self.get_api_key()
+        if api_key:
+            headers['x-api-key'] = api_key
+        body = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'temperature': TEMPERATURE,
+            'max_tokens': max_tokens,
+            'stream': stream
+        }
+        return f"{base}/messages", body, headers
+
+    def _parse_response(self, data):
+        if data.get('type') == 'error':
+            raise AiProviderError(_error_message(data.get('error')))
+        usage = data.get('usage') or {}
+        text = ''.join(block.get('text', '') for block in data.get('content', []) if block.get('type') == 'text')
+        return ProviderResponse(text.strip(), usage.get('input_tokens'), usage.get('output_tokens'))
+
+    def _iter_stream(self, response):
+        for event in _iter_sse_data(response):
+            kind = event.get('type')
+            if kind == 'error':
+                raise AiProviderError(_error_message(event.get('error')))
+            if kind == 'message_start':
+                usage = event.get('message', {}).get('usage') or {}
+                yield '', {'prompt_tokens': usage.get('input_tokens'),
+                           'completion_tokens': usage.get('output_tokens')}
+            elif kind == 'content_block_delta':
+                yield event.get('delta', {}).get('text', ''), None
+            elif kind == 'message_delta':
+                usage = event.get('usage') or {}
+                if 'output_tokens' in usage:
+                    yield '', {'completion_tokens': usage['output_tokens']}
+
+
+class OllamaProvider(AiProvider):
+    """Ollama native API, /api/generate or /api/chat (ai.ollama.endpoint)."""
+
+    name = 'local'
+
+    def _use_chat(self) -> bool:
+        """Check if /api/chat is used instead of /api/generate."""
+        return self.config.get_config('ai.ollama.endpoint', 'generate') == 'chat'
+
+    def _build_request(self, prompt, max_tokens, stream):
+        body = {
+            'model': self.model,
+            'stream': stream,
+            'options': {'temperature': TEMPERATURE, 'num_predict': max_tokens}
+        }
+        if self._use_chat():
+            body['messages'] = [{'role': 'user', 'content': prompt}]
+            return f"{self.base_url}/api/chat", body, {}
+        body['prompt'] = prompt
+        return f"{self.base_url}/api/generate", body, {}
+
+    @staticmethod
+    def _chunk_text(chunk: Dict[str, Any]) -> str:
+        """Get the text of a generate or chat answer."""
+        if 'message' in chunk:
+            return (chunk.get('message') or {}).get('content') or ''
+        return chunk.get('response') or ''
+
+    @staticmethod
+    def _chunk_counts(chunk: Dict[str, Any]) -> Dict[str, int]:
+        """Get the token counts of the final chunk."""
+        return {'prompt_tokens': chunk.get('prompt_eval_count'),
+                'completion_tokens': chunk.get('eval_count')}
+
+    def _parse_response(self, data):
+        if data.get('error'):
+            raise AiProviderError(_error_message(data['error']))
+        counts = self._chunk_counts(data)
+        return ProviderResponse(self._chunk_text(data).strip(), counts['prompt_tokens'], counts['completion_tokens'])
+
+    def _iter_stream(self, response):
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get('error'):
+                raise AiProviderError(_error_message(chunk['error']))
+            yield self._chunk_text(chunk), self._chunk_counts(chunk) if chunk.get('done') else None
+            if chunk.get('done'):
+                return
+
+
+class FakeProvider(AiProvider):
+    """
+    Deterministic offline provider.
+
+    Answers ai.fake.response when set, otherwise a subject line derived
+    from a hash of the prompt, after ai.fake.latency_ms milliseconds.
+    Token counts come from the local token counter.
+    """
+
+    name = 'fake'
+
+    def _complete(self, prompt, max_tokens, stream, show_tokens, stop):
+        latency = self.config.get_config('ai.fake.latency_ms', 0)
+        if isinstance(latency, (int, float)) and not isinstance(latency, bool) and latency > 0:
+            time.sleep(latency / 1000)
+
+        text = self.config.get_config('ai.fake.response')
+        if not isinstance(text, str):
+            digest = hashlib.sha256(prompt.encode('utf-8', 'surrogateescape')).hexdigest()
+            text = f"chore: update files {digest[:8]}"
+
+        if show_tokens:
+            sys.stderr.write(text + '\n')
+        result = text.strip()
+        complete = True
+        if stream and stop is not None:
+            first_line = stop(text + '\n')
+            if first_line is not None and first_line != result:
+                result, complete = first_line, False
+        return ProviderResponse(
+            text=result,
+            prompt_tokens=count_tokens(prompt, self.model),
+            completion_tokens=count_tokens(text, self.model),
+            complete=complete
+        )
+
+
+PROVIDERS = {
+    'openai': OpenAIProvider,
+    'azure': AzureOpenAIProvider,
+    'anthropic': AnthropicProvider,
+    'local': OllamaProvider,
+    'ollama': OllamaProvider,
+    'fake': FakeProvider
+}
+
+
+def create_provider(config_manager) -> AiProvider:
+    """
+    Create the backend selected by ai.provider.
+
+    Args:
+        config_manager (ConfigManager): Configuration management instance
+
+    Returns:
+        AiProvider: Provider backend (OpenAI-compatible when unset)
+
+    Raises:
+        AiProviderError: If ai.provider names an unknown provider
+    """
+    name = config_manager.get_config('ai.provider', 'openai') or 'openai'
+    provider_class = PROVIDERS.get(name) if isinstance(name, str) else None
+    if provider_class is None:
+        raise AiProviderError(f"Proveedor de IA no soportado: {name}")
+    return provider_class(config_manager)
@@ -0,0 +1,103 @@
+"""
+Local token counting for ggGit.
+
+Providers usually report the tokens of each request; when they do not
+(a stream closed after the subject line, a server without usage
+fields), the counts come from here.
+
+When the optional tiktoken package is installed, its BPE encodings are
+used: the vocabulary is loaded once per process and cached on disk by
+tiktoken. Without it, or when the vocabulary cannot be loaded (offline),
+the text is split like a GPT pre-tokenizer and each piece is costed by
+length: common words are single tokens in BPE vocabularies, longer
+identifiers and digit or symbol runs are split.
+"""
+
+import functools
+import math
+import re
+from typing import Any, Optional
+
+
+# Encoding used for models tiktoken does not know (local models, Claude)
+DEFAULT_ENCODING = 'cl100k_base'
+
+# Pieces as split by GPT-style BPE pre-tokenizers: contractions, words
+# with their leading space, digit runs, punctuation runs, whitespace
+_PIECES = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d+| ?[^\s\w]+|_+|\s+")
+
+# Words up to this length are usually one token; longer ones are split
+# in pieces of about _WORD_CHARS characters
+_WHOLE_WORD = 8
+_WORD_CHARS = 5
+_DIGIT_CHARS = 3
+_SYMBOL_CHARS = 2
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text (str): Text to count
+        model (str, optional): Model name, to pick the tiktoken encoding
+
+    Returns:
+        int: Number of tokens
+
+    Example:
+        >>> count_tokens("feat: add login")
+        4
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model if isinstance(model, str) else None)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return estimate_tokens(text)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the tokens of a text without a vocabulary.
+
+    Args:
+        text (str): Text to count
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        body = piece.lstrip(' ')
+        if not body:
+            # A run of spaces is usually merged into one token
+            tokens += 1
+        elif body.isspace():
+            tokens += body.count('\n') or 1
+        elif body[0].isdigit():
+            tokens += math.ceil(len(body) / _DIGIT_CHARS)
+        elif body[0].isalpha():
+            tokens += 1 if len(body) <= _WHOLE_WORD else math.ceil(len(body) / _WORD_CHARS)
+        else:
+            tokens += math.ceil(len(body) / _SYMBOL_CHARS)
+    return tokens
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: Optional[str]) -> Optional[Any]:
+    """Load the tiktoken encoding of a model once, None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception:
+        # The vocabulary could not be downloaded or read
+        return None
@@ -0,0 +1,293 @@
+"""
+AI usage reports for ggGit.
+
+Reports are computed in one pass over the usage ledger written by
+AiUsageTracker. Latencies and token counts are added to fixed
+log-scale histograms (buckets about 5% wide) instead of being kept and
+sorted, so memory does not grow with the ledger and percentiles are
+accurate to the bucket width.
+
+Requests are grouped by command, model and repository, and by day,
+ISO week or month for trends. Throughput is the completion tokens
+divided by the seconds the provider took to answer, over the requests
+that recorded both. Cache hits are counted per group but are not
+requests, since the model was not called.
+"""
+
+import math
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+
+# Width of a histogram bucket, as a ratio between its bounds
+BUCKET_RATIO = 1.05
+
+# Valid trend bucket names
+PERIODS = ('day', 'week', 'month')
+
+# Percentiles shown in reports
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """
+    Log-scale histogram of non-negative values.
+
+    Attributes:
+        count (int): Number of values added
+        total (float): Sum of the values added
+        buckets (Dict[int, int]): Counts by bucket index; index 0 holds
+                                  zeros and values below 1e-3
+
+    Example:
+        histogram = Histogram()
+        for latency in (0.8, 1.1, 4.2):
+            histogram.add(latency)
+        print(histogram.percentile(95))
+    """
+
+    _LOG_RATIO = math.log(BUCKET_RATIO)
+    _MIN_VALUE = 1e-3
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value (float): Value to add, negative values count as zero
+        """
+        value = max(0.0, float(value))
+        index = 0
+        if value >= self._MIN_VALUE:
+            index = 1 + int(math.log(value / self._MIN_VALUE) / self._LOG_RATIO)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the values, None when empty."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Get a percentile.
+
+        Args:
+            q (float): Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Midpoint of the bucket holding the
+                             percentile, None when empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return self._bucket_value(index)
+        return self._bucket_value(max(self.buckets))
+
+    def _bucket_value(self, index: int) -> float:
+        """Get the geometric midpoint of a bucket."""
+        if index == 0:
+            return 0.0
+        return self._MIN_VALUE * BUCKET_RATIO ** (index - 0.5)
+
+
+class UsageGroup:
+    """
+    Usage counters of one command, model, repository or period.
+
+    Attributes:
+        requests (int): Requests sent to the provider
+        cache_hits (int): Messages served from the cache
+        cache_misses (int): Requests made after a cache miss
+        tokens (int): Tokens used
+        cost (float): Cost in USD
+        latency (Histogram): Seconds per request
+        prompt_tokens (Histogram): Prompt tokens per request
+        completion_tokens (Histogram): Completion tokens per request
+        timed_completion_tokens (int): Completion tokens of the requests
+                                       that recorded a latency
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.requests = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.tokens = 0
+        self.cost = 0.0
+        self.latency = Histogram()
+        self.prompt_tokens = Histogram()
+        self.completion_tokens = Histogram()
+        self.timed_completion_tokens = 0
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """
+        Add a ledger entry.
+
+        Args:
+            entry (Dict[str, Any]): Entry written by AiUsageTracker
+        """
+        if entry.get('cache') == 'hit':
+            self.cache_hits += 1
+            return
+        if entry.get('cache') == 'miss':
+            self.cache_misses += 1
+
+        self.requests += 1
+        self.tokens += entry.get('tokens', 0) or 0
+        self.cost += entry.get('cost', 0.0) or 0.0
+        if entry.get('prompt_tokens') is not None:
+            self.prompt_tokens.add(entry['prompt_tokens'])
+        if entry.get('completion_tokens') is not None:
+            self.completion_tokens.add(entry['completion_tokens'])
+        if entry.get('latency') is not None:
+            self.latency.add(entry['latency'])
+            self.timed_completion_tokens += entry.get('completion_tokens') or 0
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        """Share of cache lookups that hit, None without lookups."""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Completion tokens per second of provider time, None if untimed."""
+        if not self.latency.total:
+            return None
+        return self.timed_completion_tokens / self.latency.total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the counters as plain values.
+
+        Returns:
+            Dict[str, Any]: requests, cache_hits, cache_misses,
+                            cache_hit_rate, tokens, cost, tokens_per_second,
+                            and latency, prompt_tokens and
+                            completion_tokens with mean and p50/p95/p99
+        """
+        result = {
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_rate': self.cache_hit_rate,
+            'tokens': self.tokens,
+            'cost': self.cost,
+            'tokens_per_second': self.tokens_per_second
+        }
+        for name in ('latency', 'prompt_tokens', 'completion_tokens'):
+            histogram = getattr(self, name)
+            stats = {'count': histogram.count, 'mean': histogram.mean}
+            for q in PERCENTILES:
+                stats[f'p{q}'] = histogram.percentile(q)
+            result[name] = stats
+        return result
+
+
+def period_key(entry: Dict[str, Any], period: str = 'day') -> str:
+    """
+    Get the trend bucket of a ledger entry.
+
+    Args:
+        entry (Dict[str, Any]): Ledger entry
+        period (str): 'day', 'week' (ISO) or 'month'
+
+    Returns:
+        str: '2024-12-19', '2024-W51' or '2024-12'
+    """
+    day = _entry_date(entry)
+    if period == 'week':
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == 'month':
+        return day.strftime('%Y-%m')
+    return day.isoformat()
+
+
+def build_usage_report(entries: Iterable[Dict[str, Any]], period: str = 'day',
+                       since: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Build a usage report from ledger entries.
+
+    Args:
+        entries (Iterable[Dict[str, Any]]): Ledger entries, in any order
+        period (str): Trend bucket, one of PERIODS
+        since (date, optional): Ignore entries before this day
+
+    Returns:
+        Dict[str, Any]: 'totals' and 'by_command', 'by_model',
+                        'by_repo' and 'trend' mappings of
+                        UsageGroup.to_dict() values, plus 'period'
+
+    Raises:
+        ValueError: If period is not one of PERIODS
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Período no válido: {period}")
+
+    totals = UsageGroup()
+    groups: Dict[str, Dict[str, UsageGroup]] = {
+        'by_command': {}, 'by_model': {}, 'by_repo': {}, 'trend': {}
+    }
+
+    for entry in entries:
+        if since is not None and _entry_date(entry) < since:
+            continue
+        totals.add(entry)
+        keys = {
+            'by_command': entry.get('command') or 'unknown',
+            'by_model': entry.get('model') or 'unknown',
+            'by_repo': entry.get('repo') or 'unknown',
+            'trend': period_key(entry, period)
+        }
+        for name, key in keys.items():
+            group = groups[name].get(key)
+            if group is None:
+                group = groups[name][key] = UsageGroup()
+            group.add(entry)
+
+    report = {'period': period, 'totals': totals.to_dict()}
+    for name, by_key in groups.items():
+        report[name] = {key: by_key[key].to_dict() for key in sorted(by_key)}
+    return report
+
+
+def parse_since(days: Optional[int]) -> Optional[date]:
+    """
+    Get the first day of a report covering the last days.
+
+    Args:
+        days (Optional[int]): Number of days including today, None or 0
+                              for the whole ledger
+
+    Returns:
+        Optional[date]: First day to include, None for no limit
+    """
+    if not days:
+        return None
+    return date.today() - timedelta(days=days - 1)
+
+
+def _entry_date(entry: Dict[str, Any]) -> date:
+    """Get the day of a ledger entry from its timestamp or date."""
+    if isinstance(entry.get('time'), (int, float)):
+        return date.fromtimestamp(entry['time'])
+    try:
+        return date.fromisoformat(entry.get('date', ''))
+    except (TypeError, ValueError):
+        return date.fromtimestamp(time.time())
+
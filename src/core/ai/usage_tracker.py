@@ -3,27 +3,69 @@ AI usage tracking for ggGit.
 
 This module provides functionality to track AI usage, costs, and consumption
 for monitoring and limiting AI service usage.
+
+Every request is appended as one JSON line to a ledger next to the usage
+file (.gggit/ai-usage.jsonl for the default .gggit/ai-usage.yaml), under
+an exclusive file lock so concurrent commits do not lose updates. The
+usage file itself is a rollup of the ledger up to a recorded byte
+offset; reading the statistics folds in only the lines written since,
+and rewrites the rollup once that tail grows past COMPACT_BYTES.
 """
 
+import json
 import os
-import yaml
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from ..git_context import discover_repo_context
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Ledger bytes past the rollup offset that trigger a compaction
+COMPACT_BYTES = 16 * 1024
+
+
+def _lock_file(f) -> None:
+    """Take an exclusive lock on an open file, waiting for other holders."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f) -> None:
+    """Release a lock taken by _lock_file()."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
 
 class AiUsageTracker:
     """
     Tracks AI usage, costs, and consumption for monitoring and limiting.
     
-    This class manages the tracking of AI usage through a YAML file,
-    providing methods to increment usage, get statistics, and reset counters.
+    This class manages the tracking of AI usage through an append-only
+    ledger and a YAML rollup of it, providing methods to increment usage, get statistics, and reset counters.
     It integrates with the configuration system to determine tracking settings
     and file locations.
     
     Attributes:
         config (ConfigManager): Configuration management instance
-        usage_file (str): Path to the usage tracking file
+        usage_file (str): Path to the usage rollup file
+        ledger_file (str): Path to the append-only usage ledger
+        lock_file (str): Path to the lock file guarding both
         
     Example:
         tracker = AiUsageTracker(config_manager)
@@ -50,6 +92,10 @@ class AiUsageTracker:
         """
         self.config = config_manager
         self.usage_file = self.config.get_config('ai.usage_file', '.gggit/ai-usage.yaml')
+        self.ledger_file = os.path.splitext(self.usage_file)[0] + '.jsonl'
+        self.lock_file = self.usage_file + '.lock'
+        self._repo = None
+        self._repo_resolved = False
     
     def is_tracking_enabled(self) -> bool:
         """
@@ -64,74 +110,311 @@ class AiUsageTracker:
         """
         Get current usage statistics.
         
+        The rollup file is read and only the ledger entries appended
+        since its last compaction are folded in. Once that tail grows
+        past COMPACT_BYTES it is folded into the rollup on disk.
+        
         Returns:
             Dict[str, Any]: Usage statistics including totals, daily usage, and limits
         """
         if not self.is_tracking_enabled():
             return self._create_default_usage_data()
         
-        return self._load_usage_file()
+        usage_data = self._load_usage_file()
+        if not os.path.exists(self.ledger_file):
+            return usage_data
+        
+        offset = self._ledger_offset(usage_data)
+        entries, end = self._read_ledger(offset)
+        if end - offset >= COMPACT_BYTES:
+            return self.compact()
+        
+        for entry in entries:
+            self._apply_entry(usage_data, entry)
+        return usage_data
     
-    def increment_usage(self, command: str, tokens: int, cost: float) -> None:
+    def increment_usage(self, command: str, tokens: int, cost: float,
+                        prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None,
+                        latency: Optional[float] = None, model: Optional[str] = None,
+                        cache_hit: Optional[bool] = None) -> None:
         """
         Increment usage counters for a command.
         
+        The request is appended as one line to the usage ledger, with the
+        time and the repository it was made from; the rollup file is not
+        rewritten. A cache hit is recorded for the reports but does not
+        count as a request.
+        
         Args:
             command (str): Command that used AI (e.g., "ggfeat", "ggfix")
             tokens (int): Number of tokens used
             cost (float): Cost in USD
+            prompt_tokens (int, optional): Prompt part of the tokens
+            completion_tokens (int, optional): Generated part of the tokens
+            latency (float, optional): Seconds the provider took to answer
+            model (str, optional): Model that answered
+            cache_hit (bool, optional): True if the message came from the
+                                        cache, False if the cache missed
         """
         if not self.is_tracking_enabled():
             return
         
-        # Load current usage data
-        usage_data = self._load_usage_file()
+        entry = {
+            'time': round(time.time(), 3),
+            'date': date.today().isoformat(),
+            'command': command,
+            'tokens': tokens,
+            'cost': cost
+        }
+        if prompt_tokens is not None:
+            entry['prompt_tokens'] = prompt_tokens
+        if completion_tokens is not None:
+            entry['completion_tokens'] = completion_tokens
+        if latency is not None:
+            entry['latency'] = latency
+        if model:
+            entry['model'] = model
+        if cache_hit is not None:
+            entry['cache'] = 'hit' if cache_hit else 'miss'
+        repo = self._get_repo()
+        if repo:
+            entry['repo'] = repo
         
-        # Get current date
-        today = date.today().isoformat()
+        self._append_entry(entry)
+    
+    def iter_ledger(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every entry of the usage ledger.
+        
+        Entries are read line by line, so the ledger is never held in
+        memory as a whole.
+        
+        Yields:
+            Dict[str, Any]: Entries written by increment_usage(), oldest first
+        """
+        try:
+            f = open(self.ledger_file, 'r', encoding='utf-8')
+        except IOError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+    
+    def reset_usage(self) -> None:
+        """
+        Reset usage tracking counters.
+        
+        This method resets all usage counters and starts a new tracking period.
+        """
+        if not self.is_tracking_enabled():
+            return
+        
+        with self._locked():
+            # Create new usage data with current date
+            usage_data = self._create_default_usage_data()
+            usage_data['ledger'] = {'offset': 0}
+            
+            # Empty the ledger and save reset data
+            try:
+                if os.path.exists(self.ledger_file):
+                    with open(self.ledger_file, 'w', encoding='utf-8'):
+                        pass
+            except IOError:
+                usage_data['ledger'] = {'offset': self._ledger_size()}
+            self._save_usage_file(usage_data)
+    
+    def compact(self) -> Dict[str, Any]:
+        """
+        Fold the pending ledger entries into the rollup file.
+        
+        Returns:
+            Dict[str, Any]: Usage statistics after compaction
+        """
+        if not os.path.exists(self.ledger_file):
+            # Nothing to fold in; reading must not create the lock file
+            return self._load_usage_file()
+        
+        with self._locked():
+            usage_data = self._load_usage_file()
+            offset = self._ledger_offset(usage_data)
+            entries, end = self._read_ledger(offset)
+            for entry in entries:
+                self._apply_entry(usage_data, entry)
+            if end != usage_data.get('ledger', {}).get('offset'):
+                usage_data['ledger'] = {'offset': end}
+                self._save_usage_file(usage_data)
+        return usage_data
+    
+    def _apply_entry(self, usage_data: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """
+        Add one ledger entry to the usage counters.
+        
+        Args:
+            usage_data (Dict[str, Any]): Usage data to update in place
+            entry (Dict[str, Any]): Entry written by increment_usage()
+        """
+        tokens = entry.get('tokens', 0)
+        cost = entry.get('cost', 0.0)
         
         # Initialize daily usage if not exists
-        if today not in usage_data['daily_usage']:
-            usage_data['daily_usage'][today] = {
-                'requests': 0,
-                'tokens': 0,
-                'cost': 0.0,
-                'commands': {}
-            }
+        daily = usage_data['daily_usage'].setdefault(entry.get('date', date.today().isoformat()), {
+            'requests': 0,
+            'tokens': 0,
+            'cost': 0.0,
+            'commands': {}
+        })
+        
+        # Cache lookups; a hit did not reach the model
+        if 'cache' in entry:
+            name = 'cache_hits' if entry['cache'] == 'hit' else 'cache_misses'
+            for counters in (daily, usage_data['totals']):
+                counters[name] = counters.get(name, 0) + 1
+            if entry['cache'] == 'hit':
+                return
         
         # Increment daily counters
-        daily = usage_data['daily_usage'][today]
         daily['requests'] += 1
         daily['tokens'] += tokens
         daily['cost'] += cost
         
         # Increment command counter
-        if command not in daily['commands']:
-            daily['commands'][command] = 0
-        daily['commands'][command] += 1
+        command = entry.get('command', 'unknown')
+        daily['commands'][command] = daily['commands'].get(command, 0) + 1
         
         # Update totals
         usage_data['totals']['requests'] += 1
         usage_data['totals']['tokens'] += tokens
         usage_data['totals']['cost'] += cost
         
-        # Save updated data
-        self._save_usage_file(usage_data)
+        # Token split, latency and model, when known
+        for counters in (daily, usage_data['totals']):
+            if 'prompt_tokens' in entry:
+                counters['prompt_tokens'] = counters.get('prompt_tokens', 0) + entry['prompt_tokens']
+            if 'completion_tokens' in entry:
+                counters['completion_tokens'] = counters.get('completion_tokens', 0) + entry['completion_tokens']
+            if 'latency' in entry:
+                counters['latency_seconds'] = round(counters.get('latency_seconds', 0.0) + entry['latency'], 6)
+                counters['timed_requests'] = counters.get('timed_requests', 0) + 1
+        if entry.get('model'):
+            models = daily.setdefault('models', {})
+            models[entry['model']] = models.get(entry['model'], 0) + 1
     
-    def reset_usage(self) -> None:
+    def _append_entry(self, entry: Dict[str, Any]) -> None:
         """
-        Reset usage tracking counters.
+        Append an entry to the usage ledger.
         
-        This method resets all usage counters and starts a new tracking period.
+        Args:
+            entry (Dict[str, Any]): Entry to append
         """
-        if not self.is_tracking_enabled():
-            return
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        try:
+            self._ensure_directory()
+            with self._locked():
+                with open(self.ledger_file, 'a', encoding='utf-8') as f:
+                    f.write(line)
+        except IOError as e:
+            # Log error but don't raise to avoid breaking the command
+            print(f"Warning: Could not save usage data: {e}")
+    
+    def _read_ledger(self, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read the ledger entries appended after an offset.
+        
+        Args:
+            offset (int): Byte offset already folded into the rollup
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: Entries and the byte offset
+                                              after the last complete line
+        """
+        try:
+            with open(self.ledger_file, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except IOError:
+            return [], offset
+        
+        # A line still being written has no newline yet
+        complete = data[:data.rfind(b'\n') + 1]
+        entries = []
+        for line in complete.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+        return entries, offset + len(complete)
+    
+    def _ledger_offset(self, usage_data: Dict[str, Any]) -> int:
+        """
+        Get the ledger offset recorded in the rollup.
+        
+        Args:
+            usage_data (Dict[str, Any]): Rollup data
+            
+        Returns:
+            int: Recorded offset, or 0 if the ledger is shorter (it was
+                 removed or replaced)
+        """
+        offset = (usage_data.get('ledger') or {}).get('offset', 0)
+        if not isinstance(offset, int) or offset > self._ledger_size():
+            return 0
+        return offset
+    
+    def _ledger_size(self) -> int:
+        """Get the size of the ledger in bytes."""
+        try:
+            return os.path.getsize(self.ledger_file)
+        except OSError:
+            return 0
+    
+    def _get_repo(self) -> Optional[str]:
+        """Get the work tree of the current repository, resolved once."""
+        if not self._repo_resolved:
+            try:
+                context = discover_repo_context()
+            except OSError:
+                context = None
+            self._repo = context.work_tree if context else None
+            self._repo_resolved = True
+        return self._repo
+    
+    def _ensure_directory(self) -> None:
+        """Create the directory of the usage files."""
+        directory = os.path.dirname(self.usage_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    @contextmanager
+    def _locked(self):
+        """
+        Hold an exclusive lock on the usage files.
         
-        # Create new usage data with current date
-        usage_data = self._create_default_usage_data()
+        Other ggGit processes appending to the ledger or compacting it
+        wait until the lock is released.
+        """
+        try:
+            self._ensure_directory()
+            lock = open(self.lock_file, 'a+b')
+        except IOError:
+            # Read-only location: proceed without a lock
+            yield
+            return
         
-        # Save reset data
-        self._save_usage_file(usage_data)
+        try:
+            _lock_file(lock)
+            yield
+        finally:
+            _unlock_file(lock)
+            lock.close()
     
     def _load_usage_file(self) -> Dict[str, Any]:
         """
@@ -143,26 +426,43 @@ class AiUsageTracker:
         if not os.path.exists(self.usage_file):
             return self._create_default_usage_data()
         
+        import yaml
+        
         try:
             with open(self.usage_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or self._create_default_usage_data()
+                data = yaml.safe_load(f)
         except (yaml.YAMLError, IOError):
             # If file is corrupted, return default data
             return self._create_default_usage_data()
+        
+        if not isinstance(data, dict):
+            return self._create_default_usage_data()
+        default = self._create_default_usage_data()
+        for key in ('daily_usage', 'totals', 'limits', 'period'):
+            if not isinstance(data.get(key), dict):
+                data[key] = default[key]
+        return data
     
     def _save_usage_file(self, data: Dict[str, Any]) -> None:
         """
-        Save usage data to YAML file.
+        Save usage data to YAML file atomically.
         
         Args:
             data (Dict[str, Any]): Usage data to save
         """
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.usage_file), exist_ok=True)
+        import yaml
         
         try:
-            with open(self.usage_file, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+            self._ensure_directory()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.usage_file) or '.',
+                                            prefix='.ai-usage.')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+                os.replace(tmp_path, self.usage_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except IOError as e:
             # Log error but don't raise to avoid breaking the command
             print(f"Warning: Could not save usage data: {e}")
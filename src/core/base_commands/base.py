@@ -20,12 +20,14 @@ Usage:
 from abc import ABC, abstractmethod
 from typing import List, Optional, Any, Dict
 import os
+import time
 import click
 from ..utils.colors import ColorManager
 from ..config import ConfigManager
 from ..git import GitInterface
 from ..validation import ArgumentValidator
 from ..utils.logging import LoggingManager
+from ..utils import events, profiling
 
 
 class BaseCommand(ABC):
@@ -58,23 +60,55 @@ class BaseCommand(ABC):
                 return 0
     """
     
+    # Shared components and the factory creating each one; the lambdas
+    # read the module-level class at creation time so tests can patch them
+    _COMPONENTS = {
+        'config': lambda: ConfigManager(),
+        'git': lambda: GitInterface(),
+        'validator': lambda: ArgumentValidator(),
+        'logger': lambda: LoggingManager(),
+    }
+    
     def __init__(self):
         """
-        Initialize base command with all required components.
+        Initialize base command.
         
-        This method initializes the core components that all commands need:
+        The core components that all commands need are created lazily,
+        the first time each attribute is read:
         - ConfigManager for configuration access
         - GitInterface for git operations
         - ArgumentValidator for input validation
         - LoggingManager for logging functionality
         
+        A command that never touches, say, the configuration does not pay
+        for loading it. Assigning an attribute (e.g. in tests) replaces the
+        component before it is ever created.
+        
         Subclasses should call super().__init__() in their constructors
         and can add command-specific initialization after this call.
         """
-        self.config = ConfigManager()
-        self.git = GitInterface()
-        self.validator = ArgumentValidator()
-        self.logger = LoggingManager()
+    
+    def __getattr__(self, name: str) -> Any:
+        """
+        Create a core component on first access.
+        
+        Args:
+            name: Attribute name
+            
+        Returns:
+            The component instance, cached on the command
+            
+        Raises:
+            AttributeError: If name is not a core component
+        """
+        factory = type(self)._COMPONENTS.get(name)
+        if factory is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        component = factory()
+        self.__dict__[name] = component
+        return component
     
     @abstractmethod
     def execute(self, *args, **kwargs) -> int:
@@ -134,7 +168,7 @@ class BaseCommand(ABC):
         """
         # Log command execution start
         command_name = self.__class__.__name__
-        self.logger.log_command_execution(command_name, [])
+        self.logger.log_command_execution(command_name, events.get_invocation()[1])
     
     def run(self, *args, **kwargs) -> int:
         """
@@ -150,9 +184,16 @@ class BaseCommand(ABC):
         Returns:
             int: Exit code from execute() method, or 1 if an error occurs
         """
+        start = time.perf_counter()
+        started_at = time.time()
+        start_times = os.times()
+        profiling.record('startup', profiling.PROCESS_START, start - profiling.PROCESS_START)
+        exit_code = 1
         try:
             self.setup_logging()
-            return self.execute(*args, **kwargs)
+            with profiling.span('command', command=self.__class__.__name__):
+                exit_code = self.execute(*args, **kwargs)
+            return exit_code
         except Exception as e:
             # Log the error
             self.logger.log_error(e, f"{self.__class__.__name__}.execute")
@@ -160,6 +201,85 @@ class BaseCommand(ABC):
             # Display user-friendly error message
             click.echo(ColorManager.error(f"Error: {str(e)}"))
             return 1
+        finally:
+            # Stop long-lived git helpers started during the command
+            if 'git' in self.__dict__:
+                self.git.close()
+            self._configure_logging()
+            duration = time.perf_counter() - start
+            self._log_performance(duration, exit_code)
+            self._log_event(start, started_at, start_times, duration, exit_code)
+    
+    def _configure_logging(self) -> None:
+        """
+        Apply the log rotation settings and start the daily log cleanup.
+        
+        The settings are read from the configuration only if the command
+        loaded it; commands that never read it (e.g. ggs) do not load it
+        just for logging and keep the default limits.
+        """
+        try:
+            self.logger.configure(self.__dict__.get('config'))
+        except Exception:
+            # Logging maintenance must never change the outcome of a command
+            pass
+    
+    def _log_performance(self, duration: float, exit_code: Any) -> None:
+        """
+        Write the timing record of this invocation, if enabled (see
+        core.utils.profiling.is_performance_log_enabled).
+        
+        Args:
+            duration (float): Seconds spent in run()
+            exit_code (Any): Value returned by execute()
+        """
+        try:
+            if not profiling.is_performance_log_enabled(self.__dict__.get('config')):
+                return
+            phases = profiling.summarize()
+            self.logger.log_performance(self.__class__.__name__, duration, {
+                'exit_code': exit_code if isinstance(exit_code, int) else None,
+                'cwd': os.getcwd(),
+                'startup_ms': phases.get('startup', {}).get('total_ms'),
+                'phases': phases
+            })
+        except Exception:
+            # Timing must never change the outcome of a command
+            pass
+    
+    def _log_event(self, start: float, started_at: float, start_times: os.times_result,
+                   duration: float, exit_code: Any) -> None:
+        """
+        Write the structured event of this invocation (see core.utils.events).
+        
+        Args:
+            start (float): perf_counter() at the start of run()
+            started_at (float): time.time() at the start of run()
+            start_times (os.times_result): os.times() at the start of run()
+            duration (float): Seconds spent in run()
+            exit_code (Any): Value returned by execute()
+        """
+        try:
+            if not events.is_event_log_enabled(self.__dict__.get('config')):
+                return
+            from ..git_context import discover_repo_context
+            
+            end_times = os.times()
+            context = discover_repo_context()
+            command, args = events.get_invocation()
+            event = events.build_command_event(
+                command, args, context.work_tree if context else None, exit_code,
+                started=started_at,
+                wall=duration,
+                cpu=(end_times.user + end_times.system) - (start_times.user + start_times.system),
+                child_cpu=((end_times.children_user + end_times.children_system)
+                           - (start_times.children_user + start_times.children_system)),
+                spans=[item for item in profiling.get_spans() if item.start >= start]
+            )
+            self.logger.log_event(event)
+        except Exception:
+            # Telemetry must never change the outcome of a command
+            pass
     
     def _is_ai_configured(self) -> bool:
         """
@@ -198,8 +318,9 @@ class BaseCommand(ABC):
         Generate commit message using AI.
         
         This method integrates with the AI system to generate commit messages
-        based on the current changes, using complexity analysis to decide
-        between AI generation and educational fallback.
+        based on the current changes, using complexity analysis and the
+        pre-flight cost checks to decide between AI generation and
+        educational fallback.
         
         Args:
             scope (str, optional): Scope for the commit message
@@ -210,28 +331,40 @@ class BaseCommand(ABC):
         """
         try:
             from ..ai import ComplexityAnalyzer, AiMessageGenerator, AiUsageTracker
+            from ..ai.prefetch import MessagePrefetcher, is_prefetch_enabled
             
             # Create AI components
-            analyzer = ComplexityAnalyzer(self.git, self.config)
             usage_tracker = AiUsageTracker(self.config)
+            analyzer = ComplexityAnalyzer(self.git, self.config, usage_tracker)
             generator = AiMessageGenerator(self.config, usage_tracker)
             
-            # Analyze complexity
-            should_use_ai, analysis = analyzer.should_use_ai()
+            # Get commit type from the command
+            commit_type = self._get_commit_prefix() if hasattr(self, '_get_commit_prefix') else None
+            
+            # Use the message prefetched after staging, if the index is unchanged
+            if is_prefetch_enabled(self.config):
+                message = MessagePrefetcher(self.git, self.config).claim(generator, commit_type)
+                if message is not None:
+                    return self._execute_manual_commit(message, scope, amend)
+            
+            # One status snapshot for the analysis and the commit
+            status = self.git.get_repository_status()
+            
+            # Analyze complexity and check budget before reading the diff
+            should_use_ai, analysis = analyzer.should_use_ai(status)
             
             if should_use_ai:
                 # Generate with AI
                 files = analysis['files']
                 diff_content = self.git.get_diff_content(files, staged=analysis['has_staged'])
                 
-                # Get commit type from the command
-                commit_type = self._get_commit_prefix() if hasattr(self, '_get_commit_prefix') else None
-                
-                # Generate message with context
-                message = generator.generate_message(files, diff_content, commit_type)
+                # Generate message with context, as planned by the pre-flight checks
+                plan = analysis.get('plan')
+                message = generator.generate_message(files, diff_content, commit_type,
+                                                     strategy=plan.strategy if plan else None)
                 
                 # Execute commit with generated message
-                return self._execute_manual_commit(message, scope, amend)
+                return self._execute_manual_commit(message, scope, amend, status)
             else:
                 # Show fallback
                 fallback = analyzer.get_fallback_message(analysis)
@@ -242,7 +375,23 @@ class BaseCommand(ABC):
             click.echo(ColorManager.error(f"Error generando mensaje con IA: {e}"))
             return 1
     
-    def _execute_manual_commit(self, message, scope=None, amend=False):
+    def _prefetch_ai_message(self) -> None:
+        """
+        Start generating a commit message for the staged changes.
+        
+        Called after staging when ai.prefetch.enabled is true; the worker
+        runs detached, so this returns at once. Failures are ignored, as
+        the commit command generates the message itself when needed.
+        """
+        try:
+            from ..ai.prefetch import MessagePrefetcher, is_prefetch_enabled
+            
+            if is_prefetch_enabled(self.config) and self._is_ai_configured():
+                MessagePrefetcher(self.git, self.config).start()
+        except Exception:
+            pass
+    
+    def _execute_manual_commit(self, message, scope=None, amend=False, status=None):
         """
         Execute commit with manual message.
         
@@ -253,6 +402,8 @@ class BaseCommand(ABC):
             message (str): Commit message
             scope (str, optional): Scope for the commit message
             amend (bool): Whether to amend the last commit
+            status (RepositoryStatus, optional): Status snapshot already
+                taken by the caller, so the commit does not take another
             
         Returns:
             int: Exit code (0 for success, 1 for failure)
@@ -271,8 +422,11 @@ class BaseCommand(ABC):
             from .commit import CommitCommand
             commit_cmd = CommitCommand(self._get_commit_prefix())
             
-            # Execute commit
-            result = commit_cmd.execute(message, scope, amend)
+            # Execute commit, reusing the caller's status snapshot if any
+            if status is None:
+                result = commit_cmd.execute(message, scope, amend)
+            else:
+                result = commit_cmd.execute(message, scope, amend, status=status)
             
             if result == 0:
                 click.echo(ColorManager.success("Commit realizado exitosamente"))
@@ -8,6 +8,7 @@ like ggfeat, ggfix, ggbreak, etc.
 from typing import Optional
 from .base import BaseCommand
 from ..git import GitInterface
+from ..git_status import RepositoryStatus
 
 
 class CommitCommand(BaseCommand):
@@ -18,7 +19,8 @@ class CommitCommand(BaseCommand):
         super().__init__()
         self.commit_type = commit_type
     
-    def execute(self, message: str, scope: Optional[str] = None, amend: bool = False) -> int:
+    def execute(self, message: str, scope: Optional[str] = None, amend: bool = False,
+                status: Optional[RepositoryStatus] = None) -> int:
         """
         Execute commit command with validation and Git operations.
         
@@ -33,6 +35,8 @@ class CommitCommand(BaseCommand):
             message (str): Commit message (validated for length and format)
             scope (Optional[str]): Optional scope for Conventional Commits format
             amend (bool): If True, amend the last commit instead of creating new one
+            status (Optional[RepositoryStatus]): Status snapshot already
+                taken by the caller, taken here when omitted
             
         Returns:
             int: Exit code (0 for success, 1 for failure)
@@ -54,8 +58,11 @@ class CommitCommand(BaseCommand):
             
             # Check if there are changes to commit (only for regular commits, not amend)
             if not amend:
-                staged_files = self.git.get_staged_files()
-                unstaged_files = self.git.get_unstaged_files()
+                # One status snapshot answers both questions
+                if status is None:
+                    status = self.git.get_repository_status()
+                staged_files = status.staged_files
+                unstaged_files = status.working_tree_files
                 
                 if not staged_files and not unstaged_files:
                     self.logger.log_error(Exception("No hay cambios para hacer commit"), "execute")
@@ -4,7 +4,8 @@ Configuration command base class for ggGit.
 This module provides functionality for configuration management commands.
 """
 
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from .base import BaseCommand
 
 
@@ -15,15 +16,20 @@ class ConfigCommand(BaseCommand):
         """Initialize configuration command."""
         super().__init__()
     
-    def execute(self, action: str, key: Optional[str] = None, value: Optional[str] = None, level: str = 'user') -> int:
+    def execute(self, action: str, key: Optional[str] = None, value: Optional[str] = None, level: str = 'user',
+                pairs: Optional[List[Tuple[str, str]]] = None, from_file: Optional[str] = None,
+                days: int = 7) -> int:
         """
         Execute configuration command.
         
         Args:
-            action (str): Action to perform ('get', 'set', 'list', 'reset')
+            action (str): Action to perform ('get', 'set', 'list', 'reset', 'cleanup-logs', 'events')
             key (Optional[str]): Configuration key for get/set/reset actions
             value (Optional[str]): Configuration value for set action
             level (str): Configuration level ('repo', 'module', 'user', 'default')
+            pairs (Optional[List[Tuple[str, str]]]): Several KEY VALUE pairs for set action
+            from_file (Optional[str]): YAML file with values for set action
+            days (int): Days of command events to summarize for events action
             
         Returns:
             int: Exit code (0 for success, 1 for failure)
@@ -31,12 +37,18 @@ class ConfigCommand(BaseCommand):
         try:
             if action == 'get':
                 return self._execute_get(key)
+            elif action == 'set' and (pairs or from_file):
+                return self._execute_set_many(pairs or [], from_file, level)
             elif action == 'set':
                 return self._execute_set(key, value, level)
             elif action == 'list':
                 return self._execute_list(level)
             elif action == 'reset':
                 return self._execute_reset(key, level)
+            elif action == 'cleanup-logs':
+                return self._execute_cleanup_logs()
+            elif action == 'events':
+                return self._execute_events(days, key)
             else:
                 self.logger.log_error(ValueError(f"Unknown action: {action}"), "execute")
                 return 1
@@ -97,6 +109,50 @@ class ConfigCommand(BaseCommand):
             self.logger.log_error(e, "_execute_set")
             return 1
     
+    def _execute_set_many(self, pairs: List[Tuple[str, str]], from_file: Optional[str], level: str) -> int:
+        """Execute set action for several keys, written in one transaction."""
+        try:
+            values = {}
+            if from_file:
+                values.update(self._load_values_file(from_file))
+            for key, value in pairs:
+                values[key] = self._convert_value(value)
+            
+            if not values:
+                self.logger.log_error(ValueError("No values to set"), "_execute_set_many")
+                return 1
+            
+            self.config.set_configs(values, level)
+            
+            for key, value in values.items():
+                print(f"Set {key} = {value} at {level} level")
+            return 0
+        except Exception as e:
+            self.logger.log_error(e, "_execute_set_many")
+            return 1
+    
+    def _load_values_file(self, path: str) -> Dict[str, Any]:
+        """Load values to set from a YAML file, flattened to dot notation keys."""
+        import yaml
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} must contain a mapping of keys to values")
+        
+        values = {}
+        
+        def flatten(mapping: Dict[str, Any], prefix: str) -> None:
+            for key, value in mapping.items():
+                full_key = f"{prefix}{key}"
+                if isinstance(value, dict) and value:
+                    flatten(value, f"{full_key}.")
+                else:
+                    values[full_key] = value
+        
+        flatten(data, "")
+        return values
+    
     def _execute_list(self, level: Optional[str]) -> int:
         """Execute list action."""
         try:
@@ -134,6 +190,57 @@ class ConfigCommand(BaseCommand):
             self.logger.log_error(e, "_execute_reset")
             return 1
     
+    def _execute_cleanup_logs(self) -> int:
+        """Execute cleanup-logs action."""
+        try:
+            from ..utils.logging import get_log_settings
+            
+            days = get_log_settings(self.config)['retention_days']
+            if not days:
+                print("Log cleanup disabled (logging.retention_days is 0)")
+                return 0
+            
+            removed = self.logger.cleanup_old_logs(days)
+            print(f"Removed {removed} log files older than {days} days from {self.logger.log_dir}")
+            return 0
+        except Exception as e:
+            self.logger.log_error(e, "_execute_cleanup_logs")
+            return 1
+    
+    def _execute_events(self, days: int, command: Optional[str] = None) -> int:
+        """Execute events action: summarize the command event log."""
+        try:
+            from ..utils.events import is_event_log_enabled, iter_events, summarize_events
+            
+            if days < 1:
+                raise ValueError("days must be at least 1")
+            
+            events = iter_events(self.logger.log_dir, since=time.time() - days * 24 * 60 * 60)
+            if command:
+                events = (event for event in events if event['command'] == command)
+            stats = summarize_events(events)
+            
+            if not stats:
+                print(f"No command events in the last {days} days")
+                if not is_event_log_enabled(self.config):
+                    print("The event log is off; enable it with 'ggconfig set logging.events true'")
+                return 0
+            
+            runs = sum(item.runs for item in stats.values())
+            print(f"Command events in the last {days} days: {runs} runs")
+            print(f"{'Command':<12} {'Runs':>6} {'Failed':>6} {'p50 ms':>9} {'p95 ms':>9} "
+                  f"{'CPU ms':>8} {'Git calls':>9} {'AI p95 ms':>10}")
+            for name, item in stats.items():
+                ai_p95 = item.ai.percentile(95)
+                print(f"{name:<12} {item.runs:>6} {item.failures:>6} "
+                      f"{item.wall.percentile(50):>9.1f} {item.wall.percentile(95):>9.1f} "
+                      f"{item.cpu_ms / item.runs:>8.1f} {item.git_calls / item.runs:>9.1f} "
+                      f"{(f'{ai_p95:.1f}' if ai_p95 is not None else '-'):>10}")
+            return 0
+        except Exception as e:
+            self.logger.log_error(e, "_execute_events")
+            return 1
+    
     def _convert_value(self, value: str) -> Any:
         """Convert string value to appropriate type."""
         # Try to convert to boolean
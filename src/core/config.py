@@ -12,14 +12,32 @@ The ConfigManager follows a hierarchical configuration pattern where:
 
 Configuration files are validated against JSON schemas defined in config/
 directory to ensure consistency and prevent configuration errors.
+
+yaml and jsonschema are imported on first use, so commands that never
+read configuration files do not pay for loading them. The merged and
+validated result is cached in a snapshot (see core.config_cache) that
+is reused until one of the source files or the schema changes.
 """
 
 import os
-import yaml
-import jsonschema
-from typing import Dict, Any, Optional, List, Union
+import tempfile
+from typing import Dict, Any, Optional, List, Tuple, Union
 from pathlib import Path
 
+from . import schema_registry
+from .config_cache import ConfigSnapshot
+from .utils.profiling import timed
+
+
+# Levels accepted by set_config and transactions
+VALID_LEVELS = ['repo', 'module', 'user', 'default']
+
+# Map schema types to file names under config/
+SCHEMA_FILES = {
+    'config': 'config-schema.yaml',
+    'commit': 'commit-schema.yaml',
+    'module': 'module-schema.yaml'
+}
 
 class ConfigManager:
     """
@@ -81,6 +99,25 @@ class ConfigManager:
             f"{home}/.gggit/default-config.yaml"  # Default config (lowest priority)
         ]
     
+    def _get_source_files(self) -> List[str]:
+        """
+        Get every file the merged configuration is built from.
+        
+        Returns:
+            List[str]: Config files of all levels, including each module
+                      file, followed by the config schema
+        """
+        modules_dir = Path(self.config_paths[1])
+        module_files = sorted(str(p) for p in modules_dir.glob("*.yaml")) if modules_dir.is_dir() else []
+        return [
+            self.config_paths[3],
+            self.config_paths[2],
+            *module_files,
+            self.config_paths[0],
+            str(self._get_schema_path('config'))
+        ]
+    
+    @timed('config.load')
     def load_hierarchical_config(self) -> Dict[str, Any]:
         """
         Load configuration following hierarchical priority.
@@ -89,6 +126,9 @@ class ConfigManager:
         according to the priority order. Higher priority configurations
         override lower priority ones.
         
+        The merged result is served from a snapshot when no source file
+        changed since it was built, skipping YAML parsing and validation.
+        
         Returns:
             Dict[str, Any]: Merged configuration dictionary
             
@@ -97,37 +137,28 @@ class ConfigManager:
             yaml.YAMLError: If configuration files contain invalid YAML
             jsonschema.ValidationError: If configuration doesn't match schema
         """
-        merged_config = {}
+        snapshot = ConfigSnapshot(self._get_source_files())
+        cached = snapshot.load()
+        if cached is not None:
+            if cached['warning']:
+                print(f"Warning: Configuration validation failed: {cached['warning']}")
+            self.config = cached['config']
+            return self.config
         
-        # Load configurations in priority order (lowest to highest)
-        # 1. Default configuration (lowest priority)
-        default_config = self._load_config_file(self.config_paths[3])  # default-config.yaml
-        if default_config:
-            merged_config = self._deep_merge(merged_config, default_config)
-        
-        # 2. User configuration
-        user_config = self._load_config_file(self.config_paths[2])  # user-config.yaml
-        if user_config:
-            merged_config = self._deep_merge(merged_config, user_config)
-        
-        # 3. Module configurations
-        module_configs = self._load_module_configs()
-        for module_config in module_configs:
-            merged_config = self._deep_merge(merged_config, module_config)
-        
-        # 4. Repository configuration (highest priority)
-        repo_config = self._load_config_file(self.config_paths[0])  # repo-config.yaml
-        if repo_config:
-            merged_config = self._deep_merge(merged_config, repo_config)
+        merged_config = self._merge_sources()
+        warning = None
         
         # Validate final configuration
         if merged_config:
+            import jsonschema
             try:
                 self.validate_config(merged_config, 'config')
             except jsonschema.ValidationError as e:
                 print(f"Warning: Configuration validation failed: {e.message}")
                 # Continue with invalid config but log the warning
+                warning = e.message
         
+        snapshot.store(merged_config, warning)
         self.config = merged_config
         return merged_config
     
@@ -169,6 +200,10 @@ class ConfigManager:
         """
         Set configuration value at specified level.
         
+        After writing the level file, the levels are merged again and only
+        the changed subtree is checked against its part of the schema.
+        Use set_configs() or transaction() to set several keys at once.
+        
         Args:
             key (str): Configuration key in dot notation
             value (Any): Value to set
@@ -183,28 +218,45 @@ class ConfigManager:
             config.set_config('commit.format', 'conventional', level='user')
             config.set_config('git.auto_stage', True, level='repo')
         """
-        # Validate level parameter
-        valid_levels = ['repo', 'module', 'user', 'default']
-        if level not in valid_levels:
-            raise ValueError(f"Invalid level '{level}'. Must be one of {valid_levels}")
-        
-        # Get configuration file path for the level
-        config_path = self._get_config_path_for_level(level)
-        
-        # Load existing configuration for the level
-        existing_config = self._load_config_file(config_path) or {}
-        
-        # Set nested value using dot notation
-        self._set_nested_value(existing_config, key, value)
+        with self.transaction() as transaction:
+            transaction.set(key, value, level)
+    
+    def set_configs(self, values: Dict[str, Any], level: str = 'user') -> None:
+        """
+        Set several configuration values at one level in a single write.
         
-        # Note: We don't validate individual level configs here because they are partial
-        # The full validation happens in load_hierarchical_config() after merging
+        Args:
+            values (Dict[str, Any]): Values by dot notation key
+            level (str): Configuration level ('repo', 'module', 'user', 'default')
+            
+        Raises:
+            ValueError: If level is not valid
+            PermissionError: If unable to write to configuration file
+            
+        Example:
+            config.set_configs({'ai.enabled': True, 'ai.provider': 'openai'})
+        """
+        with self.transaction() as transaction:
+            for key, value in values.items():
+                transaction.set(key, value, level)
+    
+    def transaction(self) -> 'ConfigTransaction':
+        """
+        Start a batch of configuration changes.
         
-        # Save to appropriate configuration file
-        self._save_config_file(config_path, existing_config)
+        Changes are collected and applied when the 'with' block exits
+        without an exception: each touched level file is written once and
+        the configuration is reloaded once.
         
-        # Reload hierarchical configuration
-        self.load_hierarchical_config()
+        Returns:
+            ConfigTransaction: New transaction bound to this manager
+            
+        Example:
+            with config.transaction() as transaction:
+                transaction.set('ai.enabled', True)
+                transaction.set('git.default_branch', 'main', level='repo')
+        """
+        return ConfigTransaction(self)
     
     def validate_config(self, config: Dict[str, Any], schema_type: str = 'config') -> bool:
         """
@@ -225,6 +277,8 @@ class ConfigManager:
             jsonschema.ValidationError: If configuration doesn't match schema
             FileNotFoundError: If schema file is not found
         """
+        import jsonschema
+        
         try:
             # Load appropriate JSON schema
             schema = self._load_schema(schema_type)
@@ -232,7 +286,7 @@ class ConfigManager:
                 return False
             
             # Validate configuration against schema
-            jsonschema.validate(config, schema)
+            schema_registry.validate(config, schema)
             return True
             
         except jsonschema.ValidationError as e:
@@ -339,6 +393,72 @@ class ConfigManager:
         # Reload hierarchical configuration
         self.load_hierarchical_config()
     
+    def _merge_sources(self) -> Dict[str, Any]:
+        """
+        Load every configuration level and merge them, without validation.
+        
+        Returns:
+            Dict[str, Any]: Merged configuration dictionary
+        """
+        merged_config = {}
+        
+        # Load configurations in priority order (lowest to highest)
+        # 1. Default configuration (lowest priority)
+        default_config = self._load_config_file(self.config_paths[3])  # default-config.yaml
+        if default_config:
+            merged_config = self._deep_merge(merged_config, default_config)
+        
+        # 2. User configuration
+        user_config = self._load_config_file(self.config_paths[2])  # user-config.yaml
+        if user_config:
+            merged_config = self._deep_merge(merged_config, user_config)
+        
+        # 3. Module configurations
+        module_configs = self._load_module_configs()
+        for module_config in module_configs:
+            merged_config = self._deep_merge(merged_config, module_config)
+        
+        # 4. Repository configuration (highest priority)
+        repo_config = self._load_config_file(self.config_paths[0])  # repo-config.yaml
+        if repo_config:
+            merged_config = self._deep_merge(merged_config, repo_config)
+        
+        return merged_config
+    
+    def _validate_key(self, config: Dict[str, Any], key: str) -> None:
+        """
+        Validate the subtree of a merged configuration under one key.
+        
+        Only the part of the config schema describing the key is checked.
+        Keys the schema cannot describe on their own fall back to a full
+        validation. Like load_hierarchical_config, problems are reported
+        as warnings.
+        
+        Args:
+            config (Dict[str, Any]): Merged configuration
+            key (str): Dot notation key that changed
+        """
+        import jsonschema
+        
+        schema = self._load_schema('config')
+        if not schema:
+            return
+        
+        subschema = schema_registry.get_subschema(schema, key)
+        try:
+            if subschema is None:
+                schema_registry.validate(config, schema)
+                return
+            
+            value = config
+            for k in key.split('.'):
+                if not isinstance(value, dict) or k not in value:
+                    return
+                value = value[k]
+            schema_registry.validate(value, subschema)
+        except jsonschema.ValidationError as e:
+            print(f"Warning: Configuration validation failed: {key}: {e.message}")
+    
     def _load_config_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """
         Load configuration from a YAML file.
@@ -349,11 +469,13 @@ class ConfigManager:
         Returns:
             Optional[Dict[str, Any]]: Configuration dictionary or None if file doesn't exist
         """
+        path = Path(file_path)
+        if not path.exists():
+            return None
+        
+        import yaml
+        
         try:
-            path = Path(file_path)
-            if not path.exists():
-                return None
-            
             with open(path, 'r', encoding='utf-8') as f:
                 return yaml.safe_load(f) or {}
         except (yaml.YAMLError, IOError):
@@ -370,7 +492,8 @@ class ConfigManager:
         modules_dir = Path(self.config_paths[1])  # modules directory
         
         if modules_dir.exists() and modules_dir.is_dir():
-            for yaml_file in modules_dir.glob("*.yaml"):
+            # Sorted so the merge order does not depend on the filesystem
+            for yaml_file in sorted(modules_dir.glob("*.yaml")):
                 config = self._load_config_file(str(yaml_file))
                 if config:
                     module_configs.append(config)
@@ -438,17 +561,63 @@ class ConfigManager:
     
     def _save_config_file(self, file_path: str, config: Dict[str, Any]) -> None:
         """
-        Save configuration to a YAML file.
+        Save configuration to a YAML file atomically.
         
         Args:
             file_path (str): Path to the configuration file
             config (Dict[str, Any]): Configuration dictionary
         """
+        # Write a temporary file and rename it over the old one, so readers
+        # never see a partially written configuration
+        os.replace(self._write_temp_config_file(file_path, config), file_path)
+    
+    def _write_temp_config_file(self, file_path: str, config: Dict[str, Any]) -> str:
+        """
+        Write configuration to a temporary file next to its final path.
+        
+        The temporary file gets the mode of the file it will replace, so
+        renaming it over that file with os.replace() completes the save.
+        
+        Args:
+            file_path (str): Path to the configuration file
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            str: Path of the temporary file
+        """
+        import yaml
+        
         path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, indent=2)
+        try:
+            mode = path.stat().st_mode & 0o777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                yaml.dump(config, f, default_flow_style=False, indent=2)
+            os.chmod(tmp_path, mode)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path
+    
+    def _get_schema_path(self, schema_type: str) -> Path:
+        """
+        Get the path of a schema file.
+        
+        Args:
+            schema_type (str): Type of schema ('config', 'commit', 'module')
+            
+        Returns:
+            Path: Path under the config/ directory
+        """
+        return Path(__file__).parent.parent.parent / 'config' / SCHEMA_FILES[schema_type]
     
     def _load_schema(self, schema_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -460,28 +629,21 @@ class ConfigManager:
         Returns:
             Optional[Dict[str, Any]]: Schema dictionary or None if not found
         """
+        import yaml
+        
         try:
-            # Map schema types to file names
-            schema_files = {
-                'config': 'config-schema.yaml',
-                'commit': 'commit-schema.yaml',
-                'module': 'module-schema.yaml'
-            }
-            
-            if schema_type not in schema_files:
+            if schema_type not in SCHEMA_FILES:
                 print(f"Unknown schema type: {schema_type}")
                 return None
             
-            # Get path to schema file
-            schema_path = Path(__file__).parent.parent.parent / 'config' / schema_files[schema_type]
+            schema_path = self._get_schema_path(schema_type)
             
             if not schema_path.exists():
                 print(f"Schema file not found: {schema_path}")
                 return None
             
-            # Load schema from YAML file
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            # Parsed once per process while the file is unchanged
+            return schema_registry.load_schema_file(str(schema_path))
                 
         except (yaml.YAMLError, IOError) as e:
             print(f"Error loading schema {schema_type}: {e}")
@@ -617,3 +779,108 @@ class ConfigManager:
         # Remove the final key
         if isinstance(current, dict) and keys[-1] in current:
             del current[keys[-1]]
+
+
+class ConfigTransaction:
+    """
+    Batch of configuration changes applied together.
+    
+    Changes are only recorded by set(). commit() applies them in two
+    passes: first every touched level file is loaded and updated with
+    all of its keys, and each new document is written to a temporary
+    file; only when all of them are written are they renamed over the
+    level files. A failure before the renames leaves every level file
+    untouched. The levels are then merged once and every changed key is
+    validated against its part of the schema. Leaving a 'with' block
+    with an exception discards the changes.
+    
+    Attributes:
+        manager (ConfigManager): Manager whose files are updated
+        
+    Example:
+        with config.transaction() as transaction:
+            for key, value in settings.items():
+                transaction.set(key, value, level='user')
+    """
+    
+    def __init__(self, manager: ConfigManager):
+        """
+        Initialize an empty transaction.
+        
+        Args:
+            manager (ConfigManager): Manager whose files are updated
+        """
+        self.manager = manager
+        self._changes: Dict[str, List[Tuple[str, Any]]] = {}
+    
+    def set(self, key: str, value: Any, level: str = 'user') -> None:
+        """
+        Record a configuration change.
+        
+        Args:
+            key (str): Configuration key in dot notation
+            value (Any): Value to set
+            level (str): Configuration level ('repo', 'user', 'default')
+            
+        Raises:
+            ValueError: If level is not valid or has no configuration file
+        """
+        if level not in VALID_LEVELS:
+            raise ValueError(f"Invalid level '{level}'. Must be one of {VALID_LEVELS}")
+        # Module configuration is read-only: fail here, not in commit()
+        self.manager._get_config_path_for_level(level)
+        self._changes.setdefault(level, []).append((key, value))
+    
+    def commit(self) -> None:
+        """
+        Write the recorded changes and reload the configuration once.
+        
+        Raises:
+            PermissionError: If unable to write to configuration file
+        """
+        manager = self.manager
+        changes, self._changes = self._changes, {}
+        if not changes:
+            return
+        
+        # First pass: build every level document
+        documents = []
+        for level, entries in changes.items():
+            config_path = manager._get_config_path_for_level(level)
+            existing_config = manager._load_config_file(config_path) or {}
+            for key, value in entries:
+                manager._set_nested_value(existing_config, key, value)
+            documents.append((config_path, existing_config))
+        
+        # Second pass: write them all to temporary files, then rename.
+        # Level files are partial: they are validated after merging
+        written = []
+        try:
+            for config_path, document in documents:
+                written.append((manager._write_temp_config_file(config_path, document), config_path))
+        except BaseException:
+            for tmp_path, _ in written:
+                os.unlink(tmp_path)
+            raise
+        for tmp_path, config_path in written:
+            os.replace(tmp_path, config_path)
+        
+        # Re-merge the levels and check only the subtrees that changed
+        merged_config = manager._merge_sources()
+        changed_keys = dict.fromkeys(key for entries in changes.values() for key, _ in entries)
+        for key in changed_keys:
+            manager._validate_key(merged_config, key)
+        manager.config = merged_config
+    
+    def rollback(self) -> None:
+        """Discard the recorded changes."""
+        self._changes = {}
+    
+    def __enter__(self) -> 'ConfigTransaction':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
@@ -0,0 +1,163 @@
+"""
+Compiled configuration snapshots for ggGit.
+
+Loading the configuration means parsing up to four layers of YAML plus
+the module files, deep-merging them and validating the result against
+the config schema. The merged result only changes when one of those
+files (or the schema) changes, so ConfigManager stores it in a JSON
+snapshot under ~/.gggit/cache/config/ together with the stat signature
+(path, mtime, size) of every source file. On the next invocation a
+matching signature means the snapshot is loaded as-is: a few stat()
+calls and one json.load instead of YAML parsing and schema validation.
+
+Snapshots are keyed by the absolute source paths, so every repository
+gets its own entry. A snapshot is not written while a source file was
+modified within the last couple of seconds, because a second edit in
+the same filesystem timestamp tick would otherwise go unnoticed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Bump when the snapshot layout or the merge semantics change
+CACHE_VERSION = 1
+
+# Sources modified this recently are not cached (see module docstring)
+_RACY_WINDOW_NS = 2 * 1_000_000_000
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the directory holding configuration snapshots.
+
+    Returns:
+        Path: ~/.gggit/cache/config
+    """
+    return Path.home() / '.gggit' / 'cache' / 'config'
+
+
+def stat_signature(paths: List[str]) -> List[List[Any]]:
+    """
+    Get the stat signature of a list of files.
+
+    Args:
+        paths (List[str]): Absolute file paths
+
+    Returns:
+        List[List[Any]]: [path, mtime_ns, size] per file, with None for
+                         the stat fields of missing files
+    """
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append([path, st.st_mtime_ns, st.st_size])
+        except OSError:
+            signature.append([path, None, None])
+    return signature
+
+
+class ConfigSnapshot:
+    """
+    Cached merge-and-validate result for one set of source files.
+
+    Attributes:
+        sources (List[str]): Absolute paths of the source files
+        signature (List[List[Any]]): Their stat signature at creation
+        path (Path): Snapshot file
+
+    Example:
+        snapshot = ConfigSnapshot(sources)
+        cached = snapshot.load()
+        if cached is None:
+            config = build_config()
+            snapshot.store(config)
+    """
+
+    def __init__(self, sources: List[str], cache_dir: Optional[Path] = None):
+        """
+        Initialize the snapshot and take the sources' stat signature.
+
+        Args:
+            sources (List[str]): Source file paths; relative paths are
+                                 resolved against the current directory
+            cache_dir (Path, optional): Snapshot directory
+        """
+        self.sources = [os.path.abspath(path) for path in sources]
+        self.signature = stat_signature(self.sources)
+        key = hashlib.sha1('\0'.join(self.sources).encode('utf-8')).hexdigest()
+        self.path = (cache_dir or default_cache_dir()) / f'{key}.json'
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the sources are worth caching and stable enough to cache."""
+        mtimes = [mtime for _, mtime, _ in self.signature if mtime is not None]
+        if not mtimes:
+            # Nothing to parse, loading is already cheap
+            return False
+        return time.time_ns() - max(mtimes) > _RACY_WINDOW_NS
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the snapshot if it matches the current sources.
+
+        Returns:
+            Optional[Dict[str, Any]]: {'config': ..., 'warning': ...}, or
+                                      None if missing or out of date
+        """
+        if not self.cacheable:
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get('version') != CACHE_VERSION or data.get('signature') != self.signature:
+            return None
+        return {'config': data.get('config') or {}, 'warning': data.get('warning')}
+
+    def store(self, config: Dict[str, Any], warning: Optional[str] = None) -> bool:
+        """
+        Write the snapshot atomically.
+
+        Args:
+            config (Dict[str, Any]): Merged configuration
+            warning (str, optional): Validation warning to repeat on load
+
+        Returns:
+            bool: True if the snapshot was written
+        """
+        if not self.cacheable:
+            return False
+        try:
+            payload = json.dumps({
+                'version': CACHE_VERSION,
+                'signature': self.signature,
+                'config': config,
+                'warning': warning
+            })
+        except (TypeError, ValueError):
+            # Values YAML can express but JSON cannot (e.g. dates)
+            return False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            return False
+        return True
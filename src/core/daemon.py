@@ -0,0 +1,690 @@
+"""
+Resident command server for ggGit.
+
+Every ggGit alias normally starts a fresh interpreter, imports click,
+yaml, jsonschema and requests, and builds its components from scratch.
+The daemon pays that cost once: it imports everything up front, keeps
+the compiled command scripts in memory and serves commands from forked
+copies of itself over a per-user Unix socket.
+
+Request flow:
+1. The client (src/gg.py via gg_client) connects and sends argv, cwd,
+   environment and umask, passing its stdin/stdout/stderr descriptors
+   over the socket (SCM_RIGHTS).
+2. The daemon forks a supervisor, which forks the worker. The worker
+   adopts the client's descriptors, directory and environment and runs
+   the command script exactly as 'python <script>' would, so output goes
+   straight to the user's terminal, colors and prompts included.
+3. The supervisor reports the worker's pid (for signal forwarding) and
+   finally its exit code back to the client.
+
+The daemon is optional. When the socket is missing, refuses the
+connection or reports that the installed sources changed, the client
+runs the command in-process as before.
+
+This module only imports the standard library at module level so the
+client can share its protocol helpers without loading anything heavy.
+"""
+
+import builtins
+import gc
+import json
+import os
+import re
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+import traceback
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Root of the ggGit sources (the directory containing 'core' and 'commands')
+SRC_ROOT = Path(__file__).resolve().parent.parent
+COMMANDS_DIR = SRC_ROOT / 'commands'
+
+# Valid command names; anything else is rejected before touching the disk
+COMMAND_NAME = re.compile(r'^gg[a-z]+$')
+
+# Modules imported once by the daemon so that commands start warm
+WARM_MODULES = (
+    'click',
+    'yaml',
+    'jsonschema',
+    'requests',
+    'core.config',
+    'core.git',
+    'core.validation',
+    'core.utils.colors',
+    'core.utils.logging',
+    'core.base_commands.base',
+    'core.base_commands.commit',
+    'core.base_commands.config',
+    'core.ai',
+)
+
+# Stop after this many seconds without requests
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+_HEADER = struct.Struct('!I')
+_MAX_REQUEST_SIZE = 4 * 1024 * 1024
+
+
+class DaemonError(Exception):
+    """Error starting or talking to the ggGit daemon"""
+    pass
+
+
+def default_socket_path() -> Path:
+    """
+    Get the per-user socket path.
+
+    GGGIT_DAEMON_SOCKET overrides the location; otherwise the socket lives
+    in $XDG_RUNTIME_DIR/gggit or, without it, in ~/.gggit/run.
+
+    Returns:
+        Path: Path of the daemon socket
+    """
+    override = os.environ.get('GGGIT_DAEMON_SOCKET')
+    if override:
+        return Path(override)
+
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / 'gggit' / 'daemon.sock'
+    return Path.home() / '.gggit' / 'run' / 'daemon.sock'
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any], fds: Optional[List[int]] = None) -> None:
+    """
+    Send one length-prefixed JSON message, optionally with descriptors.
+
+    Args:
+        sock (socket.socket): Connected Unix socket
+        message (Dict[str, Any]): JSON-serializable message
+        fds (Optional[List[int]]): File descriptors to pass along
+    """
+    payload = json.dumps(message).encode('utf-8')
+    header = _HEADER.pack(len(payload))
+    if fds:
+        socket.send_fds(sock, [header], fds)
+        sock.sendall(payload)
+    else:
+        sock.sendall(header + payload)
+
+
+def receive_message(sock: socket.socket, max_fds: int = 0) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+    """
+    Receive one message sent with send_message().
+
+    Args:
+        sock (socket.socket): Connected Unix socket
+        max_fds (int): Maximum number of descriptors to accept
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], List[int]]: Message (None when the
+            peer closed the connection) and received descriptors
+
+    Raises:
+        DaemonError: If the message is malformed or too large
+    """
+    if max_fds:
+        header, fds, _, _ = socket.recv_fds(sock, _HEADER.size, max_fds)
+    else:
+        header, fds = sock.recv(_HEADER.size), []
+
+    if not header:
+        return None, fds
+    header += _receive_exactly(sock, _HEADER.size - len(header))
+
+    (length,) = _HEADER.unpack(header)
+    if length > _MAX_REQUEST_SIZE:
+        raise DaemonError(f"Message too large: {length} bytes")
+
+    try:
+        return json.loads(_receive_exactly(sock, length).decode('utf-8')), fds
+    except ValueError as e:
+        raise DaemonError(f"Malformed message: {e}")
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes from the socket."""
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise DaemonError("Connection closed in the middle of a message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def source_fingerprint(root: Path = SRC_ROOT) -> int:
+    """
+    Get a value that changes whenever a ggGit source file changes.
+
+    Args:
+        root (Path): Source directory to scan
+
+    Returns:
+        int: Newest modification time (ns) of the Python sources
+    """
+    newest = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != '__pycache__']
+        for filename in filenames:
+            if filename.endswith('.py'):
+                try:
+                    newest = max(newest, os.stat(os.path.join(dirpath, filename)).st_mtime_ns)
+                except OSError:
+                    continue
+    return newest
+
+
+def exit_code_from_system_exit(code: Any) -> int:
+    """
+    Translate a SystemExit code the way the interpreter does.
+
+    Args:
+        code (Any): SystemExit.code
+
+    Returns:
+        int: Process exit status
+    """
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    print(code, file=sys.stderr)
+    return 1
+
+
+class GgDaemon:
+    """
+    Resident server running ggGit commands in warm forked workers.
+
+    The server is single threaded: it accepts a connection, forks a
+    supervisor for it and goes back to accepting. Workers inherit the
+    imported modules and compiled scripts through fork, so a command
+    starts with everything already loaded.
+
+    Attributes:
+        socket_path (Path): Unix socket the server listens on
+        commands_dir (Path): Directory containing the command scripts
+        idle_timeout (float): Seconds without requests before exiting
+
+    Example:
+        daemon = GgDaemon(default_socket_path())
+        daemon.serve_forever()
+    """
+
+    def __init__(self, socket_path: Path, commands_dir: Path = COMMANDS_DIR,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Initialize the server without binding the socket.
+
+        Args:
+            socket_path (Path): Unix socket path
+            commands_dir (Path): Directory containing the command scripts
+            idle_timeout (float): Seconds without requests before exiting
+        """
+        self.socket_path = Path(socket_path)
+        self.commands_dir = Path(commands_dir)
+        self.idle_timeout = idle_timeout
+        self._server: Optional[socket.socket] = None
+        self._scripts: Dict[str, Tuple[int, Any]] = {}
+        self._fingerprint = 0
+        self._started = time.time()
+        self._served = 0
+        self._running = False
+
+    def warm_up(self) -> None:
+        """Import heavy modules and compile every command script."""
+        for name in WARM_MODULES:
+            try:
+                __import__(name)
+            except ImportError:
+                # Optional dependencies are imported by the commands
+                # that need them; a missing one only costs startup time
+                continue
+
+        for script in sorted(self.commands_dir.glob('gg*.py')):
+            self._get_script(script.stem)
+
+        self._fingerprint = source_fingerprint(self.commands_dir.parent)
+
+        # Keep the warm heap out of future collections so forked workers
+        # do not touch (and copy) its pages
+        gc.collect()
+        gc.freeze()
+
+    def serve_forever(self) -> None:
+        """
+        Bind the socket and serve requests until stopped or idle.
+
+        Raises:
+            DaemonError: If another daemon is already listening
+        """
+        self.warm_up()
+        self._bind()
+        self._running = True
+
+        # Supervisors are reaped automatically
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+
+        try:
+            while self._running:
+                try:
+                    conn, _ = self._server.accept()
+                except socket.timeout:
+                    break
+                except InterruptedError:
+                    continue
+                except OSError:
+                    if not self._running:
+                        break
+                    raise
+                try:
+                    self._handle(conn)
+                finally:
+                    conn.close()
+        finally:
+            self._unbind()
+
+    def stop(self) -> None:
+        """Stop serving after the current request."""
+        self._running = False
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _bind(self) -> None:
+        """Create the listening socket with user-only permissions."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        os.chmod(self.socket_path.parent, 0o700)
+
+        if self.socket_path.exists():
+            if ping(self.socket_path) is not None:
+                raise DaemonError(f"Daemon already running on {self.socket_path}")
+            self.socket_path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        server.settimeout(self.idle_timeout)
+        self._server = server
+
+    def _unbind(self) -> None:
+        """Close the listening socket and remove it from disk."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Serve one connection."""
+        if not _peer_is_same_user(conn):
+            return
+
+        conn.settimeout(10)
+        try:
+            request, fds = receive_message(conn, max_fds=3)
+        except (DaemonError, OSError):
+            return
+
+        try:
+            if request is None:
+                return
+            if 'control' in request:
+                self._handle_control(conn, request['control'])
+                return
+            self._handle_command(conn, request, fds)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _handle_control(self, conn: socket.socket, action: str) -> None:
+        """Answer 'ping' and 'stop' requests."""
+        if action == 'ping':
+            send_message(conn, self.status())
+        elif action == 'stop':
+            send_message(conn, {'stopping': True})
+            self.stop()
+        else:
+            send_message(conn, {'error': f"Unknown control action: {action}"})
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get information about the running server.
+
+        Returns:
+            Dict[str, Any]: pid, uptime and number of commands served
+        """
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self._started, 1),
+            'served': self._served,
+            'socket': str(self.socket_path)
+        }
+
+    def _handle_command(self, conn: socket.socket, request: Dict[str, Any], fds: List[int]) -> None:
+        """Validate a command request and fork a supervisor for it."""
+        argv = request.get('argv') or []
+        command = argv[0] if argv else ''
+        if len(fds) != 3 or not COMMAND_NAME.match(command):
+            send_message(conn, {'error': 'invalid request'})
+            return
+
+        # Code changed since warm-up: let the client run it in-process
+        # with the new sources and retire this daemon
+        if source_fingerprint(self.commands_dir.parent) != self._fingerprint:
+            send_message(conn, {'stale': True})
+            self.stop()
+            return
+
+        script = self._get_script(command)
+        if script is None:
+            send_message(conn, {'error': f"Unknown command: {command}"})
+            return
+
+        self._served += 1
+        if os.fork() == 0:
+            code = 1
+            try:
+                self._server.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                self._supervise(conn, command, script, request, fds)
+                code = 0
+            finally:
+                os._exit(code)
+
+    def _get_script(self, command: str) -> Optional[Any]:
+        """Get the compiled code of a command script, recompiling if it changed."""
+        path = self.commands_dir / f"{command}.py"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._scripts.get(command)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        code = compile(path.read_bytes(), str(path), 'exec')
+        self._scripts[command] = (mtime, code)
+        return code
+
+    def _supervise(self, conn: socket.socket, command: str, script: Any,
+                   request: Dict[str, Any], fds: List[int]) -> None:
+        """Run the worker and report its pid and exit status to the client."""
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            os._exit(self._run_worker(command, script, request, fds))
+
+        for fd in fds:
+            os.close(fd)
+        fds.clear()
+
+        conn.settimeout(None)
+        try:
+            send_message(conn, {'pid': pid})
+        except OSError:
+            pass
+
+        _, status = os.waitpid(pid, 0)
+        try:
+            send_message(conn, {'exit': _exit_status(status)})
+        except OSError:
+            pass
+
+    def _run_worker(self, command: str, script: Any, request: Dict[str, Any], fds: List[int]) -> int:
+        """Adopt the client's process state and execute the command script."""
+        try:
+            # Own process group so the client can forward Ctrl-C to the
+            # command and any git process it starts
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            _reopen_standard_streams(request.get('encoding'))
+
+            os.environ.clear()
+            os.environ.update(request.get('env') or {})
+            os.umask(int(request.get('umask', 0o022)))
+            os.chdir(request['cwd'])
+
+            # Time the command from here, not from the daemon's start
+            from core.utils import profiling
+            profiling.reset()
+        except (OSError, KeyError) as e:
+            print(f"gggit daemon: cannot prepare command: {e}", file=sys.stderr)
+            return 1
+
+        path = str(self.commands_dir / f"{command}.py")
+        sys.argv = [path] + list(request['argv'][1:])
+        sys.path[0] = str(self.commands_dir)
+        # Fresh __main__ without a module spec, as for 'python <script>'
+        main_module = types.ModuleType('__main__')
+        main_module.__file__ = path
+        main_module.__builtins__ = builtins
+        sys.modules['__main__'] = main_module
+
+        try:
+            exec(script, main_module.__dict__)
+            status = 0
+        except SystemExit as e:
+            status = exit_code_from_system_exit(e.code)
+        except KeyboardInterrupt:
+            status = 130
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+
+        # The worker ends with os._exit(), which skips atexit handlers
+        profiling.print_breakdown()
+        from core.utils.logging import flush_logs
+        flush_logs()
+
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+        return status
+
+
+def _exit_status(status: int) -> int:
+    """Convert a waitpid() status to a shell-style exit code."""
+    code = os.waitstatus_to_exitcode(status)
+    return 128 - code if code < 0 else code
+
+
+def _reopen_standard_streams(encoding: Optional[str]) -> None:
+    """Rebuild sys.stdin/stdout/stderr on top of the adopted descriptors."""
+    encoding = encoding or 'utf-8'
+    for fd, name, mode in ((0, 'stdin', 'r'), (1, 'stdout', 'w'), (2, 'stderr', 'w')):
+        # Same buffering the interpreter picks: line buffered on terminals
+        # and always for stderr, block buffered otherwise
+        line_buffered = mode == 'w' and (name == 'stderr' or os.isatty(fd))
+        stream = open(
+            fd, mode,
+            buffering=1 if line_buffered else -1,
+            encoding=encoding,
+            errors='backslashreplace' if name == 'stderr' else 'strict',
+            closefd=False
+        )
+        setattr(sys, name, stream)
+        setattr(sys, f'__{name}__', stream)
+
+
+def _peer_is_same_user(conn: socket.socket) -> bool:
+    """Reject connections from other users where the platform allows checking."""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        # The socket directory is private to the user (0700)
+        return True
+
+    credentials = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', credentials)
+    return uid == os.getuid()
+
+
+def connect(socket_path: Optional[Path] = None, timeout: float = 2.0) -> Optional[socket.socket]:
+    """
+    Connect to a running daemon.
+
+    Args:
+        socket_path (Optional[Path]): Socket path, defaults to default_socket_path()
+        timeout (float): Connection timeout in seconds
+
+    Returns:
+        Optional[socket.socket]: Connected socket, or None if no daemon is listening
+    """
+    path = socket_path or default_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def ping(socket_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """
+    Ask a daemon for its status.
+
+    Args:
+        socket_path (Optional[Path]): Socket path, defaults to default_socket_path()
+
+    Returns:
+        Optional[Dict[str, Any]]: Status from GgDaemon.status(), or None if
+                                  no daemon answers
+    """
+    sock = connect(socket_path)
+    if sock is None:
+        return None
+    try:
+        send_message(sock, {'control': 'ping'})
+        message, _ = receive_message(sock)
+        return message
+    except (DaemonError, OSError):
+        return None
+    finally:
+        sock.close()
+
+
+def stop_daemon(socket_path: Optional[Path] = None) -> bool:
+    """
+    Ask a running daemon to exit.
+
+    Args:
+        socket_path (Optional[Path]): Socket path, defaults to default_socket_path()
+
+    Returns:
+        bool: True if a daemon acknowledged the request
+    """
+    sock = connect(socket_path)
+    if sock is None:
+        return False
+    try:
+        send_message(sock, {'control': 'stop'})
+        message, _ = receive_message(sock)
+        return bool(message and message.get('stopping'))
+    except (DaemonError, OSError):
+        return False
+    finally:
+        sock.close()
+
+
+def start_daemon(socket_path: Optional[Path] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 wait: float = 10.0) -> Dict[str, Any]:
+    """
+    Start a daemon in the background and wait until it answers.
+
+    Args:
+        socket_path (Optional[Path]): Socket path, defaults to default_socket_path()
+        idle_timeout (float): Seconds without requests before the daemon exits
+        wait (float): Seconds to wait for the daemon to come up
+
+    Returns:
+        Dict[str, Any]: Status of the running daemon
+
+    Raises:
+        DaemonError: If the daemon does not come up in time
+    """
+    path = Path(socket_path or default_socket_path())
+    status = ping(path)
+    if status is not None:
+        return status
+
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_ROOT), env.get('PYTHONPATH')]))
+
+    log_file = open(path.parent / 'daemon.log', 'ab')
+    try:
+        subprocess.Popen(
+            [sys.executable, '-m', 'core.daemon', '--socket', str(path),
+             '--idle-timeout', str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            cwd='/',
+            env=env,
+            start_new_session=True
+        )
+    finally:
+        log_file.close()
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        status = ping(path)
+        if status is not None:
+            return status
+        time.sleep(0.05)
+
+    raise DaemonError(f"El daemon no respondió en {wait:.0f}s (ver {path.parent / 'daemon.log'})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point used by start_daemon(): run the server in the foreground."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='gggit-daemon')
+    parser.add_argument('--socket', type=Path, default=None)
+    parser.add_argument('--commands-dir', type=Path, default=COMMANDS_DIR)
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT)
+    options = parser.parse_args(argv)
+
+    daemon = GgDaemon(options.socket or default_socket_path(), options.commands_dir,
+                      options.idle_timeout)
+    try:
+        daemon.serve_forever()
+    except DaemonError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
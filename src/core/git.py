@@ -19,6 +19,12 @@ import shutil
 from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
+from .git_context import RepoContext, discover_repo_context
+from .git_pool import GitProcessPool, GitObject
+from .git_refs import RefStore
+from .git_status import RepositoryStatus, parse_porcelain_v2
+from .utils.profiling import span
+
 
 class GitInterfaceError(Exception):
     """Excepción base para errores de GitInterface"""
@@ -40,6 +46,22 @@ class GitCommandError(GitInterfaceError):
     pass
 
 
+def _run_git(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """
+    Run a git command, timed as a span named after its subcommand.
+    
+    Args:
+        cmd (List[str]): Command line, starting with 'git'
+        **kwargs: Arguments for subprocess.run()
+        
+    Returns:
+        subprocess.CompletedProcess: Result of subprocess.run()
+    """
+    subcommand = next((arg for arg in cmd[1:] if not arg.startswith('-')), '')
+    with span(f"git {subcommand}".rstrip()):
+        return subprocess.run(cmd, **kwargs)
+
+
 class GitInterface:
     """
     Unified interface for Git operations with error handling.
@@ -51,8 +73,23 @@ class GitInterface:
     All Git operations are executed in the current working directory
     and return structured data for easy consumption by command classes.
     
+    Object and ref lookups are served by a pool of long-lived
+    'git cat-file' helpers (see core.git_pool) that is started on first
+    use and reused for the rest of the command. Call close() (or use the
+    interface as a context manager) to stop the helpers.
+    
+    Repository discovery (git dir, common dir, HEAD) is resolved once and
+    cached in a RepoContext (see core.git_context). The cache is dropped
+    when the working directory changes or after operations that move
+    HEAD (switch, merge, reset, pull, commit).
+    
+    Branch names, the current branch and branch existence are read from
+    .git directly by a RefStore (see core.git_refs) and only fall back to
+    'git branch' for reftable repositories.
+    
     Attributes:
-        None: This class is stateless and doesn't maintain state
+        None: No public state; the helper pool and repository context
+              are managed internally
         
     Example:
         git = GitInterface()
@@ -69,16 +106,16 @@ class GitInterface:
         
         # Get repository status
         status = git.get_repository_status()
-        print(f"Current branch: {status['current_branch']}")
+        print(f"Current branch: {status.current_branch}")
     """
     
     def __init__(self):
         """
         Initialize Git interface.
         
-        This method sets up the Git interface. No state is maintained
-        as all operations are stateless and work with the current
-        working directory.
+        This method sets up the Git interface. Operations work with the
+        current working directory; the only state kept is the lazily
+        created pool of git helper processes.
         
         Raises:
             GitNotAvailableError: If Git is not available in the system
@@ -89,34 +126,102 @@ class GitInterface:
                 "Git no está disponible en el sistema. "
                 "Por favor instala Git y asegúrate de que esté en el PATH."
             )
+        
+        self._pool: Optional[GitProcessPool] = None
+        self._context: Optional[RepoContext] = None
+        self._context_cwd: Optional[str] = None
+        self._refs: Optional[RefStore] = None
+    
+    def __enter__(self) -> 'GitInterface':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """
+        Stop the long-lived git helper processes.
+        
+        Safe to call several times; the pool is recreated on the next
+        object or ref lookup.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+    
+    def _get_pool(self) -> GitProcessPool:
+        """
+        Get the helper pool for the current working directory.
+        
+        The pool is bound to the directory it was created in; if the
+        working directory changed since then it is replaced.
+        
+        Returns:
+            GitProcessPool: Pool of git helpers for the current directory
+        """
+        cwd = os.getcwd()
+        if self._pool is None or self._pool.cwd != cwd:
+            self.close()
+            self._pool = GitProcessPool(cwd)
+        return self._pool
+    
+    def get_repo_context(self) -> Optional[RepoContext]:
+        """
+        Get the cached repository context for the current directory.
+        
+        The context is resolved on first use (reading '.git' and HEAD
+        directly when safe, otherwise with one 'git rev-parse') and reused
+        until the working directory changes or invalidate_context() runs.
+        
+        Returns:
+            Optional[RepoContext]: Repository context, or None if the current
+                                   directory is not a Git repository
+        """
+        cwd = os.getcwd()
+        if self._context_cwd != cwd:
+            self._context = discover_repo_context(cwd)
+            self._context_cwd = cwd
+        return self._context
+    
+    def invalidate_context(self) -> None:
+        """
+        Drop the cached repository context.
+        
+        Called after operations that can move HEAD or change the
+        repository layout; the next check resolves it again.
+        """
+        self._context = None
+        self._context_cwd = None
+    
+    def _get_ref_store(self) -> Optional[RefStore]:
+        """
+        Get the ref reader for the current repository.
+        
+        Returns:
+            Optional[RefStore]: Reader, or None when refs must be read
+                                through git (no repository, reftable)
+        """
+        context = self.get_repo_context()
+        if context is None:
+            return None
+        
+        refs = self._refs
+        if refs is None or refs.git_dir != context.git_dir or refs.common_dir != context.common_dir:
+            refs = self._refs = RefStore.from_context(context)
+        return refs if refs.supported else None
     
     def is_git_repository(self) -> bool:
         """
         Check if current directory is a Git repository.
         
-        Verifies that the current directory is within a Git repository
-        by checking for the .git directory or file.
+        Verifies that the current directory contains a valid '.git'
+        directory or file. The answer comes from the cached repository
+        context, so repeated checks within a command cost nothing.
         
         Returns:
             bool: True if current directory is a Git repository, False otherwise
         """
-        try:
-            # Check if .git directory or file exists
-            git_path = Path('.git')
-            if not git_path.exists():
-                return False
-            
-            # Verify it's a valid Git repository by running git status
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
-            
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError):
-            return False
+        return self.get_repo_context() is not None
     
     def stage_all_changes(self) -> bool:
         """
@@ -139,7 +244,7 @@ class GitInterface:
             )
         
         try:
-            result = subprocess.run(
+            result = _run_git(
                 ['git', 'add', '.'],
                 capture_output=True,
                 text=True,
@@ -199,7 +304,7 @@ class GitInterface:
                 raise FileNotFoundError(f"El archivo '{file_path}' no existe")
         
         try:
-            result = subprocess.run(
+            result = _run_git(
                 ['git', 'add'] + files,
                 capture_output=True,
                 text=True,
@@ -262,7 +367,9 @@ class GitInterface:
             )
         
         try:
-            result = subprocess.run(
+            # A commit moves a detached HEAD
+            self.invalidate_context()
+            result = _run_git(
                 ['git', 'commit', '-m', message.strip()],
                 capture_output=True,
                 text=True,
@@ -291,7 +398,8 @@ class GitInterface:
         Get current branch name.
         
         Returns the name of the currently checked out branch.
-        Equivalent to running 'git branch --show-current'.
+        Equivalent to running 'git branch --show-current'; HEAD is read
+        directly when the repository layout allows it.
         
         Returns:
             Optional[str]: Current branch name, or None if not in a repository
@@ -300,8 +408,12 @@ class GitInterface:
         if not self.is_git_repository():
             return None
         
+        refs = self._get_ref_store()
+        if refs is not None:
+            return refs.current_branch()
+        
         try:
-            result = subprocess.run(
+            result = _run_git(
                 ['git', 'branch', '--show-current'],
                 capture_output=True,
                 text=True,
@@ -331,7 +443,7 @@ class GitInterface:
             return []
         
         try:
-            result = subprocess.run(
+            result = _run_git(
                 ['git', 'diff', '--cached', '--name-only'],
                 capture_output=True,
                 text=True,
@@ -363,7 +475,7 @@ class GitInterface:
         
         try:
             # Get modified files
-            diff_result = subprocess.run(
+            diff_result = _run_git(
                 ['git', 'diff', '--name-only'],
                 capture_output=True,
                 text=True,
@@ -371,7 +483,7 @@ class GitInterface:
             )
             
             # Get untracked files
-            untracked_result = subprocess.run(
+            untracked_result = _run_git(
                 ['git', 'ls-files', '--others', '--exclude-standard'],
                 capture_output=True,
                 text=True,
@@ -393,36 +505,55 @@ class GitInterface:
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError):
             return []
     
-    def get_repository_status(self) -> Dict[str, Any]:
+    def get_repository_status(self) -> RepositoryStatus:
         """
         Get complete repository status.
         
-        Returns a comprehensive status of the repository including
-        current branch, staged files, unstaged files, and untracked files.
-        Equivalent to parsing 'git status --porcelain'.
+        Returns an immutable snapshot of the repository including current
+        branch, ahead/behind counts and staged, unstaged, untracked and
+        conflicted files, all from a single
+        'git status --porcelain=v2 -z --branch --untracked-files=all' call.
+        
+        Callers that need several of these values should take one snapshot
+        instead of calling get_current_branch(), get_staged_files() and
+        get_unstaged_files() one after another.
         
         Returns:
-            Dict[str, Any]: Repository status with keys:
-                - current_branch: Current branch name
+            RepositoryStatus: Snapshot with attributes:
+                - current_branch: Current branch name (None if detached)
+                - ahead / behind: Commits ahead/behind the upstream
                 - staged_files: List of staged files
                 - unstaged_files: List of unstaged files
                 - untracked_files: List of untracked files
+                - conflicted_files: List of unmerged files
                 - is_clean: Boolean indicating if working tree is clean
                 
+        Raises:
+            NotGitRepositoryError: If not in a Git repository
+            GitCommandError: If git status fails
+                
         Example:
             status = git.get_repository_status()
-            print(f"Branch: {status['current_branch']}")
-            print(f"Staged: {len(status['staged_files'])} files")
-            
-        Note:
-            This method will be implemented in STORY-1.2.3 - comandos base
+            print(f"Branch: {status.current_branch}")
+            print(f"Staged: {len(status.staged_files)} files")
         """
-        # TODO: Implement git status --porcelain parsing
-        # 1. Verify we're in a git repository
-        # 2. Execute 'git status --porcelain' command
-        # 3. Parse output to extract file statuses
-        # 4. Return structured status dictionary
-        return {}
+        if not self.is_git_repository():
+            raise NotGitRepositoryError("Not a git repository")
+        
+        cmd = ['git', 'status', '--porcelain=v2', '-z', '--branch', '--untracked-files=all']
+        try:
+            result = _run_git(cmd, capture_output=True, timeout=30)
+            
+            if result.returncode != 0:
+                stderr = result.stderr.decode('utf-8', errors='replace').strip()
+                raise GitCommandError(f"Git status failed: {stderr}")
+            
+            return parse_porcelain_v2(result.stdout)
+            
+        except subprocess.TimeoutExpired:
+            raise GitCommandError("Git status timed out")
+        except ValueError as e:
+            raise GitCommandError(f"Unexpected git status output: {e}")
     
     def get_commit_history(self, limit: int = 10) -> List[Dict[str, str]]:
         """
@@ -483,7 +614,7 @@ class GitInterface:
             if start_point:
                 cmd.append(start_point)
             
-            result = subprocess.run(
+            result = _run_git(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -551,8 +682,10 @@ class GitInterface:
             raise RuntimeError("Not a git repository")
         
         try:
+            self.invalidate_context()
+            
             # Use git switch (preferred) or fallback to git checkout
-            result = subprocess.run(
+            result = _run_git(
                 ['git', 'switch', branch_name],
                 capture_output=True,
                 text=True,
@@ -561,7 +694,7 @@ class GitInterface:
             
             if result.returncode != 0:
                 # Fallback to git checkout if git switch fails
-                result = subprocess.run(
+                result = _run_git(
                     ['git', 'checkout', branch_name],
                     capture_output=True,
                     text=True,
@@ -612,7 +745,7 @@ class GitInterface:
             if files:
                 cmd.extend(files)
             
-            result = subprocess.run(cmd, capture_output=False, text=True)
+            result = _run_git(cmd, capture_output=False, text=True)
             return result.returncode == 0
             
         except subprocess.CalledProcessError as e:
@@ -648,7 +781,7 @@ class GitInterface:
             if files:
                 cmd.extend(files)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = _run_git(cmd, capture_output=True, text=True, timeout=30)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git diff failed: {result.stderr}")
@@ -690,7 +823,7 @@ class GitInterface:
             if files:
                 cmd.extend(files)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = _run_git(cmd, capture_output=True, text=True, timeout=30)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git diff --numstat failed: {result.stderr}")
@@ -757,6 +890,45 @@ class GitInterface:
         # If no staged files, return unstaged files
         return self.get_unstaged_files()
     
+    def get_index_tree(self) -> Optional[str]:
+        """
+        Get the id of the tree recorded in the index.
+        
+        Equivalent to running 'git write-tree', which stores the tree the
+        next commit would record. Two calls return the same id exactly
+        when the staged contents are the same.
+        
+        Returns:
+            Optional[str]: Tree id, or None if the index cannot be written
+                           as a tree (unmerged entries, no repository)
+        """
+        try:
+            result = _run_git(
+                ['git', 'write-tree'],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    
+    def get_head_tree(self) -> Optional[str]:
+        """
+        Get the id of the tree of the HEAD commit.
+        
+        Returns:
+            Optional[str]: Tree id, or None before the first commit
+        """
+        try:
+            info = self.get_object_info('HEAD^{tree}')
+        except (GitCommandError, ValueError):
+            return None
+        return info.oid if info else None
+    
     def unstage_files(self, files: Optional[List[str]] = None) -> bool:
         """
         Unstage files from index.
@@ -782,7 +954,7 @@ class GitInterface:
             if files:
                 cmd.extend(files)
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_git(cmd, capture_output=True, text=True)
             return result.returncode == 0
             
         except subprocess.CalledProcessError as e:
@@ -809,7 +981,8 @@ class GitInterface:
                 raise NotGitRepositoryError("Not a git repository")
             
             cmd = ['git', 'reset', '--hard', 'HEAD']
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            self.invalidate_context()
+            result = _run_git(cmd, capture_output=True, text=True)
             return result.returncode == 0
             
         except subprocess.CalledProcessError as e:
@@ -840,12 +1013,13 @@ class GitInterface:
                 raise NotGitRepositoryError("Not a git repository")
             
             cmd = ['git', 'pull']
+            self.invalidate_context()
             if remote:
                 cmd.append(remote)
             if branch:
                 cmd.append(branch)
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_git(cmd, capture_output=True, text=True)
             return result.returncode == 0
             
         except subprocess.CalledProcessError as e:
@@ -881,7 +1055,7 @@ class GitInterface:
             if branch:
                 cmd.append(branch)
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_git(cmd, capture_output=True, text=True)
             return result.returncode == 0
             
         except subprocess.CalledProcessError as e:
@@ -904,7 +1078,7 @@ class GitInterface:
             subprocess.CalledProcessError: If git --version command fails
         """
         try:
-            result = subprocess.run(['git', '--version'], capture_output=True, text=True)
+            result = _run_git(['git', '--version'], capture_output=True, text=True)
             if result.returncode != 0:
                 raise GitNotAvailableError("Git is not available")
             return result.stdout.strip()
@@ -924,7 +1098,8 @@ class GitInterface:
         Get list of local branches.
         
         Returns a list of local branch names.
-        Equivalent to running 'git branch --format="%(refname:short)"'.
+        Equivalent to running 'git branch --format="%(refname:short)"';
+        refs are read directly when the repository layout allows it.
         
         Returns:
             List[str]: List of local branch names
@@ -937,8 +1112,12 @@ class GitInterface:
             if not self.is_git_repository():
                 raise NotGitRepositoryError("Not a git repository")
             
+            refs = self._get_ref_store()
+            if refs is not None:
+                return refs.branches()
+            
             cmd = ['git', 'branch', '--format=%(refname:short)']
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_git(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git branch command failed: {result.stderr}")
@@ -962,7 +1141,8 @@ class GitInterface:
         Get list of remote branches.
         
         Returns a list of remote branch names.
-        Equivalent to running 'git branch -r --format="%(refname:short)"'.
+        Equivalent to running 'git branch -r --format="%(refname:short)"';
+        refs are read directly when the repository layout allows it.
         
         Returns:
             List[str]: List of remote branch names
@@ -975,8 +1155,12 @@ class GitInterface:
             if not self.is_git_repository():
                 raise NotGitRepositoryError("Not a git repository")
             
+            refs = self._get_ref_store()
+            if refs is not None:
+                return refs.remote_branches()
+            
             cmd = ['git', 'branch', '-r', '--format=%(refname:short)']
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_git(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git branch -r command failed: {result.stderr}")
@@ -1028,6 +1212,29 @@ class GitInterface:
         except Exception as e:
             raise GitInterfaceError(f"Unexpected error in get_all_branches: {e}")
     
+    def branch_exists(self, branch_name: str) -> bool:
+        """
+        Check if a local branch exists.
+        
+        Reads refs/heads and packed-refs directly when possible, so the
+        check does not start a git process.
+        
+        Args:
+            branch_name (str): Name of the branch to check
+            
+        Returns:
+            bool: True if the local branch exists, False otherwise
+            
+        Raises:
+            NotGitRepositoryError: If not in a Git repository
+            GitCommandError: If the git fallback fails
+        """
+        refs = self._get_ref_store()
+        if refs is not None:
+            return refs.branch_exists(branch_name)
+        
+        return branch_name in self.get_branches()
+    
     def merge_branch(self, branch_name: str) -> bool:
         """
         Merge branch into current branch.
@@ -1050,7 +1257,8 @@ class GitInterface:
                 raise NotGitRepositoryError("Not a git repository")
             
             cmd = ['git', 'merge', '--no-ff', '--no-edit', branch_name]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            self.invalidate_context()
+            result = _run_git(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git merge failed: {result.stderr}")
@@ -1087,7 +1295,8 @@ class GitInterface:
                 raise NotGitRepositoryError("Not a git repository")
             
             cmd = ['git', 'merge', '--abort']
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            self.invalidate_context()
+            result = _run_git(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git merge --abort failed: {result.stderr}")
@@ -1124,7 +1333,8 @@ class GitInterface:
                 raise NotGitRepositoryError("Not a git repository")
             
             cmd = ['git', 'merge', '--continue']
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            self.invalidate_context()
+            result = _run_git(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 raise GitCommandError(f"Git merge --continue failed: {result.stderr}")
@@ -1191,6 +1401,10 @@ class GitInterface:
         """
         Get detailed information about a branch.
         
+        The branch tip is read through the long-lived 'git cat-file'
+        helper, so this costs a single pooled lookup instead of running
+        'git show-branch', 'git log -1' and 'git branch -v'.
+        
         Args:
             branch_name (str): Name of the branch
             
@@ -1205,29 +1419,15 @@ class GitInterface:
             if not self.is_git_repository():
                 raise NotGitRepositoryError("Not a git repository")
             
-            # Get branch information
-            cmd = ['git', 'show-branch', '--sha1-name', branch_name]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise GitCommandError(f"Git show-branch failed: {result.stderr}")
-            
-            # Get last commit info
-            cmd = ['git', 'log', '--oneline', '-1', branch_name]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            last_commit = result.stdout.strip() if result.returncode == 0 else "Unknown"
+            # Resolve the branch tip to its commit object
+            commit = self.read_object(f"{branch_name}^{{commit}}")
+            if commit is None:
+                raise GitCommandError(f"Git branch lookup failed: unknown branch '{branch_name}'")
             
-            # Get branch status
-            cmd = ['git', 'branch', '-v']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            branch_status = "Unknown"
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if branch_name in line:
-                        branch_status = line.strip()
-                        break
+            # Same shape as 'git log --oneline -1' and 'git branch -v'
+            last_commit = f"{commit.oid[:7]} {self._get_commit_subject(commit.data)}".strip()
+            marker = '*' if branch_name == self.get_current_branch() else ' '
+            branch_status = f"{marker} {branch_name} {last_commit}"
             
             return {
                 "name": branch_name,
@@ -1247,6 +1447,23 @@ class GitInterface:
         except Exception as e:
             raise GitInterfaceError(f"Unexpected error in get_branch_info: {e}")
     
+    def _get_commit_subject(self, commit_data: Optional[bytes]) -> str:
+        """
+        Extract the subject line from a raw commit object.
+        
+        Args:
+            commit_data (Optional[bytes]): Raw commit object contents
+            
+        Returns:
+            str: First line of the commit message, empty if unavailable
+        """
+        if not commit_data:
+            return ""
+        
+        _, _, message = commit_data.partition(b'\n\n')
+        subject = message.split(b'\n', 1)[0]
+        return subject.decode('utf-8', errors='replace').strip()
+    
     def is_branch_mergeable(self, branch_name: str) -> bool:
         """
         Check if branch can be merged.
@@ -1291,3 +1508,70 @@ class GitInterface:
             raise
         except Exception as e:
             raise GitInterfaceError(f"Unexpected error in is_branch_mergeable: {e}")
+    
+    def get_object_info(self, name: str) -> Optional[GitObject]:
+        """
+        Get type and size of a Git object without reading it.
+        
+        Served by the long-lived 'git cat-file --batch-check' helper.
+        Equivalent to running 'git cat-file -t <name>' and
+        'git cat-file -s <name>'.
+        
+        Args:
+            name (str): Object name, ref or revision expression
+            
+        Returns:
+            Optional[GitObject]: Object id, type and size, or None if the
+                                 name does not resolve to an object
+            
+        Raises:
+            GitCommandError: If the git helper cannot be used
+        """
+        try:
+            with span('git cat-file --batch-check'):
+                return self._get_pool().object_info(name)
+        except (OSError, EOFError) as e:
+            raise GitCommandError(f"Git cat-file --batch-check failed: {e}")
+    
+    def read_object(self, name: str) -> Optional[GitObject]:
+        """
+        Read a Git object including its raw contents.
+        
+        Served by the long-lived 'git cat-file --batch' helper.
+        Equivalent to running 'git cat-file -p <name>'.
+        
+        Args:
+            name (str): Object name, ref or revision expression
+            
+        Returns:
+            Optional[GitObject]: Object with its contents in 'data', or
+                                 None if the name does not resolve
+            
+        Raises:
+            GitCommandError: If the git helper cannot be used
+            
+        Example:
+            blob = git.read_object("HEAD:README.md")
+            if blob:
+                print(blob.data.decode())
+        """
+        try:
+            with span('git cat-file --batch'):
+                return self._get_pool().read_object(name)
+        except (OSError, EOFError) as e:
+            raise GitCommandError(f"Git cat-file --batch failed: {e}")
+    
+    def ref_exists(self, ref: str) -> bool:
+        """
+        Check whether a ref or revision resolves to an object.
+        
+        Args:
+            ref (str): Full ref name (e.g. 'refs/heads/main') or revision
+            
+        Returns:
+            bool: True if the ref resolves, False otherwise
+        """
+        try:
+            return self.get_object_info(ref) is not None
+        except (GitCommandError, ValueError):
+            return False
@@ -0,0 +1,284 @@
+"""
+Repository context discovery for ggGit.
+
+This module resolves where the repository lives (git dir, work tree,
+common dir) and what HEAD points to, once per command. GitInterface
+keeps the resulting RepoContext and reuses it for every repository check
+until the working directory changes or a mutating operation runs.
+
+Discovery has two paths:
+1. Fast path - read '.git' and '.git/HEAD' directly from Python. Used
+   when no git environment override is set and the repository is owned
+   by the current user, so the answer is guaranteed to match git's.
+2. Slow path - ask git with a single 'git rev-parse' call. Used for
+   anything the fast path cannot vouch for (GIT_DIR overrides, foreign
+   ownership and safe.directory, unusual layouts).
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .utils.profiling import span
+
+
+# Environment variables that change how git locates the repository.
+# When any of them is set only git itself can give the right answer.
+GIT_LOCATION_ENV = (
+    'GIT_DIR',
+    'GIT_WORK_TREE',
+    'GIT_COMMON_DIR',
+    'GIT_CEILING_DIRECTORIES',
+    'GIT_DISCOVERY_ACROSS_FILESYSTEM',
+)
+
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+@dataclass(frozen=True)
+class RepoContext:
+    """
+    Location and HEAD of a repository, resolved once.
+
+    Attributes:
+        cwd (str): Working directory the context was resolved for
+        git_dir (str): Absolute path of the repository's git directory
+        common_dir (str): Absolute path shared by all worktrees (refs, objects)
+        work_tree (Optional[str]): Absolute work tree path, None for bare repos
+        head_ref (Optional[str]): Ref HEAD points to (e.g. 'refs/heads/main'),
+                                  None when HEAD is detached
+        head_oid (Optional[str]): Commit id of a detached HEAD, None otherwise
+
+    Example:
+        context = discover_repo_context()
+        if context and context.current_branch:
+            print(f"On {context.current_branch} in {context.work_tree}")
+    """
+    cwd: str
+    git_dir: str
+    common_dir: str
+    work_tree: Optional[str]
+    head_ref: Optional[str]
+    head_oid: Optional[str] = None
+
+    @property
+    def current_branch(self) -> Optional[str]:
+        """Short name of the checked out branch, None when detached."""
+        if self.head_ref and self.head_ref.startswith('refs/heads/'):
+            return self.head_ref[len('refs/heads/'):]
+        return None
+
+    @property
+    def is_detached(self) -> bool:
+        """Whether HEAD points directly to a commit."""
+        return self.head_ref is None
+
+
+def discover_repo_context(cwd: Optional[str] = None) -> Optional[RepoContext]:
+    """
+    Resolve the repository context for a directory.
+
+    Only directories that contain '.git' themselves are considered,
+    matching GitInterface.is_git_repository(), which expects commands to
+    run from the repository root.
+
+    Args:
+        cwd (Optional[str]): Directory to resolve, defaults to os.getcwd()
+
+    Returns:
+        Optional[RepoContext]: Resolved context, or None if the directory
+                               is not a valid Git repository
+    """
+    cwd = cwd or os.getcwd()
+    if not os.path.lexists(os.path.join(cwd, '.git')):
+        return None
+
+    context = read_repo_context_fast(cwd)
+    if context is not None:
+        return context
+    return read_repo_context_slow(cwd)
+
+
+def read_repo_context_fast(cwd: str) -> Optional[RepoContext]:
+    """
+    Resolve the context by reading '.git' and 'HEAD' from disk.
+
+    Returns None whenever the result could differ from git's own answer,
+    so callers can fall back to read_repo_context_slow().
+
+    Args:
+        cwd (str): Directory containing '.git'
+
+    Returns:
+        Optional[RepoContext]: Context, or None if the fast path is not safe
+    """
+    if any(os.environ.get(name) for name in GIT_LOCATION_ENV):
+        return None
+
+    dot_git = os.path.join(cwd, '.git')
+    try:
+        if os.path.isdir(dot_git) and not os.path.islink(dot_git):
+            git_dir = dot_git
+        elif os.path.isfile(dot_git):
+            git_dir = _read_gitfile(dot_git, cwd)
+            if git_dir is None:
+                return None
+        else:
+            return None
+
+        # git refuses repositories owned by someone else unless they are
+        # listed in safe.directory; leave that decision to git
+        if hasattr(os, 'getuid') and os.stat(git_dir).st_uid != os.getuid():
+            return None
+
+        common_dir = _read_common_dir(git_dir)
+        if not _looks_like_git_dir(git_dir, common_dir) or _uses_reftable(common_dir):
+            return None
+
+        head = _read_head(git_dir)
+        if head is None:
+            return None
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    head_ref, head_oid = head
+    return RepoContext(
+        cwd=cwd,
+        git_dir=os.path.abspath(git_dir),
+        common_dir=os.path.abspath(common_dir),
+        work_tree=cwd,
+        head_ref=head_ref,
+        head_oid=head_oid
+    )
+
+
+def read_repo_context_slow(cwd: str, timeout: int = 10) -> Optional[RepoContext]:
+    """
+    Resolve the context by asking git.
+
+    One 'git rev-parse' call locates the directories; HEAD is then read
+    from disk, or through git for reftable repositories whose HEAD file
+    is only a placeholder.
+
+    Args:
+        cwd (str): Directory to resolve
+        timeout (int): Seconds to wait for each git call
+
+    Returns:
+        Optional[RepoContext]: Context, or None if git does not consider
+                               the directory a repository
+    """
+    result = _run_git(['rev-parse', '--absolute-git-dir', '--git-common-dir', '--show-toplevel'],
+                      cwd, timeout)
+    if result is None:
+        return None
+
+    lines = result.splitlines()
+    if len(lines) < 2:
+        return None
+
+    git_dir = lines[0]
+    common_dir = os.path.abspath(os.path.join(cwd, lines[1]))
+    work_tree = lines[2] if len(lines) > 2 else None
+
+    head = None
+    if not _uses_reftable(common_dir):
+        try:
+            head = _read_head(git_dir)
+        except (OSError, UnicodeDecodeError):
+            head = None
+    if head is None:
+        head_ref = _run_git(['symbolic-ref', '-q', 'HEAD'], cwd, timeout)
+        head_oid = None if head_ref else _run_git(['rev-parse', '--verify', '-q', 'HEAD'], cwd, timeout)
+        head = (head_ref or None, head_oid or None)
+
+    return RepoContext(
+        cwd=cwd,
+        git_dir=git_dir,
+        common_dir=common_dir,
+        work_tree=work_tree,
+        head_ref=head[0],
+        head_oid=head[1]
+    )
+
+
+def _run_git(args: List[str], cwd: str, timeout: int) -> Optional[str]:
+    """Run a git plumbing command and return its stripped output, None on failure."""
+    try:
+        with span(f"git {args[0]}"):
+            result = subprocess.run(
+                ['git'] + args,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=cwd
+            )
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError):
+        return None
+
+    if result.returncode != 0:
+        return None
+    return (result.stdout or '').strip()
+
+
+def _read_gitfile(path: str, cwd: str) -> Optional[str]:
+    """Follow a 'gitdir: <path>' file (worktrees, submodules)."""
+    with open(path, 'r', encoding='utf-8') as handle:
+        content = handle.read().strip()
+
+    if not content.startswith('gitdir:'):
+        return None
+
+    target = content[len('gitdir:'):].strip()
+    if not target:
+        return None
+    return os.path.normpath(os.path.join(cwd, target))
+
+
+def _read_common_dir(git_dir: str) -> str:
+    """Get the directory holding shared refs and objects for a worktree."""
+    commondir_file = os.path.join(git_dir, 'commondir')
+    try:
+        with open(commondir_file, 'r', encoding='utf-8') as handle:
+            common = handle.read().strip()
+    except FileNotFoundError:
+        return git_dir
+
+    return os.path.normpath(os.path.join(git_dir, common))
+
+
+def _looks_like_git_dir(git_dir: str, common_dir: str) -> bool:
+    """Apply the same minimal checks git uses to accept a git directory."""
+    return (
+        os.path.isfile(os.path.join(git_dir, 'HEAD'))
+        and os.path.isdir(os.path.join(common_dir, 'objects'))
+        and os.path.isdir(os.path.join(common_dir, 'refs'))
+    )
+
+
+def _uses_reftable(common_dir: str) -> bool:
+    """Whether refs are stored in the reftable format (HEAD is a stub)."""
+    return os.path.isdir(os.path.join(common_dir, 'reftable'))
+
+
+def _read_head(git_dir: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    Parse the HEAD file.
+
+    Returns:
+        Optional[Tuple[Optional[str], Optional[str]]]: (ref, None) for a
+            symbolic HEAD, (None, oid) for a detached HEAD, or None if the
+            file has an unexpected format
+    """
+    with open(os.path.join(git_dir, 'HEAD'), 'r', encoding='utf-8') as handle:
+        content = handle.read().strip()
+
+    if content.startswith('ref:'):
+        ref = content[len('ref:'):].strip()
+        return (ref, None) if ref.startswith('refs/') else None
+
+    if len(content) in (40, 64) and set(content) <= _HEX_DIGITS:
+        return (None, content)
+
+    return None
@@ -0,0 +1,238 @@
+"""
+Long-lived git helper processes for ggGit.
+
+This module keeps a small pool of persistent ``git cat-file`` processes
+that speak git's batch protocol. GitInterface uses them for object and
+ref lookups so that repeated queries within a command reuse an already
+running git process instead of forking a new one for every call.
+
+Two helpers are managed per repository:
+1. ``git cat-file --batch-check`` - object existence, type and size
+2. ``git cat-file --batch`` - object contents (commits, blobs, trees)
+
+Helpers are started lazily on first use and stopped with close(). They
+only read from the object database, so they never hold the index lock
+and can safely live alongside mutating git commands.
+"""
+
+import os
+import subprocess
+import threading
+from typing import Dict, NamedTuple, Optional
+
+
+class GitObject(NamedTuple):
+    """Object returned by a batch helper."""
+    oid: str
+    type: str
+    size: int
+    data: Optional[bytes] = None
+
+
+class CatFileProcess:
+    """
+    Persistent ``git cat-file`` process speaking the batch protocol.
+
+    Each query writes one object name to the helper's stdin and reads
+    the header (and the contents in ``--batch`` mode) from its stdout.
+    Queries are serialized with a lock so the helper can be shared
+    between threads.
+
+    Attributes:
+        with_contents (bool): True for ``--batch``, False for ``--batch-check``
+        cwd (str): Working directory the helper runs in
+
+    Example:
+        helper = CatFileProcess(with_contents=False)
+        info = helper.query("HEAD")
+        print(info.oid, info.type, info.size)
+        helper.close()
+    """
+
+    def __init__(self, with_contents: bool = False, cwd: Optional[str] = None):
+        """
+        Initialize the helper without starting the git process.
+
+        Args:
+            with_contents (bool): Whether to read object contents
+            cwd (Optional[str]): Working directory for the git process
+        """
+        self.with_contents = with_contents
+        self.cwd = cwd
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the underlying git process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """
+        Start the git process if it is not already running.
+
+        Raises:
+            OSError: If the git process cannot be started
+        """
+        if self.is_running:
+            return
+
+        mode = '--batch' if self.with_contents else '--batch-check'
+        self._process = subprocess.Popen(
+            ['git', 'cat-file', mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.cwd
+        )
+
+    def query(self, name: str) -> Optional[GitObject]:
+        """
+        Look up an object by name (sha, ref or any revision expression).
+
+        A helper that died in between queries is restarted once before
+        the error is propagated.
+
+        Args:
+            name (str): Object name understood by 'git rev-parse'
+
+        Returns:
+            Optional[GitObject]: Object information, or None if the name
+                                 does not resolve to a single object
+
+        Raises:
+            ValueError: If name contains a newline
+            OSError: If the git process cannot be started or talked to
+        """
+        if '\n' in name or '\r' in name:
+            raise ValueError("Object names cannot contain newlines")
+
+        with self._lock:
+            try:
+                return self._query(name)
+            except (BrokenPipeError, ConnectionResetError, EOFError):
+                self._terminate()
+                return self._query(name)
+
+    def _query(self, name: str) -> Optional[GitObject]:
+        """Send one request and parse the reply. Caller holds the lock."""
+        self.start()
+        process = self._process
+
+        process.stdin.write(name.encode('utf-8') + b'\n')
+        process.stdin.flush()
+
+        header = process.stdout.readline()
+        if not header:
+            raise EOFError("git cat-file terminated unexpectedly")
+
+        parts = header.decode('utf-8', errors='replace').rstrip('\n').split(' ')
+        if len(parts) != 3 or parts[-1] in ('missing', 'ambiguous'):
+            return None
+
+        oid, obj_type, size_text = parts
+        size = int(size_text)
+
+        data = None
+        if self.with_contents:
+            data = process.stdout.read(size + 1)[:size]
+
+        return GitObject(oid, obj_type, size, data)
+
+    def close(self) -> None:
+        """Stop the git process."""
+        with self._lock:
+            self._terminate()
+
+    def _terminate(self) -> None:
+        """Close pipes and reap the process. Caller holds the lock."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+        if process.stdout:
+            process.stdout.close()
+
+
+class GitProcessPool:
+    """
+    Pool of long-lived git helpers bound to one working directory.
+
+    The pool owns at most one helper per kind and starts each of them
+    on first use. GitInterface creates a pool lazily and replaces it
+    when the working directory changes.
+
+    Attributes:
+        cwd (str): Working directory the helpers run in
+
+    Example:
+        pool = GitProcessPool()
+        if pool.object_info("refs/heads/main"):
+            commit = pool.read_object("main^{commit}")
+        pool.close()
+    """
+
+    def __init__(self, cwd: Optional[str] = None):
+        """
+        Initialize an empty pool.
+
+        Args:
+            cwd (Optional[str]): Working directory, defaults to os.getcwd()
+        """
+        self.cwd = cwd or os.getcwd()
+        self._helpers: Dict[str, CatFileProcess] = {}
+        self._lock = threading.Lock()
+
+    def _get_helper(self, with_contents: bool) -> CatFileProcess:
+        """Return the helper for the requested mode, creating it if needed."""
+        kind = 'batch' if with_contents else 'batch-check'
+        with self._lock:
+            helper = self._helpers.get(kind)
+            if helper is None:
+                helper = CatFileProcess(with_contents=with_contents, cwd=self.cwd)
+                self._helpers[kind] = helper
+            return helper
+
+    def object_info(self, name: str) -> Optional[GitObject]:
+        """
+        Get object id, type and size without reading its contents.
+
+        Args:
+            name (str): Object name or revision expression
+
+        Returns:
+            Optional[GitObject]: Object information (data is None) or None
+        """
+        return self._get_helper(with_contents=False).query(name)
+
+    def read_object(self, name: str) -> Optional[GitObject]:
+        """
+        Get an object including its raw contents.
+
+        Args:
+            name (str): Object name or revision expression
+
+        Returns:
+            Optional[GitObject]: Object with data populated, or None
+        """
+        return self._get_helper(with_contents=True).query(name)
+
+    def close(self) -> None:
+        """Stop every helper owned by the pool."""
+        with self._lock:
+            helpers = list(self._helpers.values())
+            self._helpers.clear()
+
+        for helper in helpers:
+            helper.close()
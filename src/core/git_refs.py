@@ -0,0 +1,293 @@
+"""
+Pure-Python ref reader for ggGit.
+
+This module reads HEAD, loose refs and 'packed-refs' straight from the
+git directory so that branch listings and existence checks do not need
+to fork git. Every file and directory read is cached and keyed by its
+stat information (mtime, size, inode); git updates refs by renaming a
+lock file into place, which always changes those values, so a cached
+answer is reused only while the on-disk state is unchanged.
+
+Repositories using the reftable backend store refs in a binary format
+this module does not read. RefStore.supported is False for them and
+GitInterface falls back to git commands.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .git_context import RepoContext
+
+
+# Stat fields that change whenever git rewrites or renames a file
+StatKey = Tuple[int, int, int]
+
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+# Directories modified this recently are not cached: coarse filesystem
+# timestamps could hide a second change made within the same tick
+_RACY_WINDOW_NS = 2 * 1_000_000_000
+
+
+def _stat_key(path: str) -> Optional[StatKey]:
+    """Get the cache key for a path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _is_oid(value: str) -> bool:
+    """Whether value is a full SHA-1 or SHA-256 object id."""
+    return len(value) in (40, 64) and set(value) <= _HEX_DIGITS
+
+
+class RefStore:
+    """
+    Reader for HEAD, loose refs and packed refs of one repository.
+
+    Loose refs take precedence over packed refs, as in git. Symbolic refs
+    (such as refs/remotes/origin/HEAD) are reported with their target
+    prefixed by 'ref: ' instead of an object id.
+
+    Attributes:
+        git_dir (str): Git directory holding HEAD (per worktree)
+        common_dir (str): Directory holding refs and packed-refs
+
+    Example:
+        refs = RefStore.from_context(git.get_repo_context())
+        if refs.supported:
+            print(refs.current_branch(), refs.branches())
+    """
+
+    def __init__(self, git_dir: str, common_dir: Optional[str] = None):
+        """
+        Initialize the reader without touching the disk.
+
+        Args:
+            git_dir (str): Git directory of the worktree
+            common_dir (Optional[str]): Shared git directory, defaults to git_dir
+        """
+        self.git_dir = git_dir
+        self.common_dir = common_dir or git_dir
+        self._head_cache: Optional[Tuple[StatKey, Tuple[Optional[str], Optional[str]]]] = None
+        self._packed_cache: Optional[Tuple[StatKey, Dict[str, str]]] = None
+        self._loose_cache: Dict[str, Tuple[Dict[str, Optional[StatKey]], Dict[str, str]]] = {}
+
+    @classmethod
+    def from_context(cls, context: RepoContext) -> 'RefStore':
+        """
+        Create a reader for a resolved repository context.
+
+        Args:
+            context (RepoContext): Repository context
+
+        Returns:
+            RefStore: Reader bound to the context's directories
+        """
+        return cls(context.git_dir, context.common_dir)
+
+    @property
+    def supported(self) -> bool:
+        """Whether refs are stored in the files backend this class reads."""
+        return (
+            not os.path.isdir(os.path.join(self.common_dir, 'reftable'))
+            and os.path.isdir(os.path.join(self.common_dir, 'refs'))
+        )
+
+    def head(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Read HEAD.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (ref, None) when HEAD points
+                to a branch, (None, oid) when detached, (None, None) if HEAD
+                cannot be read
+        """
+        path = os.path.join(self.git_dir, 'HEAD')
+        key = _stat_key(path)
+        if key is None:
+            return (None, None)
+        if self._head_cache is not None and self._head_cache[0] == key:
+            return self._head_cache[1]
+
+        value = self._read_ref_file(path)
+        if value is None:
+            head: Tuple[Optional[str], Optional[str]] = (None, None)
+        elif value.startswith('ref: '):
+            head = (value[len('ref: '):], None)
+        else:
+            head = (None, value)
+
+        self._head_cache = (key, head)
+        return head
+
+    def current_branch(self) -> Optional[str]:
+        """
+        Get the checked out branch.
+
+        Returns:
+            Optional[str]: Branch name, or None when HEAD is detached
+        """
+        ref, _ = self.head()
+        if ref and ref.startswith('refs/heads/'):
+            return ref[len('refs/heads/'):]
+        return None
+
+    def refs(self, prefix: str) -> Dict[str, str]:
+        """
+        Get every ref under a prefix.
+
+        Args:
+            prefix (str): Ref namespace ending in '/', e.g. 'refs/heads/'
+
+        Returns:
+            Dict[str, str]: Full ref name mapped to object id (or 'ref: <target>')
+        """
+        result = {
+            name: value for name, value in self._packed_refs().items()
+            if name.startswith(prefix)
+        }
+        result.update(self._loose_refs(prefix))
+        return result
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """
+        Resolve a full ref name to an object id, following symbolic refs.
+
+        Args:
+            ref (str): Full ref name, e.g. 'refs/heads/main'
+
+        Returns:
+            Optional[str]: Object id, or None if the ref does not exist
+        """
+        for _ in range(5):
+            value = self._read_ref_file(os.path.join(self.common_dir, ref))
+            if value is None:
+                value = self._packed_refs().get(ref)
+            if value is None or not value.startswith('ref: '):
+                return value
+            ref = value[len('ref: '):]
+        return None
+
+    def branches(self) -> List[str]:
+        """
+        Get local branch names, sorted like 'git branch'.
+
+        Returns:
+            List[str]: Short branch names
+        """
+        return sorted(name[len('refs/heads/'):] for name in self.refs('refs/heads/'))
+
+    def remote_branches(self) -> List[str]:
+        """
+        Get remote-tracking branch names, sorted like 'git branch -r'.
+
+        Symbolic '<remote>/HEAD' refs are left out.
+
+        Returns:
+            List[str]: Short names such as 'origin/main'
+        """
+        names = (name[len('refs/remotes/'):] for name in self.refs('refs/remotes/'))
+        return sorted(name for name in names if not name.endswith('/HEAD'))
+
+    def branch_exists(self, branch_name: str) -> bool:
+        """
+        Check whether a local branch exists.
+
+        Args:
+            branch_name (str): Short branch name
+
+        Returns:
+            bool: True if refs/heads/<branch_name> exists
+        """
+        if not branch_name or '..' in branch_name or branch_name.startswith('/'):
+            return False
+
+        ref = f"refs/heads/{branch_name}"
+        if os.path.isfile(os.path.join(self.common_dir, ref)):
+            return True
+        return ref in self._packed_refs()
+
+    def _read_ref_file(self, path: str) -> Optional[str]:
+        """Read a loose ref or HEAD file; None if missing or malformed."""
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                value = handle.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        if value.startswith('ref:'):
+            target = value[len('ref:'):].strip()
+            return f"ref: {target}" if target else None
+        return value if _is_oid(value) else None
+
+    def _packed_refs(self) -> Dict[str, str]:
+        """Parse packed-refs, reusing the previous parse while the file is unchanged."""
+        path = os.path.join(self.common_dir, 'packed-refs')
+        key = _stat_key(path)
+        if key is None:
+            self._packed_cache = None
+            return {}
+        if self._packed_cache is not None and self._packed_cache[0] == key:
+            return self._packed_cache[1]
+
+        packed: Dict[str, str] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                for line in handle:
+                    # Skip the '# pack-refs with:' header and '^<oid>' peeled lines
+                    if line.startswith(('#', '^')):
+                        continue
+                    oid, _, name = line.rstrip('\n').partition(' ')
+                    if name and _is_oid(oid):
+                        packed[name] = oid
+        except (OSError, UnicodeDecodeError):
+            return {}
+
+        self._packed_cache = (key, packed)
+        return packed
+
+    def _loose_refs(self, prefix: str) -> Dict[str, str]:
+        """
+        Read loose refs under a prefix.
+
+        The result is reused while none of the directories under the
+        prefix changed; updating, creating or deleting a ref always
+        renames or unlinks an entry and so bumps its directory's mtime.
+        Listings of directories changed within the last seconds are not
+        cached, in the same spirit as git's racy-index check.
+        """
+        cached = self._loose_cache.get(prefix)
+        if cached is not None:
+            dir_keys, refs = cached
+            if all(_stat_key(path) == key for path, key in dir_keys.items()):
+                return refs
+
+        scan_started = time.time_ns()
+        root = os.path.join(self.common_dir, *prefix.rstrip('/').split('/'))
+        dir_keys: Dict[str, Optional[StatKey]] = {root: _stat_key(root)}
+        refs: Dict[str, str] = {}
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            for dirname in dirnames:
+                path = os.path.join(dirpath, dirname)
+                dir_keys[path] = _stat_key(path)
+            relative = os.path.relpath(dirpath, root)
+            for filename in filenames:
+                if filename.endswith('.lock'):
+                    continue
+                value = self._read_ref_file(os.path.join(dirpath, filename))
+                if value is None:
+                    continue
+                name = filename if relative == '.' else f"{relative}/{filename}"
+                refs[prefix + name.replace(os.sep, '/')] = value
+
+        newest = max((key[0] for key in dir_keys.values() if key), default=0)
+        if newest < scan_started - _RACY_WINDOW_NS:
+            self._loose_cache[prefix] = (dir_keys, refs)
+        else:
+            self._loose_cache.pop(prefix, None)
+        return refs
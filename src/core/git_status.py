@@ -0,0 +1,235 @@
+"""
+Repository status snapshot for ggGit.
+
+This module parses the output of a single
+'git status --porcelain=v2 -z --branch --untracked-files=all' call into
+an immutable RepositoryStatus snapshot. Commands and the complexity
+analyzer read branch, ahead/behind and file lists from the snapshot
+instead of issuing one git process per question.
+
+Porcelain v2 records (NUL terminated with -z):
+    # branch.oid <commit> | (initial)
+    # branch.head <branch> | (detached)
+    # branch.upstream <upstream>
+    # branch.ab +<ahead> -<behind>
+    1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+    2 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <score> <path> NUL <origPath>
+    u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+    ? <path>
+    ! <path>
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StatusEntry:
+    """
+    One changed path in the repository.
+
+    Attributes:
+        path (str): Path relative to the repository root
+        index_status (str): Status against HEAD ('M', 'A', 'D', 'R', ... or '.')
+        worktree_status (str): Status against the index ('M', 'D', ... or '.')
+        orig_path (Optional[str]): Original path for renames and copies
+    """
+    path: str
+    index_status: str
+    worktree_status: str
+    orig_path: Optional[str] = None
+
+    @property
+    def is_staged(self) -> bool:
+        """Whether the entry has changes in the index."""
+        return self.index_status != '.'
+
+    @property
+    def is_unstaged(self) -> bool:
+        """Whether the entry has changes in the working tree."""
+        return self.worktree_status != '.'
+
+
+@dataclass(frozen=True)
+class RepositoryStatus:
+    """
+    Immutable snapshot of the repository state.
+
+    Attributes:
+        current_branch (Optional[str]): Checked out branch, None if detached
+        head_oid (Optional[str]): Commit id of HEAD, None before the first commit
+        upstream (Optional[str]): Upstream branch, None if not configured
+        ahead (int): Commits ahead of upstream
+        behind (int): Commits behind upstream
+        staged (Tuple[StatusEntry, ...]): Entries with changes in the index
+        unstaged (Tuple[StatusEntry, ...]): Tracked entries changed in the working tree
+        untracked (Tuple[str, ...]): Untracked paths
+        conflicted (Tuple[StatusEntry, ...]): Unmerged entries
+
+    Example:
+        status = git.get_repository_status()
+        if status.has_staged:
+            print(f"{len(status.staged_files)} files ready on {status.current_branch}")
+    """
+    current_branch: Optional[str] = None
+    head_oid: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    staged: Tuple[StatusEntry, ...] = field(default_factory=tuple)
+    unstaged: Tuple[StatusEntry, ...] = field(default_factory=tuple)
+    untracked: Tuple[str, ...] = field(default_factory=tuple)
+    conflicted: Tuple[StatusEntry, ...] = field(default_factory=tuple)
+
+    @property
+    def staged_files(self) -> List[str]:
+        """Paths staged for commit (same as 'git diff --cached --name-only')."""
+        return [entry.path for entry in self.staged]
+
+    @property
+    def unstaged_files(self) -> List[str]:
+        """Tracked paths modified in the working tree (same as 'git diff --name-only')."""
+        return [entry.path for entry in self.unstaged + self.conflicted]
+
+    @property
+    def untracked_files(self) -> List[str]:
+        """Untracked paths (same as 'git ls-files --others --exclude-standard')."""
+        return list(self.untracked)
+
+    @property
+    def working_tree_files(self) -> List[str]:
+        """Unstaged and untracked paths, matching GitInterface.get_unstaged_files()."""
+        return self.unstaged_files + self.untracked_files
+
+    @property
+    def conflicted_files(self) -> List[str]:
+        """Paths with unresolved merge conflicts."""
+        return [entry.path for entry in self.conflicted]
+
+    @property
+    def has_staged(self) -> bool:
+        """Whether there is anything staged."""
+        return bool(self.staged)
+
+    @property
+    def is_clean(self) -> bool:
+        """Whether the working tree and index match HEAD."""
+        return not (self.staged or self.unstaged or self.untracked or self.conflicted)
+
+    def files_to_analyze(self) -> List[str]:
+        """
+        Files the AI and complexity analysis should look at.
+
+        Staged files take priority; without them the working tree
+        changes are used, mirroring GitInterface.get_files_to_analyze().
+
+        Returns:
+            List[str]: Files to analyze
+        """
+        return self.staged_files if self.staged else self.working_tree_files
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the snapshot to a plain dictionary.
+
+        Returns:
+            Dict[str, Any]: Snapshot with list values, suitable for YAML/JSON
+        """
+        return {
+            'current_branch': self.current_branch,
+            'head_oid': self.head_oid,
+            'upstream': self.upstream,
+            'ahead': self.ahead,
+            'behind': self.behind,
+            'staged_files': self.staged_files,
+            'unstaged_files': self.unstaged_files,
+            'untracked_files': self.untracked_files,
+            'conflicted_files': self.conflicted_files,
+            'is_clean': self.is_clean
+        }
+
+
+def parse_porcelain_v2(output: bytes) -> RepositoryStatus:
+    """
+    Parse 'git status --porcelain=v2 -z --branch' output.
+
+    Args:
+        output (bytes): Raw NUL separated output from git
+
+    Returns:
+        RepositoryStatus: Immutable snapshot of the parsed status
+
+    Raises:
+        ValueError: If a record is malformed
+    """
+    branch: Optional[str] = None
+    head_oid: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead = behind = 0
+    staged: List[StatusEntry] = []
+    unstaged: List[StatusEntry] = []
+    untracked: List[str] = []
+    conflicted: List[StatusEntry] = []
+
+    records = output.split(b'\0')
+    index = 0
+    while index < len(records):
+        record = records[index].decode('utf-8', errors='surrogateescape')
+        index += 1
+        if not record:
+            continue
+
+        kind = record[0]
+        if kind == '#':
+            header, _, value = record[2:].partition(' ')
+            if header == 'branch.oid':
+                head_oid = None if value == '(initial)' else value
+            elif header == 'branch.head':
+                branch = None if value == '(detached)' else value
+            elif header == 'branch.upstream':
+                upstream = value
+            elif header == 'branch.ab':
+                ahead_text, behind_text = value.split(' ')
+                ahead, behind = int(ahead_text), abs(int(behind_text))
+        elif kind == '1':
+            fields = record.split(' ', 8)
+            if len(fields) != 9:
+                raise ValueError(f"Malformed status record: {record!r}")
+            entry = StatusEntry(fields[8], fields[1][0], fields[1][1])
+            _classify(entry, staged, unstaged)
+        elif kind == '2':
+            fields = record.split(' ', 9)
+            if len(fields) != 10 or index >= len(records):
+                raise ValueError(f"Malformed status record: {record!r}")
+            orig_path = records[index].decode('utf-8', errors='surrogateescape')
+            index += 1
+            entry = StatusEntry(fields[9], fields[1][0], fields[1][1], orig_path)
+            _classify(entry, staged, unstaged)
+        elif kind == 'u':
+            fields = record.split(' ', 10)
+            if len(fields) != 11:
+                raise ValueError(f"Malformed status record: {record!r}")
+            conflicted.append(StatusEntry(fields[10], fields[1][0], fields[1][1]))
+        elif kind == '?':
+            untracked.append(record[2:])
+        # '!' (ignored) records are only emitted with --ignored; skip them
+
+    return RepositoryStatus(
+        current_branch=branch,
+        head_oid=head_oid,
+        upstream=upstream,
+        ahead=ahead,
+        behind=behind,
+        staged=tuple(staged),
+        unstaged=tuple(unstaged),
+        untracked=tuple(untracked),
+        conflicted=tuple(conflicted)
+    )
+
+
+def _classify(entry: StatusEntry, staged: List[StatusEntry], unstaged: List[StatusEntry]) -> None:
+    """Add an ordinary or renamed entry to the staged and/or unstaged lists."""
+    if entry.is_staged:
+        staged.append(entry)
+    if entry.is_unstaged:
+        unstaged.append(entry)
@@ -0,0 +1,148 @@
+"""
+Compiled JSON schema validators for ggGit.
+
+jsonschema.validate() picks a validator class, checks the schema itself
+and builds a new validator on every call, and ConfigManager used to
+parse the schema YAML each time as well. This module keeps, for the
+life of the process:
+
+- parsed schema files, keyed by path and reused while the file's stat
+  information is unchanged
+- compiled validators, one per schema (or sub-schema) object
+
+and can pick the sub-schema for a dotted configuration key, so a single
+changed value is checked against the part of the schema that describes
+it instead of revalidating the whole configuration.
+
+jsonschema and yaml are imported on first use.
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+
+# path -> ((mtime_ns, size), parsed schema)
+_schema_files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+# id(schema) -> (schema, validator); the schema is kept so the id stays valid
+_validators: Dict[int, Tuple[Dict[str, Any], Any]] = {}
+
+
+def load_schema_file(path: str) -> Any:
+    """
+    Parse a YAML schema file, reusing the previous parse if unchanged.
+
+    Args:
+        path (str): Path to the schema file
+
+    Returns:
+        Any: Parsed schema
+
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _schema_files.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    import yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = yaml.safe_load(f)
+    _schema_files[path] = (key, schema)
+    return schema
+
+
+def get_validator(schema: Dict[str, Any]) -> Any:
+    """
+    Get the compiled validator for a schema.
+
+    The schema is checked against its metaschema once, when its validator
+    is first built.
+
+    Args:
+        schema (Dict[str, Any]): JSON schema
+
+    Returns:
+        jsonschema.protocols.Validator: Validator for the schema
+
+    Raises:
+        jsonschema.SchemaError: If the schema itself is invalid
+    """
+    cached = _validators.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    import jsonschema
+
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+    _validators[id(schema)] = (schema, validator)
+    return validator
+
+
+def validate(instance: Any, schema: Dict[str, Any]) -> None:
+    """
+    Validate an instance like jsonschema.validate, with a cached validator.
+
+    Args:
+        instance (Any): Value to validate
+        schema (Dict[str, Any]): JSON schema
+
+    Raises:
+        jsonschema.ValidationError: Most relevant error, if any
+    """
+    from jsonschema.exceptions import best_match
+
+    error = best_match(get_validator(schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def get_subschema(schema: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the sub-schema describing a dotted configuration key.
+
+    Args:
+        schema (Dict[str, Any]): Root object schema
+        key (str): Dot notation key, e.g. 'ai.analysis.max_files'
+
+    Returns:
+        Optional[Dict[str, Any]]: Sub-schema, {} if the key is allowed
+                                  without constraints, or None if the key
+                                  cannot be checked on its own (it is not
+                                  allowed here, or the schema uses $ref)
+
+    Example:
+        >>> get_subschema({'properties': {'a': {'type': 'integer'}}}, 'a')
+        {'type': 'integer'}
+    """
+    current = schema
+    for part in key.split('.'):
+        if not isinstance(current, dict):
+            return None
+        properties = current.get('properties', {})
+        if part in properties:
+            current = properties[part]
+            continue
+        additional = current.get('additionalProperties', True)
+        if additional is False:
+            return None
+        current = additional if isinstance(additional, dict) else {}
+
+    if not isinstance(current, dict) or _has_ref(current):
+        return None
+    return current
+
+
+def _has_ref(schema: Any) -> bool:
+    """Whether a schema refers to other parts of its document."""
+    if isinstance(schema, dict):
+        return '$ref' in schema or any(_has_ref(value) for value in schema.values())
+    if isinstance(schema, list):
+        return any(_has_ref(value) for value in schema)
+    return False
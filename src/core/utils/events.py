@@ -0,0 +1,283 @@
+"""
+Structured command events for ggGit.
+
+With the event log enabled, BaseCommand.run() appends one JSON object
+per command invocation to ~/.gggit/logs/events.log:
+
+    {"v": 1, "time": "2026-03-02T10:15:04.120", "command": "ggs",
+     "argv": [], "repo": "/home/ana/src/app", "exit_code": 0,
+     "wall_ms": 41.2, "cpu_ms": 30.1, "child_cpu_ms": 6.0,
+     "git_calls": 2, "git_ms": 9.8, "ai_calls": 0, "ai_ms": 0.0}
+
+The fields of each schema version are listed in EVENT_FIELDS. Fields
+are never renamed or given another meaning; a change that needs it
+bumps EVENT_SCHEMA_VERSION ("v"), so collectors can tell the formats
+apart. Timing fields come from the spans recorded by core.utils.profiling
+during the command: git_calls counts the git commands run (and requests
+sent to the long-lived cat-file helpers), ai_calls the requests sent to
+AI providers (a span may stand for a batch, see its 'requests' detail)
+and ai_ms the time spent waiting for them.
+
+The event log is off by default. logging.events: true turns it on for
+commands that load the configuration; GGGIT_EVENT_LOG=0 or 1 forces it
+off or on for every command.
+
+Events are read back as a stream: iter_events() yields them one at a
+time from the rotated segments (oldest first) and the current file,
+and summarize_events() folds them into per-command counters and
+histograms, so the log is never loaded whole.
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Version of the event layout, written as "v"
+EVENT_SCHEMA_VERSION = 1
+
+# Fields of each event, by schema version
+EVENT_FIELDS = {
+    1: ('v', 'time', 'command', 'argv', 'repo', 'exit_code', 'wall_ms', 'cpu_ms',
+        'child_cpu_ms', 'git_calls', 'git_ms', 'ai_calls', 'ai_ms'),
+}
+
+# File the events are written to, in the log directory
+EVENTS_FILE = 'events.log'
+
+# Span names counted as AI provider calls
+AI_SPANS = ('ai.generate', 'ai.summarize')
+
+
+def is_event_log_enabled(config_manager=None) -> bool:
+    """
+    Check if command events are written.
+
+    Args:
+        config_manager (Optional[ConfigManager]): Configuration management
+                                                  instance, None if the
+                                                  command did not load it
+
+    Returns:
+        bool: GGGIT_EVENT_LOG if set to 0 or 1, else logging.events
+              (default False)
+    """
+    forced = os.environ.get('GGGIT_EVENT_LOG')
+    if forced in ('0', '1'):
+        return forced == '1'
+    if config_manager is None:
+        return False
+    return config_manager.get_config('logging.events', False) is True
+
+
+def get_invocation(argv: Optional[List[str]] = None) -> Tuple[str, List[str]]:
+    """
+    Get the command name and arguments of this process.
+
+    Commands run as 'ggs ...' (alias or daemon), 'python ggs.py ...' or
+    'gg s ...'; all of them are reported as 'ggs'.
+
+    Args:
+        argv (Optional[List[str]]): Command line, defaults to sys.argv
+
+    Returns:
+        Tuple[str, List[str]]: Command name and its arguments
+    """
+    argv = list(sys.argv if argv is None else argv)
+    if not argv:
+        return '', []
+    name = os.path.splitext(os.path.basename(argv[0]))[0]
+    args = argv[1:]
+    if name == 'gg' and args and not args[0].startswith('-'):
+        name = os.path.splitext(os.path.basename(args[0]))[0]
+        name = name if name.startswith('gg') else f'gg{name}'
+        args = args[1:]
+    return name, args
+
+
+def build_command_event(command: str, args: List[str], repo: Optional[str], exit_code: Any,
+                        started: float, wall: float, cpu: float, child_cpu: float,
+                        spans: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Build the event of one command invocation.
+
+    Args:
+        command (str): Command name, e.g. 'ggs'
+        args (List[str]): Command arguments
+        repo (Optional[str]): Repository root, None outside a repository
+        exit_code (Any): Value returned by the command
+        started (float): time.time() at the start of the command
+        wall (float): Wall time in seconds
+        cpu (float): CPU seconds of this process
+        child_cpu (float): CPU seconds of finished child processes
+        spans (Iterable[SpanRecord]): Spans recorded during the command
+
+    Returns:
+        Dict[str, Any]: Event with the fields of EVENT_FIELDS
+    """
+    git_calls = ai_calls = 0
+    git_seconds = ai_seconds = 0.0
+    for item in spans:
+        if item.name.startswith('git'):
+            git_calls += 1
+            git_seconds += item.duration
+        elif item.name in AI_SPANS:
+            # Batched spans carry the number of requests they sent
+            ai_calls += (item.details or {}).get('requests', 1)
+            ai_seconds += item.duration
+
+    return {
+        'v': EVENT_SCHEMA_VERSION,
+        'time': datetime.fromtimestamp(started).isoformat(timespec='milliseconds'),
+        'command': command,
+        'argv': [str(arg) for arg in args],
+        'repo': repo,
+        'exit_code': exit_code if isinstance(exit_code, int) and not isinstance(exit_code, bool) else None,
+        'wall_ms': round(wall * 1000, 3),
+        'cpu_ms': round(cpu * 1000, 3),
+        'child_cpu_ms': round(child_cpu * 1000, 3),
+        'git_calls': git_calls,
+        'git_ms': round(git_seconds * 1000, 3),
+        'ai_calls': ai_calls,
+        'ai_ms': round(ai_seconds * 1000, 3)
+    }
+
+
+def get_event_files(log_dir: Path) -> List[Path]:
+    """
+    Get the event log and its rotated segments, oldest first.
+
+    Args:
+        log_dir (Path): Log directory
+
+    Returns:
+        List[Path]: events.log.N[.gz] by decreasing N, then events.log
+    """
+    pattern = re.compile(re.escape(EVENTS_FILE) + r'\.(\d+)(\.gz)?$')
+    segments = []
+    try:
+        entries = list(os.scandir(log_dir))
+    except OSError:
+        return []
+    for entry in entries:
+        match = pattern.match(entry.name)
+        if match:
+            segments.append((int(match.group(1)), Path(entry.path)))
+
+    files = [path for _, path in sorted(segments, reverse=True)]
+    current = Path(log_dir) / EVENTS_FILE
+    if current.exists():
+        files.append(current)
+    return files
+
+
+def iter_events(log_dir: Path, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read command events one at a time.
+
+    Segments last written before 'since' are skipped without being
+    opened; lines that are not valid events are ignored.
+
+    Args:
+        log_dir (Path): Log directory
+        since (Optional[float]): Only events at or after this time.time()
+
+    Yields:
+        Dict[str, Any]: Events in the order they were written
+    """
+    since_text = datetime.fromtimestamp(since).isoformat(timespec='milliseconds') if since else None
+
+    for path in get_event_files(log_dir):
+        try:
+            if since and path.stat().st_mtime < since:
+                continue
+            opener = gzip.open if path.suffix == '.gz' else open
+            with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(event, dict) or not isinstance(event.get('command'), str):
+                        continue
+                    if since_text and str(event.get('time', '')) < since_text:
+                        continue
+                    yield event
+        except (OSError, EOFError):
+            continue
+
+
+class CommandStats:
+    """
+    Counters of the events of one command.
+
+    Attributes:
+        runs (int): Invocations
+        failures (int): Invocations with a non-zero exit code
+        wall (Histogram): Wall time in ms
+        cpu_ms (float): CPU ms of ggGit, summed
+        git_calls (int): git calls, summed
+        ai_calls (int): AI provider calls, summed
+        ai (Histogram): AI wait in ms of the invocations that called a provider
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        from ..ai.usage_report import Histogram
+
+        self.runs = 0
+        self.failures = 0
+        self.wall = Histogram()
+        self.cpu_ms = 0.0
+        self.git_calls = 0
+        self.ai_calls = 0
+        self.ai = Histogram()
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """
+        Add an event.
+
+        Args:
+            event (Dict[str, Any]): Event from iter_events()
+        """
+        self.runs += 1
+        if event.get('exit_code') not in (0, None):
+            self.failures += 1
+        self.wall.add(_number(event.get('wall_ms')))
+        self.cpu_ms += _number(event.get('cpu_ms'))
+        self.git_calls += int(_number(event.get('git_calls')))
+        ai_calls = int(_number(event.get('ai_calls')))
+        if ai_calls:
+            self.ai_calls += ai_calls
+            self.ai.add(_number(event.get('ai_ms')))
+
+
+def summarize_events(events: Iterable[Dict[str, Any]]) -> Dict[str, CommandStats]:
+    """
+    Fold events into per-command counters.
+
+    Args:
+        events (Iterable[Dict[str, Any]]): Events, e.g. from iter_events()
+
+    Returns:
+        Dict[str, CommandStats]: Counters by command, most run first
+    """
+    stats: Dict[str, CommandStats] = {}
+    for event in events:
+        command = event['command']
+        if command not in stats:
+            stats[command] = CommandStats()
+        stats[command].add(event)
+    return dict(sorted(stats.items(), key=lambda item: (-item[1].runs, item[0])))
+
+
+def _number(value: Any) -> float:
+    """Get a numeric field, 0 when missing or invalid."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0.0
+    return float(value)
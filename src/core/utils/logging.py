@@ -11,13 +11,308 @@ provides specialized logging methods for different types of events.
 
 Log files are organized by date and include detailed context information
 to aid in debugging and monitoring command execution.
+
+Creating a LoggingManager does no file I/O. Loggers hand their records
+to a queue; a background thread (started by the first record) formats
+them and writes the log files, which are created when the first record
+for them arrives. A command never waits for the disk to log something,
+and a command that logs nothing never touches ~/.gggit/logs. Pending
+records are written when the process exits.
+
+Log files are rotated when they grow past logging.max_size_mb and, with
+logging.rotate_daily, when a new day starts. Rotated segments
+(main.log.1.gz, main.log.2.gz...) are gzip-compressed and at most
+logging.max_files of them are kept per log. Segments older than
+logging.retention_days are removed by a cleanup that runs at most once
+a day, in the background; a stamp file records when it last ran, so
+other invocations only stat that file.
 """
 
+import atexit
+import gzip
+import json
 import logging
 import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
+
+
+# Loggers whose records (JSON lines) go to their own file only
+PERFORMANCE_LOGGER = 'gggit.performance'
+EVENTS_LOGGER = 'gggit.events'
+JSON_LOGS = {PERFORMANCE_LOGGER: 'performance.log', EVENTS_LOGGER: 'events.log'}
+
+# Format of main.log, error.log and the console
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Files written by the log writer, never removed by the cleanup
+LOG_FILES = ('main.log', 'error.log') + tuple(JSON_LOGS.values())
+
+# Rotation and retention defaults (logging.* settings)
+DEFAULT_MAX_SIZE_MB = 5
+DEFAULT_MAX_FILES = 5
+DEFAULT_RETENTION_DAYS = 30
+
+# Minimum seconds between two automatic cleanups
+CLEANUP_INTERVAL = 24 * 60 * 60
+
+# File whose modification time is the last cleanup
+CLEANUP_STAMP = '.last-cleanup'
+
+
+def get_log_settings(config_manager=None) -> Dict[str, Any]:
+    """
+    Read the rotation and retention settings.
+    
+    Args:
+        config_manager (Optional[ConfigManager]): Configuration management
+                                                  instance, None for defaults
+        
+    Returns:
+        Dict[str, Any]: max_bytes, max_files, rotate_daily, compress and
+                        retention_days, with defaults for missing or
+                        invalid values
+    """
+    def get(key, default):
+        return default if config_manager is None else config_manager.get_config(key, default)
+    
+    def number(key, default, minimum):
+        value = get(key, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+            return default
+        return value
+    
+    def flag(key, default):
+        value = get(key, default)
+        return value if isinstance(value, bool) else default
+    
+    return {
+        'max_bytes': int(number('logging.max_size_mb', DEFAULT_MAX_SIZE_MB, 0) * 1024 * 1024),
+        'max_files': int(number('logging.max_files', DEFAULT_MAX_FILES, 1)),
+        'rotate_daily': flag('logging.rotate_daily', True),
+        'compress': flag('logging.compress', True),
+        'retention_days': number('logging.retention_days', DEFAULT_RETENTION_DAYS, 0)
+    }
+
+
+class _RotatingLogHandler(RotatingFileHandler):
+    """
+    File handler opening its file on the first record and rotating it.
+    
+    The file is rotated when it would grow past max_bytes or, with
+    rotate_daily, when it was last written on an earlier day.
+    """
+    
+    def __init__(self, filename: Path):
+        super().__init__(filename, maxBytes=DEFAULT_MAX_SIZE_MB * 1024 * 1024,
+                         backupCount=DEFAULT_MAX_FILES, encoding='utf-8', delay=True)
+        self.rotate_daily = True
+        self.compress = True
+        self._day: Optional[date] = None
+    
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """Apply the settings from get_log_settings()."""
+        self.maxBytes = settings['max_bytes']
+        self.backupCount = settings['max_files']
+        self.rotate_daily = settings['rotate_daily']
+        self.compress = settings['compress']
+    
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rotate_daily:
+            today = date.today()
+            if self._day is None:
+                try:
+                    self._day = date.fromtimestamp(os.stat(self.baseFilename).st_mtime)
+                except OSError:
+                    self._day = today
+            if self._day != today:
+                return True
+        return bool(super().shouldRollover(record))
+    
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._day = date.today()
+    
+    def rotation_filename(self, default_name: str) -> str:
+        return f"{default_name}.gz" if self.compress else default_name
+    
+    def rotate(self, source: str, dest: str) -> None:
+        if not self.compress:
+            super().rotate(source, dest)
+        elif os.path.exists(source):
+            with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(source)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Stream handler writing to the current sys.stderr."""
+    
+    @property
+    def stream(self):
+        return sys.stderr
+    
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _ExcludeFilter(logging.Filter):
+    """Filter rejecting the records of some loggers and their children."""
+    
+    def __init__(self, names):
+        super().__init__()
+        self._filters = [logging.Filter(name) for name in names]
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not any(f.filter(record) for f in self._filters)
+
+
+class _LogWriter:
+    """
+    Background writer of the log files of one log directory.
+    
+    Holds the file and console handlers and the QueueListener thread
+    feeding them. The thread is started by the first record and stopped
+    by flush(), which writes everything queued so far.
+    """
+    
+    def __init__(self, log_dir: Path):
+        self.log_dir = log_dir
+        self._lock = threading.Lock()
+        self._pid = None
+        
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        not_json = _ExcludeFilter(JSON_LOGS)
+        
+        # File handler for main logs
+        main_handler = _RotatingLogHandler(log_dir / 'main.log')
+        main_handler.setLevel(logging.DEBUG)
+        
+        # File handler for errors
+        error_handler = _RotatingLogHandler(log_dir / 'error.log')
+        error_handler.setLevel(logging.ERROR)
+        
+        # Console handler, level set by the LoggingManager
+        self.console_handler = _ConsoleHandler()
+        
+        for handler in (main_handler, error_handler, self.console_handler):
+            handler.setFormatter(formatter)
+            handler.addFilter(not_json)
+        
+        # File handlers for performance records and events, one JSON object per line
+        json_handlers = []
+        for logger_name, file_name in JSON_LOGS.items():
+            json_handler = _RotatingLogHandler(log_dir / file_name)
+            json_handler.setFormatter(logging.Formatter('%(message)s'))
+            json_handler.addFilter(logging.Filter(logger_name))
+            json_handlers.append(json_handler)
+        
+        self.handlers = [main_handler, error_handler, self.console_handler] + json_handlers
+        self.file_handlers = [main_handler, error_handler] + json_handlers
+        self._new_listener()
+    
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """Apply rotation settings from get_log_settings() to the files."""
+        for handler in self.file_handlers:
+            handler.configure(settings)
+    
+    def _new_listener(self) -> None:
+        """Create the queue and the (not yet started) listener."""
+        self.queue = queue.SimpleQueue()
+        self._listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self._started = False
+    
+    def put(self, record: logging.LogRecord) -> None:
+        """Queue a record, starting the writer thread if needed."""
+        if not self._started or self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Forked: the parent's thread does not exist here
+                    self._new_listener()
+                    self._pid = os.getpid()
+                if not self._started:
+                    self._listener.start()
+                    self._started = True
+        self.queue.put_nowait(record)
+    
+    def flush(self) -> None:
+        """Write the queued records and stop the thread until the next one."""
+        with self._lock:
+            if self._started and self._pid == os.getpid():
+                self._listener.stop()
+            self._started = False
+        for handler in self.handlers:
+            handler.flush()
+    
+    def close(self) -> None:
+        """Flush and close the log files."""
+        self.flush()
+        for handler in self.handlers:
+            handler.close()
+
+
+class _WriterQueueHandler(QueueHandler):
+    """Queue handler passing records to the current _LogWriter."""
+    
+    def __init__(self):
+        super().__init__(None)
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        _get_writer().put(record)
+
+
+_writer: Optional[_LogWriter] = None
+_writer_lock = threading.Lock()
+_queue_handler = _WriterQueueHandler()
+
+
+def _get_writer(log_dir: Optional[Path] = None) -> _LogWriter:
+    """
+    Get the log writer, replacing it if the log directory changed.
+    
+    Args:
+        log_dir (Optional[Path]): Log directory, defaults to the current
+                                  writer's, or ~/.gggit/logs
+        
+    Returns:
+        _LogWriter: The writer of log_dir
+    """
+    global _writer
+    with _writer_lock:
+        if log_dir is None:
+            log_dir = _writer.log_dir if _writer else Path.home() / ".gggit" / "logs"
+        if _writer is None or _writer.log_dir != log_dir:
+            if _writer is not None:
+                _writer.close()
+            _writer = _LogWriter(log_dir)
+        return _writer
+
+
+def flush_logs() -> None:
+    """
+    Write all queued log records.
+    
+    Called at exit; processes that end with os._exit() (daemon workers)
+    call it themselves.
+    """
+    if _writer is not None:
+        _writer.flush()
+
+
+atexit.register(flush_logs)
 
 
 class LoggingManager:
@@ -57,8 +352,8 @@ class LoggingManager:
         """
         Initialize logging manager.
         
-        Sets up the logging system with the specified log level and
-        creates the necessary log directory structure.
+        Sets up the logging system with the specified log level. The
+        log directory and files are created by the first record.
         
         Args:
             log_level (str): Initial logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -68,51 +363,29 @@ class LoggingManager:
         """
         self.log_level = log_level
         self.log_dir = Path.home() / ".gggit" / "logs"
+        self.retention_days = DEFAULT_RETENTION_DAYS
         self._setup_logging()
     
     def _setup_logging(self) -> None:
         """
         Setup logging configuration.
         
-        Creates the log directory and configures the logging system
-        with both file and console handlers. The configuration includes
-        timestamps, log levels, and structured formatting.
+        Configures the logging system to queue records for the background
+        writer of this log directory, which sends them to main.log,
+        error.log and the console. The configuration includes timestamps,
+        log levels, and structured formatting. No file is opened here.
         """
-        # Create log directory if it doesn't exist
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        # Get the writer of this log directory
+        writer = _get_writer(self.log_dir)
+        writer.console_handler.setLevel(getattr(logging, self.log_level.upper()))
         
         # Configure root logger
         root_logger = logging.getLogger('gggit')
         root_logger.setLevel(getattr(logging, self.log_level.upper()))
         
-        # Clear any existing handlers
+        # Replace any existing handlers with the queue handler
         root_logger.handlers.clear()
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        # File handler for main logs
-        main_log_file = self.log_dir / 'main.log'
-        file_handler = logging.FileHandler(main_log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
-        
-        # File handler for errors
-        error_log_file = self.log_dir / 'error.log'
-        error_handler = logging.FileHandler(error_log_file, encoding='utf-8')
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(formatter)
-        root_logger.addHandler(error_handler)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(getattr(logging, self.log_level.upper()))
-        console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        root_logger.addHandler(_queue_handler)
         
         # Prevent propagation to root logger
         root_logger.propagate = False
@@ -142,12 +415,9 @@ class LoggingManager:
         # Set level to match the logging manager
         logger.setLevel(getattr(logging, self.log_level.upper()))
         
-        # Don't add handlers if they already exist (prevent duplicates)
-        if not logger.handlers:
-            # Get the root gggit logger to inherit its handlers
-            root_logger = logging.getLogger('gggit')
-            for handler in root_logger.handlers:
-                logger.addHandler(handler)
+        # Always this module's handler: a copy of the module imported under
+        # another name (core.* and src.core.*) may have attached its own
+        logger.handlers = [_queue_handler]
         
         # Prevent propagation to avoid duplicate logs
         logger.propagate = False
@@ -180,13 +450,11 @@ class LoggingManager:
         root_logger.setLevel(getattr(logging, self.log_level))
         
         # Update console handler level
-        for handler in root_logger.handlers:
-            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
-                handler.setLevel(getattr(logging, self.log_level))
+        _get_writer(self.log_dir).console_handler.setLevel(getattr(logging, self.log_level))
         
         # Update all existing gggit.* loggers
         for logger_name in logging.Logger.manager.loggerDict:
-            if logger_name.startswith('gggit.'):
+            if logger_name.startswith('gggit.') and logger_name not in JSON_LOGS:
                 logger = logging.getLogger(logger_name)
                 logger.setLevel(getattr(logging, self.log_level))
     
@@ -253,25 +521,82 @@ class LoggingManager:
         Logs performance information for operations that may be
         slow or resource-intensive. Useful for monitoring and optimization.
         
+        Records go to their own file, performance.log, one JSON object
+        per line, so they can be processed without parsing the main log.
+        They are written whatever the configured log level is and never
+        reach the console.
+        
         Args:
             operation (str): Name of the operation
             duration (float): Duration in seconds
             details (Optional[Dict[str, Any]]): Additional performance details
             
         Example:
-            start_time = time.time()
+            start_time = time.perf_counter()
             # ... perform operation ...
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             logger.log_performance("git_commit", duration, {"files_count": 5})
+        """
+        # Get performance logger
+        logger = self._get_json_logger(PERFORMANCE_LOGGER)
+        
+        # Format performance metrics
+        record = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'operation': operation,
+            'duration_ms': round(duration * 1000, 3)
+        }
+        if details:
+            record.update(details)
+        
+        # Log with INFO level
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+    
+    def log_event(self, event: Dict[str, Any]) -> None:
+        """
+        Log a structured event.
+        
+        Events go to events.log, one JSON object per line, whatever the
+        configured log level is. See core.utils.events for the schema of
+        the command events written by BaseCommand.run().
+        
+        Args:
+            event (Dict[str, Any]): JSON-serializable event
             
-        Note:
-            This method will be implemented in STORY-1.2.3 - comandos base
+        Example:
+            logger.log_event({"v": 1, "command": "ggs", "exit_code": 0})
         """
-        # TODO: Implement performance logging
-        # 1. Get performance logger
-        # 2. Format performance metrics
-        # 3. Log with INFO level
-        pass
+        logger = self._get_json_logger(EVENTS_LOGGER)
+        logger.info(json.dumps(event, ensure_ascii=False, default=str))
+    
+    def _get_json_logger(self, name: str) -> logging.Logger:
+        """
+        Get a logger writing JSON lines to its own file.
+        
+        Args:
+            name (str): Logger name, a key of JSON_LOGS
+            
+        Returns:
+            logging.Logger: The logger, queueing its records for the
+                            background writer
+        """
+        logger = logging.getLogger(name)
+        if logger.handlers != [_queue_handler]:
+            logger.handlers = [_queue_handler]
+        
+        # Not affected by set_level(), only written to its own file
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        return logger
+    
+    def flush(self) -> None:
+        """
+        Write all queued records to the log files.
+        
+        Records are written by a background thread; this waits until
+        everything logged so far is on disk.
+        """
+        flush_logs()
     
     def log_config_change(self, key: str, old_value: Any, new_value: Any, level: str) -> None:
         """
@@ -306,31 +631,97 @@ class LoggingManager:
             log_type (str): Type of log file (main, error, performance, etc.)
             
         Returns:
-            Path: Path to the log file
-            
-        Note:
-            This method will be implemented in STORY-1.2.3 - comandos base
+            Path: Path to the log file being written; rotated segments
+                  sit next to it as <name>.log.1.gz, <name>.log.2.gz...
         """
-        # TODO: Implement log file path generation
-        # 1. Generate log file name based on type and date
-        # 2. Return full path to log file
         return self.log_dir / f"{log_type}.log"
     
-    def cleanup_old_logs(self, days_to_keep: int = 30) -> None:
+    def configure(self, config_manager) -> None:
+        """
+        Apply the logging.* settings and start the cleanup when due.
+        
+        Called by BaseCommand.run() after the command. Costs one stat()
+        of the cleanup stamp file unless a cleanup is due.
+        
+        Args:
+            config_manager (Optional[ConfigManager]): Configuration management
+                                                      instance, None for defaults
+        """
+        settings = get_log_settings(config_manager)
+        _get_writer(self.log_dir).configure(settings)
+        self.retention_days = settings['retention_days']
+        
+        if self.retention_days and self._is_cleanup_due():
+            # Not a daemon thread: the interpreter waits for it at exit
+            threading.Thread(target=self.cleanup_old_logs, args=(self.retention_days,),
+                             name='gggit-log-cleanup').start()
+    
+    def _is_cleanup_due(self) -> bool:
+        """
+        Check if the last cleanup is more than CLEANUP_INTERVAL ago.
+        
+        A due cleanup is claimed by touching the stamp file, so commands
+        started at the same time do not all clean up.
+        
+        Returns:
+            bool: True if this process should run the cleanup
+        """
+        stamp = self.log_dir / CLEANUP_STAMP
+        try:
+            if time.time() - stamp.stat().st_mtime < CLEANUP_INTERVAL:
+                return False
+        except FileNotFoundError:
+            if not self.log_dir.is_dir():
+                # Nothing logged yet, nothing to clean
+                return False
+        except OSError:
+            return False
+        
+        try:
+            stamp.touch()
+        except OSError:
+            return False
+        return True
+    
+    def cleanup_old_logs(self, days_to_keep: int = DEFAULT_RETENTION_DAYS) -> int:
         """
         Clean up old log files.
         
-        Removes log files older than the specified number of days
-        to prevent disk space issues.
+        Removes rotated segments and other log files not modified in the
+        specified number of days to prevent disk space issues. The files
+        being written (LOG_FILES) are kept;
+        rotation bounds their size.
         
         Args:
             days_to_keep (int): Number of days of logs to keep
             
-        Note:
-            This method will be implemented in STORY-1.2.3 - comandos base
+        Returns:
+            int: Number of files removed
         """
-        # TODO: Implement log cleanup
-        # 1. Find log files older than specified days
-        # 2. Remove old log files
-        # 3. Log cleanup activity
-        pass
+        cutoff = time.time() - days_to_keep * 24 * 60 * 60
+        removed = 0
+        
+        try:
+            entries = list(os.scandir(self.log_dir))
+        except OSError:
+            return 0
+        
+        # Find log files older than specified days
+        for entry in entries:
+            if entry.name in LOG_FILES or '.log' not in entry.name:
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        
+        # Record the cleanup
+        try:
+            (self.log_dir / CLEANUP_STAMP).touch()
+        except OSError:
+            pass
+        if removed:
+            self.get_logger("logs").debug(f"Removed {removed} log files older than {days_to_keep} days")
+        return removed
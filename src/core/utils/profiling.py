@@ -0,0 +1,234 @@
+"""
+Timing spans for ggGit.
+
+Hot paths (command execution, git subprocesses, configuration loading
+and AI provider calls) are wrapped in named spans. Each span records its
+start, duration and a few details in a per-process list; recording costs
+two perf_counter() calls and one list append.
+
+With GGGIT_PROFILE=1 in the environment, the phase breakdown is
+printed to stderr when the process exits, and BaseCommand.run() writes
+one performance record for the invocation through
+LoggingManager.log_performance(), with the time spent per phase. The
+record can also be turned on alone with logging.performance: true.
+
+Usage:
+    with span('git status'):
+        subprocess.run(['git', 'status'])
+
+    @timed('config.load')
+    def load():
+        ...
+"""
+
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+
+# Spans kept per process; later spans are counted but not stored
+MAX_SPANS = 10000
+
+# Time the ggGit core was first imported, the reference for 'startup'
+PROCESS_START = time.perf_counter()
+
+
+class SpanRecord(NamedTuple):
+    """A finished span."""
+    name: str
+    start: float
+    duration: float
+    depth: int
+    details: Optional[Dict[str, Any]] = None
+
+
+_spans: List[SpanRecord] = []
+_dropped = 0
+_local = threading.local()
+
+
+def is_profiling() -> bool:
+    """
+    Check if the phase breakdown is printed at exit.
+
+    Returns:
+        bool: True if GGGIT_PROFILE is set to a value other than '' or '0'
+    """
+    return os.environ.get('GGGIT_PROFILE', '') not in ('', '0')
+
+
+def is_performance_log_enabled(config_manager=None) -> bool:
+    """
+    Check if the performance record of a command is written.
+
+    Args:
+        config_manager (Optional[ConfigManager]): Configuration management
+                                                  instance, None if the
+                                                  command did not load it
+
+    Returns:
+        bool: True with GGGIT_PROFILE set, else logging.performance
+              (default False)
+    """
+    if is_profiling():
+        return True
+    if config_manager is None:
+        return False
+    return config_manager.get_config('logging.performance', False) is True
+
+
+@contextmanager
+def span(name: str, **details: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block of code.
+
+    Args:
+        name (str): Phase name, e.g. 'git status' or 'ai.generate'
+        **details: Values stored with the span
+
+    Yields:
+        Dict[str, Any]: The span details, to add values found inside the block
+    """
+    depth = getattr(_local, 'depth', 0)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield details
+    finally:
+        duration = time.perf_counter() - start
+        _local.depth = depth
+        record(name, start, duration, depth, details)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorate a function so each call is timed as a span.
+
+    Args:
+        name (Optional[str]): Phase name, defaults to the function's
+                              qualified name
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name: str, start: float, duration: float, depth: int = 0,
+           details: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Store a finished span.
+
+    Args:
+        name (str): Phase name
+        start (float): perf_counter() value at the start
+        duration (float): Duration in seconds
+        depth (int): Number of enclosing spans
+        details (Optional[Dict[str, Any]]): Values stored with the span
+    """
+    global _dropped
+    if len(_spans) >= MAX_SPANS:
+        _dropped += 1
+        return
+    _spans.append(SpanRecord(name, start, duration, depth, details or None))
+
+
+def get_spans() -> List[SpanRecord]:
+    """
+    Get the spans recorded so far in this process.
+
+    Returns:
+        List[SpanRecord]: Spans in the order they finished
+    """
+    return list(_spans)
+
+
+def reset() -> None:
+    """
+    Forget the recorded spans and restart the clock.
+
+    Used by daemon workers, which are forked from a process that
+    imported ggGit long before the command started.
+    """
+    global _dropped, PROCESS_START
+    _spans.clear()
+    _dropped = 0
+    PROCESS_START = time.perf_counter()
+
+
+def summarize(spans: Optional[List[SpanRecord]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Add up spans by name.
+
+    Args:
+        spans (Optional[List[SpanRecord]]): Spans, defaults to get_spans()
+
+    Returns:
+        Dict[str, Dict[str, float]]: count, total_ms and max_ms per
+                                     name, by decreasing total
+    """
+    phases: Dict[str, Dict[str, float]] = {}
+    for item in _spans if spans is None else spans:
+        phase = phases.get(item.name)
+        if phase is None:
+            phase = phases[item.name] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        duration_ms = item.duration * 1000
+        phase['count'] += 1
+        phase['total_ms'] += duration_ms
+        phase['max_ms'] = max(phase['max_ms'], duration_ms)
+
+    for phase in phases.values():
+        phase['total_ms'] = round(phase['total_ms'], 3)
+        phase['max_ms'] = round(phase['max_ms'], 3)
+    return dict(sorted(phases.items(), key=lambda item: -item[1]['total_ms']))
+
+
+def format_breakdown(spans: Optional[List[SpanRecord]] = None, total: Optional[float] = None) -> str:
+    """
+    Format the time per phase as a table.
+
+    Args:
+        spans (Optional[List[SpanRecord]]): Spans, defaults to get_spans()
+        total (Optional[float]): Wall time in seconds the shares refer
+                                 to, defaults to the time since PROCESS_START
+
+    Returns:
+        str: One line per phase with total, share, calls and slowest call
+    """
+    if total is None:
+        total = time.perf_counter() - PROCESS_START
+    phases = summarize(spans)
+    width = max([len(name) for name in phases] + [5])
+
+    lines = [f"⏱  ggGit profile: {total * 1000:.1f} ms"]
+    for name, phase in phases.items():
+        share = phase['total_ms'] / (total * 1000) if total > 0 else 0.0
+        lines.append(
+            f"  {name:<{width}}  {phase['total_ms']:>9.1f} ms  {share:>4.0%}  "
+            f"{int(phase['count']):>4}×  max {phase['max_ms']:.1f} ms"
+        )
+    if _dropped:
+        lines.append(f"  ({_dropped} spans not recorded)")
+    return '\n'.join(lines)
+
+
+def print_breakdown() -> None:
+    """Print the phase breakdown to stderr when profiling."""
+    if is_profiling() and _spans:
+        print(format_breakdown(), file=sys.stderr)
+
+
+atexit.register(print_breakdown)
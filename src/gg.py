@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+gg - Single entry point for all ggGit commands.
+
+Usage: gg <command> [<args>...]
+       gg --help
+
+The installed aliases call this script ('alias ggs=... gg.py ggs'), and
+commands can also be spelled without their prefix ('gg s', 'gg feat').
+
+Subcommands are registered lazily: the table below only holds names and
+one-line descriptions, and a command's module under src/commands is
+imported when that command is invoked. If a ggGit daemon (see
+core.daemon) is listening, the command is forwarded to it and click is
+never imported in this process. Otherwise, or when GGGIT_NO_DAEMON=1 is
+set, the command runs in-process.
+"""
+
+import importlib
+import os
+import sys
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# Command name -> short help, kept in sync with src/commands/gg*.py
+COMMANDS = {
+    'gga': 'Add file contents to the index',
+    'ggai': 'AI-powered commit message generation and management',
+    'ggb': 'List all branches or create new branch',
+    'ggbreak': 'Commit changes adding the break prefix to the message',
+    'ggbuild': 'Commit changes adding the build prefix to the message',
+    'ggchore': 'Commit changes adding the chore prefix to the message',
+    'ggci': 'Commit changes adding the ci prefix to the message',
+    'ggconfig': 'Configuration management command for ggGit',
+    'ggdaemon': 'Manage the resident ggGit daemon',
+    'ggdevelop': 'Checkout develop branch',
+    'ggdif': 'Show git diff',
+    'ggdocs': 'Commit changes adding the docs prefix to the message',
+    'ggfeat': 'Commit changes adding the feat prefix to the message',
+    'ggfix': 'Commit changes adding the fix prefix to the message',
+    'ggl': 'Show git log',
+    'ggmain': 'Checkout main branch',
+    'ggmerge': 'Merge branches without fast-forward',
+    'ggperf': 'Commit changes adding the perf prefix to the message',
+    'ggpl': 'Pull from remote repository',
+    'ggpp': 'Push to remote repository',
+    'ggrefactor': 'Commit changes adding the refactor prefix to the message',
+    'ggreset': 'Reset --hard HEAD',
+    'ggs': 'Show git status',
+    'ggstyle': 'Commit changes adding the style prefix to the message',
+    'ggtest': 'Commit changes adding the test prefix to the message',
+    'ggunstage': 'Unstage files from index',
+    'ggv': 'Show git version',
+}
+
+
+def resolve_command(name):
+    """
+    Resolve a command name as typed by the user.
+
+    Args:
+        name (str): 'ggs', 's', or a path whose basename is a command
+
+    Returns:
+        Optional[str]: Canonical command name, or None if unknown
+
+    Example:
+        >>> resolve_command('feat')
+        'ggfeat'
+    """
+    name = os.path.basename(name)
+    if name.endswith('.py'):
+        name = name[:-3]
+    if name in COMMANDS:
+        return name
+    if f'gg{name}' in COMMANDS:
+        return f'gg{name}'
+    return None
+
+
+def load_command(name):
+    """
+    Import a command module and return its click entry point.
+
+    Args:
+        name (str): Canonical command name
+
+    Returns:
+        click.Command: The module's entry point: a command or group named
+                       after the command if there is one (ggai, whose
+                       'main' is a subcommand), 'main' otherwise
+    """
+    module = importlib.import_module(f'commands.{name}')
+    return getattr(module, name, None) or module.main
+
+
+def build_cli():
+    """
+    Build the 'gg' click group with lazily loaded subcommands.
+
+    Returns:
+        click.Group: Group whose subcommands are imported on first use
+    """
+    import click
+
+    class LazyCommandGroup(click.Group):
+        """Click group that imports a subcommand only when it is invoked."""
+
+        def list_commands(self, ctx):
+            return sorted(COMMANDS)
+
+        def get_command(self, ctx, cmd_name):
+            name = resolve_command(cmd_name)
+            return load_command(name) if name else None
+
+        def format_commands(self, ctx, formatter):
+            # Use the static table so '--help' imports no command module
+            with formatter.section('Commands'):
+                formatter.write_dl(sorted(COMMANDS.items()))
+
+    return LazyCommandGroup(name='gg', help='ggGit - Git commands with conventional commits')
+
+
+def main(argv=None):
+    """
+    Run a ggGit command through the daemon or in-process.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv[1:]
+
+    Returns:
+        int: Exit code
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    name = resolve_command(argv[0]) if argv else None
+
+    if name is None:
+        # No (known) command: let click print the help or the error
+        return build_cli().main(args=argv, prog_name='gg')
+
+    args = argv[1:]
+    from gg_client import LOCAL_COMMANDS, run_via_daemon
+    if name not in LOCAL_COMMANDS and os.environ.get('GGGIT_NO_DAEMON') != '1':
+        code = run_via_daemon(name, args)
+        if code is not None:
+            return code
+
+    return load_command(name).main(args=args, prog_name=name)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Thin client for the ggGit daemon.
+
+The 'gg' entry point (src/gg.py) uses this module to forward a command
+to a listening ggGit daemon (see core.daemon) together with the current
+directory, environment and terminal; this process then only waits for
+the exit code. When no daemon is available the caller runs the command
+in-process.
+
+Only the standard library is imported on the daemon path.
+"""
+
+import os
+import signal
+import sys
+
+
+# Commands that always run in-process: the daemon control command
+# itself, and commands whose git output may go through a pager, which
+# needs the controlling terminal a daemon worker does not have
+LOCAL_COMMANDS = frozenset({'ggdaemon', 'ggl', 'ggdif'})
+
+
+def run_via_daemon(command, args, fds=(0, 1, 2)):
+    """
+    Run a command through the daemon.
+
+    Args:
+        command (str): Command name, e.g. 'ggs'
+        args (list): Command arguments
+        fds (tuple): Descriptors to use as the command's stdin/stdout/stderr
+
+    Returns:
+        Optional[int]: Exit code, or None if the daemon is unavailable and
+                       the command must run in-process
+    """
+    from core.daemon import DaemonError, connect, receive_message, send_message
+
+    sock = connect()
+    if sock is None:
+        return None
+
+    previous_handlers = {}
+    try:
+        umask = os.umask(0)
+        os.umask(umask)
+        send_message(sock, {
+            'argv': [command] + list(args),
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+            'umask': umask,
+            'encoding': getattr(sys.stdout, 'encoding', None)
+        }, list(fds))
+
+        sock.settimeout(None)
+        worker_pid = None
+        while True:
+            message, _ = receive_message(sock)
+            if message is None:
+                # Worker vanished without reporting: it was killed
+                return 1 if worker_pid is not None else None
+            if 'pid' in message:
+                worker_pid = message['pid']
+                previous_handlers = _forward_signals(worker_pid)
+            elif 'exit' in message:
+                return int(message['exit'])
+            else:
+                # 'stale' or 'error': the daemon cannot serve this command
+                return None
+    except (DaemonError, OSError):
+        return None
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        sock.close()
+
+
+def _forward_signals(worker_pid):
+    """Send Ctrl-C and termination signals to the worker's process group."""
+    def forward(signum, frame):
+        try:
+            os.killpg(worker_pid, signum)
+        except OSError:
+            pass
+
+    handlers = {}
+    for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGQUIT):
+        handlers[signum] = signal.signal(signum, forward)
+    return handlers
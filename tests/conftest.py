@@ -22,6 +22,10 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from unittest.mock import Mock, patch, MagicMock
 import subprocess
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add src to Python path for imports
 src_path = Path(__file__).parent.parent / "src"
@@ -36,6 +40,21 @@ from src.core.utils.colors import ColorManager
 from src.core.utils.logging import LoggingManager
 
 
+# ============================================================================
+# Test Isolation
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path_factory):
+    """Run every test with a scratch HOME and the event log off."""
+    # patch.dict rather than monkeypatch: sharing the test's monkeypatch
+    # would also defer undoing its chdir until after directory fixtures
+    home = tmp_path_factory.mktemp("home")
+    with patch.dict(os.environ, {'HOME': str(home), 'GGGIT_EVENT_LOG': '0'}):
+        os.environ.pop('GGGIT_PROFILE', None)
+        yield home
+
+
 # ============================================================================
 # Mock Fixtures for External Dependencies
 # ============================================================================
@@ -306,10 +325,148 @@ def integration_test_env(temp_git_repo, sample_config_data):
     }
 
 
+# ============================================================================
+# Local AI Stub Server
+# ============================================================================
+
+class AiStubServer:
+    """
+    State of a local server answering like an AI provider.
+    
+    It serves Ollama's /api/generate and /api/chat, OpenAI-compatible
+    /v1/chat/completions and Anthropic's /v1/messages, streamed or not.
+    
+    Attributes:
+        url (str): Base URL to use as ai.base_url
+        tokens (List[str]): Tokens of every answer
+        usage (tuple): Prompt and completion token counts reported
+        requests (List[Dict]): JSON bodies received
+        paths (List[str]): Paths requested
+        headers (List[Dict]): Headers of each request
+        connections (set): Client addresses seen, one per TCP connection
+        fail_next (int): Requests to drop without answering (connection reset)
+        delay (float): Seconds to wait before answering
+    """
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.tokens = ["feat: add", " stub server\n", "\nMore text"]
+        self.usage = (11, 7)
+        self.requests = []
+        self.paths = []
+        self.headers = []
+        self.connections = set()
+        self.fail_next = 0
+        self.delay = 0.0
+
+
+class _AiStubHandler(BaseHTTPRequestHandler):
+    """Request handler for AiStubServer, with keep-alive."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send(self, body, content_type):
+        body = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_json_lines(self, lines):
+        self._send(''.join(json.dumps(line) + '\n' for line in lines), 'application/x-ndjson')
+    
+    def _send_events(self, events, done=False):
+        body = ''.join(f"data: {json.dumps(event)}\n\n" for event in events)
+        self._send(body + ('data: [DONE]\n\n' if done else ''), 'text/event-stream')
+    
+    def do_GET(self):
+        self.server.stub.connections.add(self.client_address)
+        self._send_json_lines([{'models': []}])
+    
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get('Content-Length', 0))
+        data = json.loads(self.rfile.read(length) or b'{}')
+        stub.connections.add(self.client_address)
+        if stub.fail_next:
+            stub.fail_next -= 1
+            self.close_connection = True
+            return
+        stub.requests.append(data)
+        stub.paths.append(self.path)
+        stub.headers.append(dict(self.headers))
+        time.sleep(stub.delay)
+        
+        text = ''.join(stub.tokens)
+        prompt_tokens, completion_tokens = stub.usage
+        stream = data.get('stream')
+        if self.path.startswith('/v1/chat/completions'):
+            usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens}
+            if stream:
+                events = [{'choices': [{'delta': {'content': token}}]} for token in stub.tokens]
+                if data.get('stream_options', {}).get('include_usage'):
+                    events.append({'choices': [], 'usage': usage})
+                self._send_events(events, done=True)
+            else:
+                self._send_json_lines([{'choices': [{'message': {'content': text}}], 'usage': usage}])
+        elif self.path.startswith('/v1/messages'):
+            if stream:
+                events = [{'type': 'message_start', 'message': {'usage': {'input_tokens': prompt_tokens}}}]
+                events += [{'type': 'content_block_delta', 'delta': {'text': token}} for token in stub.tokens]
+                events.append({'type': 'message_delta', 'usage': {'output_tokens': completion_tokens}})
+                self._send_events(events)
+            else:
+                self._send_json_lines([{
+                    'content': [{'type': 'text', 'text': text}],
+                    'usage': {'input_tokens': prompt_tokens, 'output_tokens': completion_tokens}
+                }])
+        else:
+            def chunk(token):
+                if self.path.startswith('/api/chat'):
+                    return {'message': {'role': 'assistant', 'content': token}}
+                return {'response': token}
+            final = dict(chunk('' if stream else text), done=True,
+                         prompt_eval_count=prompt_tokens, eval_count=completion_tokens)
+            if stream:
+                self._send_json_lines([dict(chunk(token), done=False) for token in stub.tokens] + [final])
+            else:
+                self._send_json_lines([final])
+
+
+@pytest.fixture
+def ai_stub_server():
+    """Run a local AI provider server for offline tests."""
+    from src.core.ai.http_client import close_http_clients
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _AiStubHandler)
+    server.daemon_threads = True
+    server.stub = AiStubServer(f"http://127.0.0.1:{server.server_port}")
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server.stub
+    finally:
+        close_http_clients()
+        server.shutdown()
+        server.server_close()
+
+
 # ============================================================================
 # Test Utilities
 # ============================================================================
 
+def make_config(values=None):
+    """Create a config mock answering get_config from a dict."""
+    values = values or {}
+    config = Mock()
+    config.get_config.side_effect = lambda key, default=None: values.get(key, default)
+    return config
+
+
 class TestHelpers:
     """Helper class with utility methods for testing."""
     
@@ -223,6 +223,7 @@ class TestAIConfigurationIntegration:
         # Test that default values are used when no user config
         # Note: The config may already have values set from previous tests
         # So we test the hierarchy by setting and getting values
+        config_manager.set_config('ai.provider', 'openai', level='user')
         assert config_manager.get_config('ai.provider') == 'openai'
         
         # Test setting user-level configuration
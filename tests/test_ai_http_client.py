@@ -0,0 +1,106 @@
+"""
+Tests for the pooled AI provider HTTP client.
+
+This module tests AiHttpClient against the local stub server from
+conftest.py: connection reuse, retries after dropped connections,
+timeouts, and the message generator going through the client.
+"""
+
+import pytest
+import requests
+from unittest.mock import Mock
+
+from src.core.ai.http_client import AiHttpClient, get_http_client
+from src.core.ai.message_generator import AiMessageGenerator
+from tests.conftest import make_config
+
+
+class TestAiHttpClient:
+    """Test AiHttpClient."""
+
+    def test_session_created_on_first_use(self):
+        """Test creating a client does not open a session."""
+        client = AiHttpClient()
+        assert client._session is None
+        assert client.session is client.session
+
+    def test_new_session_after_fork(self):
+        """Test a session inherited from another process is replaced."""
+        client = AiHttpClient()
+        session = client.session
+        client._pid = -1
+        assert client.session is not session
+
+    def test_shared_client_per_settings(self):
+        """Test callers with the same settings share one client."""
+        first = get_http_client(make_config())
+        assert get_http_client(make_config()) is first
+        assert get_http_client(make_config({'ai.http.retries': 5})) is not first
+
+    def test_invalid_settings_use_defaults(self):
+        """Test invalid values fall back to the defaults."""
+        client = AiHttpClient.from_config(make_config({
+            'ai.http.connect_timeout': 0, 'ai.http.read_timeout': 'slow', 'ai.http.retries': 0
+        }))
+        assert (client.connect_timeout, client.read_timeout, client.retries) == (5, 30, 0)
+
+    def test_connection_is_reused(self, ai_stub_server):
+        """Test consecutive requests share one kept-alive connection."""
+        client = AiHttpClient()
+
+        for _ in range(3):
+            response = client.post(f"{ai_stub_server.url}/api/generate", json={'prompt': 'x'})
+            response.json()
+
+        assert len(ai_stub_server.requests) == 3
+        assert len(ai_stub_server.connections) == 1
+
+    def test_dropped_connection_is_retried(self, ai_stub_server):
+        """Test a connection closed without answer is retried."""
+        client = AiHttpClient(retries=2, backoff=0)
+        ai_stub_server.fail_next = 2
+
+        response = client.post(f"{ai_stub_server.url}/api/generate", json={'prompt': 'x'})
+
+        assert response.status_code == 200
+        assert len(ai_stub_server.requests) == 1
+
+    def test_retries_exhausted(self, ai_stub_server):
+        """Test the error is raised once the retries are used."""
+        client = AiHttpClient(retries=1, backoff=0)
+        ai_stub_server.fail_next = 2
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.post(f"{ai_stub_server.url}/api/generate", json={'prompt': 'x'})
+
+    def test_read_timeout_is_not_retried(self, ai_stub_server):
+        """Test slow answers fail after the read timeout, without retry."""
+        client = AiHttpClient(read_timeout=0.05, retries=2, backoff=0)
+        ai_stub_server.delay = 0.3
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.post(f"{ai_stub_server.url}/api/generate", json={'prompt': 'x'})
+
+        assert len(ai_stub_server.requests) == 1
+
+
+class TestGeneratorWithStubServer:
+    """Test AiMessageGenerator against the stub server."""
+
+    def test_streamed_generation(self, ai_stub_server):
+        """Test a streamed answer is cut at the subject line."""
+        generator = AiMessageGenerator(make_config({'ai.provider': 'local', 'ai.base_url': ai_stub_server.url}), Mock())
+        generator.show_tokens = False
+
+        assert generator._call_ai_api("prompt") == "feat: add stub server"
+        assert ai_stub_server.requests[0]['stream'] is True
+
+    def test_calls_share_connection(self, ai_stub_server):
+        """Test repeated calls of one run reuse the connection."""
+        config = make_config({'ai.provider': 'local', 'ai.base_url': ai_stub_server.url, 'ai.stream': False})
+        generator = AiMessageGenerator(config, Mock())
+
+        generator._call_ai_api("first")
+        AiMessageGenerator(config, Mock())._call_ai_api("second")
+
+        assert len(ai_stub_server.connections) == 1
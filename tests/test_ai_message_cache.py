@@ -0,0 +1,142 @@
+"""
+Tests for the AI message cache.
+
+This module tests storing, expiring and evicting cached commit
+messages, the generator's use of the cache and 'ggai cache'.
+"""
+
+import os
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from click.testing import CliRunner
+
+from src.core.ai.message_cache import AiMessageCache
+from src.core.ai.message_generator import AiMessageGenerator
+from tests.conftest import make_config
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache in a temporary directory."""
+    return AiMessageCache(make_config({'ai.cache.max_entries': 3}), cache_dir=tmp_path)
+
+
+class TestAiMessageCache:
+    """Test AiMessageCache storage and eviction."""
+
+    def test_key_depends_on_every_input(self):
+        """Test each key component changes the key."""
+        base = ("diff", ["a.py"], "model", "feat", 1)
+        key = AiMessageCache.make_key(*base)
+        for index, value in enumerate(("diff2", ["b.py"], "model2", "fix", 2)):
+            changed = list(base)
+            changed[index] = value
+            assert AiMessageCache.make_key(*changed) != key
+
+    def test_round_trip_and_counters(self, cache):
+        """Test hits and misses are counted."""
+        assert cache.get("k1") is None
+        cache.put("k1", "add login form")
+
+        assert cache.get("k1") == "add login form"
+        stats = cache.get_stats()
+        assert stats['entries'] == 1
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_expired_entry_is_a_miss(self, cache, tmp_path):
+        """Test entries unused for longer than max_age_days expire."""
+        cache.put("k1", "message")
+        old = time.time() - 31 * 86400
+        os.utime(tmp_path / "k1.json", (old, old))
+
+        assert cache.get("k1") is None
+        assert not (tmp_path / "k1.json").exists()
+
+    def test_least_recently_used_are_evicted(self, cache, tmp_path):
+        """Test the oldest entries go once max_entries is exceeded."""
+        start = time.time() - 100
+        for index, key in enumerate(["k1", "k2", "k3"]):
+            cache.put(key, key)
+            os.utime(tmp_path / f"{key}.json", (start + index, start + index))
+        os.utime(tmp_path / "k1.json")  # recently used
+
+        cache.put("k4", "k4")
+
+        remaining = sorted(p.stem for p in tmp_path.glob("k*.json"))
+        assert remaining == ["k1", "k3", "k4"]
+
+    def test_clear(self, cache):
+        """Test clearing removes entries and counters."""
+        cache.put("k1", "message")
+        cache.get("k1")
+
+        assert cache.clear() == 1
+        assert cache.get_stats()['entries'] == 0
+        assert cache.get_stats()['hits'] == 0
+
+
+class TestGeneratorCache:
+    """Test AiMessageGenerator served from the cache."""
+
+    def make_generator(self, tmp_path, values=None):
+        """Create a generator whose cache lives in tmp_path."""
+        generator = AiMessageGenerator(make_config(values), Mock())
+        generator.message_cache.cache_dir = tmp_path
+        generator.usage_tracker.is_tracking_enabled.return_value = False
+        return generator
+
+    def test_second_generation_skips_model(self, tmp_path):
+        """Test identical requests call the model once."""
+        generator = self.make_generator(tmp_path)
+
+        with patch.object(generator, '_call_ai_api', return_value="feat: add login") as call:
+            first = generator.generate_message(["a.py"], "diff", "feat")
+            second = generator.generate_message(["a.py"], "diff", "feat")
+
+        assert first == second == "add login"
+        call.assert_called_once()
+
+    def test_changed_diff_calls_model(self, tmp_path):
+        """Test a different diff is not served from the cache."""
+        generator = self.make_generator(tmp_path)
+
+        with patch.object(generator, '_call_ai_api', return_value="fix: bug") as call:
+            generator.generate_message(["a.py"], "diff", "fix")
+            generator.generate_message(["a.py"], "other diff", "fix")
+
+        assert call.call_count == 2
+
+    def test_cache_disabled(self, tmp_path):
+        """Test ai.cache.enabled false always calls the model."""
+        generator = self.make_generator(tmp_path, {'ai.cache.enabled': False})
+
+        with patch.object(generator, '_call_ai_api', return_value="fix: bug") as call:
+            generator.generate_message(["a.py"], "diff", "fix")
+            generator.generate_message(["a.py"], "diff", "fix")
+
+        assert call.call_count == 2
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestGgaiCacheCommands:
+    """Test 'ggai cache stats' and 'ggai cache clear'."""
+
+    def test_stats_and_clear(self, tmp_path):
+        """Test both subcommands report on the cache directory."""
+        from src.commands.ggai import ggai
+
+        with patch('pathlib.Path.home', return_value=tmp_path):
+            AiMessageCache(make_config()).put("k1", "message")
+            runner = CliRunner()
+
+            result = runner.invoke(ggai, ['cache', 'stats'])
+            assert result.exit_code == 0
+            assert "Entradas: 1" in result.output
+
+            result = runner.invoke(ggai, ['cache', 'clear'])
+            assert result.exit_code == 0
+            assert "1 mensajes eliminados" in result.output
+            assert list((tmp_path / ".gggit" / "cache" / "ai-messages").glob("*.json")) == []
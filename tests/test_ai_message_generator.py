@@ -0,0 +1,203 @@
+"""
+Tests for AiMessageGenerator.
+
+This module tests the Ollama calls made by the message generator,
+including streamed responses cut at the first complete subject line,
+and map-reduce generation from per-file summaries.
+"""
+
+import json
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from src.core.ai.message_generator import AiMessageGenerator
+from src.core.ai.providers import ProviderResponse, extract_subject_line
+from tests.conftest import make_config
+
+
+def stream_response(tokens, done=True):
+    """Create a streaming response mock yielding NDJSON chunks."""
+    lines = [json.dumps({'response': token, 'done': False}).encode() for token in tokens]
+    if done:
+        lines.append(json.dumps({'response': '', 'done': True}).encode())
+
+    consumed = []
+
+    def iter_lines():
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    response = Mock()
+    response.iter_lines.side_effect = iter_lines
+    response.consumed = consumed
+    return response
+
+
+class TestExtractSubjectLine:
+    """Test subject line detection in partial output."""
+
+    def test_incomplete_line(self):
+        """Test a line is not complete before its newline."""
+        assert extract_subject_line("feat: add log") is None
+
+    def test_skips_fences_and_introductions(self):
+        """Test code fences, blank lines and introductions are skipped."""
+        text = "Here is the commit message:\n\n```\nfeat: add login\n"
+        assert extract_subject_line(text) == "feat: add login"
+
+
+class TestOllamaStreaming:
+    """Test streamed /api/generate calls."""
+
+    def test_stops_after_subject_line(self):
+        """Test the stream is closed once a subject line is complete."""
+        generator = AiMessageGenerator(make_config({'ai.provider': 'local'}), Mock())
+        generator.show_tokens = False
+        response = stream_response(["feat: add", " login\n", "\nThis change adds", " more text"])
+
+        with patch('src.core.ai.http_client.AiHttpClient.post', return_value=response) as post:
+            result = generator._call_ai_api("prompt")
+
+        assert result == "feat: add login"
+        assert post.call_args.kwargs['stream'] is True
+        assert post.call_args.kwargs['json']['stream'] is True
+        assert len(response.consumed) == 2
+        response.close.assert_called_once()
+
+    def test_single_line_without_newline(self):
+        """Test output finishing without a newline is returned whole."""
+        generator = AiMessageGenerator(make_config({'ai.provider': 'local'}), Mock())
+        generator.show_tokens = False
+        response = stream_response(["fix: handle", " empty diff"])
+
+        with patch('src.core.ai.http_client.AiHttpClient.post', return_value=response):
+            assert generator._call_ai_api("prompt") == "fix: handle empty diff"
+
+    def test_stream_error(self):
+        """Test errors reported inside the stream are raised."""
+        generator = AiMessageGenerator(make_config({'ai.provider': 'local'}), Mock())
+        response = Mock()
+        response.iter_lines.return_value = [json.dumps({'error': 'model not found'}).encode()]
+
+        with patch('src.core.ai.http_client.AiHttpClient.post', return_value=response):
+            with pytest.raises(Exception, match="model not found"):
+                generator._call_ai_api("prompt")
+
+    def test_tokens_are_shown(self, capsys):
+        """Test tokens are echoed to stderr as they arrive."""
+        generator = AiMessageGenerator(make_config({'ai.provider': 'local'}), Mock())
+        generator.show_tokens = True
+        response = stream_response(["docs: update", " readme\n"])
+
+        with patch('src.core.ai.http_client.AiHttpClient.post', return_value=response):
+            generator._call_ai_api("prompt")
+
+        assert capsys.readouterr().err == "docs: update readme\n"
+
+    def test_streaming_disabled(self):
+        """Test ai.stream false waits for the whole response."""
+        generator = AiMessageGenerator(make_config({'ai.provider': 'local', 'ai.stream': False}), Mock())
+        response = Mock()
+        response.json.return_value = {'response': ' chore: bump version \n'}
+
+        with patch('src.core.ai.http_client.AiHttpClient.post', return_value=response) as post:
+            assert generator._call_ai_api("prompt") == "chore: bump version"
+
+        assert post.call_args.kwargs['json']['stream'] is False
+
+
+def file_diff(path, blobs, line):
+    """Build the diff of one file with one added line."""
+    return (f"diff --git a/{path} b/{path}\nindex {blobs} 100644\n--- a/{path}\n+++ b/{path}\n"
+            f"@@ -1 +1,2 @@\n context\n+{line}\n")
+
+
+class TestMapReduce:
+    """Test generation from per-file summaries."""
+
+    def make_generator(self, tmp_path, values=None):
+        """Create a map-reduce generator with caches in tmp_path."""
+        values = dict({'ai.provider': 'fake', 'ai.map_reduce.enabled': True, 'ai.map_reduce.min_files': 3},
+                      **(values or {}))
+        generator = AiMessageGenerator(make_config(values), Mock())
+        generator.message_cache.cache_dir = tmp_path / "messages"
+        generator.summary_cache.cache_dir = tmp_path / "summaries"
+        generator.usage_tracker.is_tracking_enabled.return_value = False
+        return generator
+
+    def fake_model(self, prompts):
+        """Answer summary prompts with the file name and record them."""
+        def call(prompt, *args, **kwargs):
+            prompts.append(prompt)
+            if prompt.startswith("Summarize"):
+                return ProviderResponse("changed " + prompt.split(" to ", 1)[1].split(" in one line")[0])
+            return ProviderResponse("feat: update modules")
+        return call
+
+    def test_few_files_use_single_prompt(self, tmp_path):
+        """Test commits below min_files are not split."""
+        generator = self.make_generator(tmp_path)
+        prompts = []
+
+        with patch.object(generator._get_provider(), 'generate', side_effect=self.fake_model(prompts)):
+            generator.generate_message(["a.py"], file_diff("a.py", "1..2", "x = 1"), "feat")
+
+        assert len(prompts) == 1
+
+    def test_files_are_summarized_then_reduced(self, tmp_path):
+        """Test one summary per file and a final prompt built from them."""
+        generator = self.make_generator(tmp_path)
+        diff = file_diff("a.py", "1..2", "a") + file_diff("b.py", "3..4", "b") + \
+            file_diff("yarn.lock", "5..6", "dep")
+        prompts = []
+
+        with patch.object(generator._get_provider(), 'generate', side_effect=self.fake_model(prompts)):
+            message = generator.generate_message(["a.py", "b.py", "yarn.lock"], diff, "feat")
+
+        assert message == "update modules"
+        assert len(prompts) == 3
+        assert "- a.py: changed a.py" in prompts[-1]
+        assert "- yarn.lock: lockfile file changed" in prompts[-1]
+
+    def test_summaries_cached_by_blob(self, tmp_path):
+        """Test restaging only summarizes files whose blobs changed."""
+        generator = self.make_generator(tmp_path)
+        files = ["a.py", "b.py", "c.py"]
+        first = ''.join(file_diff(name, f"1..{i}", name) for i, name in enumerate(files))
+        second = first.replace("index 1..2", "index 1..9")
+        prompts = []
+
+        with patch.object(generator._get_provider(), 'generate', side_effect=self.fake_model(prompts)):
+            generator.generate_message(files, first, "feat")
+            prompts.clear()
+            generator.generate_message(files, second, "feat")
+
+        summary_prompts = [p for p in prompts if p.startswith("Summarize")]
+        assert len(summary_prompts) == 1
+        assert "c.py" in summary_prompts[0]
+
+    def test_concurrency_is_bounded(self, tmp_path):
+        """Test at most max_workers summaries run at once."""
+        generator = self.make_generator(tmp_path, {'ai.map_reduce.max_workers': 2})
+        files = [f"f{i}.py" for i in range(6)]
+        diff = ''.join(file_diff(name, f"0..{i + 1}", name) for i, name in enumerate(files))
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def call(prompt, *args, **kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return ProviderResponse("feat: done" if not prompt.startswith("Summarize") else "summary")
+
+        with patch.object(generator._get_provider(), 'generate', side_effect=call):
+            generator.generate_message(files, diff, "feat")
+
+        assert peak[0] == 2
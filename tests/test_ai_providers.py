@@ -0,0 +1,138 @@
+"""
+Tests for the AI provider backends.
+
+This module tests every backend selected by ai.provider against the
+local stub server from conftest.py, streamed and not, including the
+token counts each provider reports.
+"""
+
+import pytest
+
+from src.core.ai.providers import (
+    AiProviderError, AnthropicProvider, AzureOpenAIProvider, FakeProvider,
+    OllamaProvider, OpenAIProvider, create_provider
+)
+from tests.conftest import make_config
+
+
+class TestCreateProvider:
+    """Test backend selection from ai.provider."""
+
+    @pytest.mark.parametrize("name,provider_class", [
+        ('openai', OpenAIProvider),
+        ('azure', AzureOpenAIProvider),
+        ('anthropic', AnthropicProvider),
+        ('local', OllamaProvider),
+        ('ollama', OllamaProvider),
+        ('fake', FakeProvider),
+        (None, OpenAIProvider)
+    ])
+    def test_schema_values(self, name, provider_class):
+        """Test each ai.provider value selects its backend."""
+        assert isinstance(create_provider(make_config({'ai.provider': name})), provider_class)
+
+    def test_unknown_provider(self):
+        """Test unknown providers are rejected."""
+        with pytest.raises(AiProviderError, match="no soportado"):
+            create_provider(make_config({'ai.provider': 'unknown'}))
+
+
+class TestNetworkProviders:
+    """Test the HTTP backends against the stub server."""
+
+    @pytest.mark.parametrize("provider,extra,path", [
+        ('openai', {}, '/v1/chat/completions'),
+        ('anthropic', {}, '/v1/messages'),
+        ('local', {}, '/api/generate'),
+        ('local', {'ai.ollama.endpoint': 'chat'}, '/api/chat')
+    ])
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_generate(self, ai_stub_server, provider, extra, path, stream):
+        """Test each protocol, streamed and not, with token counts."""
+        config = make_config(dict({'ai.provider': provider, 'ai.base_url': ai_stub_server.url}, **extra))
+
+        result = create_provider(config).generate("prompt", stream=stream)
+
+        assert ai_stub_server.paths == [path]
+        if stream:
+            assert result.text == "feat: add stub server"
+            assert result.complete is False
+        else:
+            assert result.text == "feat: add stub server\n\nMore text"
+        # Streams closed early only carry the counts sent before the text
+        assert result.prompt_tokens == (11 if not stream or provider == 'anthropic' else None)
+
+    def test_counts_when_stream_completes(self, ai_stub_server):
+        """Test streamed counts are reported when the answer is read whole."""
+        ai_stub_server.tokens = ["fix: short"]
+        config = make_config({'ai.provider': 'local', 'ai.base_url': ai_stub_server.url})
+
+        result = create_provider(config).generate("prompt")
+
+        assert (result.text, result.prompt_tokens, result.completion_tokens) == ("fix: short", 11, 7)
+        assert result.complete is True
+
+    def test_openai_authentication(self, ai_stub_server, monkeypatch):
+        """Test the API key is sent as a bearer token."""
+        monkeypatch.setenv('GGGIT_TEST_KEY', 'secret')
+        config = make_config({'ai.provider': 'openai', 'ai.base_url': f"{ai_stub_server.url}/v1",
+                              'ai.api_key_env': 'GGGIT_TEST_KEY', 'ai.model': 'tiny'})
+
+        create_provider(config).generate("prompt", stream=False)
+
+        assert ai_stub_server.headers[0]['Authorization'] == 'Bearer secret'
+        assert ai_stub_server.requests[0]['model'] == 'tiny'
+        assert ai_stub_server.requests[0]['messages'] == [{'role': 'user', 'content': 'prompt'}]
+
+    def test_azure_deployment_url(self, ai_stub_server, monkeypatch):
+        """Test Azure uses the deployment URL, API version and api-key header."""
+        monkeypatch.setenv('GGGIT_TEST_KEY', 'secret')
+        config = make_config({'ai.provider': 'azure', 'ai.endpoint': ai_stub_server.url,
+                              'ai.model': 'gpt', 'ai.api_key_env': 'GGGIT_TEST_KEY'})
+
+        provider = create_provider(config)
+
+        assert provider._get_url().startswith(
+            f"{ai_stub_server.url}/openai/deployments/gpt/chat/completions?api-version="
+        )
+        assert provider._get_headers() == {'api-key': 'secret'}
+
+    def test_connection_error(self):
+        """Test unreachable providers raise AiProviderError."""
+        config = make_config({'ai.provider': 'openai', 'ai.base_url': 'http://127.0.0.1:9',
+                              'ai.http.retries': 0})
+
+        with pytest.raises(AiProviderError, match="Error de conexión"):
+            create_provider(config).generate("prompt")
+
+    def test_batch_keeps_order(self, ai_stub_server):
+        """Test batches answer every prompt, in order."""
+        config = make_config({'ai.provider': 'openai', 'ai.base_url': ai_stub_server.url})
+
+        results = create_provider(config).generate_batch(["a", "b", "c"], max_workers=3)
+
+        assert [result.text for result in results] == ["feat: add stub server"] * 3
+        assert sorted(request['messages'][0]['content'] for request in ai_stub_server.requests) == ["a", "b", "c"]
+
+
+class TestFakeProvider:
+    """Test the offline backend."""
+
+    def test_deterministic(self):
+        """Test the same prompt always gives the same answer."""
+        provider = FakeProvider(make_config())
+        first = provider.generate("prompt")
+
+        second = provider.generate("prompt")
+        assert (first.text, first.completion_tokens) == (second.text, second.completion_tokens)
+        assert first.text.startswith("chore: update files ")
+        assert provider.generate("other").text != first.text
+        assert first.prompt_tokens == 1
+        assert first.latency is not None
+
+    def test_configured_response(self):
+        """Test ai.fake.response is cut at its subject line when streaming."""
+        provider = FakeProvider(make_config({'ai.fake.response': "feat: x\n\nbody"}))
+
+        assert provider.generate("p").text == "feat: x"
+        assert provider.generate("p", stream=False).text == "feat: x\n\nbody"
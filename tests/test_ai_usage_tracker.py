@@ -17,16 +17,22 @@ class TestAiUsageTracker:
     """Test AiUsageTracker functionality."""
     
     def setup_method(self):
-        """Set up test fixtures."""
+        """Set up test fixtures writing to a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
         self.config_mock = Mock()
         self.config_mock.get_config.side_effect = lambda key, default: {
-            'ai.usage_file': '.gggit/ai-usage.yaml',
+            'ai.usage_file': os.path.join(self.temp_dir, '.gggit', 'ai-usage.yaml'),
             'ai.tracking_enabled': True,
             'ai.cost_limit': 5.00
         }.get(key, default)
         
         self.tracker = AiUsageTracker(self.config_mock)
     
+    def teardown_method(self):
+        """Remove the temporary directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
     def test_is_tracking_enabled_true(self):
         """Test is_tracking_enabled when tracking is enabled."""
         self.config_mock.get_config.return_value = True
@@ -69,24 +75,19 @@ class TestAiUsageTracker:
                     mock_save.assert_not_called()
     
     def test_increment_usage_tracking_enabled(self):
-        """Test increment_usage when tracking is enabled."""
+        """Test increment_usage appends to the ledger without rewriting the rollup."""
         with patch.object(self.tracker, 'is_tracking_enabled', return_value=True):
             with patch.object(self.tracker, '_load_usage_file') as mock_load:
                 with patch.object(self.tracker, '_save_usage_file') as mock_save:
-                    # Mock loaded data
-                    mock_load.return_value = {
-                        'daily_usage': {},
-                        'totals': {'requests': 0, 'tokens': 0, 'cost': 0.0}
-                    }
-                    
-                    self.tracker.increment_usage("ggfeat", 100, 0.05)
-                    
-                    # Verify save was called with updated data
-                    mock_save.assert_called_once()
-                    saved_data = mock_save.call_args[0][0]
-                    assert saved_data['totals']['requests'] == 1
-                    assert saved_data['totals']['tokens'] == 100
-                    assert saved_data['totals']['cost'] == 0.05
+                    with patch.object(self.tracker, '_append_entry') as mock_append:
+                        self.tracker.increment_usage("ggfeat", 100, 0.05)
+                        
+                        mock_load.assert_not_called()
+                        mock_save.assert_not_called()
+                        entry = mock_append.call_args[0][0]
+                        assert entry['command'] == "ggfeat"
+                        assert entry['tokens'] == 100
+                        assert entry['cost'] == 0.05
     
     def test_reset_usage_tracking_disabled(self):
         """Test reset_usage when tracking is disabled."""
@@ -218,13 +219,15 @@ class TestAiUsageTrackerIntegration:
             
             tracker = AiUsageTracker(config_mock)
             
-            # Increment usage (should create file)
+            # Increment usage (should create the ledger)
             tracker.increment_usage("ggfeat", 100, 0.05)
             
-            # Check if file was created
-            assert os.path.exists(usage_file)
+            # Check if the ledger was created
+            assert os.path.exists(os.path.join(temp_dir, "test-usage.jsonl"))
+            assert tracker.get_usage_stats()['totals']['requests'] == 1
             
-            # Check file content
+            # Compaction writes the rollup
+            tracker.compact()
             with open(usage_file, 'r') as f:
                 data = yaml.safe_load(f)
                 assert data['totals']['requests'] == 1
@@ -260,3 +263,123 @@ class TestAiUsageTrackerIntegration:
             assert stats['totals']['requests'] == 5
             assert stats['totals']['tokens'] == 500
             assert stats['totals']['cost'] == 0.25
+
+
+class TestAiUsageLedger:
+    """Test the append-only usage ledger and its rollup."""
+    
+    def setup_method(self):
+        """Set up a tracker writing to a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.usage_file = os.path.join(self.temp_dir, "ai-usage.yaml")
+        self.config_mock = Mock()
+        self.config_mock.get_config.side_effect = lambda key, default: {
+            'ai.usage_file': self.usage_file,
+            'ai.tracking_enabled': True,
+            'ai.cost_limit': 5.00
+        }.get(key, default)
+        self.tracker = AiUsageTracker(self.config_mock)
+    
+    def teardown_method(self):
+        """Remove the temporary directory."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_increment_does_not_write_rollup(self):
+        """Test that increments only append to the ledger."""
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        self.tracker.increment_usage("ggfix", 50, 0.01, prompt_tokens=40,
+                                     completion_tokens=10, latency=0.5, model="gpt-4o")
+        
+        assert not os.path.exists(self.usage_file)
+        with open(self.tracker.ledger_file, 'r') as f:
+            assert len(f.readlines()) == 2
+        
+        stats = self.tracker.get_usage_stats()
+        assert stats['totals']['requests'] == 2
+        assert stats['totals']['tokens'] == 150
+        assert stats['totals']['prompt_tokens'] == 40
+        assert stats['totals']['timed_requests'] == 1
+        daily = next(iter(stats['daily_usage'].values()))
+        assert daily['commands'] == {'ggfeat': 1, 'ggfix': 1}
+        assert daily['models'] == {'gpt-4o': 1}
+    
+    def test_compact_folds_tail_once(self):
+        """Test that compacted entries are not counted twice."""
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        self.tracker.compact()
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        
+        assert self.tracker.get_usage_stats()['totals']['requests'] == 2
+        assert self.tracker.compact()['totals']['requests'] == 2
+        assert self.tracker.get_usage_stats()['totals']['requests'] == 2
+    
+    def test_large_tail_is_compacted_on_read(self):
+        """Test that reading compacts a tail past COMPACT_BYTES."""
+        with patch('src.core.ai.usage_tracker.COMPACT_BYTES', 1):
+            self.tracker.increment_usage("ggfeat", 100, 0.05)
+            self.tracker.get_usage_stats()
+        
+        with open(self.usage_file, 'r') as f:
+            data = yaml.safe_load(f)
+        assert data['totals']['requests'] == 1
+        assert data['ledger']['offset'] == os.path.getsize(self.tracker.ledger_file)
+    
+    def test_partial_line_is_left_for_later(self):
+        """Test that a line still being written is not consumed."""
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        with open(self.tracker.ledger_file, 'a') as f:
+            f.write('{"command": "ggfix", "tok')
+        
+        assert self.tracker.compact()['totals']['requests'] == 1
+        with open(self.tracker.ledger_file, 'a') as f:
+            f.write('ens": 10, "cost": 0.0}\n')
+        assert self.tracker.get_usage_stats()['totals']['requests'] == 2
+    
+    def test_legacy_rollup_is_kept(self):
+        """Test that a usage file written before the ledger keeps its totals."""
+        with open(self.usage_file, 'w') as f:
+            yaml.dump({'period': {'start_date': '2024-12-19'},
+                       'daily_usage': {},
+                       'totals': {'requests': 5, 'tokens': 500, 'cost': 0.25},
+                       'limits': {'cost_limit': 5.00, 'tracking_enabled': True}}, f)
+        
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        
+        assert self.tracker.get_usage_stats()['totals']['requests'] == 6
+    
+    def test_reading_without_ledger_creates_no_files(self):
+        """Test that statistics are read without creating the ledger or the lock."""
+        self.tracker.get_usage_stats()
+        self.tracker.compact()
+        self.tracker.is_cost_limit_exceeded()
+        
+        assert os.listdir(self.temp_dir) == []
+    
+    def test_reset_empties_ledger(self):
+        """Test that reset clears both the ledger and the rollup."""
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        self.tracker.compact()
+        self.tracker.increment_usage("ggfeat", 100, 0.05)
+        
+        self.tracker.reset_usage()
+        
+        assert self.tracker.get_usage_stats()['totals']['requests'] == 0
+        assert os.path.getsize(self.tracker.ledger_file) == 0
+    
+    def test_concurrent_increments(self):
+        """Test that concurrent writers do not lose updates."""
+        import threading
+        
+        def worker():
+            tracker = AiUsageTracker(self.config_mock)
+            for _ in range(50):
+                tracker.increment_usage("ggfeat", 1, 0.0)
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert self.tracker.get_usage_stats()['totals']['requests'] == 200
@@ -109,8 +109,15 @@ class TestBaseCommand:
     @patch('src.core.base_commands.base.GitInterface')
     @patch('src.core.base_commands.base.ArgumentValidator')
     def test_init_creates_components(self, mock_validator, mock_git, mock_config):
-        """Test that __init__ creates the required components."""
+        """Test that components are created once, on first access."""
         cmd = ConcreteCommand()
+        mock_config.assert_not_called()
+        mock_git.assert_not_called()
+        
+        assert cmd.config is mock_config.return_value
+        assert cmd.git is mock_git.return_value
+        assert cmd.validator is mock_validator.return_value
+        cmd.config
         
         mock_config.assert_called_once()
         mock_git.assert_called_once()
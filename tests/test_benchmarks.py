@@ -0,0 +1,155 @@
+"""
+Tests for the benchmark harness.
+
+This module tests the synthetic repository generator, timing and
+summary statistics, result files, the baseline comparison and a short
+end-to-end run of 'python -m benchmarks'.
+"""
+
+import json
+import subprocess
+import pytest
+
+from benchmarks import harness, synthetic
+from benchmarks.__main__ import main
+
+
+def git(repo, *args):
+    """Run a git command in a repository and return its output."""
+    return subprocess.run(['git', *args], cwd=repo, capture_output=True, text=True, check=True).stdout
+
+
+def make_results(**medians):
+    """Create a result document with the given medians."""
+    return {'version': harness.RESULTS_VERSION,
+            'benchmarks': {name: {'n': 5, 'median_ms': value} for name, value in medians.items()}}
+
+
+class TestSyntheticRepo:
+    """Test generating synthetic repositories."""
+
+    def test_repo_layout(self, tmp_path):
+        """Test the repository has the history, branches and changes of its scale."""
+        scale = synthetic.SCALES['tiny']
+        info = synthetic.create_repo(tmp_path / 'repo', scale)
+        repo = tmp_path / 'repo'
+
+        assert git(repo, 'rev-parse', '--abbrev-ref', 'HEAD').strip() == 'main'
+        assert int(git(repo, 'rev-list', '--count', 'HEAD')) == scale.commits
+        assert len(info['branches']) == scale.branches
+        for branch in info['branches']:
+            assert int(git(repo, 'rev-list', '--count', f'main..{branch}')) == 1
+
+        assert git(repo, 'diff', '--cached', '--name-only').split() == sorted(info['staged'])
+        assert git(repo, 'diff', '--name-only').split() == sorted(info['unstaged'])
+        assert sorted(git(repo, 'ls-files', '--others').split()) == info['untracked']
+        assert (repo / 'assets' / 'logo.bin').stat().st_size == scale.binary_diff_kb * 1024
+
+    def test_same_seed_same_repo(self, tmp_path):
+        """Test the seed alone decides the commit ids."""
+        scale = synthetic.SCALES['tiny']
+        for name, seed in (('a', 1), ('b', 1), ('c', 2)):
+            synthetic.create_repo(tmp_path / name, scale, seed=seed)
+
+        heads = [git(tmp_path / name, 'rev-parse', 'HEAD') for name in 'abc']
+        assert heads[0] == heads[1] != heads[2]
+
+
+class TestHarness:
+    """Test timing and summaries."""
+
+    def test_measure_runs_warmup_setup_and_teardown(self):
+        """Test warmup runs are not timed and setup/teardown wrap every run."""
+        calls = []
+        benchmark = harness.Benchmark('b', lambda: calls.append('run'), setup=lambda: calls.append('setup'),
+                                      teardown=lambda: calls.append('teardown'), warmup=1)
+
+        assert len(harness.measure(benchmark, 2)) == 2
+        assert calls == ['setup', 'run', 'teardown'] * 3
+
+    def test_summarize(self):
+        """Test the statistics are reported in milliseconds."""
+        summary = harness.summarize([0.001 * value for value in range(1, 21)])
+
+        assert summary['n'] == 20
+        assert (summary['min_ms'], summary['max_ms']) == (1.0, 20.0)
+        assert summary['median_ms'] == 10.5
+        assert summary['p95_ms'] == 19.0
+        assert summary['stdev_ms'] > 0
+        assert harness.summarize([0.002])['stdev_ms'] == 0.0
+
+    def test_run_suite_records_errors(self):
+        """Test a failing benchmark does not stop the others."""
+        def fail():
+            raise RuntimeError('boom')
+
+        results = harness.run_suite([harness.Benchmark('bad', fail), harness.Benchmark('good', lambda: None)], 2)
+
+        assert results['bad'] == {'n': 0, 'error': 'RuntimeError: boom'}
+        assert results['good']['n'] == 2
+
+    def test_results_round_trip(self, tmp_path):
+        """Test result files keep the run parameters and environment."""
+        path = tmp_path / 'out' / 'results.json'
+        harness.write_results(path, {'b': {'n': 1, 'median_ms': 1.0}}, scale='tiny', seed=3)
+
+        document = harness.load_results(path)
+        assert (document['scale'], document['seed']) == ('tiny', 3)
+        assert document['benchmarks']['b']['median_ms'] == 1.0
+        assert 'git' in document['environment']
+
+        path.write_text(json.dumps({'version': 99}))
+        with pytest.raises(ValueError):
+            harness.load_results(path)
+
+
+class TestCompare:
+    """Test comparing results with a baseline."""
+
+    def test_statuses(self):
+        """Test each benchmark is classified against the baseline."""
+        baseline = make_results(slower=100.0, faster=100.0, same=100.0, tiny=1.0, gone=5.0)
+        current = make_results(slower=150.0, faster=50.0, same=110.0, tiny=1.9, added=5.0)
+        current['benchmarks']['broken'] = {'n': 0, 'error': 'RuntimeError: boom'}
+
+        rows = {row['name']: row for row in harness.compare(current, baseline, threshold=0.25, min_delta_ms=2.0)}
+
+        assert rows['slower']['status'] == 'regression'
+        assert rows['slower']['change'] == pytest.approx(0.5)
+        assert rows['faster']['status'] == 'improvement'
+        assert rows['same']['status'] == 'ok'
+        assert rows['tiny']['status'] == 'ok'
+        assert rows['added']['status'] == 'new'
+        assert rows['gone']['status'] == 'missing'
+        assert rows['broken']['status'] == 'error'
+
+    def test_format_lists_regressions_first(self):
+        """Test the table starts with the regressions."""
+        rows = harness.compare(make_results(a=100.0, b=300.0), make_results(a=100.0, b=100.0))
+        lines = harness.format_comparison(rows).splitlines()
+
+        assert lines[1].split()[0] == 'b' and lines[1].endswith('regression')
+        assert '+200%' in lines[1]
+
+
+class TestMain:
+    """Test 'python -m benchmarks'."""
+
+    def test_baseline_then_compare(self, tmp_path, monkeypatch, capsys):
+        """Test a run saves a baseline and the next run is compared with it."""
+        monkeypatch.setenv('GGGIT_EVENT_LOG', '0')
+        output, baseline = tmp_path / 'results.json', tmp_path / 'baseline.json'
+        argv = ['--scale', 'tiny', '--repeat', '1', '--output', str(output), '--baseline', str(baseline),
+                '--filter', 'git.get_staged_files:*', '--filter', 'config.load:*', '--filter', 'cmd.ggv:cold']
+
+        assert main(argv + ['--save-baseline']) == 0
+        saved = harness.load_results(baseline)
+        assert sorted(saved['benchmarks']) == ['cmd.ggv:cold', 'config.load:cold', 'config.load:warm',
+                                               'git.get_staged_files:cold', 'git.get_staged_files:warm']
+        assert all('error' not in summary for summary in saved['benchmarks'].values())
+
+        # Generous threshold: only the comparison itself is under test
+        assert main(argv + ['--threshold', '100']) == 0
+        out = capsys.readouterr().out
+        assert 'cmd.ggv:cold' in out and 'regression' not in out
+        assert harness.load_results(output)['scale'] == 'tiny'
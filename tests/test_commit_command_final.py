@@ -10,6 +10,15 @@ import subprocess
 from unittest.mock import patch, MagicMock
 
 from src.core.base_commands.commit import CommitCommand
+from src.core.git_status import RepositoryStatus, StatusEntry
+
+
+def make_status(staged=(), unstaged=()):
+    """Build a status snapshot with the given staged and modified files."""
+    return RepositoryStatus(
+        staged=tuple(StatusEntry(path, 'M', '.') for path in staged),
+        unstaged=tuple(StatusEntry(path, '.', 'M') for path in unstaged)
+    )
 
 
 class TestCommitCommandInitialization:
@@ -74,8 +83,9 @@ class TestExecuteCommitCommand:
             
             # Mock git interface methods
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = []
-            mock_git.get_unstaged_files.return_value = ['test_file.py']
+            mock_git.get_repository_status.return_value = make_status(
+                staged=[], unstaged=['test_file.py']
+            )
             mock_git.stage_all_changes.return_value = True
             mock_git.commit.return_value = True
             
@@ -94,8 +104,9 @@ class TestExecuteCommitCommand:
             
             # Mock git interface methods
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = []
-            mock_git.get_unstaged_files.return_value = ['test_file.py']
+            mock_git.get_repository_status.return_value = make_status(
+                staged=[], unstaged=['test_file.py']
+            )
             mock_git.stage_all_changes.return_value = True
             mock_git.commit.return_value = True
             
@@ -116,8 +127,9 @@ class TestExecuteCommitCommand:
             
             # Mock git interface methods
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = ['test_file.py']
-            mock_git.get_unstaged_files.return_value = []
+            mock_git.get_repository_status.return_value = make_status(
+                staged=['test_file.py'], unstaged=[]
+            )
             
             # Mock validator
             mock_validator.validate_commit_message.return_value = True
@@ -180,8 +192,9 @@ class TestExecuteCommitCommand:
              patch.object(cmd, 'validator') as mock_validator:
             
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = []
-            mock_git.get_unstaged_files.return_value = []
+            mock_git.get_repository_status.return_value = make_status(
+                staged=[], unstaged=[]
+            )
             mock_validator.validate_commit_message.return_value = True
             
             result = cmd.execute("add feature")
@@ -195,8 +208,9 @@ class TestExecuteCommitCommand:
              patch.object(cmd, 'validator') as mock_validator:
             
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = []
-            mock_git.get_unstaged_files.return_value = ['test_file.py']
+            mock_git.get_repository_status.return_value = make_status(
+                staged=[], unstaged=['test_file.py']
+            )
             mock_git.stage_all_changes.return_value = False
             mock_validator.validate_commit_message.return_value = True
             
@@ -211,8 +225,9 @@ class TestExecuteCommitCommand:
              patch.object(cmd, 'validator') as mock_validator:
             
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = []
-            mock_git.get_unstaged_files.return_value = ['test_file.py']
+            mock_git.get_repository_status.return_value = make_status(
+                staged=[], unstaged=['test_file.py']
+            )
             mock_git.stage_all_changes.return_value = True
             mock_git.commit.return_value = False
             mock_validator.validate_commit_message.return_value = True
@@ -229,8 +244,9 @@ class TestExecuteCommitCommand:
              patch.object(cmd, '_execute_amend_commit') as mock_amend:
             
             mock_git.is_git_repository.return_value = True
-            mock_git.get_staged_files.return_value = ['test_file.py']
-            mock_git.get_unstaged_files.return_value = []
+            mock_git.get_repository_status.return_value = make_status(
+                staged=['test_file.py'], unstaged=[]
+            )
             mock_amend.return_value = False
             mock_validator.validate_commit_message.return_value = True
             
@@ -10,6 +10,7 @@ from unittest.mock import Mock, patch, MagicMock
 from src.core.ai.complexity_analyzer import ComplexityAnalyzer
 from src.core.git import GitInterface
 from src.core.config import ConfigManager
+from src.core.git_status import RepositoryStatus, StatusEntry
 
 
 class TestComplexityAnalyzer:
@@ -23,7 +24,7 @@ class TestComplexityAnalyzer:
     
     def test_analyze_complexity_no_files(self):
         """Test complexity analysis with no files."""
-        self.git_mock.get_files_to_analyze.return_value = []
+        self.git_mock.get_repository_status.return_value = RepositoryStatus()
         
         result = self.analyzer.analyze_complexity()
         
@@ -36,8 +37,9 @@ class TestComplexityAnalyzer:
     def test_analyze_complexity_with_files(self):
         """Test complexity analysis with files."""
         files = ['file1.py', 'file2.py']
-        self.git_mock.get_files_to_analyze.return_value = files
-        self.git_mock.get_staged_files.return_value = files
+        self.git_mock.get_repository_status.return_value = RepositoryStatus(
+            staged=tuple(StatusEntry(f, 'M', '.') for f in files)
+        )
         self.git_mock.get_diff_line_count.return_value = 50
         self.git_mock.get_file_size.side_effect = [1000, 2000]
         
@@ -52,8 +54,10 @@ class TestComplexityAnalyzer:
     def test_analyze_complexity_unstaged_files(self):
         """Test complexity analysis with unstaged files."""
         files = ['file1.py', 'file2.py']
-        self.git_mock.get_files_to_analyze.return_value = files
-        self.git_mock.get_staged_files.return_value = []
+        self.git_mock.get_repository_status.return_value = RepositoryStatus(
+            unstaged=(StatusEntry('file1.py', '.', 'M'),),
+            untracked=('file2.py',)
+        )
         self.git_mock.get_diff_line_count.return_value = 30
         self.git_mock.get_file_size.side_effect = [500, 1500]
         
@@ -65,6 +69,17 @@ class TestComplexityAnalyzer:
         assert result['files'] == files
         assert result['has_staged'] == False
     
+    def test_analyze_complexity_reuses_given_snapshot(self):
+        """Test a snapshot passed by the caller avoids another status call."""
+        status = RepositoryStatus(staged=(StatusEntry('file1.py', 'A', '.'),))
+        self.git_mock.get_diff_line_count.return_value = 5
+        self.git_mock.get_file_size.return_value = 10
+        
+        result = self.analyzer.analyze_complexity(status)
+        
+        assert result['files'] == ['file1.py']
+        self.git_mock.get_repository_status.assert_not_called()
+    
     def test_should_use_ai_simple_changes(self):
         """Test should_use_ai with simple changes."""
         analysis = {
@@ -0,0 +1,116 @@
+"""
+Tests for compiled configuration snapshots.
+
+This module tests ConfigSnapshot on its own and the way ConfigManager
+uses it to skip YAML parsing and validation when nothing changed.
+"""
+
+import datetime
+import os
+import tempfile
+import pytest
+import yaml
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.config import ConfigManager
+from src.core.config_cache import ConfigSnapshot
+
+
+OLD = 1_000_000_000
+
+
+def write_old(path, content):
+    """Write a file and give it an old mtime so it can be cached."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.utime(path, ns=(OLD, OLD))
+
+
+@pytest.fixture
+def home():
+    """Use a temporary home directory and working directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+        with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+            yield Path(tmpdir)
+        os.chdir(original_cwd)
+
+
+class TestConfigSnapshot:
+    """Test storing and loading snapshots."""
+
+    def test_round_trip(self, home):
+        """Test a stored snapshot is loaded while sources are unchanged."""
+        source = home / "a.yaml"
+        write_old(source, "x: 1\n")
+
+        assert ConfigSnapshot([str(source)]).store({'x': 1}, 'warn') is True
+        assert ConfigSnapshot([str(source)]).load() == {'config': {'x': 1}, 'warning': 'warn'}
+
+    def test_changed_source_invalidates(self, home):
+        """Test a modified source makes the snapshot stale."""
+        source = home / "a.yaml"
+        write_old(source, "x: 1\n")
+        ConfigSnapshot([str(source)]).store({'x': 1})
+
+        write_old(source, "x: 22\n")
+
+        assert ConfigSnapshot([str(source)]).load() is None
+
+    def test_recent_sources_are_not_cached(self, home):
+        """Test sources modified within the racy window are not cached."""
+        source = home / "a.yaml"
+        source.write_text("x: 1\n")
+
+        snapshot = ConfigSnapshot([str(source)])
+
+        assert snapshot.cacheable is False
+        assert snapshot.store({'x': 1}) is False
+
+    def test_non_json_values_are_not_cached(self, home):
+        """Test configurations JSON cannot represent are skipped."""
+        source = home / "a.yaml"
+        write_old(source, "when: 2024-01-01\n")
+
+        assert ConfigSnapshot([str(source)]).store({'when': datetime.date(2024, 1, 1)}) is False
+
+
+class TestConfigManagerSnapshot:
+    """Test ConfigManager served from snapshots."""
+
+    def test_second_load_skips_parsing(self, home):
+        """Test an unchanged configuration is not parsed again."""
+        write_old(home / ".gggit" / "user-config.yaml", yaml.dump({'ui': {'colors': {'success': 'blue'}}}))
+        ConfigManager()
+
+        with patch.object(ConfigManager, '_load_config_file') as load_file, \
+             patch.object(ConfigManager, 'validate_config') as validate:
+            config = ConfigManager()
+            load_file.assert_not_called()
+            validate.assert_not_called()
+
+        assert config.get_config('ui.colors.success') == 'blue'
+
+    def test_edit_and_new_module_are_picked_up(self, home):
+        """Test edits and added module files rebuild the configuration."""
+        user_config = home / ".gggit" / "user-config.yaml"
+        write_old(user_config, yaml.dump({'ui': {'colors': {'success': 'blue'}}}))
+        ConfigManager()
+
+        write_old(user_config, yaml.dump({'ui': {'colors': {'success': 'green'}}}))
+        assert ConfigManager().get_config('ui.colors.success') == 'green'
+
+        write_old(home / ".gggit" / "modules" / "team.yaml", yaml.dump({'ui': {'colors': {'success': 'cyan'}}}))
+        assert ConfigManager().get_config('ui.colors.success') == 'cyan'
+
+    def test_validation_warning_is_repeated(self, home, capsys):
+        """Test a cached invalid configuration still warns."""
+        write_old(home / ".gggit" / "user-config.yaml", yaml.dump({'ai': {'enabled': 'yes'}}))
+        ConfigManager()
+        capsys.readouterr()
+
+        ConfigManager()
+
+        assert "Warning: Configuration validation failed" in capsys.readouterr().out
@@ -281,6 +281,27 @@ class TestExecuteList:
                 assert result == 0
 
 
+class TestExecuteCleanupLogs:
+    """Test cleanup-logs action."""
+    
+    def test_execute_cleanup_logs(self, capsys):
+        """Test cleanup-logs removes segments past logging.retention_days."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                config_cmd = ConfigCommand()
+                config_cmd.config = MagicMock()
+                config_cmd.config.get_config.side_effect = (
+                    lambda key, default=None: 7 if key == 'logging.retention_days' else default
+                )
+                
+                with patch.object(config_cmd.logger, 'cleanup_old_logs', return_value=2) as mock_cleanup:
+                    result = config_cmd.execute('cleanup-logs')
+                
+                assert result == 0
+                mock_cleanup.assert_called_once_with(7)
+                assert "Removed 2 log files older than 7 days" in capsys.readouterr().out
+
+
 class TestValueConversion:
     """Test value conversion functionality."""
     
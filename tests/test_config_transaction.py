@@ -0,0 +1,155 @@
+"""
+Tests for batched configuration changes.
+
+This module tests ConfigManager transactions and the multi-key and
+--from-file forms of 'ggconfig set'.
+"""
+
+import os
+import tempfile
+import pytest
+import yaml
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from src.core.config import ConfigManager
+
+
+@pytest.fixture
+def home():
+    """Use a temporary home directory and working directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+        with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+            yield Path(tmpdir)
+        os.chdir(original_cwd)
+
+
+def read_yaml(path):
+    """Read a YAML file."""
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+class TestConfigTransaction:
+    """Test ConfigManager.transaction and set_configs."""
+
+    def test_one_write_and_one_reload(self, home):
+        """Test many keys cause a single write and merge."""
+        config = ConfigManager()
+
+        with patch.object(ConfigManager, '_write_temp_config_file',
+                          wraps=config._write_temp_config_file) as save, \
+             patch.object(ConfigManager, '_merge_sources', wraps=config._merge_sources) as merge:
+            config.set_configs({
+                'ai.enabled': True,
+                'ai.provider': 'openai',
+                'ui.colors.success': 'green'
+            })
+            assert save.call_count == 1
+            assert merge.call_count == 1
+
+        assert config.get_config('ai.provider') == 'openai'
+        assert read_yaml(home / ".gggit" / "user-config.yaml")['ui']['colors']['success'] == 'green'
+
+    def test_levels_are_written_separately(self, home):
+        """Test a transaction spanning levels writes each level file."""
+        config = ConfigManager()
+
+        with config.transaction() as transaction:
+            transaction.set('ai.enabled', True, level='user')
+            transaction.set('git.default_branch', 'trunk', level='repo')
+
+        assert read_yaml(home / ".gggit" / "user-config.yaml") == {'ai': {'enabled': True}}
+        assert read_yaml(home / ".gggit" / "repo-config.yaml") == {'git': {'default_branch': 'trunk'}}
+        assert config.get_config('git.default_branch') == 'trunk'
+
+    def test_exception_discards_changes(self, home):
+        """Test nothing is written when the block fails."""
+        config = ConfigManager()
+
+        with pytest.raises(RuntimeError):
+            with config.transaction() as transaction:
+                transaction.set('ai.enabled', True)
+                raise RuntimeError("abort")
+
+        assert not (home / ".gggit" / "user-config.yaml").exists()
+
+    def test_invalid_level(self, home):
+        """Test invalid levels are rejected when recorded."""
+        with pytest.raises(ValueError):
+            ConfigManager().transaction().set('ai.enabled', True, level='invalid')
+        with pytest.raises(ValueError):
+            ConfigManager().transaction().set('ai.enabled', True, level='module')
+
+    def test_failed_write_leaves_every_level(self, home):
+        """Test no level file changes when one of them cannot be written."""
+        config = ConfigManager()
+        config.set_config('ai.enabled', False)
+        write = config._write_temp_config_file
+
+        def fail_on_repo(file_path, document):
+            if file_path.endswith('repo-config.yaml'):
+                raise PermissionError(file_path)
+            return write(file_path, document)
+
+        with patch.object(config, '_write_temp_config_file', side_effect=fail_on_repo):
+            with pytest.raises(PermissionError):
+                with config.transaction() as transaction:
+                    transaction.set('ai.enabled', True, level='user')
+                    transaction.set('git.default_branch', 'trunk', level='repo')
+
+        assert read_yaml(home / ".gggit" / "user-config.yaml") == {'ai': {'enabled': False}}
+        assert not (home / ".gggit" / "repo-config.yaml").exists()
+        assert [p.name for p in (home / ".gggit").iterdir() if p.name.startswith('.')] == []
+
+    def test_save_keeps_file_mode(self, home):
+        """Test the atomic rewrite keeps the file permissions."""
+        config = ConfigManager()
+        config.set_config('ai.enabled', True)
+        user_config = home / ".gggit" / "user-config.yaml"
+        os.chmod(user_config, 0o600)
+
+        config.set_config('ai.enabled', False)
+
+        assert user_config.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in user_config.parent.iterdir() if p.name.startswith('.')] == []
+
+
+class TestGgconfigSetMany:
+    """Test the batched forms of 'ggconfig set'."""
+
+    def test_multiple_pairs(self, home):
+        """Test several KEY VALUE pairs in one call."""
+        from src.commands.ggconfig import main
+
+        result = CliRunner().invoke(main, ['set', 'ai.enabled', 'true', 'ai.max_tokens', '500'])
+
+        assert result.exit_code == 0
+        assert read_yaml(home / ".gggit" / "user-config.yaml") == {'ai': {'enabled': True, 'max_tokens': 500}}
+
+    def test_odd_number_of_arguments(self, home):
+        """Test a key without value is rejected."""
+        from src.commands.ggconfig import main
+
+        result = CliRunner().invoke(main, ['set', 'ai.enabled', 'true', 'ai.provider'])
+
+        assert result.exit_code == 1
+
+    def test_from_file(self, home):
+        """Test values are read from a YAML file, nested or dotted."""
+        from src.commands.ggconfig import main
+
+        values = home / "values.yaml"
+        values.write_text(yaml.dump({'ai': {'enabled': True}, 'ui.colors.success': 'cyan'}))
+
+        result = CliRunner().invoke(main, ['set', '--from-file', str(values), '--level', 'repo'])
+
+        assert result.exit_code == 0
+        assert read_yaml(home / ".gggit" / "repo-config.yaml") == {
+            'ai': {'enabled': True},
+            'ui': {'colors': {'success': 'cyan'}}
+        }
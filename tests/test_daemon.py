@@ -0,0 +1,169 @@
+"""
+Tests for the resident daemon and its thin client.
+
+This module starts a real daemon on a temporary socket with a temporary
+commands directory and checks that commands run with the client's
+arguments, directory, environment and descriptors, and that the client
+falls back to in-process execution when no daemon is available.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import pytest
+from pathlib import Path
+
+from src.core.daemon import (
+    exit_code_from_system_exit,
+    ping,
+    source_fingerprint,
+    stop_daemon
+)
+from src.gg import main as gg_main
+from src.gg_client import run_via_daemon
+
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+ECHO_SCRIPT = '''
+import os
+import sys
+print("args:", " ".join(sys.argv[1:]))
+print("cwd:", os.getcwd())
+print("env:", os.environ.get("GG_TEST_VALUE"))
+print("stdin:", sys.stdin.read().strip())
+sys.exit(int(os.environ.get("GG_TEST_EXIT", "0")))
+'''
+
+
+@pytest.fixture
+def daemon(monkeypatch):
+    """Start a daemon serving a temporary 'ggecho' command."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        commands_dir = Path(tmpdir) / "commands"
+        commands_dir.mkdir()
+        (commands_dir / "ggecho.py").write_text(ECHO_SCRIPT)
+        socket_path = Path(tmpdir) / "run" / "daemon.sock"
+        monkeypatch.setenv('GGGIT_DAEMON_SOCKET', str(socket_path))
+
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'core.daemon', '--socket', str(socket_path),
+             '--commands-dir', str(commands_dir), '--idle-timeout', '60'],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + 15
+        while ping(socket_path) is None:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                pytest.fail("daemon did not start")
+            time.sleep(0.05)
+
+        yield {'socket': socket_path, 'commands_dir': commands_dir, 'tmpdir': Path(tmpdir)}
+
+        stop_daemon(socket_path)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_echo(tmpdir, args, stdin=b""):
+    """Run ggecho through the daemon with file-backed descriptors."""
+    stdin_path = tmpdir / "stdin"
+    stdin_path.write_bytes(stdin)
+    with open(stdin_path, 'rb') as fin, \
+         open(tmpdir / "stdout", 'wb') as fout, \
+         open(tmpdir / "stderr", 'wb') as ferr:
+        code = run_via_daemon('ggecho', args, fds=(fin.fileno(), fout.fileno(), ferr.fileno()))
+    return code, (tmpdir / "stdout").read_text()
+
+
+class TestDaemon:
+    """Test commands served by a running daemon."""
+
+    def test_runs_command_with_client_state(self, daemon, monkeypatch):
+        """Test argv, cwd, environment and stdin come from the client."""
+        monkeypatch.setenv('GG_TEST_VALUE', 'from-client')
+        workdir = daemon['tmpdir'] / "work"
+        workdir.mkdir()
+        monkeypatch.chdir(workdir)
+
+        code, output = run_echo(daemon['tmpdir'], ['a', 'b c'], stdin=b"typed\n")
+
+        assert code == 0
+        assert "args: a b c" in output
+        assert f"cwd: {os.path.realpath(workdir)}" in output
+        assert "env: from-client" in output
+        assert "stdin: typed" in output
+
+    def test_exit_code_is_returned(self, daemon, monkeypatch):
+        """Test the command's exit status reaches the client."""
+        monkeypatch.setenv('GG_TEST_EXIT', '3')
+        code, _ = run_echo(daemon['tmpdir'], [])
+        assert code == 3
+
+    def test_status_counts_commands(self, daemon):
+        """Test ping reports the daemon state."""
+        run_echo(daemon['tmpdir'], [])
+        status = ping(daemon['socket'])
+        assert status['pid'] > 0
+        assert status['served'] >= 1
+
+    def test_unknown_command_is_not_served(self, daemon):
+        """Test unknown commands are left to the client."""
+        with open(os.devnull, 'rb') as fin, open(os.devnull, 'wb') as fout:
+            fds = (fin.fileno(), fout.fileno(), fout.fileno())
+            assert run_via_daemon('ggmissing', [], fds=fds) is None
+
+    def test_stale_sources_retire_daemon(self, daemon):
+        """Test the daemon steps aside after its sources change."""
+        script = daemon['commands_dir'] / "ggecho.py"
+        later = time.time() + 5
+        os.utime(script, (later, later))
+
+        code, _ = run_echo(daemon['tmpdir'], [])
+
+        assert code is None
+        deadline = time.monotonic() + 5
+        while ping(daemon['socket']) is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert ping(daemon['socket']) is None
+
+
+class TestClientFallback:
+    """Test the client without a daemon."""
+
+    def test_no_daemon_returns_none(self, monkeypatch, tmp_path):
+        """Test a missing socket means in-process execution."""
+        monkeypatch.setenv('GGGIT_DAEMON_SOCKET', str(tmp_path / "missing.sock"))
+        assert run_via_daemon('ggv', []) is None
+
+    def test_command_runs_in_process(self, monkeypatch, tmp_path, capsys):
+        """Test commands run in-process when no daemon listens."""
+        monkeypatch.setenv('GGGIT_DAEMON_SOCKET', str(tmp_path / "missing.sock"))
+        with pytest.raises(SystemExit) as exc_info:
+            gg_main(['ggv'])
+        assert exc_info.value.code == 0
+        assert "git version" in capsys.readouterr().out
+
+
+class TestHelpers:
+    """Test protocol helpers."""
+
+    def test_exit_code_from_system_exit(self):
+        """Test SystemExit codes map like the interpreter's."""
+        assert exit_code_from_system_exit(None) == 0
+        assert exit_code_from_system_exit(4) == 4
+        assert exit_code_from_system_exit("boom") == 1
+
+    def test_source_fingerprint_changes(self, tmp_path):
+        """Test the fingerprint follows source modifications."""
+        source = tmp_path / "module.py"
+        source.write_text("x = 1\n")
+        before = source_fingerprint(tmp_path)
+        later = time.time() + 5
+        os.utime(source, (later, later))
+        assert source_fingerprint(tmp_path) > before
@@ -0,0 +1,142 @@
+"""
+Tests for the token-budgeted diff reducer.
+
+This module tests diff parsing, the files and hunks that are reduced to
+notes, budget enforcement and determinism.
+"""
+
+from src.core.ai.diff_reducer import estimate_tokens, parse_diff, reduce_diff
+
+
+def file_diff(path, hunks, extra_header=""):
+    """Build the diff of one file from (removed, added) line lists."""
+    text = f"diff --git a/{path} b/{path}\nindex 1111111..2222222 100644\n{extra_header}"
+    text += f"--- a/{path}\n+++ b/{path}\n"
+    for number, (removed, added) in enumerate(hunks):
+        text += f"@@ -{number * 10 + 1},{len(removed) + 1} +{number * 10 + 1},{len(added) + 1} @@\n"
+        text += " context\n"
+        text += ''.join(f"-{line}\n" for line in removed)
+        text += ''.join(f"+{line}\n" for line in added)
+    return text
+
+
+RENAME = (
+    "diff --git a/old/name.py b/new/name.py\n"
+    "similarity index 100%\n"
+    "rename from old/name.py\n"
+    "rename to new/name.py\n"
+)
+
+BINARY = (
+    "diff --git a/logo.png b/logo.png\n"
+    "index 1111111..2222222 100644\n"
+    "Binary files a/logo.png and b/logo.png differ\n"
+)
+
+
+class TestParseDiff:
+    """Test parsing of git diff output."""
+
+    def test_files_hunks_and_counts(self):
+        """Test files, hunks and added/removed counts."""
+        diff = file_diff("a.py", [(["x = 1"], ["x = 2", "y = 3"]), ([], ["z = 4"])])
+        files = parse_diff(diff)
+
+        assert len(files) == 1
+        assert files[0].path == "a.py"
+        assert len(files[0].hunks) == 2
+        assert (files[0].added, files[0].removed) == (3, 1)
+
+    def test_rename_and_binary(self):
+        """Test renames and binary files are recognised."""
+        files = parse_diff(RENAME + BINARY)
+
+        assert files[0].old_path == "old/name.py"
+        assert files[0].path == "new/name.py"
+        assert files[1].binary is True
+
+
+class TestReduceDiff:
+    """Test reduce_diff."""
+
+    def test_small_diff_is_kept(self):
+        """Test a diff within budget keeps every hunk."""
+        diff = file_diff("a.py", [(["x = 1"], ["x = 2"])])
+        reduced = reduce_diff(diff, 1000)
+
+        assert reduced.reduced is False
+        assert "+x = 2" in reduced.text
+        assert "index 1111111" not in reduced.text
+
+    def test_noise_files_become_notes(self):
+        """Test lockfiles, generated, binary and renamed files are noted."""
+        diff = (
+            file_diff("package-lock.json", [([], ["lock"] * 50)])
+            + file_diff("static/app.min.js", [([], ["min"] * 50)])
+            + BINARY + RENAME
+            + file_diff("src/app.py", [(["a"], ["b"])])
+        )
+        reduced = reduce_diff(diff, 1000)
+        statuses = {stats.path: stats.status for stats in reduced.files}
+
+        assert statuses == {
+            'package-lock.json': 'lockfile',
+            'static/app.min.js': 'generated',
+            'logo.png': 'binary',
+            'new/name.py': 'renamed',
+            'src/app.py': 'kept'
+        }
+        assert "+lock" not in reduced.text
+        assert "old/name.py -> new/name.py" in reduced.text
+        assert "lockfile files: package-lock.json" in reduced.summary()
+
+    def test_whitespace_only_hunks_are_dropped(self):
+        """Test hunks changing only whitespace are left out."""
+        diff = file_diff("a.py", [(["x=1"], ["x = 1"]), (["y = 1"], ["y = 2"])])
+        reduced = reduce_diff(diff, 1000)
+
+        assert "+x = 1" not in reduced.text
+        assert "+y = 2" in reduced.text
+        assert "1 whitespace-only hunks omitted" in reduced.text
+
+    def test_budget_is_respected_and_every_file_shown(self):
+        """Test large diffs fit the budget and keep a hunk per file."""
+        big = [([f"old line {i}" for i in range(200)], [f"new line {i}" for i in range(200)])] * 3
+        diff = file_diff("big.py", big) + file_diff("small.py", [(["a"], ["b"])])
+        reduced = reduce_diff(diff, 600)
+
+        assert reduced.original_tokens > 600
+        assert reduced.tokens <= 600 + estimate_tokens("# ... 9999 more lines in this hunk\n") * 3
+        stats = {s.path: s for s in reduced.files}
+        assert stats['small.py'].status == 'kept'
+        assert stats['big.py'].status == 'partial'
+        assert "+b" in reduced.text
+        assert "hunks omitted" in reduced.text
+
+    def test_deterministic(self):
+        """Test the same input always gives the same output."""
+        diff = file_diff("a.py", [([f"l{i}"], [f"m{i}"]) for i in range(40)])
+        assert reduce_diff(diff, 200).text == reduce_diff(diff, 200).text
+
+
+class TestGeneratorUsesReducer:
+    """Test the message generator sends the reduced diff."""
+
+    def test_prompt_gets_reduced_diff_and_notes(self):
+        """Test ai.diff.max_tokens limits the diff in the prompt."""
+        from unittest.mock import Mock, patch
+        from src.core.ai.message_generator import AiMessageGenerator
+
+        values = {'ai.diff.max_tokens': 100, 'ai.cache.enabled': False}
+        config = Mock()
+        config.get_config.side_effect = lambda key, default=None: values.get(key, default)
+        generator = AiMessageGenerator(config, Mock())
+        diff = file_diff("yarn.lock", [([], ["dep"] * 400)]) + file_diff("a.py", [(["a"], ["b"])])
+
+        with patch.object(generator, '_call_ai_api', return_value="chore: update deps") as call:
+            generator.generate_message(["yarn.lock", "a.py"], diff)
+
+        prompt = call.call_args.args[0]
+        assert "+dep" not in prompt
+        assert "+b" in prompt
+        assert "Note: lockfile files: yarn.lock" in prompt
@@ -0,0 +1,193 @@
+"""
+Tests for structured command events.
+
+This module tests building command events, reading them back from the
+event log and its rotated segments, and the per-command summary shown
+by 'ggconfig events'.
+"""
+
+import gzip
+import json
+import os
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from src.core.base_commands.base import BaseCommand
+from src.core.base_commands.config import ConfigCommand
+from src.core.utils import profiling
+from src.core.utils.events import (
+    EVENT_FIELDS, EVENT_SCHEMA_VERSION, build_command_event, get_event_files, get_invocation,
+    is_event_log_enabled, iter_events, summarize_events
+)
+
+
+def make_event(command='ggs', exit_code=0, wall_ms=40.0, when=None, **fields):
+    """Create an event as written to events.log."""
+    event = {'v': 1, 'command': command, 'argv': [], 'repo': None, 'exit_code': exit_code,
+             'wall_ms': wall_ms, 'cpu_ms': 10.0, 'child_cpu_ms': 0.0, 'git_calls': 2,
+             'git_ms': 5.0, 'ai_calls': 0, 'ai_ms': 0.0,
+             'time': time.strftime('%Y-%m-%dT%H:%M:%S.000', time.localtime(when or time.time()))}
+    event.update(fields)
+    return event
+
+
+def write_events(path, events, compress=False):
+    """Write events as JSON lines, gzip-compressed if asked."""
+    opener = gzip.open if compress else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for event in events:
+            f.write((event if isinstance(event, str) else json.dumps(event)) + '\n')
+
+
+class TestInvocation:
+    """Test get_invocation and is_event_log_enabled."""
+
+    @pytest.mark.parametrize('argv, expected', [
+        (['/usr/local/ggGit/src/commands/ggfeat.py', 'add login'], ('ggfeat', ['add login'])),
+        (['src/gg.py', 'ggs'], ('ggs', [])),
+        (['gg', 'feat', '-s', 'auth', 'msg'], ('ggfeat', ['-s', 'auth', 'msg'])),
+        (['gg', '--help'], ('gg', ['--help'])),
+        ([], ('', [])),
+    ])
+    def test_get_invocation(self, argv, expected):
+        """Test every way of starting a command gives its gg name."""
+        assert get_invocation(argv) == expected
+
+    def test_event_log_setting(self, monkeypatch):
+        """Test the event log is opt-in and the environment overrides logging.events."""
+        config = MagicMock()
+        config.get_config.side_effect = lambda key, default=None: default
+
+        monkeypatch.delenv('GGGIT_EVENT_LOG', raising=False)
+        assert is_event_log_enabled(None) is False
+        assert is_event_log_enabled(config) is False
+        config.get_config.side_effect = lambda key, default=None: True
+        assert is_event_log_enabled(config) is True
+
+        monkeypatch.setenv('GGGIT_EVENT_LOG', '1')
+        assert is_event_log_enabled(None) is True
+        monkeypatch.setenv('GGGIT_EVENT_LOG', '0')
+        assert is_event_log_enabled(config) is False
+
+
+class TestBuildCommandEvent:
+    """Test the event layout."""
+
+    def test_fields_and_span_totals(self):
+        """Test the event has the schema fields and adds up git and AI spans."""
+        spans = [
+            profiling.SpanRecord('git status', 0.0, 0.004, 1),
+            profiling.SpanRecord('git rev-parse', 0.0, 0.002, 1),
+            profiling.SpanRecord('ai.generate', 0.0, 1.5, 1),
+            profiling.SpanRecord('ai.summarize', 0.0, 0.5, 1, {'files': 3, 'requests': 3}),
+            profiling.SpanRecord('config.load', 0.0, 0.003, 1),
+        ]
+        event = build_command_event('ggfeat', ['msg'], '/repo', 0, started=time.time(),
+                                    wall=1.6, cpu=0.05, child_cpu=0.01, spans=spans)
+
+        assert tuple(event) == EVENT_FIELDS[EVENT_SCHEMA_VERSION]
+        assert event['v'] == EVENT_SCHEMA_VERSION
+        assert (event['git_calls'], event['git_ms']) == (2, 6.0)
+        assert (event['ai_calls'], event['ai_ms']) == (4, 2000.0)
+        assert (event['wall_ms'], event['cpu_ms'], event['child_cpu_ms']) == (1600.0, 50.0, 10.0)
+        json.dumps(event)
+
+    def test_non_integer_exit_code(self):
+        """Test exit codes that are not integers are stored as null."""
+        event = build_command_event('ggs', [], None, True, started=time.time(),
+                                    wall=0, cpu=0, child_cpu=0, spans=[])
+        assert event['exit_code'] is None
+
+
+class TestReadEvents:
+    """Test streaming events from the log and its segments."""
+
+    def test_segments_oldest_first(self, tmp_path):
+        """Test rotated segments are read before the current file."""
+        write_events(tmp_path / 'events.log.2.gz', [make_event('gg2')], compress=True)
+        write_events(tmp_path / 'events.log.1.gz', [make_event('gg1')], compress=True)
+        write_events(tmp_path / 'events.log', [make_event('gg0'), 'not json', '[1]'])
+        (tmp_path / 'main.log').write_text('x')
+
+        assert [p.name for p in get_event_files(tmp_path)] == ['events.log.2.gz', 'events.log.1.gz', 'events.log']
+        assert [e['command'] for e in iter_events(tmp_path)] == ['gg2', 'gg1', 'gg0']
+
+    def test_since_skips_old_events_and_segments(self, tmp_path):
+        """Test events and whole segments before 'since' are left out."""
+        old = time.time() - 10 * 24 * 60 * 60
+        write_events(tmp_path / 'events.log.1.gz', [make_event('ggold', when=old)], compress=True)
+        os.utime(tmp_path / 'events.log.1.gz', (old, old))
+        write_events(tmp_path / 'events.log', [make_event('ggold', when=old), make_event('ggnew')])
+
+        since = time.time() - 24 * 60 * 60
+        assert [e['command'] for e in iter_events(tmp_path, since=since)] == ['ggnew']
+
+    def test_summarize_events(self):
+        """Test events are folded into per-command counters."""
+        stats = summarize_events([
+            make_event('ggs', wall_ms=10.0),
+            make_event('ggs', wall_ms=30.0, exit_code=1),
+            make_event('ggfeat', wall_ms=900.0, ai_calls=1, ai_ms=800.0),
+        ])
+
+        assert list(stats) == ['ggs', 'ggfeat']
+        assert (stats['ggs'].runs, stats['ggs'].failures, stats['ggs'].git_calls) == (2, 1, 4)
+        assert stats['ggs'].wall.percentile(50) == pytest.approx(10.0, rel=0.05)
+        assert stats['ggfeat'].ai.percentile(95) == pytest.approx(800.0, rel=0.05)
+        assert stats['ggs'].ai.count == 0
+
+
+class TestCommandEvents:
+    """Test the events written by commands and 'ggconfig events'."""
+
+    def test_run_logs_event(self, temp_git_repo, monkeypatch):
+        """Test run() writes one event for the invocation."""
+        monkeypatch.chdir(temp_git_repo)
+        monkeypatch.setenv('GGGIT_EVENT_LOG', '1')
+        monkeypatch.setattr('sys.argv', ['/opt/ggGit/src/commands/ggs.py', '--short'])
+
+        class StatusLikeCommand(BaseCommand):
+            def execute(self, *args, **kwargs):
+                with profiling.span('git status'):
+                    pass
+                return 0
+
+        command = StatusLikeCommand()
+        command.logger = MagicMock()
+        assert command.run() == 0
+
+        event = command.logger.log_event.call_args[0][0]
+        assert (event['command'], event['argv'], event['exit_code']) == ('ggs', ['--short'], 0)
+        assert os.path.samefile(event['repo'], temp_git_repo)
+        assert event['git_calls'] == 1
+        command.logger.log_command_execution.assert_called_once_with('StatusLikeCommand', ['--short'])
+
+    def test_run_without_event_log(self, monkeypatch):
+        """Test no event is written unless the event log is turned on."""
+        monkeypatch.delenv('GGGIT_EVENT_LOG', raising=False)
+
+        class QuietCommand(BaseCommand):
+            def execute(self, *args, **kwargs):
+                return 0
+
+        command = QuietCommand()
+        command.logger = MagicMock()
+        assert command.run() == 0
+        command.logger.log_event.assert_not_called()
+
+    def test_ggconfig_events_summary(self, tmp_path, capsys):
+        """Test the events action prints one line per command."""
+        write_events(tmp_path / 'events.log', [make_event('ggs'), make_event('ggs'), make_event('ggfeat')])
+        command = ConfigCommand()
+        command.logger = MagicMock()
+        command.logger.log_dir = tmp_path
+
+        assert command.execute('events', days=7) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "Command events in the last 7 days: 3 runs"
+        assert lines[2].split()[:3] == ['ggs', '2', '0']
+        assert lines[3].split()[:3] == ['ggfeat', '1', '0']
+
+        assert command.execute('events', 'ggfeat', days=7) == 0
+        assert "1 runs" in capsys.readouterr().out
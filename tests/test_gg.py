@@ -0,0 +1,100 @@
+"""
+Tests for the single 'gg' entry point.
+
+This module tests command name resolution, the lazily loaded click
+group and that running a command only imports what it needs.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from src.gg import COMMANDS, build_cli, load_command, resolve_command
+
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+class TestResolveCommand:
+    """Test command name resolution."""
+
+    def test_full_and_short_names(self):
+        """Test names with and without the 'gg' prefix."""
+        assert resolve_command('ggs') == 'ggs'
+        assert resolve_command('feat') == 'ggfeat'
+        assert resolve_command('unknown') is None
+
+    def test_group_entry_point(self):
+        """Test commands built as click groups are loaded as the group."""
+        import click
+        assert isinstance(load_command('ggai'), click.Group)
+        assert load_command('ggs').name == 'main'
+
+    def test_registry_matches_command_scripts(self):
+        """Test every command script is registered and vice versa."""
+        scripts = {path.stem for path in (SRC_DIR / "commands").glob("gg*.py")}
+        assert set(COMMANDS) == scripts
+
+
+class TestLazyCommandGroup:
+    """Test the 'gg' click group."""
+
+    def test_help_lists_commands(self):
+        """Test '--help' lists commands from the static table."""
+        result = CliRunner().invoke(build_cli(), ['--help'])
+
+        assert result.exit_code == 0
+        assert 'ggs' in result.output
+        assert 'Show git status' in result.output
+
+    def test_unknown_command(self):
+        """Test unknown commands are reported by click."""
+        result = CliRunner().invoke(build_cli(), ['nope'])
+
+        assert result.exit_code == 2
+        assert "No such command" in result.output
+
+
+class TestLazyImports:
+    """Test that commands only import what they use."""
+
+    def run_probe(self, code, cwd):
+        """Run code in a fresh interpreter and return its stdout."""
+        env = dict(os.environ, GGGIT_NO_DAEMON='1')
+        result = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        return result.stdout
+
+    def test_ggs_skips_heavy_dependencies(self, tmp_path):
+        """Test 'ggs' loads neither other commands nor yaml/jsonschema/requests."""
+        subprocess.run(['git', 'init', '-q'], cwd=tmp_path, check=True)
+        code = (
+            f"import sys; sys.path.insert(0, {str(SRC_DIR)!r})\n"
+            "import gg\n"
+            "try:\n"
+            "    gg.main(['ggs'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = ('yaml', 'jsonschema', 'requests', 'commands.ggfeat', 'core.ai')\n"
+            "print('loaded:', [m for m in heavy if m in sys.modules])\n"
+        )
+        output = self.run_probe(code, tmp_path)
+
+        assert output.strip().splitlines()[-1] == 'loaded: []'
+
+    def test_help_imports_no_command(self, tmp_path):
+        """Test 'gg --help' imports no command module."""
+        code = (
+            f"import sys; sys.path.insert(0, {str(SRC_DIR)!r})\n"
+            "import gg\n"
+            "try:\n"
+            "    gg.main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(sorted(m for m in sys.modules if m.startswith('commands.')))\n"
+        )
+        assert self.run_probe(code, tmp_path).strip().endswith('[]')
@@ -253,3 +253,39 @@ class TestGgaiCommandErrorHandling:
             result = self.command.execute_test()
             
             assert result == 1
+
+
+class TestGgaiUsageReport:
+    """Test ggai usage report."""
+    
+    def test_report_command(self):
+        """Test the report subcommand passes its options."""
+        runner = CliRunner()
+        with patch('src.commands.ggai.GgaiCommand') as mock_command_class:
+            mock_command = Mock()
+            mock_command.execute_usage_report.return_value = 0
+            mock_command_class.return_value = mock_command
+            
+            result = runner.invoke(ggai, ['usage', 'report', '--days', '7', '--period', 'week'])
+            
+            assert result.exit_code == 0
+            mock_command.execute_usage_report.assert_called_once_with(7, 'week')
+    
+    def test_execute_usage_report(self, tmp_path):
+        """Test the report shows percentiles and throughput."""
+        command = GgaiCommand()
+        command.usage_tracker.usage_file = str(tmp_path / 'ai-usage.yaml')
+        command.usage_tracker.ledger_file = str(tmp_path / 'ai-usage.jsonl')
+        command.usage_tracker.lock_file = str(tmp_path / 'ai-usage.yaml.lock')
+        
+        with patch.object(command.usage_tracker, 'is_tracking_enabled', return_value=True):
+            command.usage_tracker.increment_usage("ggfeat", 60, 0.0, prompt_tokens=50,
+                                                  completion_tokens=10, latency=0.5, model="llama3")
+            with patch('click.echo') as mock_echo:
+                result = command.execute_usage_report()
+        
+        output = '\n'.join(str(call.args[0]) for call in mock_echo.call_args_list)
+        assert result == 0
+        assert "p50/p95/p99" in output
+        assert "20.0 tokens/s" in output
+        assert "llama3" in output
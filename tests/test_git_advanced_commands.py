@@ -184,7 +184,7 @@ class TestGitAdvancedCommandsSpecific:
         """Test ggb branch exists check."""
         cmd = GgbCommand()
         
-        with patch.object(cmd.git, 'get_branches', return_value=["main", "develop"]):
+        with patch.object(cmd.git, 'branch_exists', side_effect=lambda name: name in ["main", "develop"]):
             assert cmd._branch_exists("main") is True
             assert cmd._branch_exists("feature") is False
     
@@ -0,0 +1,116 @@
+"""
+Tests for repository context discovery.
+
+This module tests the pure-Python fast path and the 'git rev-parse'
+fallback of core.git_context against real temporary repositories.
+"""
+
+import os
+import subprocess
+import tempfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.git_context import (
+    RepoContext,
+    discover_repo_context,
+    read_repo_context_fast,
+    read_repo_context_slow
+)
+
+
+@pytest.fixture
+def repo():
+    """Create a repository with one commit on 'main'."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = os.path.realpath(tmpdir)
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=tmpdir, check=True)
+        subprocess.run(['git', 'config', 'user.name', 'Test User'], cwd=tmpdir, check=True)
+        subprocess.run(['git', 'config', 'user.email', 'test@example.com'], cwd=tmpdir, check=True)
+        Path(tmpdir, 'README.md').write_text("context\n")
+        subprocess.run(['git', 'add', 'README.md'], cwd=tmpdir, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'initial'], cwd=tmpdir, check=True)
+        yield tmpdir
+
+
+class TestFastPath:
+    """Test reading the context straight from disk."""
+
+    def test_regular_repository(self, repo):
+        """Test a regular repository is resolved without running git."""
+        with patch('subprocess.run') as mock_run:
+            context = discover_repo_context(repo)
+            mock_run.assert_not_called()
+
+        assert context.git_dir == os.path.join(repo, '.git')
+        assert context.common_dir == context.git_dir
+        assert context.work_tree == repo
+        assert context.head_ref == 'refs/heads/main'
+        assert context.current_branch == 'main'
+        assert not context.is_detached
+
+    def test_detached_head(self, repo):
+        """Test a detached HEAD exposes the commit id."""
+        subprocess.run(['git', 'checkout', '-q', '--detach'], cwd=repo, check=True)
+        oid = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo, check=True,
+                             capture_output=True, text=True).stdout.strip()
+
+        context = read_repo_context_fast(repo)
+
+        assert context.is_detached
+        assert context.current_branch is None
+        assert context.head_oid == oid
+
+    def test_linked_worktree(self, repo):
+        """Test a '.git' file is followed to the worktree's git dir."""
+        with tempfile.TemporaryDirectory() as parent:
+            worktree = os.path.join(os.path.realpath(parent), 'wt')
+            subprocess.run(['git', 'worktree', 'add', '-q', '-b', 'feature', worktree],
+                           cwd=repo, check=True)
+
+            context = read_repo_context_fast(worktree)
+
+            assert context.current_branch == 'feature'
+            assert context.common_dir == os.path.join(repo, '.git')
+            assert context.git_dir.startswith(os.path.join(repo, '.git', 'worktrees'))
+
+    def test_env_override_disables_fast_path(self, repo, monkeypatch):
+        """Test GIT_DIR and friends force the git fallback."""
+        monkeypatch.setenv('GIT_DIR', os.path.join(repo, '.git'))
+        assert read_repo_context_fast(repo) is None
+
+    def test_reftable_disables_fast_path(self, repo):
+        """Test reftable repositories are left to git."""
+        os.mkdir(os.path.join(repo, '.git', 'reftable'))
+        assert read_repo_context_fast(repo) is None
+
+    def test_invalid_git_dir(self, repo):
+        """Test a '.git' directory without HEAD is not trusted."""
+        os.remove(os.path.join(repo, '.git', 'HEAD'))
+        assert read_repo_context_fast(repo) is None
+
+
+class TestSlowPath:
+    """Test the 'git rev-parse' fallback."""
+
+    def test_matches_fast_path(self, repo):
+        """Test both paths agree on a regular repository."""
+        assert read_repo_context_slow(repo) == read_repo_context_fast(repo)
+
+    def test_unborn_branch(self):
+        """Test a repository without commits is still a repository."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            subprocess.run(['git', 'init', '-q', '-b', 'trunk'], cwd=tmpdir, check=True)
+
+            context = read_repo_context_slow(tmpdir)
+
+            assert isinstance(context, RepoContext)
+            assert context.current_branch == 'trunk'
+
+    def test_not_a_repository(self):
+        """Test directories outside any repository resolve to None."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert discover_repo_context(tmpdir) is None
+            Path(tmpdir, '.git').write_text("garbage\n")
+            assert discover_repo_context(tmpdir) is None
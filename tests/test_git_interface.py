@@ -19,6 +19,7 @@ from src.core.git import (
     NotGitRepositoryError,
     GitCommandError
 )
+from src.core.git_context import discover_repo_context
 
 
 class TestGitInterfaceInitialization:
@@ -57,21 +58,53 @@ class TestIsGitRepository:
             result = git.is_git_repository()
             assert result is False
     
-    def test_is_git_repository_false_when_git_status_fails(self, temp_git_repo):
-        """Test returns False when git status fails."""
+    def test_is_git_repository_false_when_git_status_fails(self, temp_dir):
+        """Test returns False when git rejects a .git the fast path cannot read."""
+        Path('.git').write_text("not a gitdir pointer\n")
         with patch('subprocess.run') as mock_run:
             mock_run.return_value.returncode = 1
             git = GitInterface()
             result = git.is_git_repository()
             assert result is False
+            mock_run.assert_called_once()
     
-    def test_is_git_repository_handles_timeout(self, temp_git_repo):
+    def test_is_git_repository_handles_timeout(self, temp_dir):
         """Test handles timeout gracefully."""
+        Path('.git').write_text("not a gitdir pointer\n")
         with patch('subprocess.run') as mock_run:
             mock_run.side_effect = subprocess.TimeoutExpired('git', 10)
             git = GitInterface()
             result = git.is_git_repository()
             assert result is False
+    
+    def test_is_git_repository_fast_path_without_subprocess(self, temp_git_repo):
+        """Test a regular repository is recognized without running git."""
+        with patch('subprocess.run') as mock_run:
+            git = GitInterface()
+            assert git.is_git_repository() is True
+            mock_run.assert_not_called()
+    
+    def test_is_git_repository_is_cached(self, temp_git_repo):
+        """Test the repository context is resolved once per directory."""
+        git = GitInterface()
+        with patch('src.core.git.discover_repo_context', wraps=discover_repo_context) as discover:
+            assert git.is_git_repository() is True
+            assert git.is_git_repository() is True
+            assert git.get_repo_context().current_branch is not None
+            assert discover.call_count == 1
+            
+            git.invalidate_context()
+            git.is_git_repository()
+            assert discover.call_count == 2
+    
+    def test_is_git_repository_follows_cwd(self, temp_git_repo, temp_dir, monkeypatch):
+        """Test the cached context is dropped when the directory changes."""
+        monkeypatch.chdir(temp_git_repo)
+        git = GitInterface()
+        assert git.is_git_repository() is True
+        
+        monkeypatch.chdir(temp_dir)
+        assert git.is_git_repository() is False
 
 
 class TestStageAllChanges:
@@ -80,14 +113,13 @@ class TestStageAllChanges:
     def test_stage_all_changes_success(self, temp_git_repo):
         """Test successful staging of all changes."""
         with patch('subprocess.run') as mock_run:
-            # Mock both git status and git add calls
             mock_run.return_value.returncode = 0
             git = GitInterface()
             result = git.stage_all_changes()
             assert result is True
             # Verify git add was called
-            assert mock_run.call_count == 2  # git status + git add
-            assert mock_run.call_args_list[1] == (
+            assert mock_run.call_count == 1  # git add only
+            assert mock_run.call_args_list[0] == (
                 (['git', 'add', '.'],),
                 {'capture_output': True, 'text': True, 'timeout': 30}
             )
@@ -102,9 +134,8 @@ class TestStageAllChanges:
     def test_stage_all_changes_git_command_fails(self, temp_git_repo):
         """Test raises GitCommandError when git add fails."""
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git add) fails
+            # The repository check is answered from .git, so git add is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=1, stderr="fatal: not a git repository")  # git add
             ]
             git = GitInterface()
@@ -115,9 +146,8 @@ class TestStageAllChanges:
     def test_stage_all_changes_timeout(self, temp_git_repo):
         """Test handles timeout gracefully."""
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git add) times out
+            # The repository check is answered from .git, so git add is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 subprocess.TimeoutExpired('git', 30)  # git add
             ]
             git = GitInterface()
@@ -136,17 +166,16 @@ class TestStageFiles:
         Path('file2.py').touch()
         
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git add) succeeds
+            # The repository check is answered from .git, so git add is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=0)   # git add
             ]
             git = GitInterface()
             result = git.stage_files(['file1.py', 'file2.py'])
             assert result is True
             # Verify git add was called with correct files
-            assert mock_run.call_count == 2
-            assert mock_run.call_args_list[1] == (
+            assert mock_run.call_count == 1
+            assert mock_run.call_args_list[0] == (
                 (['git', 'add', 'file1.py', 'file2.py'],),
                 {'capture_output': True, 'text': True, 'timeout': 30}
             )
@@ -178,9 +207,8 @@ class TestStageFiles:
         Path('file1.py').touch()
         
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git add) fails
+            # The repository check is answered from .git, so git add is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=1, stderr="fatal: pathspec 'file1.py' did not match")  # git add
             ]
             git = GitInterface()
@@ -196,17 +224,16 @@ class TestCommit:
         """Test successful commit."""
         with patch('subprocess.run') as mock_run, \
              patch.object(GitInterface, 'get_staged_files', return_value=['file1.py']):
-            # First call (git status) succeeds, second call (git commit) succeeds
+            # The repository check is answered from .git, so git commit is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=0)   # git commit
             ]
             git = GitInterface()
             result = git.commit("feat: add new feature")
             assert result is True
             # Verify git commit was called
-            assert mock_run.call_count == 2
-            assert mock_run.call_args_list[1] == (
+            assert mock_run.call_count == 1
+            assert mock_run.call_args_list[0] == (
                 (['git', 'commit', '-m', 'feat: add new feature'],),
                 {'capture_output': True, 'text': True, 'timeout': 30}
             )
@@ -244,9 +271,8 @@ class TestCommit:
         """Test raises GitCommandError when git commit fails."""
         with patch('subprocess.run') as mock_run, \
              patch.object(GitInterface, 'get_staged_files', return_value=['file1.py']):
-            # First call (git status) succeeds, second call (git commit) fails
+            # The repository check is answered from .git, so git commit is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=1, stderr="fatal: nothing to commit")  # git commit
             ]
             git = GitInterface()
@@ -258,20 +284,25 @@ class TestCommit:
 class TestGetCurrentBranch:
     """Test get_current_branch method."""
     
+    @pytest.fixture(autouse=True)
+    def use_git_fallback(self):
+        """Exercise the 'git branch' fallback; RefStore has its own tests."""
+        with patch.object(GitInterface, '_get_ref_store', return_value=None):
+            yield
+    
     def test_get_current_branch_success(self, temp_git_repo):
         """Test successful branch retrieval."""
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git branch) succeeds
+            # The repository check is answered from .git, so git branch is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=0, stdout="main\n")  # git branch
             ]
             git = GitInterface()
             result = git.get_current_branch()
             assert result == "main"
             # Verify git branch was called
-            assert mock_run.call_count == 2
-            assert mock_run.call_args_list[1] == (
+            assert mock_run.call_count == 1
+            assert mock_run.call_args_list[0] == (
                 (['git', 'branch', '--show-current'],),
                 {'capture_output': True, 'text': True, 'timeout': 10}
             )
@@ -306,17 +337,16 @@ class TestGetStagedFiles:
     def test_get_staged_files_success(self, temp_git_repo):
         """Test successful retrieval of staged files."""
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git diff) succeeds
+            # The repository check is answered from .git, so git diff is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=0, stdout="file1.py\nfile2.py\n")  # git diff
             ]
             git = GitInterface()
             result = git.get_staged_files()
             assert result == ["file1.py", "file2.py"]
             # Verify git diff was called
-            assert mock_run.call_count == 2
-            assert mock_run.call_args_list[1] == (
+            assert mock_run.call_count == 1
+            assert mock_run.call_args_list[0] == (
                 (['git', 'diff', '--cached', '--name-only'],),
                 {'capture_output': True, 'text': True, 'timeout': 10}
             )
@@ -351,17 +381,16 @@ class TestGetUnstagedFiles:
     def test_get_unstaged_files_success(self, temp_git_repo):
         """Test successful retrieval of unstaged files."""
         with patch('subprocess.run') as mock_run:
-            # First call (git status) succeeds, second call (git diff) succeeds
+            # The repository check is answered from .git, so git diff is the only call
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # git status
                 MagicMock(returncode=0, stdout="file1.py\nfile2.py\n")  # git diff
             ]
             git = GitInterface()
             result = git.get_unstaged_files()
             assert result == ["file1.py", "file2.py"]
             # Verify git diff was called
-            assert mock_run.call_count == 2
-            assert mock_run.call_args_list[1] == (
+            assert mock_run.call_count == 1
+            assert mock_run.call_args_list[0] == (
                 (['git', 'diff', '--name-only'],),
                 {'capture_output': True, 'text': True, 'timeout': 10}
             )
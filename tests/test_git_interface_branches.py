@@ -15,6 +15,12 @@ from src.core.git import GitInterface, GitInterfaceError, GitCommandError, NotGi
 class TestGitInterfaceBranches:
     """Test GitInterface branch methods."""
     
+    @pytest.fixture(autouse=True)
+    def use_git_fallback(self):
+        """Exercise the 'git branch' fallback; RefStore has its own tests."""
+        with patch.object(GitInterface, '_get_ref_store', return_value=None):
+            yield
+    
     def test_get_branches_success(self):
         """Test successful get_branches."""
         git = GitInterface()
@@ -7,9 +7,10 @@ for git interactive commands.
 
 import pytest
 import subprocess
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from src.core.git import GitInterface, GitInterfaceError, GitCommandError, NotGitRepositoryError
+from src.core.git_pool import GitObject
 
 
 class TestGitInterfaceInteractive:
@@ -58,22 +59,21 @@ class TestGitInterfaceInteractive:
     def test_get_branch_info_success(self):
         """Test successful get_branch_info."""
         git = GitInterface()
+        commit = GitObject(
+            "abc1234def", "commit", 60,
+            b"tree 0000\nauthor Test <t@e.com> 0 +0000\n\nLast commit message\n\nBody\n"
+        )
         
-        with patch.object(git, 'is_git_repository', return_value=True):
-            with patch('subprocess.run') as mock_run:
-                # Mock show-branch command
-                mock_run.side_effect = [
-                    MagicMock(returncode=0, stdout="branch info"),
-                    MagicMock(returncode=0, stdout="abc123 Last commit message"),
-                    MagicMock(returncode=0, stdout="* feature/test abc123 Last commit message")
-                ]
-                
-                result = git.get_branch_info("feature/test")
-                
-                assert result["name"] == "feature/test"
-                assert result["last_commit"] == "abc123 Last commit message"
-                assert result["status"] == "* feature/test abc123 Last commit message"
-                assert result["exists"] is True
+        with patch.object(git, 'is_git_repository', return_value=True), \
+             patch.object(git, 'read_object', return_value=commit) as mock_read, \
+             patch.object(git, 'get_current_branch', return_value='feature/test'):
+            result = git.get_branch_info("feature/test")
+            
+            assert result["name"] == "feature/test"
+            assert result["last_commit"] == "abc1234 Last commit message"
+            assert result["status"] == "* feature/test abc1234 Last commit message"
+            assert result["exists"] is True
+            mock_read.assert_called_once_with("feature/test^{commit}")
     
     def test_get_branch_info_not_git_repo(self):
         """Test get_branch_info when not in git repository."""
@@ -84,15 +84,12 @@ class TestGitInterfaceInteractive:
                 git.get_branch_info("feature/test")
     
     def test_get_branch_info_command_error(self):
-        """Test get_branch_info when git command fails."""
+        """Test get_branch_info when the branch does not resolve."""
         git = GitInterface()
         
         with patch.object(git, 'is_git_repository', return_value=True):
-            with patch('subprocess.run') as mock_run:
-                mock_run.return_value.returncode = 1
-                mock_run.return_value.stderr = "Branch not found"
-                
-                with pytest.raises(GitCommandError, match="Git show-branch failed"):
+            with patch.object(git, 'read_object', return_value=None):
+                with pytest.raises(GitCommandError, match="Git branch lookup failed"):
                     git.get_branch_info("nonexistent")
     
     def test_is_branch_mergeable_success(self):
@@ -161,7 +158,7 @@ class TestGitInterfaceInteractive:
         git = GitInterface()
         
         with patch.object(git, 'is_git_repository', return_value=True):
-            with patch('subprocess.run', side_effect=subprocess.CalledProcessError(1, 'git')):
+            with patch.object(git, 'read_object', side_effect=subprocess.CalledProcessError(1, 'git')):
                 with pytest.raises(GitCommandError, match="Git command failed"):
                     git.get_branch_info("feature/test")
     
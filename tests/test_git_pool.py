@@ -0,0 +1,155 @@
+"""
+Tests for the long-lived git helper pool.
+
+This module tests CatFileProcess, GitProcessPool and the GitInterface
+methods served by them against a real temporary repository.
+"""
+
+import os
+import subprocess
+import tempfile
+import pytest
+from pathlib import Path
+
+from src.core.git import GitInterface
+from src.core.git_pool import CatFileProcess, GitProcessPool, GitObject
+
+
+@pytest.fixture
+def repo_with_commit():
+    """Create a repository with one commit and chdir into it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], check=True)
+        subprocess.run(['git', 'config', 'user.name', 'Test User'], check=True)
+        subprocess.run(['git', 'config', 'user.email', 'test@example.com'], check=True)
+        Path('README.md').write_text("hello pool\n")
+        subprocess.run(['git', 'add', 'README.md'], check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'feat: initial commit'], check=True)
+
+        yield tmpdir
+        os.chdir(original_cwd)
+
+
+class TestCatFileProcess:
+    """Test a single batch helper."""
+
+    def test_query_info_without_contents(self, repo_with_commit):
+        """Test --batch-check returns header only."""
+        helper = CatFileProcess(with_contents=False)
+        try:
+            info = helper.query("HEAD")
+            assert info.type == "commit"
+            assert len(info.oid) == 40
+            assert info.data is None
+        finally:
+            helper.close()
+
+    def test_query_with_contents(self, repo_with_commit):
+        """Test --batch returns object contents."""
+        helper = CatFileProcess(with_contents=True)
+        try:
+            blob = helper.query("HEAD:README.md")
+            assert blob.type == "blob"
+            assert blob.data == b"hello pool\n"
+            assert blob.size == len(blob.data)
+        finally:
+            helper.close()
+
+    def test_query_missing_object(self, repo_with_commit):
+        """Test unknown names return None."""
+        helper = CatFileProcess(with_contents=True)
+        try:
+            assert helper.query("refs/heads/does-not-exist") is None
+            # The helper keeps working after a miss
+            assert helper.query("HEAD") is not None
+        finally:
+            helper.close()
+
+    def test_process_is_reused(self, repo_with_commit):
+        """Test several queries share the same git process."""
+        helper = CatFileProcess()
+        try:
+            helper.query("HEAD")
+            pid = helper._process.pid
+            helper.query("HEAD:README.md")
+            helper.query("refs/heads/main")
+            assert helper._process.pid == pid
+        finally:
+            helper.close()
+
+    def test_restarts_after_process_death(self, repo_with_commit):
+        """Test a dead helper is restarted transparently."""
+        helper = CatFileProcess()
+        try:
+            helper.query("HEAD")
+            helper._process.kill()
+            helper._process.wait()
+            assert helper.query("HEAD").type == "commit"
+        finally:
+            helper.close()
+
+    def test_rejects_newlines(self, repo_with_commit):
+        """Test names with newlines are rejected before reaching git."""
+        helper = CatFileProcess()
+        with pytest.raises(ValueError):
+            helper.query("HEAD\nHEAD")
+
+    def test_close_stops_process(self, repo_with_commit):
+        """Test close terminates the git process."""
+        helper = CatFileProcess()
+        helper.query("HEAD")
+        assert helper.is_running
+        helper.close()
+        assert not helper.is_running
+
+
+class TestGitProcessPool:
+    """Test the pool of helpers."""
+
+    def test_pool_starts_helpers_lazily(self, repo_with_commit):
+        """Test no process is started until a lookup happens."""
+        pool = GitProcessPool()
+        assert pool._helpers == {}
+        pool.object_info("HEAD")
+        assert list(pool._helpers) == ['batch-check']
+        pool.close()
+        assert pool._helpers == {}
+
+
+class TestGitInterfaceObjectLookups:
+    """Test GitInterface methods served by the pool."""
+
+    def test_read_object_and_ref_exists(self, repo_with_commit):
+        """Test object reads and ref checks."""
+        with GitInterface() as git:
+            assert git.ref_exists("refs/heads/main") is True
+            assert git.ref_exists("refs/heads/missing") is False
+            assert git.read_object("HEAD:README.md").data == b"hello pool\n"
+            assert isinstance(git.get_object_info("HEAD"), GitObject)
+
+    def test_get_branch_info_real_repo(self, repo_with_commit):
+        """Test get_branch_info against a real repository."""
+        with GitInterface() as git:
+            info = git.get_branch_info("main")
+            assert info["last_commit"].endswith("feat: initial commit")
+            assert info["status"].startswith("* main ")
+
+    def test_pool_follows_working_directory(self, repo_with_commit):
+        """Test the pool is replaced when the working directory changes."""
+        git = GitInterface()
+        try:
+            git.ref_exists("HEAD")
+            first_pool = git._pool
+            with tempfile.TemporaryDirectory() as other:
+                os.chdir(other)
+                try:
+                    assert git.ref_exists("HEAD") is False
+                    assert git._pool is not first_pool
+                finally:
+                    os.chdir(repo_with_commit)
+        finally:
+            git.close()
+        assert git._pool is None
@@ -0,0 +1,157 @@
+"""
+Tests for the pure-Python ref reader.
+
+This module tests RefStore against real temporary repositories, including
+packed refs, remote-tracking refs, cache invalidation and the fallback
+to git for reftable repositories.
+"""
+
+import os
+import subprocess
+import tempfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core.git import GitInterface
+from src.core.git_refs import RefStore
+
+
+def git(*args, cwd):
+    """Run a git command in a test repository."""
+    return subprocess.run(['git'] + list(args), cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo():
+    """Create a repository with a commit and a few branches, chdir into it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+
+        git('init', '-q', '-b', 'main', cwd=tmpdir)
+        git('config', 'user.name', 'Test User', cwd=tmpdir)
+        git('config', 'user.email', 'test@example.com', cwd=tmpdir)
+        Path('README.md').write_text("refs\n")
+        git('add', 'README.md', cwd=tmpdir)
+        git('commit', '-q', '-m', 'initial', cwd=tmpdir)
+        git('branch', 'develop', cwd=tmpdir)
+        git('branch', 'feature/login', cwd=tmpdir)
+
+        yield tmpdir
+        os.chdir(original_cwd)
+
+
+def make_store(path):
+    """Create a RefStore for a repository path."""
+    git_dir = os.path.join(path, '.git')
+    return RefStore(git_dir)
+
+
+class TestRefStore:
+    """Test reading refs from disk."""
+
+    def test_branches_match_git(self, repo):
+        """Test local branches are listed like 'git branch'."""
+        expected = git('branch', '--format=%(refname:short)', cwd=repo).splitlines()
+        assert make_store(repo).branches() == expected
+
+    def test_packed_refs(self, repo):
+        """Test branches only present in packed-refs are found."""
+        git('pack-refs', '--all', cwd=repo)
+        store = make_store(repo)
+
+        assert store.branches() == ['develop', 'feature/login', 'main']
+        assert store.branch_exists('feature/login')
+        assert store.resolve('refs/heads/main') == git('rev-parse', 'main', cwd=repo)
+
+    def test_loose_ref_overrides_packed(self, repo):
+        """Test loose refs win over stale packed entries."""
+        git('pack-refs', '--all', cwd=repo)
+        Path('CHANGES').write_text("more\n")
+        git('add', 'CHANGES', cwd=repo)
+        git('commit', '-q', '-m', 'second', cwd=repo)
+
+        assert make_store(repo).resolve('refs/heads/main') == git('rev-parse', 'HEAD', cwd=repo)
+
+    def test_remote_branches_skip_head(self, repo):
+        """Test remote-tracking refs are listed without '<remote>/HEAD'."""
+        oid = git('rev-parse', 'HEAD', cwd=repo)
+        git('update-ref', 'refs/remotes/origin/main', oid, cwd=repo)
+        git('update-ref', 'refs/remotes/origin/develop', oid, cwd=repo)
+        git('symbolic-ref', 'refs/remotes/origin/HEAD', 'refs/remotes/origin/main', cwd=repo)
+
+        store = make_store(repo)
+
+        assert store.remote_branches() == ['origin/develop', 'origin/main']
+        assert store.resolve('refs/remotes/origin/HEAD') == oid
+
+    def test_head_and_detached_head(self, repo):
+        """Test current branch and detached HEAD."""
+        store = make_store(repo)
+        assert store.current_branch() == 'main'
+
+        git('checkout', '-q', 'develop', cwd=repo)
+        assert store.current_branch() == 'develop'
+
+        git('checkout', '-q', '--detach', cwd=repo)
+        assert store.current_branch() is None
+        assert store.head()[1] == git('rev-parse', 'HEAD', cwd=repo)
+
+    def test_branch_exists(self, repo):
+        """Test existence checks, including unsafe names."""
+        store = make_store(repo)
+        assert store.branch_exists('develop')
+        assert not store.branch_exists('missing')
+        assert not store.branch_exists('../HEAD')
+
+    def test_listing_is_cached_until_refs_change(self, repo):
+        """Test unchanged ref directories are not scanned again."""
+        store = make_store(repo)
+        heads = os.path.join(repo, '.git', 'refs', 'heads')
+        old = 1_000_000_000
+        for dirpath, _, _ in os.walk(heads):
+            os.utime(dirpath, ns=(old, old))
+
+        assert 'develop' in store.branches()
+        with patch('os.walk') as walk:
+            assert 'develop' in store.branches()
+            walk.assert_not_called()
+
+        git('branch', 'hotfix', cwd=repo)
+        assert 'hotfix' in store.branches()
+
+    def test_reftable_not_supported(self, repo):
+        """Test reftable repositories are reported as unsupported."""
+        os.mkdir(os.path.join(repo, '.git', 'reftable'))
+        assert make_store(repo).supported is False
+
+
+class TestGitInterfaceRefs:
+    """Test GitInterface branch methods served by RefStore."""
+
+    def test_branch_methods_without_subprocess(self, repo):
+        """Test branch listing and lookups do not start git."""
+        git_interface = GitInterface()
+        git_interface.is_git_repository()
+
+        with patch('subprocess.run') as mock_run:
+            assert git_interface.get_current_branch() == 'main'
+            assert git_interface.get_branches() == ['develop', 'feature/login', 'main']
+            assert git_interface.get_remote_branches() == []
+            assert git_interface.branch_exists('develop') is True
+            assert git_interface.is_branch_mergeable('develop') is True
+            mock_run.assert_not_called()
+
+    def test_falls_back_to_git_for_reftable(self, repo):
+        """Test branch listing uses git when refs cannot be read."""
+        os.mkdir(os.path.join(repo, '.git', 'reftable'))
+        git_interface = GitInterface()
+        assert git_interface.is_git_repository() is True
+
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = "main\n"
+            assert git_interface.get_branches() == ['main']
+            mock_run.assert_called_once()
@@ -0,0 +1,201 @@
+"""
+Tests for the repository status snapshot.
+
+This module tests the porcelain v2 parser and
+GitInterface.get_repository_status() against a real repository.
+"""
+
+import os
+import subprocess
+import tempfile
+import pytest
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from src.core.git import GitInterface, GitCommandError, NotGitRepositoryError
+from src.core.git_status import RepositoryStatus, StatusEntry, parse_porcelain_v2
+
+
+def porcelain(*records):
+    """Join records the way 'git status -z' prints them."""
+    return b''.join(record.encode('utf-8') + b'\0' for record in records)
+
+
+class TestParsePorcelainV2:
+    """Test parse_porcelain_v2."""
+
+    def test_branch_headers(self):
+        """Test branch name, upstream and ahead/behind are parsed."""
+        status = parse_porcelain_v2(porcelain(
+            "# branch.oid 1234567890abcdef1234567890abcdef12345678",
+            "# branch.head feature/login",
+            "# branch.upstream origin/feature/login",
+            "# branch.ab +2 -3",
+        ))
+
+        assert status.current_branch == "feature/login"
+        assert status.head_oid.startswith("1234567")
+        assert status.upstream == "origin/feature/login"
+        assert (status.ahead, status.behind) == (2, 3)
+        assert status.is_clean
+
+    def test_initial_and_detached(self):
+        """Test repositories without commits and detached HEAD."""
+        status = parse_porcelain_v2(porcelain(
+            "# branch.oid (initial)",
+            "# branch.head (detached)",
+        ))
+
+        assert status.head_oid is None
+        assert status.current_branch is None
+
+    def test_ordinary_entries(self):
+        """Test staged, unstaged and partially staged files."""
+        status = parse_porcelain_v2(porcelain(
+            "# branch.head main",
+            "1 M. N... 100644 100644 100644 aaa bbb src/staged.py",
+            "1 .M N... 100644 100644 100644 aaa aaa src/modified.py",
+            "1 MM N... 100644 100644 100644 aaa bbb src/both.py",
+            "1 A. N... 000000 100644 100644 000 ccc path with spaces.txt",
+        ))
+
+        assert status.staged_files == ["src/staged.py", "src/both.py", "path with spaces.txt"]
+        assert status.unstaged_files == ["src/modified.py", "src/both.py"]
+        assert status.has_staged
+        assert not status.is_clean
+
+    def test_rename_entry(self):
+        """Test renames consume the extra original path record."""
+        status = parse_porcelain_v2(porcelain(
+            "2 R. N... 100644 100644 100644 aaa aaa R100 new_name.py",
+            "old_name.py",
+            "? notes.txt",
+        ))
+
+        assert status.staged == (StatusEntry("new_name.py", "R", ".", "old_name.py"),)
+        assert status.untracked_files == ["notes.txt"]
+
+    def test_unmerged_and_untracked(self):
+        """Test conflicts and untracked files."""
+        status = parse_porcelain_v2(porcelain(
+            "u UU N... 100644 100644 100644 100644 a b c conflict.py",
+            "? new.py",
+        ))
+
+        assert status.conflicted_files == ["conflict.py"]
+        assert status.working_tree_files == ["conflict.py", "new.py"]
+        assert status.files_to_analyze() == ["conflict.py", "new.py"]
+
+    def test_malformed_record(self):
+        """Test malformed records raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_porcelain_v2(porcelain("1 M. broken"))
+
+    def test_snapshot_is_immutable(self):
+        """Test the snapshot cannot be modified."""
+        status = parse_porcelain_v2(porcelain("# branch.head main"))
+        with pytest.raises(FrozenInstanceError):
+            status.current_branch = "other"
+
+    def test_to_dict(self):
+        """Test conversion to a plain dictionary."""
+        status = RepositoryStatus(current_branch="main", untracked=("a.txt",))
+        data = status.to_dict()
+
+        assert data["current_branch"] == "main"
+        assert data["untracked_files"] == ["a.txt"]
+        assert data["is_clean"] is False
+
+
+class TestGetRepositoryStatus:
+    """Test GitInterface.get_repository_status."""
+
+    def test_single_git_process(self, status_repo):
+        """Test the snapshot is produced by one git status call."""
+        git = GitInterface()
+        with patch.object(git, 'is_git_repository', return_value=True), \
+             patch('subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout=porcelain("# branch.head main", "? a.txt"), stderr=b""
+            )
+            status = git.get_repository_status()
+
+        assert status.untracked_files == ["a.txt"]
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][:3] == ['git', 'status', '--porcelain=v2']
+
+    def test_real_repository(self, status_repo):
+        """Test snapshot contents against a real repository."""
+        Path('tracked.txt').write_text("changed\n")
+        Path('staged.txt').write_text("new\n")
+        Path('untracked.txt').write_text("?\n")
+        subprocess.run(['git', 'add', 'staged.txt'], check=True)
+
+        status = GitInterface().get_repository_status()
+
+        assert status.current_branch == "main"
+        assert status.staged_files == ["staged.txt"]
+        assert status.unstaged_files == ["tracked.txt"]
+        assert status.untracked_files == ["untracked.txt"]
+
+    def test_git_failure(self, status_repo):
+        """Test git errors are reported as GitCommandError."""
+        git = GitInterface()
+        with patch.object(git, 'is_git_repository', return_value=True), \
+             patch('subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(returncode=128, stdout=b"", stderr=b"fatal: boom")
+            with pytest.raises(GitCommandError, match="Git status failed"):
+                git.get_repository_status()
+
+    def test_not_git_repository(self):
+        """Test outside a repository."""
+        git = GitInterface()
+        with patch.object(git, 'is_git_repository', return_value=False):
+            with pytest.raises(NotGitRepositoryError):
+                git.get_repository_status()
+
+
+class TestSnapshotReuse:
+    """Test the AI commit path takes one status snapshot."""
+
+    def test_ai_commit_path(self, status_repo):
+        """Test the analysis and the commit share the command's snapshot."""
+        from src.commands.ggfeat import FeatCommand
+
+        Path('tracked.txt').write_text("changed\n")
+        subprocess.run(['git', 'add', 'tracked.txt'], check=True)
+        command = FeatCommand()
+        analysis = {'files': ['tracked.txt'], 'has_staged': True}
+
+        # Command scripts import the core package as 'core'
+        with patch('core.ai.prefetch.is_prefetch_enabled', return_value=False), \
+             patch('core.ai.ComplexityAnalyzer.should_use_ai', return_value=(True, analysis)) as mock_analysis, \
+             patch('core.ai.AiMessageGenerator.generate_message', return_value='feat: change'), \
+             patch.object(command.git, 'get_repository_status',
+                          wraps=command.git.get_repository_status) as mock_status, \
+             patch('core.base_commands.commit.CommitCommand.execute', return_value=0) as mock_commit:
+            assert command._generate_ai_message() == 0
+
+        mock_status.assert_called_once()
+        status = mock_analysis.call_args[0][0]
+        assert status.staged_files == ['tracked.txt']
+        assert mock_commit.call_args.kwargs['status'] is status
+
+
+@pytest.fixture
+def status_repo():
+    """Create a repository with one tracked file and chdir into it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], check=True)
+        subprocess.run(['git', 'config', 'user.name', 'Test User'], check=True)
+        subprocess.run(['git', 'config', 'user.email', 'test@example.com'], check=True)
+        Path('tracked.txt').write_text("original\n")
+        subprocess.run(['git', 'add', 'tracked.txt'], check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'initial'], check=True)
+
+        yield tmpdir
+        os.chdir(original_cwd)
@@ -23,6 +23,7 @@ import shutil
 from src.core.base_commands.base import BaseCommand
 from src.core.config import ConfigManager
 from src.core.git import GitInterface
+from src.core.git_status import RepositoryStatus
 from src.core.validation import ArgumentValidator
 from src.core.utils.colors import ColorManager
 from src.core.utils.logging import LoggingManager
@@ -113,7 +114,7 @@ class TestComponentIntegration:
         assert isinstance(git_interface.get_current_branch(), (str, type(None)))
         assert isinstance(git_interface.get_staged_files(), list)
         assert isinstance(git_interface.get_unstaged_files(), list)
-        assert isinstance(git_interface.get_repository_status(), dict)
+        assert isinstance(git_interface.get_repository_status(), RepositoryStatus)
     
     def test_argument_validator_integration(self, argument_validator, sample_validation_data):
         """Test ArgumentValidator integration with validation data."""
@@ -5,14 +5,21 @@ This module contains comprehensive tests for the LoggingManager class,
 covering all methods and functionality as specified in the architecture.
 """
 
+import gzip
+import json
 import pytest
 import tempfile
 import os
 import logging
+import logging.handlers
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from src.core.utils import logging as gggit_logging
 from src.core.utils.logging import LoggingManager
+from tests.conftest import make_config
 
 
 class TestLoggingManagerInitialization:
@@ -30,13 +37,23 @@ class TestLoggingManagerInitialization:
         assert logger.log_level == "DEBUG"
         assert logger.log_dir == Path.home() / ".gggit" / "logs"
     
-    def test_init_creates_log_directory(self):
-        """Test that initialization creates log directory."""
+    def test_init_does_not_create_log_directory(self):
+        """Test that initialization does no file I/O."""
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch('pathlib.Path.home', return_value=Path(tmpdir)):
                 logger = LoggingManager()
-                assert logger.log_dir.exists()
+                assert not logger.log_dir.exists()
+    
+    def test_first_record_creates_log_directory(self):
+        """Test that the log directory is created by the first record."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                logger.get_logger("test").info("first record")
+                logger.flush()
+                
                 assert logger.log_dir.is_dir()
+                assert "first record" in (logger.log_dir / 'main.log').read_text()
 
 
 class TestSetupLogging:
@@ -49,23 +66,50 @@ class TestSetupLogging:
                 logger = LoggingManager()
                 root_logger = logging.getLogger('gggit')
                 
-                # Should have file and console handlers
-                assert len(root_logger.handlers) >= 2
+                # Records are queued for the background writer
+                assert len(root_logger.handlers) == 1
+                assert isinstance(root_logger.handlers[0], logging.handlers.QueueHandler)
                 
-                # Check handler types
-                handler_types = [type(h).__name__ for h in root_logger.handlers]
-                assert 'FileHandler' in handler_types
-                assert 'StreamHandler' in handler_types
+                # Which writes the files and the console
+                writer = gggit_logging._get_writer(logger.log_dir)
+                assert all(isinstance(h, logging.StreamHandler) for h in writer.handlers)
+                assert sum(isinstance(h, logging.FileHandler) for h in writer.handlers) == len(gggit_logging.LOG_FILES)
     
     def test_setup_logging_creates_log_files(self):
-        """Test that _setup_logging creates log files."""
+        """Test that log files are created by the first record for them."""
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch('pathlib.Path.home', return_value=Path(tmpdir)):
                 logger = LoggingManager()
+                logger.get_logger("test").info("only main.log")
+                logger.flush()
                 
-                # Check that log files exist
                 assert (logger.log_dir / 'main.log').exists()
-                assert (logger.log_dir / 'error.log').exists()
+                assert not (logger.log_dir / 'error.log').exists()
+                
+                try:
+                    raise ValueError("boom")
+                except ValueError as e:
+                    logger.log_error(e, "test")
+                logger.flush()
+                
+                error_log = (logger.log_dir / 'error.log').read_text()
+                assert "Error occurred in test: boom" in error_log
+                assert "ValueError: boom" in error_log
+    
+    def test_setup_logging_does_not_block(self):
+        """Test that records are written by a background thread."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                writer = gggit_logging._get_writer(logger.log_dir)
+                emitted = []
+                
+                with patch.object(writer.handlers[0], 'emit',
+                                  side_effect=lambda record: emitted.append(threading.get_ident())):
+                    logger.get_logger("test").info("queued")
+                    logger.flush()
+                
+                assert emitted and emitted[0] != threading.get_ident()
 
 
 class TestGetLogger:
@@ -98,6 +142,15 @@ class TestGetLogger:
         assert cmd_logger.name == "gggit.command"
         assert error_logger.name == "gggit.error"
         assert git_logger.name == "gggit.git"
+    
+    def test_get_logger_replaces_foreign_handlers(self):
+        """Test handlers left by another copy of the module are replaced."""
+        stale = logging.NullHandler()
+        logging.getLogger("gggit.stale").handlers = [stale]
+        
+        test_logger = LoggingManager().get_logger("stale")
+        
+        assert test_logger.handlers == [gggit_logging._queue_handler]
 
 
 class TestSetLevel:
@@ -258,6 +311,167 @@ class TestGetLogFilePath:
         assert perf_path == logger.log_dir / "performance.log"
 
 
+class TestLogPerformance:
+    """Test log_performance method."""
+    
+    def test_log_performance_writes_json_line(self):
+        """Test performance records go to performance.log as JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager("ERROR")
+                logger.log_performance("FeatCommand", 0.25, {"exit_code": 0})
+                logger.log_performance("git_commit", 0.001)
+                logger.flush()
+                
+                lines = logger.get_log_file_path("performance").read_text().splitlines()
+                records = [json.loads(line) for line in lines]
+                
+                assert records[0]["operation"] == "FeatCommand"
+                assert records[0]["duration_ms"] == 250.0
+                assert records[0]["exit_code"] == 0
+                assert records[1]["operation"] == "git_commit"
+                assert "time" in records[1]
+                
+                # Not written to the main log
+                assert not logger.get_log_file_path("main").exists()
+    
+    def test_log_performance_follows_log_dir(self):
+        """Test a new log directory gets its own performance.log."""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            with patch('pathlib.Path.home', return_value=Path(first)):
+                LoggingManager().log_performance("one", 0.1)
+            with patch('pathlib.Path.home', return_value=Path(second)):
+                logger = LoggingManager()
+                logger.log_performance("two", 0.1)
+                logger.flush()
+                
+                content = logger.get_log_file_path("performance").read_text()
+                assert '"two"' in content and '"one"' not in content
+
+
+class TestLogRotation:
+    """Test rotation of the log files."""
+    
+    def test_get_log_settings_defaults_and_invalid_values(self):
+        """Test settings fall back to defaults for missing or invalid values."""
+        settings = gggit_logging.get_log_settings(None)
+        assert settings == {'max_bytes': 5 * 1024 * 1024, 'max_files': 5, 'rotate_daily': True,
+                            'compress': True, 'retention_days': 30}
+        
+        settings = gggit_logging.get_log_settings(make_config({
+            'logging.max_size_mb': 0.5, 'logging.max_files': 0,
+            'logging.compress': 'yes', 'logging.retention_days': 7
+        }))
+        assert settings['max_bytes'] == 512 * 1024
+        assert settings['max_files'] == 5
+        assert settings['compress'] is True
+        assert settings['retention_days'] == 7
+    
+    def test_rotates_by_size_and_compresses(self):
+        """Test a full log is rotated into gzip segments."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                gggit_logging._get_writer(logger.log_dir).configure(gggit_logging.get_log_settings(
+                    make_config({'logging.max_size_mb': 200 / (1024 * 1024), 'logging.max_files': 2})
+                ))
+                test_logger = logger.get_logger("test")
+                for index in range(10):
+                    test_logger.info(f"record {index} " + "x" * 50)
+                logger.flush()
+                
+                names = sorted(p.name for p in logger.log_dir.iterdir())
+                assert names == ['main.log', 'main.log.1.gz', 'main.log.2.gz']
+                with gzip.open(logger.log_dir / 'main.log.1.gz', 'rt') as f:
+                    assert 'record' in f.read()
+                assert 'record 9' in (logger.log_dir / 'main.log').read_text()
+    
+    def test_rotates_daily(self):
+        """Test a log last written on an earlier day is rotated first."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                logger.log_dir.mkdir(parents=True)
+                main_log = logger.log_dir / 'main.log'
+                main_log.write_text("yesterday\n")
+                two_days_ago = time.time() - 2 * 24 * 60 * 60
+                os.utime(main_log, (two_days_ago, two_days_ago))
+                
+                logger.get_logger("test").info("today")
+                logger.flush()
+                
+                assert 'yesterday' not in main_log.read_text()
+                with gzip.open(logger.log_dir / 'main.log.1.gz', 'rt') as f:
+                    assert f.read() == "yesterday\n"
+
+
+class TestCleanupOldLogs:
+    """Test cleanup_old_logs and the daily automatic cleanup."""
+    
+    def make_old(self, path, days):
+        """Set the modification time of a file some days back."""
+        old = time.time() - days * 24 * 60 * 60
+        os.utime(path, (old, old))
+    
+    def test_cleanup_removes_old_segments_only(self):
+        """Test old segments are removed and active logs are kept."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                logger.log_dir.mkdir(parents=True)
+                for name in ('main.log', 'main.log.1.gz', 'main.log.2.gz', 'notes.txt'):
+                    (logger.log_dir / name).write_text(name)
+                    self.make_old(logger.log_dir / name, 40)
+                (logger.log_dir / 'main.log.1.gz').touch()
+                
+                assert logger.cleanup_old_logs(30) == 1
+                
+                names = sorted(p.name for p in logger.log_dir.iterdir())
+                assert names == ['.last-cleanup', 'main.log', 'main.log.1.gz', 'notes.txt']
+    
+    def test_cleanup_runs_at_most_once_a_day(self):
+        """Test the automatic cleanup only runs when the stamp is old."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                
+                # No log directory yet: nothing to do
+                assert logger._is_cleanup_due() is False
+                
+                logger.log_dir.mkdir(parents=True)
+                assert logger._is_cleanup_due() is True
+                assert logger._is_cleanup_due() is False
+                
+                self.make_old(logger.log_dir / '.last-cleanup', 2)
+                assert logger._is_cleanup_due() is True
+    
+    def test_configure_starts_cleanup_when_due(self):
+        """Test configure() cleans up with the configured retention."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                logger.log_dir.mkdir(parents=True)
+                
+                with patch.object(logger, 'cleanup_old_logs') as mock_cleanup:
+                    logger.configure(make_config({'logging.retention_days': 7}))
+                    logger.configure(make_config({'logging.retention_days': 7}))
+                    for thread in threading.enumerate():
+                        if thread.name == 'gggit-log-cleanup':
+                            thread.join()
+                
+                mock_cleanup.assert_called_once_with(7)
+    
+    def test_configure_without_retention_does_not_clean(self):
+        """Test retention_days 0 disables the cleanup."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                logger = LoggingManager()
+                logger.log_dir.mkdir(parents=True)
+                logger.configure(make_config({'logging.retention_days': 0}))
+                
+                assert not (logger.log_dir / '.last-cleanup').exists()
+
+
 class TestLoggingIntegration:
     """Test logging integration with real file output."""
     
@@ -266,6 +480,9 @@ class TestLoggingIntegration:
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch('pathlib.Path.home', return_value=Path(tmpdir)):
                 logger = LoggingManager("DEBUG")
+                logger.log_command_execution("ggfeat", [])
+                logger.log_error(ValueError("Test error"))
+                logger.flush()
                 
                 # Check that files were created
                 main_log = logger.log_dir / "main.log"
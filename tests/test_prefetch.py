@@ -0,0 +1,198 @@
+"""
+Tests for speculative commit message prefetch.
+
+This module tests MessagePrefetcher: starting workers after staging,
+generating messages keyed by index tree, and dropping stale workers
+when the index changes before the commit.
+"""
+
+import os
+import subprocess
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from src.core.ai.message_generator import AiMessageGenerator
+from src.core.ai.prefetch import MessagePrefetcher, get_prefetch_types, is_prefetch_enabled
+from src.core.ai.usage_tracker import AiUsageTracker
+from src.core.git import GitInterface
+from tests.conftest import make_config
+
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Prefetch needs POSIX process control")
+
+
+@pytest.fixture
+def repo(temp_git_repo, monkeypatch, tmp_path):
+    """A repository with one commit and a staged change, as cwd."""
+    monkeypatch.chdir(temp_git_repo)
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    (temp_git_repo / 'app.py').write_text("print('v1')\n")
+    subprocess.run(['git', 'add', 'app.py'], check=True)
+    subprocess.run(['git', 'commit', '-q', '-m', 'init'], check=True)
+    (temp_git_repo / 'app.py').write_text("print('v2')\n")
+    subprocess.run(['git', 'add', 'app.py'], check=True)
+    git = GitInterface()
+    yield git
+    git.close()
+
+
+def fake_config(tmp_path, **values):
+    """Create a configuration using the fake provider."""
+    return make_config(dict({
+        'ai.enabled': True,
+        'ai.provider': 'fake',
+        'ai.model': 'fake-model',
+        'ai.fake.response': 'feat: print v2',
+        'ai.usage_file': str(tmp_path / 'ai-usage.yaml'),
+        'ai.prefetch.enabled': True
+    }, **values))
+
+
+class TestPrefetchSettings:
+    """Test the prefetch configuration helpers."""
+
+    def test_disabled_by_default(self):
+        """Test prefetch is opt-in."""
+        assert is_prefetch_enabled(make_config({'ai.enabled': True})) is False
+
+    def test_enabled(self):
+        """Test prefetch needs AI and the message cache."""
+        assert is_prefetch_enabled(make_config({'ai.enabled': True, 'ai.prefetch.enabled': True}))
+        assert not is_prefetch_enabled(make_config({'ai.enabled': True, 'ai.prefetch.enabled': True,
+                                                    'ai.cache.enabled': False}))
+
+    def test_types(self):
+        """Test configured types and the default."""
+        assert get_prefetch_types(make_config()) == ['feat']
+        assert get_prefetch_types(make_config({'ai.prefetch.types': ['fix', 'feat']})) == ['fix', 'feat']
+        assert get_prefetch_types(make_config({'ai.prefetch.types': 'fix'})) == ['feat']
+
+
+class TestIndexTree:
+    """Test the index tree ids the prefetch is keyed by."""
+
+    def test_tree_follows_index(self, repo, temp_git_repo):
+        """Test the tree changes with the staged contents only."""
+        tree = repo.get_index_tree()
+        assert tree and tree != repo.get_head_tree()
+
+        (temp_git_repo / 'app.py').write_text("print('v3')\n")
+        assert repo.get_index_tree() == tree
+
+        subprocess.run(['git', 'add', 'app.py'], check=True)
+        assert repo.get_index_tree() != tree
+
+
+class TestMessagePrefetcher:
+    """Test starting, claiming and cancelling workers."""
+
+    def test_start_without_staged_changes(self, repo, tmp_path):
+        """Test no worker is started when the index matches HEAD."""
+        subprocess.run(['git', 'commit', '-q', '-m', 'v2'], check=True)
+        prefetcher = MessagePrefetcher(repo, fake_config(tmp_path), tmp_path / 'jobs')
+
+        with patch.object(prefetcher, '_spawn') as mock_spawn:
+            assert prefetcher.start() is False
+        mock_spawn.assert_not_called()
+
+    def test_start_records_job(self, repo, tmp_path):
+        """Test the worker is started detached for the index tree."""
+        prefetcher = MessagePrefetcher(repo, fake_config(tmp_path), tmp_path / 'jobs')
+        tree = repo.get_index_tree()
+        repo.get_head_tree()
+
+        with patch.object(repo, 'get_index_tree', return_value=tree), \
+             patch('src.core.ai.prefetch.subprocess.Popen') as mock_popen:
+            mock_popen.return_value.pid = 999999
+            assert prefetcher.start() is True
+
+        args, kwargs = mock_popen.call_args
+        assert args[0][-1] == tree
+        assert kwargs['start_new_session'] is True
+        job = prefetcher._read_job()
+        assert (job['pid'], job['tree'], job['types']) == (999999, tree, ['feat'])
+
+    def test_run_then_claim(self, repo, temp_git_repo, tmp_path):
+        """Test a generated message is claimed for the same index only."""
+        config = fake_config(tmp_path)
+        prefetcher = MessagePrefetcher(repo, config, tmp_path / 'jobs')
+        tree = repo.get_index_tree()
+
+        assert prefetcher.run(tree) == 0
+
+        generator = AiMessageGenerator(config, AiUsageTracker(config))
+        assert prefetcher.claim(generator, 'feat') == 'print v2'
+        assert prefetcher.claim(generator, 'fix') is None
+
+        (temp_git_repo / 'app.py').write_text("print('v3')\n")
+        subprocess.run(['git', 'add', 'app.py'], check=True)
+        assert prefetcher.claim(generator, 'feat') is None
+
+    def test_run_skips_changed_index(self, repo, tmp_path):
+        """Test a worker does not store a message for a tree it no longer sees."""
+        config = fake_config(tmp_path)
+        prefetcher = MessagePrefetcher(repo, config, tmp_path / 'jobs')
+
+        assert prefetcher.run('0' * 40) == 1
+        generator = AiMessageGenerator(config, AiUsageTracker(config))
+        assert prefetcher.claim(generator, 'feat') is None
+
+    def test_claim_cancels_stale_worker(self, repo, tmp_path):
+        """Test a worker for another index tree is stopped."""
+        prefetcher = MessagePrefetcher(repo, fake_config(tmp_path), tmp_path / 'jobs')
+        (tmp_path / 'jobs').mkdir()
+        worker = subprocess.Popen(['sleep', '30'], start_new_session=True)
+        try:
+            prefetcher._write_job({'pid': worker.pid, 'tree': '0' * 40, 'types': ['feat']})
+
+            generator = Mock()
+            generator.get_prefetched.return_value = None
+            assert prefetcher.claim(generator, 'feat') is None
+
+            assert worker.wait(timeout=5) != 0
+            assert prefetcher._read_job() is None
+        finally:
+            if worker.poll() is None:
+                worker.kill()
+
+    def test_claim_waits_for_running_worker(self, repo, tmp_path):
+        """Test a worker for the same tree is waited for."""
+        config = fake_config(tmp_path, **{'ai.prefetch.wait': 5})
+        prefetcher = MessagePrefetcher(repo, config, tmp_path / 'jobs')
+        (tmp_path / 'jobs').mkdir()
+        job_path = prefetcher._job_path()
+        tree = repo.get_index_tree()
+        # Stand-in worker: removes its job file after a short while
+        worker = subprocess.Popen(['sh', '-c', f'sleep 0.3; rm -f "{job_path}"'])
+        try:
+            prefetcher._write_job({'pid': worker.pid, 'tree': tree, 'types': ['feat']})
+
+            generator = Mock()
+            generator.get_prefetched.return_value = 'feat: ready'
+            started = time.monotonic()
+            assert prefetcher.claim(generator, 'feat') == 'feat: ready'
+
+            assert time.monotonic() - started >= 0.2
+            generator.get_prefetched.assert_called_once_with(tree, 'feat')
+        finally:
+            worker.wait(timeout=5)
+
+
+class TestCommitUsesPrefetch:
+    """Test the commit commands use a prefetched message."""
+
+    def test_generate_ai_message_claims_first(self, tmp_path):
+        """Test the AI path commits a prefetched message without analysis."""
+        from src.commands.ggfeat import FeatCommand
+
+        command = FeatCommand()
+        # Command scripts import the core package as 'core'
+        with patch('core.ai.prefetch.is_prefetch_enabled', return_value=True), \
+             patch('core.ai.prefetch.MessagePrefetcher.claim', return_value='feat: ready'), \
+             patch('core.ai.ComplexityAnalyzer.should_use_ai') as mock_analysis, \
+             patch.object(command, '_execute_manual_commit', return_value=0) as mock_commit:
+            assert command._generate_ai_message() == 0
+
+        mock_analysis.assert_not_called()
+        mock_commit.assert_called_once_with('feat: ready', None, False)
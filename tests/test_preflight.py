@@ -0,0 +1,178 @@
+"""
+Tests for the AI request pre-flight checks.
+
+This module tests plan_request: token and cost projections from the
+diff line counts, the choice between full and summarized prompts, and
+refusals for the ai.analysis ceilings, the cost budget and latency.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.core.ai.complexity_analyzer import ComplexityAnalyzer
+from src.core.ai.message_generator import AiMessageGenerator
+from src.core.ai.preflight import (
+    STRATEGY_FULL, STRATEGY_REFUSE, STRATEGY_SUMMARIZED, plan_request
+)
+from tests.conftest import make_config
+
+
+def make_tracker(cost=0.0, cost_limit=5.0, latency_seconds=0.0, timed_requests=0):
+    """Create a usage tracker mock with the given spending and latency."""
+    tracker = Mock()
+    tracker.is_tracking_enabled.return_value = True
+    tracker.get_cost_limit.return_value = cost_limit
+    tracker.is_cost_limit_exceeded.return_value = cost >= cost_limit
+    tracker.get_remaining_budget.return_value = max(0.0, cost_limit - cost)
+    tracker.get_usage_stats.return_value = {'totals': {
+        'cost': cost, 'latency_seconds': latency_seconds, 'timed_requests': timed_requests
+    }}
+    return tracker
+
+
+def make_analysis(file_count=2, diff_lines=40, max_file_size=900):
+    """Create complexity analysis results."""
+    return {'file_count': file_count, 'diff_lines': diff_lines, 'max_file_size': max_file_size,
+            'files': [f"file{i}.py" for i in range(file_count)], 'has_staged': True}
+
+
+class TestPlanRequest:
+    """Test the strategy chosen before building the prompt."""
+
+    def test_small_change_is_sent_whole(self):
+        """Test changes within the ceilings use one full prompt."""
+        plan = plan_request(make_analysis(), make_config())
+
+        assert plan.strategy == STRATEGY_FULL
+        assert (plan.prompt_tokens, plan.requests) == (590, 1)
+        assert plan.cost == 0.0
+
+    def test_full_prompt_capped_by_diff_budget(self):
+        """Test the projection accounts for the diff reduction."""
+        config = make_config({'ai.diff.max_tokens': 100, 'ai.analysis.max_diff_lines': 10000})
+
+        plan = plan_request(make_analysis(diff_lines=5000), config)
+
+        assert plan.prompt_tokens == 250
+
+    def test_over_ceilings_is_sent_reduced_without_map_reduce(self):
+        """Test changes over ai.analysis ceilings use one reduced prompt by default."""
+        plan = plan_request(make_analysis(file_count=15, diff_lines=300), make_config())
+
+        assert plan.strategy == STRATEGY_FULL
+        assert plan.requests == 1
+        assert plan.limits == ["demasiados archivos (15)", "demasiadas líneas de cambio (300)"]
+        assert plan.reason is None
+
+    def test_default_config_sends_large_change(self):
+        """Test the shipped defaults never refuse a change for its size alone."""
+        config = make_config({'ai.analysis.max_files': 10, 'ai.analysis.max_diff_lines': 200,
+                              'ai.map_reduce.enabled': False})
+
+        plan = plan_request(make_analysis(file_count=3, diff_lines=250), config, make_tracker())
+
+        assert plan.strategy == STRATEGY_FULL
+        assert not plan.refused
+        assert plan.prompt_tokens == 250 * 10 + 3 * 20 + 150
+
+    def test_over_ceilings_is_summarized_with_map_reduce(self):
+        """Test changes over the ceilings are summarized file by file."""
+        config = make_config({'ai.map_reduce.enabled': True})
+
+        plan = plan_request(make_analysis(file_count=3, diff_lines=300), config)
+
+        assert plan.strategy == STRATEGY_SUMMARIZED
+        assert plan.requests == 4
+        assert plan.limits == ["demasiadas líneas de cambio (300)"]
+
+    def test_priced_projection(self):
+        """Test the projected cost uses the model price."""
+        config = make_config({'ai.provider': 'openai', 'ai.model': 'gpt-4o'})
+
+        plan = plan_request(make_analysis(), config)
+
+        # 590 prompt tokens at $2.50/M and 200 answer tokens at $10/M
+        assert plan.cost == pytest.approx(0.003475)
+
+    def test_cost_limit_reached(self):
+        """Test nothing is sent once ai.cost_limit has been spent."""
+        plan = plan_request(make_analysis(), make_config(), make_tracker(cost=5.0))
+
+        assert plan.strategy == STRATEGY_REFUSE
+        assert "Límite de costo alcanzado" in plan.reason
+
+    def test_cost_over_remaining_budget(self):
+        """Test requests costing more than the remaining budget are refused."""
+        config = make_config({'ai.provider': 'openai', 'ai.model': 'gpt-4o'})
+
+        plan = plan_request(make_analysis(), config, make_tracker(cost=4.999))
+
+        assert plan.strategy == STRATEGY_REFUSE
+        assert "presupuesto restante" in plan.reason
+
+    def test_cost_over_max_cost(self):
+        """Test ai.analysis.max_cost caps the cost of one message."""
+        config = make_config({'ai.provider': 'anthropic', 'ai.model': 'claude-opus-4',
+                              'ai.analysis.max_cost': 0.01})
+
+        plan = plan_request(make_analysis(), config)
+
+        assert plan.strategy == STRATEGY_REFUSE
+        assert "ai.analysis.max_cost" in plan.reason
+
+    def test_latency_projected_from_history(self):
+        """Test summaries run in rounds of ai.map_reduce.max_workers."""
+        config = make_config({'ai.map_reduce.enabled': True, 'ai.map_reduce.min_files': 2,
+                              'ai.map_reduce.max_workers': 2})
+
+        plan = plan_request(make_analysis(file_count=5), config,
+                            make_tracker(latency_seconds=6.0, timed_requests=3))
+
+        # 3 rounds of summaries and the final request, 2s each
+        assert plan.strategy == STRATEGY_SUMMARIZED
+        assert plan.latency == 8.0
+
+    def test_latency_over_max_latency(self):
+        """Test ai.analysis.max_latency refuses slow requests."""
+        config = make_config({'ai.analysis.max_latency': 5})
+
+        plan = plan_request(make_analysis(), config, make_tracker(latency_seconds=20.0, timed_requests=2))
+
+        assert plan.strategy == STRATEGY_REFUSE
+        assert "latencia estimada" in plan.reason
+
+
+class TestPreflightIntegration:
+    """Test the plan reaches the analyzer and the generator."""
+
+    def test_analyzer_refuses_over_budget(self):
+        """Test should_use_ai checks the budget before the diff is read."""
+        git = Mock()
+        analyzer = ComplexityAnalyzer(git, make_config(), make_tracker(cost=5.0))
+
+        with patch.object(analyzer, 'analyze_complexity', return_value=make_analysis()):
+            should_use_ai, analysis = analyzer.should_use_ai()
+
+        assert should_use_ai is False
+        assert "Límite de costo alcanzado" in analyzer.get_fallback_message(analysis)
+        git.get_diff_content.assert_not_called()
+
+    def test_summary_shows_projection(self):
+        """Test the analysis summary includes the projected tokens."""
+        analyzer = ComplexityAnalyzer(Mock(), make_config())
+
+        with patch.object(analyzer, 'analyze_complexity', return_value=make_analysis()):
+            _, analysis = analyzer.should_use_ai()
+
+        assert "~590 tokens en 1 petición" in analyzer.get_analysis_summary(analysis)
+
+    @pytest.mark.parametrize("strategy,expected", [
+        (STRATEGY_SUMMARIZED, True),
+        (STRATEGY_FULL, False),
+        (None, False)
+    ])
+    def test_generator_follows_strategy(self, strategy, expected):
+        """Test the planned strategy overrides ai.map_reduce.min_files."""
+        generator = AiMessageGenerator(make_config({'ai.map_reduce.enabled': True}), Mock())
+
+        assert generator._use_map_reduce(['a.py'], strategy) is expected
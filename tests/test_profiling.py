@@ -0,0 +1,170 @@
+"""
+Tests for timing spans.
+
+This module tests the span registry, the phase breakdown printed with
+GGGIT_PROFILE and the performance record BaseCommand.run() writes.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from src.core.utils import profiling
+from src.core.base_commands.base import BaseCommand
+from src.core.git import GitInterface
+from src.core.git_context import read_repo_context_slow
+
+
+@pytest.fixture(autouse=True)
+def clean_spans():
+    """Start each test with no recorded spans."""
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+class TestSpans:
+    """Test recording spans."""
+
+    def test_span_records_duration_and_details(self):
+        """Test a span stores its name, details and nesting depth."""
+        with profiling.span('outer', key='a') as details:
+            with profiling.span('inner'):
+                pass
+            details['extra'] = 1
+
+        inner, outer = profiling.get_spans()
+        assert (inner.name, inner.depth) == ('inner', 1)
+        assert (outer.name, outer.depth) == ('outer', 0)
+        assert outer.details == {'key': 'a', 'extra': 1}
+        assert outer.duration >= inner.duration >= 0
+
+    def test_span_records_on_exception(self):
+        """Test a failing block is still timed."""
+        with pytest.raises(ValueError):
+            with profiling.span('failing'):
+                raise ValueError("boom")
+
+        assert [s.name for s in profiling.get_spans()] == ['failing']
+
+    def test_timed_decorator(self):
+        """Test each call of a decorated function is a span."""
+        @profiling.timed('work')
+        def work(value):
+            return value * 2
+
+        assert work(2) == 4
+        assert work(3) == 6
+        assert profiling.summarize()['work']['count'] == 2
+
+    def test_span_limit(self, monkeypatch):
+        """Test spans beyond MAX_SPANS are counted, not stored."""
+        monkeypatch.setattr(profiling, 'MAX_SPANS', 2)
+        for _ in range(3):
+            with profiling.span('loop'):
+                pass
+
+        assert len(profiling.get_spans()) == 2
+        assert '1 spans not recorded' in profiling.format_breakdown()
+
+
+class TestBreakdown:
+    """Test the phase summary and breakdown."""
+
+    def test_summarize_sorts_by_total(self):
+        """Test phases are added up by name, slowest first."""
+        profiling.record('git status', 0.0, 0.002)
+        profiling.record('ai.generate', 0.0, 0.5)
+        profiling.record('git status', 0.0, 0.004)
+
+        phases = profiling.summarize()
+        assert list(phases) == ['ai.generate', 'git status']
+        assert phases['git status'] == {'count': 2, 'total_ms': 6.0, 'max_ms': 4.0}
+
+    def test_format_breakdown(self):
+        """Test the breakdown shows totals and shares."""
+        profiling.record('config.load', 0.0, 0.25)
+
+        text = profiling.format_breakdown(total=1.0)
+        assert 'ggGit profile: 1000.0 ms' in text
+        assert 'config.load' in text and '25%' in text
+
+    def test_print_breakdown_needs_env(self, monkeypatch, capsys):
+        """Test the breakdown is only printed with GGGIT_PROFILE."""
+        profiling.record('config.load', 0.0, 0.25)
+
+        monkeypatch.delenv('GGGIT_PROFILE', raising=False)
+        profiling.print_breakdown()
+        assert capsys.readouterr().err == ''
+
+        monkeypatch.setenv('GGGIT_PROFILE', '1')
+        profiling.print_breakdown()
+        assert 'config.load' in capsys.readouterr().err
+
+
+class TestCommandTiming:
+    """Test the timing of command runs."""
+
+    def test_run_logs_performance(self, monkeypatch):
+        """Test run() writes one record with the phases when profiling."""
+        monkeypatch.setenv('GGGIT_PROFILE', '1')
+
+        class TimedCommand(BaseCommand):
+            def execute(self, *args, **kwargs):
+                with profiling.span('git status'):
+                    pass
+                return 3
+
+        command = TimedCommand()
+        command.logger = Mock()
+        assert command.run() == 3
+
+        operation, duration, details = command.logger.log_performance.call_args[0]
+        assert operation == 'TimedCommand'
+        assert duration >= 0
+        assert details['exit_code'] == 3
+        assert {'startup', 'command', 'git status'} <= set(details['phases'])
+
+    def test_performance_record_is_opt_in(self, monkeypatch):
+        """Test the record needs GGGIT_PROFILE or logging.performance."""
+        monkeypatch.delenv('GGGIT_PROFILE', raising=False)
+
+        class QuietCommand(BaseCommand):
+            def execute(self, *args, **kwargs):
+                return 0
+
+        command = QuietCommand()
+        command.logger = Mock()
+        assert command.run() == 0
+        command.logger.log_performance.assert_not_called()
+
+        command.config = Mock()
+        command.config.get_config.side_effect = lambda key, default=None: key == 'logging.performance'
+        assert command.run() == 0
+        command.logger.log_performance.assert_called_once()
+
+    def test_performance_logging_errors_are_ignored(self, monkeypatch):
+        """Test a failing performance log does not change the exit code."""
+        monkeypatch.setenv('GGGIT_PROFILE', '1')
+
+        class QuietCommand(BaseCommand):
+            def execute(self, *args, **kwargs):
+                return 0
+
+        command = QuietCommand()
+        command.logger = Mock()
+        command.logger.log_performance.side_effect = OSError("disk full")
+        assert command.run() == 0
+
+    def test_git_calls_are_timed(self, temp_git_repo, monkeypatch):
+        """Test git subprocesses are recorded by subcommand."""
+        monkeypatch.chdir(temp_git_repo)
+        with GitInterface() as git:
+            git.get_index_tree()
+
+        assert 'git write-tree' in profiling.summarize()
+
+    def test_repo_discovery_calls_are_timed(self, temp_git_repo):
+        """Test the rev-parse fallback of repository discovery is recorded."""
+        assert read_repo_context_slow(str(temp_git_repo)) is not None
+
+        assert 'git rev-parse' in profiling.summarize()
@@ -0,0 +1,112 @@
+"""
+Tests for compiled schema validators.
+
+This module tests the schema registry helpers and the subtree
+validation ConfigManager.set_config performs with them.
+"""
+
+import os
+import tempfile
+import jsonschema
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core import schema_registry
+from src.core.config import ConfigManager
+
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'ai': {
+            'type': 'object',
+            'properties': {
+                'enabled': {'type': 'boolean'},
+                'analysis': {
+                    'type': 'object',
+                    'properties': {'max_files': {'type': 'integer'}},
+                    'required': ['max_files']
+                }
+            }
+        },
+        'strict': {'type': 'object', 'additionalProperties': False}
+    }
+}
+
+
+class TestValidators:
+    """Test validator compilation and reuse."""
+
+    def test_validator_is_built_once(self):
+        """Test the same schema object reuses its validator."""
+        schema = {'type': 'integer'}
+        assert schema_registry.get_validator(schema) is schema_registry.get_validator(schema)
+
+    def test_validate_raises_best_match(self):
+        """Test errors are raised like jsonschema.validate does."""
+        schema_registry.validate({'ai': {'enabled': True}}, SCHEMA)
+        with pytest.raises(jsonschema.ValidationError) as exc_info:
+            schema_registry.validate({'ai': {'enabled': 'yes'}}, SCHEMA)
+        assert list(exc_info.value.path) == ['ai', 'enabled']
+
+    def test_schema_file_parsed_once(self, tmp_path):
+        """Test schema files are parsed again only after a change."""
+        path = tmp_path / "schema.yaml"
+        path.write_text("type: object\n")
+        first = schema_registry.load_schema_file(str(path))
+
+        with patch('yaml.safe_load') as safe_load:
+            assert schema_registry.load_schema_file(str(path)) is first
+            safe_load.assert_not_called()
+
+        path.write_text("type: integer\n")
+        os.utime(path, ns=(1, 1))
+        assert schema_registry.load_schema_file(str(path)) == {'type': 'integer'}
+
+
+class TestGetSubschema:
+    """Test sub-schema lookup by dotted key."""
+
+    def test_nested_property(self):
+        """Test keys described by nested properties."""
+        assert schema_registry.get_subschema(SCHEMA, 'ai.analysis.max_files') == {'type': 'integer'}
+
+    def test_unconstrained_key(self):
+        """Test keys allowed by default additionalProperties."""
+        assert schema_registry.get_subschema(SCHEMA, 'ai.custom.value') == {}
+
+    def test_forbidden_key(self):
+        """Test keys rejected by additionalProperties: false."""
+        assert schema_registry.get_subschema(SCHEMA, 'strict.value') is None
+
+    def test_ref_is_not_split(self):
+        """Test sub-schemas using $ref need the whole document."""
+        schema = {'properties': {'a': {'$ref': '#/definitions/b'}}}
+        assert schema_registry.get_subschema(schema, 'a') is None
+
+
+class TestSetConfigValidation:
+    """Test set_config validates only the changed subtree."""
+
+    def test_valid_value_skips_full_validation(self):
+        """Test a valid change does not revalidate everything."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                config = ConfigManager()
+                with patch.object(ConfigManager, 'validate_config') as validate:
+                    config.set_config('ai.enabled', True, 'user')
+                    validate.assert_not_called()
+
+                assert config.get_config('ai.enabled') is True
+
+    def test_invalid_value_warns(self, capsys):
+        """Test an invalid value is stored but reported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('pathlib.Path.home', return_value=Path(tmpdir)):
+                config = ConfigManager()
+                config.set_config('ai.provider', 'unknown', 'user')
+
+                assert config.get_config('ai.provider') == 'unknown'
+                output = capsys.readouterr().out
+                assert "Warning: Configuration validation failed: ai.provider" in output
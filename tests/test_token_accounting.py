@@ -0,0 +1,141 @@
+"""
+Tests for token accounting.
+
+This module tests the local token counter, the model price table and
+the usage the message generator records for each provider call.
+"""
+
+import builtins
+import pytest
+from unittest.mock import Mock, patch
+
+from src.core.ai import token_counter
+from src.core.ai.message_generator import AiMessageGenerator
+from src.core.ai.pricing import calculate_cost, get_price
+from src.core.ai.providers import ProviderResponse
+from src.core.ai.token_counter import count_tokens, estimate_tokens
+from tests.conftest import make_config
+
+
+class TestTokenCounter:
+    """Test count_tokens and its fallback estimate."""
+
+    def test_common_words_are_single_tokens(self):
+        """Test short words, punctuation and spaces."""
+        assert estimate_tokens("feat: add login") == 4
+        assert estimate_tokens("") == 0
+
+    def test_long_identifiers_and_numbers_are_split(self):
+        """Test long words and digit runs cost several tokens."""
+        assert estimate_tokens("internationalization") == 4
+        assert estimate_tokens("123456789") == 3
+
+    def test_fallback_without_tiktoken(self):
+        """Test the estimate is used when tiktoken cannot be imported."""
+        real_import = builtins.__import__
+
+        def no_tiktoken(name, *args, **kwargs):
+            if name == 'tiktoken':
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        token_counter._get_encoding.cache_clear()
+        try:
+            with patch('builtins.__import__', side_effect=no_tiktoken):
+                assert count_tokens("feat: add login", "gpt-4o") == 4
+        finally:
+            token_counter._get_encoding.cache_clear()
+
+    def test_encoding_is_loaded_once(self):
+        """Test the encoding of a model is cached."""
+        encoding = Mock()
+        encoding.encode.return_value = [1, 2, 3]
+        token_counter._get_encoding.cache_clear()
+        try:
+            with patch.object(token_counter, '_get_encoding', return_value=encoding):
+                assert count_tokens("text", "gpt-4o") == 3
+            token_counter._get_encoding("x")
+            token_counter._get_encoding("x")
+            assert token_counter._get_encoding.cache_info().hits == 1
+        finally:
+            token_counter._get_encoding.cache_clear()
+
+
+class TestPricing:
+    """Test the price table."""
+
+    def test_longest_prefix_wins(self):
+        """Test dated snapshots use the price of their family."""
+        assert get_price('gpt-4o-mini-2024-07-18') == (0.15, 0.60)
+        assert get_price('gpt-4o') == (2.50, 10.00)
+        assert get_price('claude-3-5-sonnet-20241022') == (3.00, 15.00)
+
+    def test_unknown_and_free(self):
+        """Test unknown models and local providers cost nothing."""
+        assert get_price('gemma3:4b') is None
+        assert calculate_cost('openai', 'gemma3:4b', 1000, 100) == 0.0
+        assert calculate_cost('local', 'gpt-4o', 1000, 100) == 0.0
+
+    def test_cost(self):
+        """Test input and output tokens are priced separately."""
+        assert calculate_cost('openai', 'gpt-4o-mini', 1_000_000, 1_000_000) == pytest.approx(0.75)
+
+    def test_configured_prices(self):
+        """Test ai.prices adds and overrides models."""
+        config = make_config({'ai.prices': {'my-model': {'input': 1, 'output': 2}}})
+        assert calculate_cost('openai', 'my-model', 1_000_000, 500_000, config) == pytest.approx(2.0)
+
+
+class TestGeneratorUsage:
+    """Test the usage recorded for provider calls."""
+
+    def make_generator(self, values):
+        """Create a generator with tracking enabled."""
+        generator = AiMessageGenerator(make_config(values), Mock())
+        generator.usage_tracker.is_tracking_enabled.return_value = True
+        generator.show_tokens = False
+        return generator
+
+    def test_provider_counts_are_used(self):
+        """Test reported counts, latency and price are recorded."""
+        generator = self.make_generator({'ai.provider': 'openai', 'ai.model': 'gpt-4o-mini'})
+        result = ProviderResponse("feat: x", prompt_tokens=1000, completion_tokens=10, latency=0.5)
+
+        with patch.object(generator._get_provider(), 'generate', return_value=result):
+            assert generator._call_ai_api("prompt") == "feat: x"
+
+        generator.usage_tracker.increment_usage.assert_called_once_with(
+            "ggai", 1010, pytest.approx(0.000156),
+            prompt_tokens=1000, completion_tokens=10, latency=0.5, model='gpt-4o-mini',
+            cache_hit=None
+        )
+
+    def test_local_count_when_missing(self):
+        """Test missing counts are counted locally."""
+        generator = self.make_generator({'ai.provider': 'local', 'ai.model': 'gemma3:4b'})
+        result = ProviderResponse("feat: add login", latency=0.1)
+
+        with patch.object(generator._get_provider(), 'generate', return_value=result):
+            generator._call_ai_api("feat: add login")
+
+        args, kwargs = generator.usage_tracker.increment_usage.call_args
+        assert args == ("ggai", 8, 0.0)
+        assert (kwargs['prompt_tokens'], kwargs['completion_tokens']) == (4, 4)
+
+
+class TestTrackerRecordsDetails:
+    """Test AiUsageTracker stores the token split and latency."""
+
+    def test_split_and_latency(self, tmp_path):
+        """Test prompt/completion tokens, latency and model are stored."""
+        from src.core.ai.usage_tracker import AiUsageTracker
+
+        tracker = AiUsageTracker(make_config({'ai.usage_file': str(tmp_path / "usage.yaml")}))
+        tracker.increment_usage("ggai", 30, 0.01, prompt_tokens=20, completion_tokens=10,
+                                latency=0.25, model='gpt-4o')
+        tracker.increment_usage("ggai", 5, 0.0)
+
+        totals = tracker.get_usage_stats()['totals']
+        assert totals['tokens'] == 35
+        assert (totals['prompt_tokens'], totals['completion_tokens']) == (20, 10)
+        assert (totals['latency_seconds'], totals['timed_requests']) == (0.25, 1)
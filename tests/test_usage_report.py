@@ -0,0 +1,179 @@
+"""
+Tests for AI usage reports.
+
+This module tests the log-scale histograms, the grouping of ledger
+entries into reports and the details AiUsageTracker records for them.
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import Mock, patch
+
+from src.core.ai.message_generator import AiMessageGenerator
+from src.core.ai.usage_report import Histogram, build_usage_report, parse_since, period_key
+from src.core.ai.usage_tracker import AiUsageTracker
+from tests.conftest import make_config
+
+
+def entry(latency=1.0, completion=10, **fields):
+    """Create a ledger entry."""
+    data = {'date': '2024-12-19', 'command': 'ggfeat', 'model': 'gemma3:4b', 'repo': '/src/app',
+            'tokens': 100 + completion, 'cost': 0.0, 'prompt_tokens': 100,
+            'completion_tokens': completion, 'latency': latency}
+    data.update(fields)
+    return data
+
+
+class TestHistogram:
+    """Test Histogram percentiles."""
+
+    def test_empty(self):
+        """Test an empty histogram has no percentiles."""
+        histogram = Histogram()
+        assert histogram.percentile(50) is None
+        assert histogram.mean is None
+
+    def test_percentiles_within_bucket_width(self):
+        """Test percentiles are accurate to about 5%."""
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.add(value / 10)
+
+        assert histogram.percentile(50) == pytest.approx(5.0, rel=0.05)
+        assert histogram.percentile(95) == pytest.approx(9.5, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(9.9, rel=0.05)
+        assert histogram.mean == pytest.approx(5.05)
+
+    def test_zero_values(self):
+        """Test zeros land in their own bucket."""
+        histogram = Histogram()
+        histogram.add(0)
+        histogram.add(0)
+        histogram.add(2)
+
+        assert histogram.percentile(50) == 0.0
+        assert histogram.percentile(99) == pytest.approx(2, rel=0.05)
+
+
+class TestBuildUsageReport:
+    """Test build_usage_report grouping and throughput."""
+
+    def test_groups(self):
+        """Test requests are grouped by command, model and repository."""
+        report = build_usage_report([
+            entry(command='ggfeat', model='gemma3:4b'),
+            entry(command='ggfix', model='llama3', repo='/src/lib'),
+            entry(command='ggfix', model='llama3', repo='/src/lib')
+        ])
+
+        assert report['totals']['requests'] == 3
+        assert report['by_command']['ggfix']['requests'] == 2
+        assert list(report['by_model']) == ['gemma3:4b', 'llama3']
+        assert report['by_repo']['/src/app']['requests'] == 1
+
+    def test_tokens_per_second(self):
+        """Test throughput uses the completion tokens of timed requests."""
+        report = build_usage_report([
+            entry(latency=2.0, completion=40),
+            entry(latency=2.0, completion=20),
+            entry(latency=None, completion=1000)
+        ])
+
+        assert report['by_model']['gemma3:4b']['tokens_per_second'] == pytest.approx(15.0)
+        assert report['totals']['latency']['count'] == 2
+
+    def test_cache_hits_are_not_requests(self):
+        """Test cache hits only count towards the hit rate."""
+        report = build_usage_report([
+            entry(cache='miss'),
+            {'date': '2024-12-19', 'command': 'ggfeat', 'tokens': 0, 'cost': 0.0, 'cache': 'hit'}
+        ])
+
+        totals = report['totals']
+        assert totals['requests'] == 1
+        assert (totals['cache_hits'], totals['cache_misses']) == (1, 1)
+        assert totals['cache_hit_rate'] == 0.5
+
+    def test_trend_periods(self):
+        """Test entries are bucketed by day, ISO week or month."""
+        entries = [entry(date='2024-12-19'), entry(date='2024-12-20'), entry(date='2025-01-02')]
+
+        assert list(build_usage_report(entries, 'day')['trend']) == ['2024-12-19', '2024-12-20', '2025-01-02']
+        assert list(build_usage_report(entries, 'week')['trend']) == ['2024-W51', '2025-W01']
+        assert list(build_usage_report(entries, 'month')['trend']) == ['2024-12', '2025-01']
+
+    def test_since(self):
+        """Test entries before the first day are skipped."""
+        report = build_usage_report([entry(date='2024-12-01'), entry(date='2024-12-19')],
+                                    since=date(2024, 12, 10))
+        assert report['totals']['requests'] == 1
+
+    def test_invalid_period(self):
+        """Test an unknown period is rejected."""
+        with pytest.raises(ValueError):
+            build_usage_report([], 'year')
+
+    def test_timestamp_wins_over_date(self):
+        """Test the entry time is used when recorded."""
+        timestamp = 1734998400  # 2024-12-24 UTC
+        assert period_key({'time': timestamp, 'date': '2000-01-01'}, 'month') == '2024-12'
+
+    def test_parse_since(self):
+        """Test the report window includes today."""
+        assert parse_since(0) is None
+        assert parse_since(1) == date.today()
+
+
+class TestTrackerReportDetails:
+    """Test AiUsageTracker records what the reports need."""
+
+    def make_tracker(self, tmp_path):
+        """Create a tracker writing to a temporary directory."""
+        return AiUsageTracker(make_config({'ai.usage_file': str(tmp_path / 'ai-usage.yaml')}))
+
+    def test_entry_fields(self, tmp_path):
+        """Test time, repository and cache outcome are recorded."""
+        tracker = self.make_tracker(tmp_path)
+        with patch.object(tracker, '_get_repo', return_value='/src/app'):
+            tracker.increment_usage("ggfeat", 30, 0.0, latency=0.2, model="llama3", cache_hit=False)
+
+        recorded = next(tracker.iter_ledger())
+        assert recorded['repo'] == '/src/app'
+        assert recorded['cache'] == 'miss'
+        assert isinstance(recorded['time'], float)
+
+    def test_cache_hits_in_rollup(self, tmp_path):
+        """Test cache hits are counted apart from requests."""
+        tracker = self.make_tracker(tmp_path)
+        tracker.increment_usage("ggfeat", 30, 0.0, cache_hit=False)
+        tracker.increment_usage("ggfeat", 0, 0.0, cache_hit=True)
+
+        totals = tracker.get_usage_stats()['totals']
+        assert totals['requests'] == 1
+        assert (totals['cache_hits'], totals['cache_misses']) == (1, 1)
+
+    def test_report_from_ledger(self, tmp_path):
+        """Test a report built from the tracker's ledger."""
+        tracker = self.make_tracker(tmp_path)
+        for latency in (0.5, 1.0, 1.5):
+            tracker.increment_usage("ggfix", 30, 0.0, completion_tokens=10, latency=latency, model="llama3")
+
+        report = build_usage_report(tracker.iter_ledger())
+        assert report['by_command']['ggfix']['latency']['p50'] == pytest.approx(1.0, rel=0.05)
+
+
+class TestGeneratorReportDetails:
+    """Test the command and cache outcome the generator records."""
+
+    def test_cache_hit_is_recorded(self):
+        """Test a cached message records a hit for the commit command."""
+        generator = AiMessageGenerator(make_config({'ai.model': 'llama3'}), Mock())
+        generator.usage_tracker.is_tracking_enabled.return_value = True
+
+        with patch.object(generator.message_cache, 'is_enabled', return_value=True), \
+             patch.object(generator.message_cache, 'get', return_value="feat: cached"):
+            assert generator.generate_message(['a.py'], "diff", 'feat') == "feat: cached"
+
+        generator.usage_tracker.increment_usage.assert_called_once_with(
+            "ggfeat", 0, 0.0, model='llama3', cache_hit=True
+        )